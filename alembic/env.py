@@ -24,6 +24,7 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 from app.db.session import Base
 from app.models.strategy import Strategy # Strategy 모델 임포트
+from app.models.triggered_symbol import TriggeredSymbol
 
 # 여기에 다른 모델들도 추가합니다. 예: from app.models.user import User
 
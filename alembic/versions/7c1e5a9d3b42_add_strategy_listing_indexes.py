@@ -0,0 +1,30 @@
+"""Add composite indexes for strategy listing
+
+Revision ID: 7c1e5a9d3b42
+Revises: 2497826f900a
+Create Date: 2026-10-19 12:05:41.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e5a9d3b42'
+down_revision: Union[str, Sequence[str], None] = '2497826f900a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_strategies_is_active_id', 'strategies', ['is_active', 'id'], unique=False)
+    op.create_index('ix_strategies_broker_market_active_id', 'strategies', ['broker', 'market', 'is_active', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_strategies_broker_market_active_id', table_name='strategies')
+    op.drop_index('ix_strategies_is_active_id', table_name='strategies')
@@ -0,0 +1,40 @@
+"""Create triggered_symbols table
+
+Revision ID: b3f08d6e21c7
+Revises: 7c1e5a9d3b42
+Create Date: 2026-10-19 13:21:09.552810
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f08d6e21c7'
+down_revision: Union[str, Sequence[str], None] = '7c1e5a9d3b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('triggered_symbols',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('strategy_id', sa.Integer(), nullable=False),
+    sa.Column('ticker', sa.String(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['strategy_id'], ['strategies.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('strategy_id', 'ticker', name='uq_triggered_symbols_strategy_ticker')
+    )
+    op.create_index(op.f('ix_triggered_symbols_id'), 'triggered_symbols', ['id'], unique=False)
+    op.create_index(op.f('ix_triggered_symbols_strategy_id'), 'triggered_symbols', ['strategy_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_triggered_symbols_strategy_id'), table_name='triggered_symbols')
+    op.drop_index(op.f('ix_triggered_symbols_id'), table_name='triggered_symbols')
+    op.drop_table('triggered_symbols')
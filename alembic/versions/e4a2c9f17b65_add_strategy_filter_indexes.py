@@ -0,0 +1,30 @@
+"""Add strategy listing indexes for market-only and broker + is_active filters
+
+Revision ID: e4a2c9f17b65
+Revises: b3f08d6e21c7
+Create Date: 2026-10-19 16:42:08.511374
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a2c9f17b65'
+down_revision: Union[str, Sequence[str], None] = 'b3f08d6e21c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_strategies_market_active_id', 'strategies', ['market', 'is_active', 'id'], unique=False)
+    op.create_index('ix_strategies_broker_active_id', 'strategies', ['broker', 'is_active', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_strategies_broker_active_id', table_name='strategies')
+    op.drop_index('ix_strategies_market_active_id', table_name='strategies')
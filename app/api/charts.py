@@ -0,0 +1,31 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional
+
+from app.models.chart import ChartResponse
+from app.services.chart_service import chart_service, validate_chart_request
+
+router = APIRouter()
+
+
+@router.get("/charts/{ticker}", response_model=ChartResponse)
+async def read_chart(
+    ticker: str,
+    timeframe: str = "day",
+    limit: int = Query(200, gt=0),
+    width: Optional[int] = Query(None, ge=3),
+    overlays: List[str] = Query([]),
+    broker: str = "upbit",
+):
+    """
+    종목의 최근 `limit`개 봉과 보조지표 오버레이(`overlays=ma(20)&overlays=ma(60)`)를 반환합니다.
+    `width`(차트 픽셀 폭)보다 봉이 많으면 서버에서 모양을 보존하도록(LTTB) 줄여서 보냅니다.
+    `limit`은 서버 설정(CHART_MAX_BARS)의 상한을 넘을 수 없습니다. 실시간 봉은 WebSocket "chart" 채널로 받습니다.
+    잘못된 오버레이/타임프레임은 422, 알 수 없는 브로커는 400을 반환합니다.
+    """
+    errors = validate_chart_request(timeframe, overlays, broker)
+    invalid = [error for error in errors if error["field"] != "broker"]
+    if invalid:
+        raise HTTPException(status_code=422, detail=invalid)
+    if errors:
+        raise HTTPException(status_code=400, detail=errors[0]["error"])
+    return await chart_service.get_chart(ticker, timeframe, limit, overlays, width, broker)
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.core.metrics import metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def read_metrics():
+    """
+    스캔 단계별 지연 시간 히스토그램과 종목/요청 수 카운터를 Prometheus 텍스트 형식으로 반환합니다.
+    """
+    if not metrics.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled.")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Header, HTTPException
+from typing import Optional
+
+from app.core.orders import OrderRequest
+from app.models.order import OrderCreate, OrderSchema
+from app.services.order_service import get_order_pipeline
+
+router = APIRouter()
+
+
+@router.post("/orders", response_model=OrderSchema, status_code=202)
+async def create_order(
+    order_in: OrderCreate,
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key"),
+):
+    """
+    주문을 주문 파이프라인에 제출합니다. 주문은 요청 수 제한 안에서 비동기로 전송되고 체결이 추적됩니다.
+    같은 `Idempotency-Key`로 다시 요청하면 새 주문을 내지 않고 기존 주문 상태를 반환합니다.
+    """
+    record = await get_order_pipeline().submit(OrderRequest(
+        ticker=order_in.ticker,
+        side=order_in.side,
+        order_type=order_in.order_type,
+        amount=order_in.amount,
+        price=order_in.price,
+        idempotency_key=idempotency_key,
+        strategy_id=order_in.strategy_id,
+    ))
+    return OrderSchema.from_record(record)
+
+
+@router.get("/orders/{client_order_id}", response_model=OrderSchema)
+async def read_order(client_order_id: str):
+    """
+    주문 상태를 조회합니다.
+    """
+    record = get_order_pipeline().get(client_order_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Order not found")
+    return OrderSchema.from_record(record)
+
+
+@router.post("/orders/{client_order_id}/cancel", response_model=OrderSchema)
+async def cancel_order(client_order_id: str):
+    """
+    대기 중이거나 미체결인 주문을 취소합니다.
+    """
+    record = await get_order_pipeline().cancel(client_order_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Order not found")
+    return OrderSchema.from_record(record)
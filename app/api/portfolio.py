@@ -0,0 +1,22 @@
+from fastapi import APIRouter, HTTPException
+
+from app.services.order_service import get_order_pipeline
+from app.services.portfolio_service import portfolio_service
+
+router = APIRouter()
+
+
+@router.get("/portfolio")
+async def read_portfolio(refresh: bool = False):
+    """
+    포트폴리오 평가(현금, 총자산, 평가손익, 종목별 비중과 한도 위반)를 반환합니다.
+    `refresh=true`이면 주문 브로커의 잔고와 현재가를 다시 읽어 평가한 뒤 반환합니다.
+    """
+    if refresh or not portfolio_service.portfolio.loaded:
+        if portfolio_service.broker is None:
+            portfolio_service.broker = get_order_pipeline().broker
+        try:
+            await portfolio_service.refresh()
+        except RuntimeError as e:
+            raise HTTPException(status_code=502, detail=str(e))
+    return portfolio_service.snapshot()
@@ -1,143 +1,207 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db
 from app.services import strategy_service
-from app.core.engine import ScanEngine
-from app.core.brokers.upbit import UpbitBroker
-from app.services.websocket_manager import manager
-import json
-import polars as pl
+from app.models.triggered_symbol import TriggeredSymbolSchema
+from app.models.scan_profile import ScanProfileSchema, ScanProfileSummary
+from app.services.profile_service import scan_profiles
+from app.models.dynamic_scan import DynamicScanRequest, DynamicScanResponse
+from app.services.scan_service import (
+    watchlist_storage, run_1st_scan_background, run_2nd_scan_background, action_scanners,
+    mock_indicators, run_dynamic_scan, builder_to_scan_logic,
+)
+from app.services.trigger_service import triggered_symbols, ensure_triggered_symbols_loaded
+from app.services.job_service import get_scan_job_relay, get_job_queue
+from app.core.config import settings
+from app.core.brokers.registry import get_broker_class
+from app.core.engine import validate_scan_logic
+from typing import List
 import asyncio
+import datetime
 
 router = APIRouter()
 
-# --- Mock/Temporary implementations ---
-# TODO: 플러그인 시스템을 통해 동적으로 로드해야 합니다.
-def moving_average(period: int):
-    return pl.col('close').rolling_mean(window_size=period)
-mock_indicators = {"ma": moving_average}
-
-# TODO: Redis와 같은 견고한 캐시/메시지 큐로 교체해야 합니다.
-watchlist_storage = {}
-# --- End of Mock/Temporary implementations ---
-
-
-async def broadcast_scan_result(strategy_name: str, result_df: pl.DataFrame):
-    """Helper function to broadcast scan results via WebSocket."""
-    if not result_df.is_empty():
-        result_json = result_df.write_json(row_oriented=True)
-        message = {
-            "event": "scan_result_found",
-            "payload": {
-                "strategy_name": strategy_name,
-                "results": json.loads(result_json)
-            }
-        }
-        await manager.broadcast(json.dumps(message))
-        print(f"'{strategy_name}' 스캔 결과 ({len(result_df)}개) WebSocket으로 전송 완료.")
-    else:
-        print(f"'{strategy_name}' 스캔 결과 없음.")
-
-
-async def broadcast_watchlist(strategy_name: str, watchlist: list[str]):
-    """Helper function to broadcast the watchlist via WebSocket."""
-    message = {
-        "event": "watchlist_updated",
-        "payload": {
-            "strategy_name": strategy_name,
-            "watchlist": watchlist,
-            "count": len(watchlist)
-        }
-    }
-    await manager.broadcast(json.dumps(message))
-    print(f"'{strategy_name}' 관심종목 ({len(watchlist)}개) WebSocket으로 전송 완료.")
-
-
-def run_1st_scan_background(strategy_id: int):
-    """백그라운드에서 1차 스캔을 실행합니다."""
-    from app.db.session import SessionLocal
-    db = SessionLocal()
-    try:
-        strategy = strategy_service.get_strategy(db, strategy_id=strategy_id)
-        if not strategy:
-            print(f"백그라운드 작업 오류: 전략 ID {strategy_id}를 찾을 수 없습니다.")
-            return
-
-        print(f"1차 백그라운드 스캔 시작: {strategy.name}")
-        broker = UpbitBroker()
-        engine = ScanEngine(broker=broker, indicators=mock_indicators)
-
-        watchlist = asyncio.run(engine.run_1st_scan(strategy.scan_logic))
 
-        watchlist_storage[strategy.id] = watchlist
-        print(f"'{strategy.name}'의 1차 스캔 완료. 관심종목 {len(watchlist)}개 저장.")
+def _started(message: str, scan_profile) -> dict:
+    response = {"message": message}
+    if scan_profile is not None:
+        response["profile_id"] = scan_profile.id
+    return response
 
-        asyncio.run(broadcast_watchlist(strategy.name, watchlist))
 
-    finally:
-        db.close()
+def _use_workers(profile: bool) -> bool:
+    # 프로파일은 API 프로세스 메모리에 보관하므로 프로파일 실행은 워커 모드에서도 이 프로세스에서 실행합니다.
+    return settings.SCAN_WORKERS_ENABLED and not profile
 
 
-def run_2nd_scan_background(strategy_id: int):
-    """백그라운드에서 2차 스캔을 실행합니다."""
-    from app.db.session import SessionLocal
-    db = SessionLocal()
+@router.post("/scans/run-dynamic", response_model=DynamicScanResponse)
+async def run_dynamic_strategy_scan(request: DynamicScanRequest):
+    """
+    저장하지 않은 전략(scan_logic 또는 전략 빌더 식)을 즉시 실행하고 결과를 바로 반환합니다.
+    조건 컴파일 오류는 422로 즉시 반환합니다. 실행 시간과 2차 스캔 종목 수는 서버 설정의 상한으로 제한되며,
+    한도에 걸리면 그때까지의 결과를 `partial=true`로 반환합니다.
+    """
+    scan_logic = request.scan_logic if request.scan_logic is not None else builder_to_scan_logic(request.strategy)
+    errors = validate_scan_logic(scan_logic, mock_indicators)
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
     try:
-        strategy = strategy_service.get_strategy(db, strategy_id=strategy_id)
-        if not strategy:
-            print(f"백그라운드 작업 오류: 전략 ID {strategy_id}를 찾을 수 없습니다.")
-            return
-
-        watchlist = watchlist_storage.get(strategy.id)
-        if watchlist is None:
-            print(f"'{strategy.name}'에 대한 2차 스캔을 시작할 수 없습니다. 먼저 1차 스캔을 실행해야 합니다.")
-            # TODO: 사용자에게 에러를 알리는 WebSocket 메시지 전송
-            return
-
-        print(f"2차 백그라운드 스캔 시작: {strategy.name} (대상: {len(watchlist)}개)")
-        broker = UpbitBroker()
-        engine = ScanEngine(broker=broker, indicators=mock_indicators)
-
-        results = asyncio.run(engine.run_2nd_scan(strategy.scan_logic, tickers=watchlist))
-
-        asyncio.run(broadcast_scan_result(strategy.name, results))
+        get_broker_class(request.broker)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    finally:
-        db.close()
+    try:
+        return await run_dynamic_scan(
+            scan_logic,
+            broker_name=request.broker,
+            tickers=request.tickers,
+            max_tickers=request.max_tickers,
+            timeout=request.timeout_seconds,
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Dynamic scan did not finish the 1st phase within the time limit.")
 
 
 @router.post("/scans/{strategy_id}/run-1st", status_code=202)
-def run_1st_strategy_scan(
+async def run_1st_strategy_scan(
     *,
     strategy_id: int,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    profile: bool = False,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     [1단계] 특정 전략에 대한 1차 스캔을 백그라운드에서 실행하여 '관심종목'을 생성합니다.
+    `profile=true`이면 실행 프로파일을 기록하며, 응답의 `profile_id`로 나중에 조회할 수 있습니다.
+    스캔 워커 모드에서는 작업 큐에 넣고 `job_id`를 반환합니다.
     """
-    if not strategy_service.get_strategy(db, strategy_id=strategy_id):
+    entry = await strategy_service.get_cached_strategy(db, strategy_id=strategy_id)
+    if not entry:
         raise HTTPException(status_code=404, detail="Strategy not found")
 
-    background_tasks.add_task(run_1st_scan_background, strategy_id)
-    return {"message": "1st phase scan has been started in the background."}
+    if _use_workers(profile):
+        job_id = await get_scan_job_relay().submit("scan_1st", entry.data)
+        return {"message": "1st phase scan has been queued for a scan worker.", "job_id": job_id}
+
+    scan_profile = scan_profiles.start(strategy_id, "1st") if profile else None
+    background_tasks.add_task(run_1st_scan_background, entry.data, scan_profile)
+    return _started("1st phase scan has been started in the background.", scan_profile)
 
 
 @router.post("/scans/{strategy_id}/run-2nd", status_code=202)
-def run_2nd_strategy_scan(
+async def run_2nd_strategy_scan(
     *,
     strategy_id: int,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    profile: bool = False,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     [2단계] 생성된 '관심종목'을 바탕으로 2차 스캔을 실행하여 최종 결과를 도출합니다.
+    `profile=true`이면 실행 프로파일을 기록합니다. 스캔 워커 모드에서는 작업 큐에 넣고 `job_id`를 반환합니다.
     """
-    if not strategy_service.get_strategy(db, strategy_id=strategy_id):
+    entry = await strategy_service.get_cached_strategy(db, strategy_id=strategy_id)
+    if not entry:
         raise HTTPException(status_code=404, detail="Strategy not found")
 
     if strategy_id not in watchlist_storage:
          raise HTTPException(status_code=404, detail="Watchlist not found. Please run the 1st phase scan first.")
 
-    background_tasks.add_task(run_2nd_scan_background, strategy_id)
-    return {"message": "2nd phase scan has been started in the background."}
+    if _use_workers(profile):
+        job_id = await get_scan_job_relay().submit("scan_2nd", entry.data, watchlist=watchlist_storage[strategy_id])
+        return {"message": "2nd phase scan has been queued for a scan worker.", "job_id": job_id}
+
+    scan_profile = scan_profiles.start(strategy_id, "2nd") if profile else None
+    background_tasks.add_task(run_2nd_scan_background, entry.data, scan_profile)
+    return _started("2nd phase scan has been started in the background.", scan_profile)
+
+
+@router.get("/scans/jobs/{job_id}")
+async def read_scan_job(job_id: int):
+    """
+    스캔 워커 모드에서 큐에 넣은 스캔 작업의 상태(queued, running, done, failed)를 조회합니다.
+    """
+    if not settings.SCAN_WORKERS_ENABLED:
+        raise HTTPException(status_code=404, detail="Scan workers are disabled.")
+    job = await asyncio.to_thread(get_job_queue().get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Scan job not found")
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "strategy_id": job.payload["strategy"]["id"],
+        "status": job.status,
+        "attempts": job.attempts,
+        "worker": job.worker,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+@router.get("/scans/{strategy_id}/profiles", response_model=List[ScanProfileSummary])
+async def read_scan_profiles(strategy_id: int):
+    """
+    `profile=true`로 실행된 전략의 최근 스캔 프로파일 목록을 최신순으로 조회합니다.
+    """
+    return scan_profiles.list(strategy_id)
+
+
+@router.get("/scans/profiles/{profile_id}", response_model=ScanProfileSchema)
+async def read_scan_profile(profile_id: str):
+    """
+    스캔 프로파일(cProfile 통계, Polars 쿼리 플랜과 노드별 시간, 가장 느린 종목)을 조회합니다.
+    """
+    scan_profile = scan_profiles.get(profile_id)
+    if scan_profile is None:
+        raise HTTPException(status_code=404, detail="Scan profile not found")
+    return scan_profile
+
+
+@router.post("/scans/{strategy_id}/action/start", status_code=202)
+async def start_action_scanner(
+    *,
+    strategy_id: int,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    [트리거-액션] 액션 전략의 고빈도 스캔 루프를 시작합니다.
+    액션 루프는 트리거 전략이 무장시킨 종목만 주기적으로 재평가합니다.
+    """
+    entry = await strategy_service.get_cached_strategy(db, strategy_id=strategy_id)
+    if not entry:
+        raise HTTPException(status_code=404, detail="Strategy not found")
+    action_config = entry.data.scan_logic.get("action")
+    if not action_config or "trigger_strategy_id" not in action_config:
+        raise HTTPException(status_code=400, detail="Strategy has no 'action.trigger_strategy_id' in scan_logic.")
+
+    action_scanners.start(entry.data)
+    return {"message": "Action scanner has been started."}
+
+
+@router.post("/scans/{strategy_id}/action/stop")
+async def stop_action_scanner(strategy_id: int):
+    """
+    [트리거-액션] 실행 중인 액션 스캔 루프를 중지합니다.
+    """
+    if not action_scanners.is_running(strategy_id):
+        raise HTTPException(status_code=404, detail="Action scanner is not running.")
+    await action_scanners.stop(strategy_id)
+    return {"message": "Action scanner has been stopped."}
+
+
+@router.get("/scans/{strategy_id}/triggered", response_model=List[TriggeredSymbolSchema])
+async def read_triggered_symbols(strategy_id: int):
+    """
+    [트리거-액션] 트리거 전략이 무장시킨 (만료되지 않은) 종목 목록을 조회합니다.
+    """
+    await ensure_triggered_symbols_loaded()
+    triggered_symbols.prune()
+    return [
+        TriggeredSymbolSchema(
+            ticker=ticker,
+            expires_at=datetime.datetime.fromtimestamp(expires_at, datetime.timezone.utc),
+        )
+        for ticker, expires_at in sorted(triggered_symbols.items(strategy_id).items())
+    ]
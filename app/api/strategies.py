@@ -1,78 +1,213 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Literal
+import json
 
-from app.db.session import get_db
-from app.models.strategy import StrategyCreate, StrategyUpdate, StrategySchema
+from app.db.session import get_async_db
+from app.models.strategy import (
+    StrategyCreate, StrategyUpdate, StrategySchema, StrategyPage,
+    StrategyBatchRequest, StrategyBatchResult, StrategyBatchItemResult,
+)
 from app.services import strategy_service
+from app.services.strategy_cache import CacheEntry, etag_matches
 
 router = APIRouter()
 
+
+def _cached_response(entry: CacheEntry, if_none_match: Optional[str]) -> Response:
+    """캐시된 응답 본문을 ETag와 함께 반환하거나, 클라이언트 캐시가 유효하면 304를 반환합니다."""
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+def _batch_result(results: List[StrategyBatchItemResult]) -> StrategyBatchResult:
+    failed = sum(1 for r in results if r.status == "error")
+    return StrategyBatchResult(results=results, succeeded=len(results) - failed, failed=failed)
+
 @router.post("/strategies", response_model=StrategySchema, status_code=201)
-def create_strategy_endpoint(
+async def create_strategy_endpoint(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     strategy_in: StrategyCreate
 ):
     """
     새로운 전략을 생성합니다.
     """
-    strategy = strategy_service.create_strategy(db=db, strategy=strategy_in)
+    strategy = await strategy_service.create_strategy(db=db, strategy=strategy_in)
     return strategy
 
 @router.get("/strategies", response_model=List[StrategySchema])
-def read_strategies_endpoint(
-    db: Session = Depends(get_db),
+async def read_strategies_endpoint(
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    if_none_match: Optional[str] = Header(None),
 ):
     """
     전략 목록을 조회합니다.
+    캐시된 목록의 ETag가 `If-None-Match`와 일치하면 DB 조회 없이 304를 반환합니다.
+    """
+    entry = await strategy_service.get_cached_strategies(db, skip=skip, limit=limit)
+    return _cached_response(entry, if_none_match)
+
+@router.get("/strategies/page", response_model=StrategyPage)
+async def read_strategies_page_endpoint(
+    db: AsyncSession = Depends(get_async_db),
+    cursor: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    fields: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    broker: Optional[str] = None,
+    market: Optional[str] = None,
+):
+    """
+    키셋 페이지네이션 기반의 경량 전략 목록을 조회합니다.
+    `fields`(쉼표 구분)로 필요한 필드만 선택할 수 있으며, 기본적으로 scan_logic은 제외됩니다.
+    다음 페이지는 응답의 `next_cursor`를 `cursor`로 전달하여 조회합니다.
+    """
+    selected = (
+        [f.strip() for f in fields.split(",") if f.strip()]
+        if fields else strategy_service.DEFAULT_STRATEGY_LIST_FIELDS
+    )
+    try:
+        items, next_cursor = await strategy_service.list_strategies_page(
+            db, cursor=cursor, limit=limit, fields=selected,
+            is_active=is_active, broker=broker, market=market,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StrategyPage(items=items, next_cursor=next_cursor)
+
+@router.get("/strategies/export")
+async def export_strategies_endpoint(
+    db: AsyncSession = Depends(get_async_db),
+    is_active: Optional[bool] = None,
+    broker: Optional[str] = None,
+    market: Optional[str] = None,
+):
+    """
+    전략들을 JSON Lines(한 줄에 전략 하나) 스트림으로 내보냅니다.
+    """
+    stream = strategy_service.export_strategies(db, is_active=is_active, broker=broker, market=market)
+    return StreamingResponse(stream, media_type="application/x-ndjson")
+
+@router.post("/strategies/import", response_model=StrategyBatchResult)
+async def import_strategies_endpoint(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    on_conflict: Literal["error", "skip", "update"] = "error",
+):
+    """
+    JSON Lines 형식의 요청 본문으로 여러 전략을 하나의 트랜잭션으로 가져옵니다.
+    결과의 `index`는 요청 본문의 줄 번호이며, 잘못된 줄은 해당 줄의 오류로 보고됩니다.
+    본문이 MAX_IMPORT_BYTES를 넘으면 413, 전략이 MAX_BATCH_ITEMS개를 넘으면 422를 파싱을 마치기 전에 반환합니다.
+    """
+    max_bytes = strategy_service.MAX_IMPORT_BYTES
+    content_length = request.headers.get("content-length")
+    if content_length is not None and content_length.isdigit() and int(content_length) > max_bytes:
+        raise HTTPException(status_code=413, detail=f"Request body too large (max {max_bytes} bytes)")
+
+    records = []
+    parse_errors = []
+    line_number = 0
+    buffer = b""
+
+    def parse_line(raw: bytes):
+        if not raw.strip():
+            return
+        try:
+            data = json.loads(raw)
+            if not isinstance(data, dict):
+                raise ValueError("Each line must be a JSON object")
+            records.append((line_number, data))
+        except ValueError as e:
+            parse_errors.append(StrategyBatchItemResult(index=line_number, status="error", error=f"Invalid JSON line: {e}"))
+
+    def check_count():
+        if len(records) > strategy_service.MAX_BATCH_ITEMS:
+            raise HTTPException(status_code=422, detail=f"Too many strategies (max {strategy_service.MAX_BATCH_ITEMS})")
+
+    received = 0
+    async for chunk in request.stream():
+        # Content-Length가 없거나(청크 전송) 틀려도 읽은 만큼 세어 한도를 넘으면 바로 중단합니다.
+        received += len(chunk)
+        if received > max_bytes:
+            raise HTTPException(status_code=413, detail=f"Request body too large (max {max_bytes} bytes)")
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for raw in lines:
+            line_number += 1
+            parse_line(raw)
+        check_count()
+    if buffer:
+        line_number += 1
+        parse_line(buffer)
+    check_count()
+
+    results = await strategy_service.import_strategies(db, records, on_conflict=on_conflict)
+    return _batch_result(sorted(results + parse_errors, key=lambda r: r.index))
+
+@router.post("/strategies/batch", response_model=StrategyBatchResult)
+async def batch_strategies_endpoint(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    batch_in: StrategyBatchRequest,
+):
     """
-    strategies = strategy_service.get_strategies(db, skip=skip, limit=limit)
-    return strategies
+    여러 전략의 생성/수정/삭제/활성화/비활성화를 하나의 트랜잭션으로 처리하고 항목별 결과를 반환합니다.
+    """
+    try:
+        results = await strategy_service.apply_strategy_batch(db, batch_in.operations)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return _batch_result(results)
 
 @router.get("/strategies/{strategy_id}", response_model=StrategySchema)
-def read_strategy_endpoint(
+async def read_strategy_endpoint(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     strategy_id: int,
+    if_none_match: Optional[str] = Header(None),
 ):
     """
     ID로 특정 전략을 조회합니다.
+    캐시된 전략의 ETag가 `If-None-Match`와 일치하면 DB 조회 없이 304를 반환합니다.
     """
-    strategy = strategy_service.get_strategy(db, strategy_id=strategy_id)
-    if not strategy:
+    entry = await strategy_service.get_cached_strategy(db, strategy_id=strategy_id)
+    if entry is None:
         raise HTTPException(status_code=404, detail="Strategy not found")
-    return strategy
+    return _cached_response(entry, if_none_match)
 
 @router.put("/strategies/{strategy_id}", response_model=StrategySchema)
-def update_strategy_endpoint(
+async def update_strategy_endpoint(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     strategy_id: int,
     strategy_in: StrategyUpdate,
 ):
     """
     기존 전략을 수정합니다.
     """
-    strategy = strategy_service.get_strategy(db, strategy_id=strategy_id)
+    strategy = await strategy_service.get_strategy(db, strategy_id=strategy_id)
     if not strategy:
         raise HTTPException(status_code=404, detail="Strategy not found")
-    strategy = strategy_service.update_strategy(db=db, strategy_id=strategy_id, strategy_update=strategy_in)
+    strategy = await strategy_service.update_strategy(db=db, strategy_id=strategy_id, strategy_update=strategy_in)
     return strategy
 
 @router.delete("/strategies/{strategy_id}", response_model=StrategySchema)
-def delete_strategy_endpoint(
+async def delete_strategy_endpoint(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     strategy_id: int,
 ):
     """
     전략을 삭제합니다.
     """
-    strategy = strategy_service.get_strategy(db, strategy_id=strategy_id)
+    strategy = await strategy_service.get_strategy(db, strategy_id=strategy_id)
     if not strategy:
         raise HTTPException(status_code=404, detail="Strategy not found")
-    strategy = strategy_service.delete_strategy(db=db, strategy_id=strategy_id)
+    strategy = await strategy_service.delete_strategy(db=db, strategy_id=strategy_id)
     return strategy
@@ -1,7 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import asyncio
+import logging
 import polars as pl
 
+from app.core.config import settings
+from app.core.logs import log_sampled
+
+logger = logging.getLogger(__name__)
+
 class BaseBroker(ABC):
     """
     모든 브로커 구현체가 따라야 하는 추상 기반 클래스.
@@ -14,13 +21,29 @@ class BaseBroker(ABC):
         """
         pass
 
-    @abstractmethod
     async def get_market_data_for_1st_scan(self, tickers: List[str]) -> pl.DataFrame:
         """
         1차 스캔을 위해 여러 종목의 현재 시점 데이터를 한 번에 가져옵니다.
         'open', 'high', 'low', 'close', 'volume', 'amount' 컬럼을 포함해야 합니다.
+        기본 구현은 종목마다 최근 일봉 2개를 `get_ohlcv`로 조회하며, 거래소 요청 수 제한을 넘지 않도록
+        동시 조회 수를 `SCAN_FETCH_CONCURRENCY`로 제한합니다. 조회에 실패한 종목은 결과에서 빠집니다.
         """
-        pass
+        slots = asyncio.Semaphore(settings.SCAN_FETCH_CONCURRENCY)
+
+        async def fetch_one(ticker: str) -> Optional[pl.DataFrame]:
+            async with slots:
+                try:
+                    df = await self.get_ohlcv(ticker, "day", limit=2)
+                except Exception as e:
+                    log_sampled(logger, logging.WARNING, "scan.1st.ticker_failed", "1차 스캔 데이터 조회 중 오류: %s", e, ticker=ticker)
+                    return None
+            if df.height > 1:
+                return df.tail(1).with_columns(pl.lit(ticker).alias("ticker"))
+            return None
+
+        results = await asyncio.gather(*(fetch_one(t) for t in tickers))
+        valid_results = [res for res in results if res is not None]
+        return pl.concat(valid_results) if valid_results else pl.DataFrame()
 
     @abstractmethod
     async def get_ohlcv(
@@ -42,6 +65,14 @@ class BaseBroker(ABC):
         """
         pass
 
+    async def get_current_prices(self, tickers: List[str]) -> Dict[str, float]:
+        """
+        여러 종목의 현재가를 한 번에 반환합니다. (포트폴리오 평가용)
+        기본 구현은 종목마다 get_current_price를 호출하므로, 일괄 조회 API가 있는 브로커는 재정의해야 합니다.
+        """
+        prices = await asyncio.gather(*(self.get_current_price(t) for t in tickers))
+        return dict(zip(tickers, prices))
+
     @abstractmethod
     async def place_order(
         self,
@@ -62,3 +93,16 @@ class BaseBroker(ABC):
         계좌 잔고 정보를 반환합니다.
         """
         pass
+
+    async def get_order(self, order_id: str) -> Dict[str, Any]:
+        """
+        주문 상태를 조회합니다. (체결 추적용)
+        Upbit 주문 응답 형식('uuid', 'state', 'executed_volume' 등)을 따라야 합니다.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support order lookup.")
+
+    async def cancel_order(self, order_id: str) -> Dict[str, Any]:
+        """
+        미체결 주문을 취소합니다.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support order cancellation.")
@@ -0,0 +1,141 @@
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple, Callable, Awaitable
+import asyncio
+import logging
+import math
+
+import polars as pl
+
+from app.core.candles import timeframe_to_seconds
+from app.core.clock import Clock
+from app.core.metrics import BROKER_CACHE_REQUESTS
+from .base import BaseBroker
+
+logger = logging.getLogger(__name__)
+
+# 종목 목록은 거의 바뀌지 않으므로 시세보다 오래 보관합니다.
+TICKERS_TTL_SECONDS = 60.0
+
+
+class CachingBroker(BaseBroker):
+    """
+    시세 조회(get_tickers, get_ohlcv, get_current_price)를 합치고 짧게 캐시하는 브로커.
+    - 동시에 들어온 같은 요청(같은 인자)은 내부 브로커로 한 번만 보내고 결과를 함께 받습니다. (single-flight)
+    - 결과는 `ttl`초 동안 재사용하되, OHLCV는 다음 봉이 시작되는 시각을 넘겨 보관하지 않습니다.
+    - 보관 개수는 `max_entries`로 제한하며, 가장 오래 사용되지 않은 항목부터 버립니다. (LRU)
+    빈 결과(조회 실패)는 캐시하지 않습니다. 주문/잔고 조회는 그대로 내부 브로커에 위임합니다.
+    """
+    def __init__(
+        self,
+        inner: BaseBroker,
+        ttl: float = 2.0,
+        max_entries: int = 4096,
+        clock: Optional[Clock] = None,
+    ):
+        self.inner = inner
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock or Clock()
+        # key → (만료 시각(epoch 초), 값)
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+
+    def _expires_at(self, now: float, ttl: float, timeframe: Optional[str] = None) -> float:
+        expires = now + ttl
+        if timeframe is not None and timeframe not in ("week", "month"):
+            period = timeframe_to_seconds(timeframe)
+            next_boundary = (math.floor(now / period) + 1) * period
+            expires = min(expires, next_boundary)
+        return expires
+
+    def _lookup(self, key: Tuple) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires, value = entry
+        if self.clock.now() >= expires:
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _store(self, key: Tuple, value: Any, expires: float):
+        self._entries[key] = (expires, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _read(
+        self,
+        key: Tuple,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: float,
+        timeframe: Optional[str] = None,
+        is_empty: Callable[[Any], bool] = lambda value: not value,
+    ) -> Any:
+        endpoint = key[0]
+        found, value = self._lookup(key)
+        if found:
+            BROKER_CACHE_REQUESTS.inc(endpoint=endpoint, result="hit")
+            return value
+
+        future = self._inflight.get(key)
+        if future is not None:
+            BROKER_CACHE_REQUESTS.inc(endpoint=endpoint, result="coalesced")
+            # 먼저 요청한 호출자가 취소되어도 함께 기다리는 호출자에게는 영향을 주지 않습니다.
+            return await asyncio.shield(future)
+
+        BROKER_CACHE_REQUESTS.inc(endpoint=endpoint, result="miss")
+        future = self._inflight[key] = asyncio.ensure_future(fetch())
+        try:
+            value = await asyncio.shield(future)
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        if self.ttl > 0 and not is_empty(value):
+            self._store(key, value, self._expires_at(self.clock.now(), ttl, timeframe))
+        return value
+
+    def clear(self):
+        self._entries.clear()
+
+    async def get_tickers(self) -> List[str]:
+        return await self._read(("tickers",), self.inner.get_tickers, max(self.ttl, TICKERS_TTL_SECONDS))
+
+    async def get_ohlcv(self, ticker: str, timeframe: str = 'day', limit: int = 200) -> pl.DataFrame:
+        return await self._read(
+            ("ohlcv", ticker, timeframe, limit),
+            lambda: self.inner.get_ohlcv(ticker, timeframe, limit=limit),
+            self.ttl,
+            timeframe=timeframe,
+            is_empty=lambda df: df.is_empty(),
+        )
+
+    async def get_current_price(self, ticker: str) -> float:
+        return await self._read(
+            ("current_price", ticker), lambda: self.inner.get_current_price(ticker), self.ttl,
+        )
+
+    async def get_current_prices(self, tickers: List[str]) -> Dict[str, float]:
+        return await self._read(
+            ("current_prices", tuple(tickers)), lambda: self.inner.get_current_prices(tickers), self.ttl,
+        )
+
+    async def place_order(
+        self,
+        ticker: str,
+        order_type: str,
+        side: str,
+        amount: float,
+        price: float = None
+    ) -> Dict[str, Any]:
+        return await self.inner.place_order(ticker, order_type, side, amount, price)
+
+    async def get_order(self, order_id: str) -> Dict[str, Any]:
+        return await self.inner.get_order(order_id)
+
+    async def cancel_order(self, order_id: str) -> Dict[str, Any]:
+        return await self.inner.cancel_order(order_id)
+
+    async def get_balance(self) -> Dict[str, Any]:
+        return await self.inner.get_balance()
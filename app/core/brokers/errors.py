@@ -0,0 +1,26 @@
+from typing import Optional
+
+
+class BrokerError(Exception):
+    """
+    거래소 호출 실패. `retryable`이면 요청이 처리되지 않았음이 확실하여 다시 보내도 안전한 오류입니다.
+    """
+    retryable = False
+
+    def __init__(self, message: str, endpoint: Optional[str] = None):
+        super().__init__(message)
+        self.endpoint = endpoint
+
+
+class RateLimitedError(BrokerError):
+    """거래소 요청 수 제한(HTTP 429)에 걸린 경우."""
+    retryable = True
+
+
+class BrokerUnavailableError(BrokerError):
+    """시간 초과, 연결 실패, 5xx 응답 등 거래소가 일시적으로 응답하지 못한 경우."""
+    retryable = True
+
+
+class CircuitOpenError(BrokerError):
+    """최근 실패가 많아 서킷 브레이커가 열려 있어 요청을 보내지 않은 경우."""
@@ -0,0 +1,76 @@
+from typing import List, Dict, Any, Optional, Set
+import polars as pl
+import logging
+import asyncio
+
+from app.core.candles import CandleStore, frame_to_rows
+from .base import BaseBroker
+
+logger = logging.getLogger(__name__)
+
+
+class LiveCandleBroker(BaseBroker):
+    """
+    실시간 체결 스트림으로 집계된 메모리 내 봉(CandleStore)을 우선 사용하는 브로커.
+    집계 대상 타임프레임의 OHLCV는 메모리에서 제공하고, 처음 요청된 종목만 내부 브로커(REST)로
+    과거 봉을 한 번 채워 넣습니다(backfill). 그 외 호출은 모두 내부 브로커에 위임합니다.
+    """
+    def __init__(self, inner: BaseBroker, store: CandleStore, timeframes: Set[str]):
+        self.inner = inner
+        self.store = store
+        self.timeframes = timeframes
+        self._backfills: Dict[tuple, asyncio.Task] = {}
+
+    async def _backfill(self, ticker: str, timeframe: str, limit: int):
+        key = (ticker, timeframe)
+        task = self._backfills.get(key)
+        if task is None:
+            task = self._backfills[key] = asyncio.ensure_future(
+                self.inner.get_ohlcv(ticker, timeframe, limit=max(limit, self.store.capacity))
+            )
+        try:
+            df = await task
+        finally:
+            self._backfills.pop(key, None)
+        if not self.store.is_seeded(ticker, timeframe) and not df.is_empty():
+            self.store.seed(ticker, timeframe, frame_to_rows(df))
+
+    async def get_tickers(self) -> List[str]:
+        return await self.inner.get_tickers()
+
+    async def get_market_data_for_1st_scan(self, tickers: List[str]) -> pl.DataFrame:
+        if "day" not in self.timeframes:
+            return await self.inner.get_market_data_for_1st_scan(tickers)
+        return await super().get_market_data_for_1st_scan(tickers)
+
+    async def get_ohlcv(self, ticker: str, timeframe: str = 'day', limit: int = 200) -> pl.DataFrame:
+        if timeframe not in self.timeframes:
+            return await self.inner.get_ohlcv(ticker, timeframe, limit=limit)
+        if not self.store.is_seeded(ticker, timeframe):
+            await self._backfill(ticker, timeframe, limit)
+        return self.store.to_frame(ticker, timeframe, limit)
+
+    async def get_current_price(self, ticker: str) -> float:
+        return await self.inner.get_current_price(ticker)
+
+    async def get_current_prices(self, tickers: List[str]) -> Dict[str, float]:
+        return await self.inner.get_current_prices(tickers)
+
+    async def place_order(
+        self,
+        ticker: str,
+        order_type: str,
+        side: str,
+        amount: float,
+        price: float = None
+    ) -> Dict[str, Any]:
+        return await self.inner.place_order(ticker, order_type, side, amount, price)
+
+    async def get_order(self, order_id: str) -> Dict[str, Any]:
+        return await self.inner.get_order(order_id)
+
+    async def cancel_order(self, order_id: str) -> Dict[str, Any]:
+        return await self.inner.cancel_order(order_id)
+
+    async def get_balance(self) -> Dict[str, Any]:
+        return await self.inner.get_balance()
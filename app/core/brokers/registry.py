@@ -0,0 +1,47 @@
+from importlib import import_module
+from typing import Callable, Dict, List, Union
+import logging
+
+from .base import BaseBroker
+
+logger = logging.getLogger(__name__)
+
+BrokerFactory = Callable[..., BaseBroker]
+
+# 브로커 이름(Strategy.broker) → "모듈:클래스" 경로.
+# 모듈은 해당 브로커를 처음 사용할 때 불러오므로, API 서버는 쓰지 않는 거래소 SDK를 불러오지 않습니다.
+_BROKERS: Dict[str, Union[str, BrokerFactory]] = {
+    "upbit": "app.core.brokers.upbit:UpbitBroker",
+    "simulator": "app.core.brokers.simulator:SimulatedBroker",
+}
+
+
+def register_broker(name: str, target: Union[str, BrokerFactory]):
+    """
+    브로커 구현체를 등록합니다. `target`은 "모듈:클래스" 경로(지연 로딩) 또는 브로커를 만드는 호출 가능 객체입니다.
+    예: `register_broker("binance", "app.core.brokers.binance:BinanceBroker")`
+    """
+    _BROKERS[name.lower()] = target
+
+
+def available_brokers() -> List[str]:
+    return sorted(_BROKERS)
+
+
+def get_broker_class(name: str) -> BrokerFactory:
+    """이름에 해당하는 브로커 클래스(팩토리)를 반환합니다. 처음 호출될 때 모듈을 불러옵니다."""
+    key = name.lower()
+    target = _BROKERS.get(key)
+    if target is None:
+        raise ValueError(f"Unknown broker '{name}'. Available brokers: {', '.join(available_brokers())}")
+    if isinstance(target, str):
+        module_path, _, attr = target.partition(":")
+        logger.debug(f"브로커 모듈 로드: {module_path}")
+        target = getattr(import_module(module_path), attr)
+        _BROKERS[key] = target
+    return target
+
+
+def create_broker(name: str, **kwargs) -> BaseBroker:
+    """이름(Strategy.broker)으로 브로커 인스턴스를 생성합니다."""
+    return get_broker_class(name)(**kwargs)
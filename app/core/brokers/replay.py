@@ -0,0 +1,151 @@
+from bisect import bisect_right
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+import asyncio
+import logging
+
+import polars as pl
+
+from app.core.candles import KST, candle_schema, timeframe_to_seconds
+from app.core.clock import Clock
+from .base import BaseBroker
+from .simulator import SimulatedBroker
+
+logger = logging.getLogger(__name__)
+
+
+def load_candle_directory(path: str) -> Dict[str, Dict[str, pl.DataFrame]]:
+    """
+    `<종목>_<타임프레임>.parquet`(또는 `.csv`) 파일들을 {종목: {타임프레임: OHLCV}}로 읽어옵니다.
+    예: `KRW-BTC_day.parquet`, `KRW-BTC_minute1.csv`
+    """
+    candles: Dict[str, Dict[str, pl.DataFrame]] = {}
+    for file in sorted(Path(path).iterdir()):
+        if file.suffix not in (".parquet", ".csv") or "_" not in file.stem:
+            continue
+        ticker, timeframe = file.stem.rsplit("_", 1)
+        if file.suffix == ".parquet":
+            df = pl.read_parquet(file)
+        else:
+            df = pl.read_csv(file, try_parse_dates=True)
+        candles.setdefault(ticker, {})[timeframe] = df
+    return candles
+
+
+def _normalize(df: pl.DataFrame) -> Tuple[pl.DataFrame, List[int]]:
+    """
+    OHLCV를 표준 스키마(epoch ms timestamp, 설정된 실수 정밀도)로 맞추고, 봉 시작 시각(epoch ms) 목록을 함께 반환합니다.
+    timestamp가 Datetime이면 KST 기준 naive datetime(과거 pyupbit 형식)으로 간주합니다.
+    """
+    df = df.sort("timestamp")
+    if not df["timestamp"].dtype.is_integer():
+        df = df.with_columns(pl.col("timestamp").dt.replace_time_zone(KST).dt.epoch("ms"))
+    df = df.select([pl.col(name).cast(dtype) for name, dtype in candle_schema().items()])
+    return df, df["timestamp"].to_list()
+
+
+class ReplayBroker(BaseBroker):
+    """
+    저장된 과거 봉을 시뮬레이션 시계에 맞춰 제공하는 브로커. (부하 테스트/재현용)
+    시계가 가리키는 시각에 이미 완성된 봉만 보이므로 미래 데이터가 새지 않습니다.
+    주문은 현재 시각의 종가를 시세로 하는 로컬 모의 거래소(SimulatedBroker)가 체결합니다.
+    """
+    def __init__(
+        self,
+        candles: Dict[str, Dict[str, pl.DataFrame]],
+        clock: Clock,
+        exchange: Optional[SimulatedBroker] = None,
+        latency: float = 0.0,
+    ):
+        self.clock = clock
+        self.latency = latency
+        self.exchange = exchange or SimulatedBroker()
+        self._frames: Dict[Tuple[str, str], pl.DataFrame] = {}
+        # 봉이 완성되는 시각(epoch ms) 목록. 이진 탐색으로 현재 시각까지의 봉을 자릅니다.
+        self._ends: Dict[Tuple[str, str], List[int]] = {}
+        for ticker, by_timeframe in candles.items():
+            for timeframe, df in by_timeframe.items():
+                if df.is_empty():
+                    continue
+                frame, starts = _normalize(df)
+                period_ms = timeframe_to_seconds(timeframe) * 1000
+                self._frames[(ticker, timeframe)] = frame
+                self._ends[(ticker, timeframe)] = [start + period_ms for start in starts]
+        self._tickers = sorted({ticker for ticker, _ in self._frames})
+        # 현재가는 가장 짧은 타임프레임의 마지막 완성 봉 종가를 사용합니다.
+        self._price_timeframe: Dict[str, str] = {}
+        for ticker, timeframe in self._frames:
+            current = self._price_timeframe.get(ticker)
+            if current is None or timeframe_to_seconds(timeframe) < timeframe_to_seconds(current):
+                self._price_timeframe[ticker] = timeframe
+
+    @classmethod
+    def from_directory(cls, path: str, clock: Clock, **kwargs) -> "ReplayBroker":
+        return cls(load_candle_directory(path), clock, **kwargs)
+
+    def time_range(self) -> Tuple[float, float]:
+        """데이터의 첫 봉이 완성되는 시각과 마지막 봉이 완성되는 시각(epoch 초)."""
+        if not self._ends:
+            raise ValueError("Replay data is empty.")
+        return (
+            min(ends[0] for ends in self._ends.values()) / 1000,
+            max(ends[-1] for ends in self._ends.values()) / 1000,
+        )
+
+    async def _delay(self):
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+
+    def _visible(self, ticker: str, timeframe: str, limit: int) -> pl.DataFrame:
+        key = (ticker, timeframe)
+        frame = self._frames.get(key)
+        if frame is None:
+            return pl.DataFrame()
+        count = bisect_right(self._ends[key], int(self.clock.now() * 1000))
+        start = max(0, count - limit)
+        return frame.slice(start, count - start)
+
+    async def get_tickers(self) -> List[str]:
+        return list(self._tickers)
+
+    async def get_market_data_for_1st_scan(self, tickers: List[str]) -> pl.DataFrame:
+        await self._delay()
+        frames = []
+        for ticker in tickers:
+            df = self._visible(ticker, "day", 2)
+            if df.height > 1:
+                frames.append(df.tail(1).with_columns(pl.lit(ticker).alias("ticker")))
+        return pl.concat(frames) if frames else pl.DataFrame()
+
+    async def get_ohlcv(self, ticker: str, timeframe: str = 'day', limit: int = 200) -> pl.DataFrame:
+        await self._delay()
+        return self._visible(ticker, timeframe, limit)
+
+    async def get_current_price(self, ticker: str) -> float:
+        timeframe = self._price_timeframe.get(ticker)
+        if timeframe is None:
+            return 0.0
+        df = self._visible(ticker, timeframe, 1)
+        return float(df["close"][0]) if not df.is_empty() else 0.0
+
+    async def place_order(
+        self,
+        ticker: str,
+        order_type: str,
+        side: str,
+        amount: float,
+        price: float = None
+    ) -> Dict[str, Any]:
+        current = await self.get_current_price(ticker)
+        if current > 0:
+            self.exchange.set_price(ticker, current)
+        return await self.exchange.place_order(ticker, order_type, side, amount, price)
+
+    async def get_order(self, order_id: str) -> Dict[str, Any]:
+        return await self.exchange.get_order(order_id)
+
+    async def cancel_order(self, order_id: str) -> Dict[str, Any]:
+        return await self.exchange.cancel_order(order_id)
+
+    async def get_balance(self) -> Dict[str, Any]:
+        return await self.exchange.get_balance()
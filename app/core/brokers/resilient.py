@@ -0,0 +1,115 @@
+from typing import List, Dict, Any, Optional, Callable, Awaitable
+import asyncio
+import logging
+
+import polars as pl
+
+from app.core.metrics import BROKER_RESILIENCE_EVENTS
+from app.core.resilience import CircuitBreaker, RetryPolicy, OPEN, hedged
+from .base import BaseBroker
+from .errors import BrokerError, CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+
+class ResilientBroker(BaseBroker):
+    """
+    시세 조회 호출에 재시도, 서킷 브레이커, 헤지 요청을 적용하는 브로커.
+    - 재시도 가능한 오류(BrokerError.retryable)는 `retry` 정책에 따라 지터를 준 지수 백오프로 다시 시도합니다.
+    - 엔드포인트별 서킷 브레이커가 열려 있으면 거래소로 보내지 않고 즉시 CircuitOpenError를 발생시킵니다.
+    - `hedge_delay`가 지정되면 그 시간 안에 응답이 없는 조회 요청을 한 번 더 보내 먼저 온 응답을 사용합니다.
+    오류는 삼키지 않고 호출자에게 전달하므로, 스캔은 종목별 실패 사유를 보고할 수 있습니다.
+    주문은 주문 파이프라인이 재시도/멱등성을 관리하므로 그대로 내부 브로커에 위임합니다.
+    """
+    def __init__(
+        self,
+        inner: BaseBroker,
+        name: str = "broker",
+        retry: Optional[RetryPolicy] = None,
+        failure_threshold: int = 5,
+        reset_timeout: float = 10.0,
+        hedge_delay: Optional[float] = None,
+    ):
+        self.inner = inner
+        self.name = name
+        self.retry = retry or RetryPolicy()
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.hedge_delay = hedge_delay
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def _breaker(self, endpoint: str) -> CircuitBreaker:
+        breaker = self.breakers.get(endpoint)
+        if breaker is None:
+            breaker = self.breakers[endpoint] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        return breaker
+
+    def _event(self, endpoint: str, event: str):
+        BROKER_RESILIENCE_EVENTS.inc(broker=self.name, endpoint=endpoint, event=event)
+
+    async def _call(self, endpoint: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        breaker = self._breaker(endpoint)
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                self._event(endpoint, "rejected")
+                raise CircuitOpenError(f"{self.name} {endpoint} circuit is open", endpoint=endpoint)
+            try:
+                result = await hedged(call, self.hedge_delay, on_hedge=lambda: self._event(endpoint, "hedge"))
+            except BrokerError as e:
+                if not e.retryable:
+                    # 잘못된 요청 등은 거래소 상태와 무관하므로 서킷 브레이커에 반영하지 않습니다.
+                    breaker.record_success()
+                    raise
+                was_open = breaker.state == OPEN
+                breaker.record_failure()
+                if breaker.state == OPEN and not was_open:
+                    self._event(endpoint, "circuit_open")
+                    logger.warning(f"{self.name} {endpoint} 서킷 브레이커 열림 (연속 실패 {breaker.failures}회)")
+                attempt += 1
+                if attempt >= self.retry.max_attempts:
+                    raise
+                self._event(endpoint, "retry")
+                await asyncio.sleep(self.retry.delay(attempt))
+                continue
+            except Exception:
+                # 응답 해석 실패 등 예상하지 못한 오류도 실패로 기록하여 시험 요청 자리가 남지 않게 합니다.
+                breaker.record_failure()
+                raise
+            except BaseException:
+                # 취소는 거래소 상태와 무관하므로 시험 요청 자리만 돌려줍니다.
+                breaker.release()
+                raise
+            breaker.record_success()
+            return result
+
+    async def get_tickers(self) -> List[str]:
+        return await self._call("tickers", self.inner.get_tickers)
+
+    async def get_ohlcv(self, ticker: str, timeframe: str = 'day', limit: int = 200) -> pl.DataFrame:
+        return await self._call("ohlcv", lambda: self.inner.get_ohlcv(ticker, timeframe, limit=limit))
+
+    async def get_current_price(self, ticker: str) -> float:
+        return await self._call("current_price", lambda: self.inner.get_current_price(ticker))
+
+    async def get_current_prices(self, tickers: List[str]) -> Dict[str, float]:
+        return await self._call("current_price", lambda: self.inner.get_current_prices(tickers))
+
+    async def place_order(
+        self,
+        ticker: str,
+        order_type: str,
+        side: str,
+        amount: float,
+        price: float = None
+    ) -> Dict[str, Any]:
+        return await self.inner.place_order(ticker, order_type, side, amount, price)
+
+    async def get_order(self, order_id: str) -> Dict[str, Any]:
+        return await self.inner.get_order(order_id)
+
+    async def cancel_order(self, order_id: str) -> Dict[str, Any]:
+        return await self.inner.cancel_order(order_id)
+
+    async def get_balance(self) -> Dict[str, Any]:
+        return await self.inner.get_balance()
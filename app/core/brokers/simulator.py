@@ -0,0 +1,207 @@
+from typing import List, Dict, Any, Optional
+import asyncio
+import datetime
+import logging
+import uuid
+
+import polars as pl
+
+from .base import BaseBroker
+
+logger = logging.getLogger(__name__)
+
+
+class SimulatedBroker(BaseBroker):
+    """
+    거래소 없이 주문을 체결하는 로컬 모의 거래소. 주문 응답과 잔고는 Upbit API 형식을 따릅니다.
+    - 시장가 주문은 현재가로 즉시 체결됩니다. (시장가 매수의 `amount`는 주문 금액, 그 외는 수량)
+    - 지정가 주문은 현재가가 지정가에 도달하면 즉시, 아니면 `set_price`로 가격이 도달할 때 체결됩니다.
+    - `latency`로 주문/조회 요청마다 네트워크 지연을 흉내 낼 수 있습니다.
+    시세는 `set_price`로 지정하거나, 종목별 OHLCV 프레임(`candles`)의 마지막 종가를 사용합니다.
+    """
+    def __init__(
+        self,
+        balances: Optional[Dict[str, float]] = None,
+        prices: Optional[Dict[str, float]] = None,
+        candles: Optional[Dict[str, pl.DataFrame]] = None,
+        fee_rate: float = 0.0005,
+        latency: float = 0.0,
+    ):
+        self.balances: Dict[str, float] = dict(balances if balances is not None else {"KRW": 10_000_000.0})
+        self.locked: Dict[str, float] = {}
+        self.candles: Dict[str, pl.DataFrame] = dict(candles or {})
+        self.prices: Dict[str, float] = dict(prices or {})
+        for ticker, df in self.candles.items():
+            if ticker not in self.prices and not df.is_empty():
+                self.prices[ticker] = float(df["close"][-1])
+        self.fee_rate = fee_rate
+        self.latency = latency
+        self.orders: Dict[str, Dict[str, Any]] = {}
+
+    async def _delay(self):
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+
+    # --- market data ---
+
+    async def get_tickers(self) -> List[str]:
+        return sorted(self.prices)
+
+    async def get_market_data_for_1st_scan(self, tickers: List[str]) -> pl.DataFrame:
+        frames = [
+            self.candles[t].tail(1).with_columns(pl.lit(t).alias("ticker"))
+            for t in tickers if t in self.candles and self.candles[t].height > 1
+        ]
+        return pl.concat(frames) if frames else pl.DataFrame()
+
+    async def get_ohlcv(self, ticker: str, timeframe: str = 'day', limit: int = 200) -> pl.DataFrame:
+        df = self.candles.get(ticker)
+        return df.tail(limit) if df is not None else pl.DataFrame()
+
+    async def get_current_price(self, ticker: str) -> float:
+        return self.prices.get(ticker, 0.0)
+
+    def set_price(self, ticker: str, price: float):
+        """현재가를 바꾸고, 가격에 도달한 미체결 지정가 주문을 체결합니다."""
+        self.prices[ticker] = price
+        for order in list(self.orders.values()):
+            if order["market"] != ticker or order["state"] != "wait":
+                continue
+            limit_price = float(order["price"])
+            if (order["side"] == "bid" and price <= limit_price) or (order["side"] == "ask" and price >= limit_price):
+                self._fill_limit(order, limit_price)
+
+    # --- balances ---
+
+    def _available(self, currency: str) -> float:
+        return self.balances.get(currency, 0.0) - self.locked.get(currency, 0.0)
+
+    def _credit(self, currency: str, amount: float):
+        self.balances[currency] = self.balances.get(currency, 0.0) + amount
+
+    def _lock(self, currency: str, amount: float):
+        self.locked[currency] = self.locked.get(currency, 0.0) + amount
+
+    async def get_balance(self) -> Dict[str, Any]:
+        await self._delay()
+        return {"all_balances": [
+            {"currency": currency, "balance": str(balance), "locked": str(self.locked.get(currency, 0.0)),
+             "unit_currency": "KRW"}
+            for currency, balance in sorted(self.balances.items())
+        ]}
+
+    # --- orders ---
+
+    def _new_order(self, ticker: str, side: str, ord_type: str, price: Optional[float], volume: Optional[float]):
+        order = {
+            "uuid": uuid.uuid4().hex,
+            "side": side,
+            "ord_type": ord_type,
+            "price": None if price is None else str(price),
+            "state": "wait",
+            "market": ticker,
+            "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "volume": None if volume is None else str(volume),
+            "remaining_volume": None if volume is None else str(volume),
+            "executed_volume": "0.0",
+            "paid_fee": "0.0",
+            "trades_count": 0,
+        }
+        self.orders[order["uuid"]] = order
+        return order
+
+    def _settle(self, order: Dict[str, Any], price: float, volume: float):
+        coin = order["market"].split("-", 1)[1]
+        fee = price * volume * self.fee_rate
+        if order["side"] == "bid":
+            self._credit("KRW", -(price * volume + fee))
+            self._credit(coin, volume)
+        else:
+            self._credit(coin, -volume)
+            self._credit("KRW", price * volume - fee)
+        order.update({
+            "state": "done",
+            "executed_volume": str(volume),
+            "remaining_volume": "0.0",
+            "paid_fee": str(fee),
+            "trades_count": 1,
+            "avg_price": str(price),
+        })
+
+    def _fill_limit(self, order: Dict[str, Any], price: float):
+        volume = float(order["volume"])
+        coin = order["market"].split("-", 1)[1]
+        if order["side"] == "bid":
+            self._lock("KRW", -float(order["locked"]))
+        else:
+            self._lock(coin, -volume)
+        self._settle(order, price, volume)
+
+    async def place_order(
+        self,
+        ticker: str,
+        order_type: str,
+        side: str,
+        amount: float,
+        price: float = None
+    ) -> Dict[str, Any]:
+        await self._delay()
+        side = side.lower()
+        if side not in ("buy", "sell"):
+            return {"error": "side는 'buy' 또는 'sell'이어야 합니다."}
+        current = self.prices.get(ticker)
+        if current is None:
+            return {"error": f"Unknown market: {ticker}"}
+        coin = ticker.split("-", 1)[1]
+        bid = side == "buy"
+
+        if order_type == "market":
+            if bid:
+                volume = amount / current
+                if self._available("KRW") < amount * (1 + self.fee_rate):
+                    return {"error": "InsufficientFundsBid"}
+                order = self._new_order(ticker, "bid", "price", amount, None)
+            else:
+                volume = amount
+                if self._available(coin) < volume:
+                    return {"error": "InsufficientFundsAsk"}
+                order = self._new_order(ticker, "ask", "market", None, volume)
+            self._settle(order, current, volume)
+            return dict(order)
+
+        if price is None:
+            return {"error": "지정가 주문에는 price가 필요합니다."}
+        if bid:
+            required = price * amount * (1 + self.fee_rate)
+            if self._available("KRW") < required:
+                return {"error": "InsufficientFundsBid"}
+            order = self._new_order(ticker, "bid", "limit", price, amount)
+            order["locked"] = str(required)
+            self._lock("KRW", required)
+        else:
+            if self._available(coin) < amount:
+                return {"error": "InsufficientFundsAsk"}
+            order = self._new_order(ticker, "ask", "limit", price, amount)
+            order["locked"] = str(amount)
+            self._lock(coin, amount)
+        if (bid and current <= price) or (not bid and current >= price):
+            self._fill_limit(order, current)
+        return dict(order)
+
+    async def get_order(self, order_id: str) -> Dict[str, Any]:
+        await self._delay()
+        order = self.orders.get(order_id)
+        return dict(order) if order is not None else {"error": "OrderNotFound"}
+
+    async def cancel_order(self, order_id: str) -> Dict[str, Any]:
+        await self._delay()
+        order = self.orders.get(order_id)
+        if order is None or order["state"] != "wait":
+            return {"error": "OrderNotFound"}
+        coin = order["market"].split("-", 1)[1]
+        if order["side"] == "bid":
+            self._lock("KRW", -float(order["locked"]))
+        else:
+            self._lock(coin, -float(order["volume"]))
+        order["state"] = "cancel"
+        return dict(order)
@@ -1,79 +1,165 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import polars as pl
 import logging
-import pyupbit
 import asyncio
+import io
+import datetime
+import weakref
 from functools import partial
 
+import httpx
+
 from app.core.config import settings
+from app.core.candles import candle_schema, timeframe_to_seconds
+from app.core.metrics import BROKER_REQUEST_SECONDS, BROKER_RATE_LIMITED
 from .base import BaseBroker
+from .errors import BrokerError, BrokerUnavailableError, RateLimitedError
 
 logger = logging.getLogger(__name__)
 
+UPBIT_API_URL = "https://api.upbit.com/v1"
+# 캔들 API가 한 번에 반환하는 최대 개수
+MAX_CANDLES_PER_REQUEST = 200
+# 현재가 API 요청 하나에 담는 최대 종목 수 (URL 길이 제한 안쪽)
+MAX_TICKERS_PER_PRICE_REQUEST = 100
+
+# 캔들 응답(JSON)에서 읽을 필드. 나머지 필드는 디코딩하지 않습니다.
+_CANDLE_JSON_SCHEMA = {
+    "candle_date_time_utc": pl.String,
+    "opening_price": pl.Float64,
+    "high_price": pl.Float64,
+    "low_price": pl.Float64,
+    "trade_price": pl.Float64,
+    "candle_acc_trade_volume": pl.Float64,
+    "candle_acc_trade_price": pl.Float64,
+}
+
 # pyupbit의 동기 함수를 비동기적으로 실행하기 위한 래퍼
 async def run_sync(func, *args, **kwargs):
     loop = asyncio.get_running_loop()
     return await loop.run_in_executor(None, partial(func, *args, **kwargs))
 
 
+def _is_rate_limited(error: Exception) -> bool:
+    """pyupbit의 요청 수 제한 예외(code 429) 또는 시세 API의 429 응답인지 확인합니다."""
+    return isinstance(error, RateLimitedError) or getattr(error, "code", None) == 429
+
+
+async def call_upbit(endpoint: str, func, *args, **kwargs):
+    """pyupbit 호출을 실행하면서 엔드포인트별 지연 시간과 요청 수 제한(429) 발생을 기록합니다."""
+    try:
+        with BROKER_REQUEST_SECONDS.time(broker="upbit", endpoint=endpoint):
+            return await run_sync(func, *args, **kwargs)
+    except Exception as e:
+        if _is_rate_limited(e):
+            BROKER_RATE_LIMITED.inc(broker="upbit", endpoint=endpoint)
+        raise
+
+
+# httpx 클라이언트(커넥션 풀)는 이벤트 루프에 묶이므로 루프마다 하나씩 공유합니다.
+_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def _http_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None:
+        client = _http_clients[loop] = httpx.AsyncClient(
+            base_url=UPBIT_API_URL, timeout=10.0, headers={"Accept": "application/json"},
+        )
+    return client
+
+
+async def fetch_public(endpoint: str, path: str, params: Dict[str, Any]) -> bytes:
+    """
+    Upbit 시세(Quotation) API를 직접 호출하여 응답 본문(JSON 바이트)을 반환합니다.
+    실패하면 재시도 가능 여부가 구분된 BrokerError를 발생시킵니다.
+    """
+    try:
+        with BROKER_REQUEST_SECONDS.time(broker="upbit", endpoint=endpoint):
+            response = await _http_client().get(path, params=params)
+    except httpx.TransportError as e:
+        # 시간 초과/연결 실패
+        raise BrokerUnavailableError(f"Upbit {endpoint} request failed: {e!r}", endpoint=endpoint) from e
+    if response.status_code == 429:
+        BROKER_RATE_LIMITED.inc(broker="upbit", endpoint=endpoint)
+        raise RateLimitedError(f"Upbit {endpoint} rate limited", endpoint=endpoint)
+    if response.status_code >= 500:
+        raise BrokerUnavailableError(f"Upbit {endpoint} returned {response.status_code}", endpoint=endpoint)
+    if response.status_code >= 400:
+        raise BrokerError(f"Upbit {endpoint} returned {response.status_code}: {response.text[:200]}", endpoint=endpoint)
+    return response.content
+
+
+def candle_path(timeframe: str) -> str:
+    """pyupbit 표기(`day`, `minute1`, `week`, `month`)의 타임프레임을 캔들 API 경로로 변환합니다."""
+    if timeframe in ("week", "weeks"):
+        return "/candles/weeks"
+    if timeframe in ("month", "months"):
+        return "/candles/months"
+    seconds = timeframe_to_seconds(timeframe)
+    if seconds == 86400:
+        return "/candles/days"
+    return f"/candles/minutes/{seconds // 60}"
+
+
+def decode_candles(payload: bytes) -> pl.DataFrame:
+    """
+    캔들 API의 JSON 응답을 pandas나 행 단위 파이썬 객체를 거치지 않고 표준 스키마의 OHLCV로 디코딩합니다.
+    응답은 최신 봉이 먼저 오므로 시간 순으로 뒤집습니다.
+    """
+    schema = candle_schema()
+    raw = pl.read_json(io.BytesIO(payload), schema=_CANDLE_JSON_SCHEMA)
+    return raw.select(
+        pl.col("candle_date_time_utc")
+        .str.to_datetime("%Y-%m-%dT%H:%M:%S", time_zone="UTC")
+        .dt.epoch("ms")
+        .alias("timestamp"),
+        pl.col("opening_price").cast(schema["open"]).alias("open"),
+        pl.col("high_price").cast(schema["high"]).alias("high"),
+        pl.col("low_price").cast(schema["low"]).alias("low"),
+        pl.col("trade_price").cast(schema["close"]).alias("close"),
+        pl.col("candle_acc_trade_volume").cast(schema["volume"]).alias("volume"),
+        pl.col("candle_acc_trade_price").cast(schema["amount"]).alias("amount"),
+    ).reverse()
+
+
 class UpbitBroker(BaseBroker):
     """
     Upbit 거래소와의 연동을 담당하는 브로커 구현체.
+    시세 조회는 Upbit REST API를 직접 호출하고, 인증이 필요한 주문/잔고 조회에만 pyupbit를 사용합니다.
+    pyupbit(및 pandas)는 인증 기능을 처음 사용할 때 불러옵니다.
     """
     def __init__(self, api_key: str = None, api_secret: str = None):
-        access_key = api_key or settings.UPBIT_API_KEY
-        secret_key = api_secret or settings.UPBIT_API_SECRET
+        self._access_key = api_key or settings.UPBIT_API_KEY
+        self._secret_key = api_secret or settings.UPBIT_API_SECRET
+        self._upbit = None
 
-        has_credentials = "default" not in access_key and "default" not in secret_key
+        has_credentials = "default" not in self._access_key and "default" not in self._secret_key
 
-        try:
-            self.upbit = pyupbit.Upbit(access_key, secret_key)
-            if has_credentials:
+        if has_credentials:
+            try:
                 balance = self.upbit.get_balance("KRW")
                 logger.info(f"UpbitBroker가 인증된 사용자로 초기화되었습니다. (잔고: {balance} KRW)")
-            else:
-                logger.info("UpbitBroker가 인증되지 않은 사용자(시세 조회용)로 초기화되었습니다.")
-        except Exception as e:
-            logger.error(f"Upbit 클라이언트 초기화 실패: {e}", exc_info=True)
-            raise ConnectionError("Upbit API 키가 유효하지 않거나 연결에 실패했습니다.")
-
-    async def get_tickers(self, fiat="KRW") -> List[str]:
-        logger.info(f"Upbit {fiat} 마켓 종목 목록을 가져옵니다.")
-        try:
-            tickers = await run_sync(pyupbit.get_tickers, fiat=fiat)
-            return tickers
-        except Exception as e:
-            logger.error(f"Upbit 종목 목록 조회 실패: {e}", exc_info=True)
-            return []
-
-    async def get_market_data_for_1st_scan(self, tickers: List[str], timeframe: str = 'day') -> pl.DataFrame:
-        """
-        1차 스캔을 위해 여러 종목의 현재 시점 데이터를 한 번에 효율적으로 가져옵니다.
-        """
-        logger.info(f"1차 스캔을 위해 {len(tickers)}개 종목의 시장 데이터를 가져옵니다.")
-
-        async def fetch_one(ticker):
-            try:
-                # get_ohlcv(count=2)를 사용하여 현재가(종가)와 전일 거래대금을 가져옴
-                df = await self.get_ohlcv(ticker, timeframe=timeframe, limit=2)
-                if df.height > 1:
-                    # 최신 행 선택, ticker 컬럼 추가
-                    latest = df.tail(1).with_columns(pl.lit(ticker).alias("ticker"))
-                    return latest
-                return None
             except Exception as e:
-                logger.warning(f"1차 스캔 데이터 조회 중 {ticker} 오류: {e}")
-                return None
-
-        tasks = [fetch_one(ticker) for ticker in tickers]
-        results = await asyncio.gather(*tasks)
-
-        valid_results = [res for res in results if res is not None and not res.is_empty()]
+                logger.error(f"Upbit 클라이언트 초기화 실패: {e}", exc_info=True)
+                raise ConnectionError("Upbit API 키가 유효하지 않거나 연결에 실패했습니다.")
+        else:
+            logger.info("UpbitBroker가 인증되지 않은 사용자(시세 조회용)로 초기화되었습니다.")
 
-        if not valid_results:
-            return pl.DataFrame()
+    @property
+    def upbit(self):
+        """인증된 pyupbit 클라이언트. 처음 사용할 때 생성합니다."""
+        if self._upbit is None:
+            import pyupbit
+            self._upbit = pyupbit.Upbit(self._access_key, self._secret_key)
+        return self._upbit
 
-        return pl.concat(valid_results)
+    async def get_tickers(self, fiat="KRW") -> List[str]:
+        logger.info(f"Upbit {fiat} 마켓 종목 목록을 가져옵니다.")
+        payload = await fetch_public("tickers", "/market/all", {"isDetails": "false"})
+        markets = pl.read_json(io.BytesIO(payload), schema={"market": pl.String})["market"]
+        return markets.filter(markets.str.starts_with(f"{fiat}-")).to_list()
 
     async def get_ohlcv(
         self,
@@ -82,26 +168,45 @@ class UpbitBroker(BaseBroker):
         limit: int = 200
     ) -> pl.DataFrame:
         logger.debug(f"{ticker}의 {timeframe} OHLCV 데이터를 가져옵니다 (최근 {limit}개).")
-        try:
-            pandas_df = await run_sync(pyupbit.get_ohlcv, ticker=ticker, interval=timeframe, count=limit)
-
-            if pandas_df is None or pandas_df.empty:
-                return pl.DataFrame()
+        path = candle_path(timeframe)
+        frames: List[pl.DataFrame] = []
+        remaining = limit
+        to: Optional[str] = None
+        # 캔들 API는 한 번에 200개까지 반환하므로 더 많이 필요하면 `to`로 이전 구간을 이어서 받습니다.
+        while remaining > 0:
+            params = {"market": ticker, "count": min(remaining, MAX_CANDLES_PER_REQUEST)}
+            if to is not None:
+                params["to"] = to
+            df = decode_candles(await fetch_public("ohlcv", path, params))
+            if df.is_empty():
+                break
+            frames.append(df)
+            remaining -= df.height
+            if df.height < params["count"]:
+                break
+            oldest = datetime.datetime.fromtimestamp(df["timestamp"][0] / 1000, datetime.timezone.utc)
+            to = oldest.strftime("%Y-%m-%dT%H:%M:%SZ")
 
-            df = pl.from_pandas(pandas_df.reset_index().rename(columns={'index': 'timestamp'}))
-            df = df.rename({"value": "amount"})
-            return df
-        except Exception as e:
-            logger.error(f"{ticker} OHLCV 데이터 조회 실패: {e}", exc_info=True)
+        if not frames:
             return pl.DataFrame()
+        return pl.concat(reversed(frames)) if len(frames) > 1 else frames[0]
 
     async def get_current_price(self, ticker: str) -> float:
-        try:
-            price = await run_sync(pyupbit.get_current_price, ticker)
-            return price if price is not None else 0.0
-        except Exception as e:
-            logger.error(f"{ticker} 현재가 조회 실패: {e}", exc_info=True)
-            return 0.0
+        payload = await fetch_public("current_price", "/ticker", {"markets": ticker})
+        prices = pl.read_json(io.BytesIO(payload), schema={"trade_price": pl.Float64})["trade_price"]
+        if not len(prices) or prices[0] is None:
+            raise BrokerError(f"No current price for {ticker}", endpoint="current_price")
+        return float(prices[0])
+
+    async def get_current_prices(self, tickers: List[str]) -> Dict[str, float]:
+        # 현재가 API는 여러 종목을 한 번에 조회할 수 있으므로, 종목 수와 무관하게 몇 번의 요청으로 끝납니다.
+        prices: Dict[str, float] = {}
+        for start in range(0, len(tickers), MAX_TICKERS_PER_PRICE_REQUEST):
+            chunk = tickers[start:start + MAX_TICKERS_PER_PRICE_REQUEST]
+            payload = await fetch_public("current_price", "/ticker", {"markets": ",".join(chunk)})
+            df = pl.read_json(io.BytesIO(payload), schema={"market": pl.String, "trade_price": pl.Float64})
+            prices.update(zip(df["market"].to_list(), df["trade_price"].to_list()))
+        return prices
 
     async def place_order(
         self,
@@ -115,24 +220,41 @@ class UpbitBroker(BaseBroker):
         try:
             if side.lower() == 'buy':
                 if order_type == 'market':
-                    return await run_sync(self.upbit.buy_market_order, ticker, amount)
+                    return await call_upbit("order", self.upbit.buy_market_order, ticker, amount)
                 else:
-                    return await run_sync(self.upbit.buy_limit_order, ticker, price, amount)
+                    return await call_upbit("order", self.upbit.buy_limit_order, ticker, price, amount)
             elif side.lower() == 'sell':
                 if order_type == 'market':
-                    return await run_sync(self.upbit.sell_market_order, ticker, amount)
+                    return await call_upbit("order", self.upbit.sell_market_order, ticker, amount)
                 else:
-                    return await run_sync(self.upbit.sell_limit_order, ticker, price, amount)
+                    return await call_upbit("order", self.upbit.sell_limit_order, ticker, price, amount)
             else:
                 raise ValueError("side는 'buy' 또는 'sell'이어야 합니다.")
         except Exception as e:
             logger.error(f"{ticker} 주문 실패: {e}", exc_info=True)
+            # 요청 수 제한으로 거부된 주문은 접수되지 않았으므로 다시 보내도 안전합니다.
+            return {"error": str(e), "retryable": _is_rate_limited(e)}
+
+    async def get_order(self, order_id: str) -> Dict[str, Any]:
+        try:
+            order = await call_upbit("order", self.upbit.get_individual_order, order_id)
+            return order if order is not None else {"error": f"Order {order_id} lookup failed."}
+        except Exception as e:
+            logger.error(f"주문 {order_id} 조회 실패: {e}", exc_info=True)
+            return {"error": str(e)}
+
+    async def cancel_order(self, order_id: str) -> Dict[str, Any]:
+        try:
+            order = await call_upbit("order", self.upbit.cancel_order, order_id)
+            return order if order is not None else {"error": f"Order {order_id} cancellation failed."}
+        except Exception as e:
+            logger.error(f"주문 {order_id} 취소 실패: {e}", exc_info=True)
             return {"error": str(e)}
 
     async def get_balance(self) -> Dict[str, Any]:
         logger.info("전체 잔고를 가져옵니다.")
         try:
-            all_balances = await run_sync(self.upbit.get_balances)
+            all_balances = await call_upbit("balances", self.upbit.get_balances)
             return {"all_balances": all_balances}
         except Exception as e:
             logger.error(f"잔고 조회 실패: {e}", exc_info=True)
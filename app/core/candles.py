@@ -0,0 +1,228 @@
+import polars as pl
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 화면/전송용 시각은 Upbit 시장 기준인 한국 시간(KST)으로 표시합니다.
+KST = "Asia/Seoul"
+
+OHLCV_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume", "amount"]
+
+_FLOAT_DTYPES = {"float32": pl.Float32, "float64": pl.Float64}
+
+
+def candle_schema() -> Dict[str, pl.DataType]:
+    """
+    모든 브로커가 제공하는 OHLCV DataFrame의 표준 스키마.
+    timestamp는 봉 시작 시각(epoch ms, Int64)이며, 가격/거래량 컬럼의 정밀도는 설정으로 정합니다.
+    기본은 모두 Float64입니다. 가격을 Float32(CANDLE_PRICE_DTYPE="float32")로 줄이면 메모리는 절반이 되지만
+    유효 자릿수가 약 7자리(가수부 24비트)라 2^24를 넘는 KRW 가격이 반올림되고(143,251,000 → 143,251,008),
+    조건식의 소수 리터럴 비교(`close > 100.1`, `close == 100.1`) 결과가 Float64와 달라질 수 있습니다.
+    """
+    price = _FLOAT_DTYPES[settings.CANDLE_PRICE_DTYPE.lower()]
+    volume = _FLOAT_DTYPES[settings.CANDLE_VOLUME_DTYPE.lower()]
+    return {
+        "timestamp": pl.Int64, "open": price, "high": price, "low": price, "close": price,
+        "volume": volume, "amount": volume,
+    }
+
+
+def with_kst_datetime(df: pl.DataFrame) -> pl.DataFrame:
+    """epoch ms timestamp를 KST 기준의 naive Datetime으로 바꿉니다. (JSON 전송 등 표시용)"""
+    if "timestamp" not in df.columns or not df["timestamp"].dtype.is_integer():
+        return df
+    return df.with_columns(
+        pl.from_epoch("timestamp", time_unit="ms")
+        .dt.replace_time_zone("UTC")
+        .dt.convert_time_zone(KST)
+        .dt.replace_time_zone(None)
+    )
+
+
+def timeframe_to_seconds(timeframe: str) -> int:
+    """
+    타임프레임 문자열을 봉 하나의 길이(초)로 변환합니다.
+    Upbit 표기(`minute1`, `minute60`, `day`)와 일반 표기(`1m`, `1h`, `1d`)를 모두 지원합니다.
+    """
+    if timeframe in ("day", "days", "1d"):
+        return 86400
+    if timeframe.startswith("minute"):
+        return int(timeframe[len("minute"):] or 1) * 60
+    if timeframe[:-1].isdigit() and timeframe[-1] in ("m", "h"):
+        return int(timeframe[:-1]) * (60 if timeframe[-1] == "m" else 3600)
+    raise ValueError(f"Unsupported timeframe: {timeframe}")
+
+
+def bucket_start(timestamp_ms: int, period_seconds: int) -> int:
+    """체결 시각(epoch ms)이 속한 봉의 시작 시각(epoch ms, UTC 기준 정렬)을 계산합니다."""
+    period_ms = period_seconds * 1000
+    return timestamp_ms - timestamp_ms % period_ms
+
+
+@dataclass(frozen=True)
+class Trade:
+    """거래소 체결(틱) 한 건."""
+    ticker: str
+    price: float
+    volume: float
+    timestamp: int  # epoch ms
+
+
+class Candle:
+    """집계 중이거나 완성된 OHLCV 봉 하나. 많은 종목을 메모리에 유지하므로 __slots__를 사용합니다."""
+    __slots__ = ("start", "open", "high", "low", "close", "volume", "amount")
+
+    def __init__(self, start: int, price: float, volume: float):
+        self.start = start
+        self.open = self.high = self.low = self.close = price
+        self.volume = volume
+        self.amount = price * volume
+
+    def update(self, price: float, volume: float):
+        if price > self.high:
+            self.high = price
+        if price < self.low:
+            self.low = price
+        self.close = price
+        self.volume += volume
+        self.amount += price * volume
+
+    def as_row(self) -> Tuple[int, float, float, float, float, float, float]:
+        return (self.start, self.open, self.high, self.low, self.close, self.volume, self.amount)
+
+
+def rows_to_frame(rows: List[Tuple]) -> pl.DataFrame:
+    """(epoch ms, o, h, l, c, v, amount) 튜플 목록을 표준 스키마의 OHLCV DataFrame으로 변환합니다."""
+    return pl.DataFrame(rows, schema=list(candle_schema().items()), orient="row")
+
+
+def frame_to_rows(df: pl.DataFrame) -> List[Tuple]:
+    """OHLCV DataFrame을 메모리 저장용 튜플 목록으로 변환합니다."""
+    timestamps = df["timestamp"]
+    if not timestamps.dtype.is_integer():
+        # 과거 형식(KST 기준 naive datetime)의 데이터도 받아들입니다.
+        timestamps = timestamps.dt.replace_time_zone(KST).dt.epoch("ms")
+    return list(zip(
+        timestamps.to_list(), df["open"].to_list(), df["high"].to_list(), df["low"].to_list(),
+        df["close"].to_list(), df["volume"].to_list(), df["amount"].to_list(),
+    ))
+
+
+class CandleStore:
+    """
+    종목/타임프레임별 완성된 봉과 현재 집계 중인 봉을 메모리에 보관하는 데이터 소스.
+    종목당 최근 `capacity`개의 완성된 봉만 유지합니다.
+    """
+    def __init__(self, capacity: int = 500):
+        self.capacity = capacity
+        self._closed: Dict[Tuple[str, str], Deque[Tuple]] = {}
+        self._open: Dict[Tuple[str, str], Candle] = {}
+        self._seeded: set = set()
+
+    def _series(self, ticker: str, timeframe: str) -> Deque[Tuple]:
+        key = (ticker, timeframe)
+        series = self._closed.get(key)
+        if series is None:
+            series = self._closed[key] = deque(maxlen=self.capacity)
+        return series
+
+    def is_seeded(self, ticker: str, timeframe: str) -> bool:
+        return (ticker, timeframe) in self._seeded
+
+    def seed(self, ticker: str, timeframe: str, rows: Iterable[Tuple]):
+        """
+        REST로 받은 과거 봉으로 저장소를 초기화합니다.
+        이미 메모리에서 집계된 봉과 겹치는 구간은 메모리 쪽을 우선합니다.
+        """
+        series = self._series(ticker, timeframe)
+        known = {row[0] for row in series}
+        current = self._open.get((ticker, timeframe))
+        if current is not None:
+            known.add(current.start)
+        merged = sorted([row for row in rows if row[0] not in known] + list(series), key=lambda r: r[0])
+        series.clear()
+        series.extend(merged[-self.capacity:])
+        self._seeded.add((ticker, timeframe))
+
+    def set_open(self, ticker: str, timeframe: str, candle: Candle):
+        self._open[(ticker, timeframe)] = candle
+
+    def append_closed(self, ticker: str, timeframe: str, candle: Candle):
+        series = self._series(ticker, timeframe)
+        if series and series[-1][0] >= candle.start:
+            # REST로 받은 (진행 중이던) 봉을 완성된 봉으로 교체합니다.
+            while series and series[-1][0] >= candle.start:
+                series.pop()
+        series.append(candle.as_row())
+        if self._open.get((ticker, timeframe)) is candle:
+            del self._open[(ticker, timeframe)]
+
+    def size(self, ticker: str, timeframe: str) -> int:
+        key = (ticker, timeframe)
+        return len(self._closed.get(key, ())) + (1 if key in self._open else 0)
+
+    def to_frame(self, ticker: str, timeframe: str, limit: int) -> pl.DataFrame:
+        """최근 `limit`개의 봉(진행 중인 봉 포함)을 OHLCV DataFrame으로 반환합니다."""
+        key = (ticker, timeframe)
+        rows = list(self._closed.get(key, ()))
+        current = self._open.get(key)
+        if current is not None:
+            if rows and rows[-1][0] >= current.start:
+                rows = [row for row in rows if row[0] < current.start]
+            rows.append(current.as_row())
+        if not rows:
+            return pl.DataFrame()
+        return rows_to_frame(rows[-limit:])
+
+
+class CandleAggregator:
+    """
+    체결 스트림으로부터 설정된 타임프레임들의 OHLCV 봉을 실시간으로 만듭니다.
+    봉이 완성되면(다음 구간의 체결이 들어오거나, `close_expired`로 구간이 끝나면) `on_close`가 호출됩니다.
+    """
+    def __init__(
+        self,
+        timeframes: Iterable[str],
+        store: CandleStore,
+        on_close: Optional[Callable[[str, str, Candle], None]] = None,
+    ):
+        self.periods = {tf: timeframe_to_seconds(tf) for tf in timeframes}
+        self.store = store
+        self.on_close = on_close
+        self._open: Dict[Tuple[str, str], Candle] = {}
+
+    def _close(self, ticker: str, timeframe: str, candle: Candle):
+        self.store.append_closed(ticker, timeframe, candle)
+        if self.on_close is not None:
+            self.on_close(ticker, timeframe, candle)
+
+    def add_trade(self, trade: Trade):
+        for timeframe, period in self.periods.items():
+            key = (trade.ticker, timeframe)
+            start = bucket_start(trade.timestamp, period)
+            candle = self._open.get(key)
+            if candle is not None and candle.start == start:
+                candle.update(trade.price, trade.volume)
+                continue
+            if candle is not None and start < candle.start:
+                # 이미 지난 구간의 늦은 체결은 무시합니다.
+                continue
+            if candle is not None:
+                self._close(trade.ticker, timeframe, candle)
+            candle = self._open[key] = Candle(start, trade.price, trade.volume)
+            self.store.set_open(trade.ticker, timeframe, candle)
+
+    def close_expired(self, now_ms: int) -> int:
+        """구간이 끝났지만 다음 체결이 아직 없어 열려 있는 봉들을 완성 처리합니다."""
+        closed = 0
+        for (ticker, timeframe), candle in list(self._open.items()):
+            if candle.start + self.periods[timeframe] * 1000 <= now_ms:
+                del self._open[(ticker, timeframe)]
+                self._close(ticker, timeframe, candle)
+                closed += 1
+        return closed
@@ -0,0 +1,141 @@
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import polars as pl
+
+from app.core.candles import timeframe_to_seconds
+from app.core.engine import LogicParser
+from app.core.features import FeatureCache
+from app.core.metrics import metrics
+
+CHART_CACHE_REQUESTS = metrics.counter(
+    "tbot_chart_cache_requests_total", "Chart overlay lookups by cache result (hit, miss).", ("result",),
+)
+
+# (종목, 타임프레임, 봉 수, 오버레이 식들)
+ChartKey = Tuple[str, str, int, Tuple[str, ...]]
+
+
+def lttb_indices(x: Sequence[float], y: Sequence[float], threshold: int) -> List[int]:
+    """
+    Largest-Triangle-Three-Buckets 다운샘플링으로 남길 점의 인덱스를 반환합니다.
+    첫 점과 마지막 점은 항상 남기고, 나머지 구간을 `threshold - 2`개 버킷으로 나눠 버킷마다
+    이전에 고른 점, 다음 버킷의 평균점과 만드는 삼각형의 넓이가 가장 큰 점 하나를 고릅니다.
+    급등락처럼 모양을 결정하는 점이 평균/간격 추출보다 잘 보존됩니다.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+    every = (n - 2) / (threshold - 2)
+    indices = [0]
+    a = 0
+    for i in range(threshold - 2):
+        # 다음 버킷의 평균점
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        span = next_end - next_start
+        avg_x = sum(x[next_start:next_end]) / span
+        avg_y = sum(y[next_start:next_end]) / span
+
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        ax, ay = x[a], y[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (y[j] - ay) - (ax - x[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        indices.append(best)
+        a = best
+    indices.append(n - 1)
+    return indices
+
+
+def downsample(frame: pl.DataFrame, threshold: int, column: str = "close") -> pl.DataFrame:
+    """
+    봉 데이터를 `column`(기본 종가) 기준 LTTB로 최대 `threshold`개 행으로 줄입니다.
+    고른 행은 OHLCV와 오버레이 값을 그대로 유지하므로 캔들과 오버레이가 같은 시각에 정렬됩니다.
+    """
+    if frame.height <= threshold or threshold < 3:
+        return frame
+    values = frame[column].fill_null(strategy="forward").fill_null(0.0).to_list()
+    return frame[lttb_indices(frame["timestamp"].to_list(), values, threshold)]
+
+
+def compile_overlays(parser: LogicParser, overlays: Sequence[str]) -> Dict[str, pl.Expr]:
+    """오버레이 식(예: `ma(20)`)을 스캔 조건과 같은 파서로 컴파일합니다. 잘못된 식이면 ValueError/KeyError."""
+    return {overlay: parser.compile(overlay) for overlay in overlays}
+
+
+def validate_overlays(overlays: Sequence[str], indicators: Dict[str, Callable]) -> List[Dict[str, str]]:
+    """데이터 없이 오버레이 식을 컴파일해 보고 오류 목록(`[{"field": ..., "error": ...}]`)을 반환합니다."""
+    errors: List[Dict[str, str]] = []
+    empty = pl.DataFrame(schema={"timestamp": pl.Int64, "open": pl.Float64, "high": pl.Float64, "low": pl.Float64,
+                                 "close": pl.Float64, "volume": pl.Float64, "amount": pl.Float64})
+    for i, overlay in enumerate(overlays):
+        try:
+            LogicParser(indicators, empty).compile(overlay)
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            errors.append({"field": f"overlays[{i}]", "error": str(e) or type(e).__name__})
+    return errors
+
+
+def validate_timeframe(timeframe: str) -> Optional[str]:
+    """차트 타임프레임(`day`, `week`, `month`, `minuteN`, `1m`/`1h`/`1d`)을 확인하고, 잘못되었으면 오류 메시지를 반환합니다."""
+    if timeframe in ("week", "weeks", "month", "months"):
+        return None
+    try:
+        timeframe_to_seconds(timeframe)
+    except ValueError as e:
+        return str(e)
+    return None
+
+
+def with_overlays(
+    candles: pl.DataFrame,
+    overlays: Sequence[str],
+    indicators: Dict[str, Callable],
+    features: Optional[FeatureCache] = None,
+    frame_key: Optional[Tuple[str, str]] = None,
+) -> pl.DataFrame:
+    """봉 데이터에 오버레이 컬럼(컬럼 이름은 식 그대로)을 덧붙입니다. 보조지표는 스캔과 같은 캐시를 사용합니다."""
+    if not overlays or candles.is_empty():
+        return candles
+    parser = LogicParser(indicators, candles, features=features, frame_key=frame_key)
+    exprs = compile_overlays(parser, overlays)
+    frame = parser.frame_for(exprs.values())
+    return frame.select(*candles.columns, *(expr.alias(name) for name, expr in exprs.items()))
+
+
+class OverlayCache:
+    """
+    차트용 봉 + 오버레이 계산 결과 캐시. (종목, 타임프레임, 봉 수, 오버레이)마다 봉 데이터 버전과 함께 저장하여,
+    새 봉이 추가되거나 진행 중인 봉이 바뀌기 전까지는 같은 차트를 여러 번 열어도 다시 계산하지 않습니다.
+    보관 개수는 `max_entries`로 제한하며, 가장 오래 사용되지 않은 항목부터 버립니다. (LRU)
+    """
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[ChartKey, Tuple[Hashable, pl.DataFrame]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: ChartKey, version: Optional[Hashable]) -> Optional[pl.DataFrame]:
+        entry = self._entries.get(key)
+        if version is None or entry is None or entry[0] != version:
+            CHART_CACHE_REQUESTS.inc(result="miss")
+            return None
+        self._entries.move_to_end(key)
+        CHART_CACHE_REQUESTS.inc(result="hit")
+        return entry[1]
+
+    def put(self, key: ChartKey, version: Optional[Hashable], frame: pl.DataFrame):
+        if version is None:
+            return
+        self._entries[key] = (version, frame)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
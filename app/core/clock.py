@@ -0,0 +1,34 @@
+import asyncio
+import time
+
+
+class Clock:
+    """스케줄러와 리플레이 브로커가 공유하는 시계. 기본 구현은 실제 시간을 사용합니다."""
+    speed = 1.0
+
+    def now(self) -> float:
+        """현재 시각(epoch 초)."""
+        return time.time()
+
+    async def sleep(self, seconds: float):
+        """시계 기준으로 `seconds`초 동안 기다립니다."""
+        await asyncio.sleep(max(0.0, seconds))
+
+
+class SimulatedClock(Clock):
+    """
+    `start`(epoch 초)에서 시작하여 실제 시간의 `speed`배로 흐르는 시계.
+    예: speed=1000이면 실제 1초에 시뮬레이션 시간 1000초(약 17분)가 지납니다.
+    """
+    def __init__(self, start: float, speed: float = 1.0):
+        if speed <= 0:
+            raise ValueError("speed must be positive")
+        self.start = start
+        self.speed = speed
+        self._origin = time.monotonic()
+
+    def now(self) -> float:
+        return self.start + (time.monotonic() - self._origin) * self.speed
+
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(max(0.0, seconds) / self.speed)
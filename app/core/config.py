@@ -1,6 +1,7 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pathlib import Path
 from dotenv import load_dotenv
+from typing import Optional
 
 # ===================================================================
 # .env 파일 명시적 로드 (가장 확실한 방법)
@@ -22,9 +23,129 @@ class Settings(BaseSettings):
     이제 .env 파일이 아니라, 위에서 로드된 '환경 변수'로부터 직접 값을 읽어옵니다.
     """
     DATABASE_URL: str
+    # 비동기 드라이버 URL. 지정하지 않으면 DATABASE_URL로부터 자동 변환합니다.
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    # 커넥션 풀 설정 (PostgreSQL 등 서버형 DB에만 적용)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
     UPBIT_API_KEY: str = "default_key"
     UPBIT_API_SECRET: str = "default_secret"
 
+    # 전략 캐시: 다른 프로세스(레플리카)에서 수정된 전략이 반영되기까지의 최대 지연 시간(초).
+    # 0으로 설정하면 캐시를 사용하지 않습니다.
+    STRATEGY_CACHE_TTL_SECONDS: float = 30.0
+    # 단건/목록 캐시 각각의 최대 항목 수 (목록은 skip/limit 조합마다 하나씩 저장됩니다)
+    STRATEGY_CACHE_MAX_ENTRIES: int = 1024
+
+    # 실시간 봉 집계: 체결 스트림으로 OHLCV를 메모리에서 만들어 스캔이 REST 호출 없이 사용합니다.
+    LIVE_CANDLES_ENABLED: bool = False
+    LIVE_CANDLE_TIMEFRAMES: str = "minute1,day"
+    LIVE_CANDLE_CAPACITY: int = 500
+    # 비워두면 KRW 마켓 전체 종목을 구독합니다. (쉼표 구분)
+    LIVE_CANDLE_TICKERS: Optional[str] = None
+    # 지정하면 거래소 소켓 대신 로컬 JSON Lines 체결 파일을 재생합니다.
+    LIVE_CANDLE_REPLAY_FILE: Optional[str] = None
+    LIVE_CANDLE_REPLAY_SPEED: Optional[float] = None
+
+    # 트리거-액션 스캐너의 무장 종목 상태를 DB에 저장하는 주기(초)
+    TRIGGER_PERSIST_INTERVAL_SECONDS: float = 10.0
+
+    # OHLCV 컬럼 정밀도 ("float32" 또는 "float64"). 기본은 float64이며, "float32"는 메모리를 줄이는 대신
+    # 2^24(약 1,677만)를 넘는 가격이 반올림되고 `close > 100.1` 같은 리터럴 비교 결과가 달라질 수 있어 명시적으로 선택해야 합니다.
+    CANDLE_PRICE_DTYPE: str = "float64"
+    CANDLE_VOLUME_DTYPE: str = "float64"
+
+    # 브로커 시세 조회 캐시: 동시에 들어온 같은 요청은 한 번만 보내고, 결과를 짧게(봉 경계를 넘지 않게) 재사용합니다.
+    BROKER_CACHE_ENABLED: bool = True
+    BROKER_CACHE_TTL_SECONDS: float = 2.0
+    BROKER_CACHE_MAX_ENTRIES: int = 4096
+
+    # 브로커 호출 복원력: 일시적 오류(429/시간 초과/5xx)는 지터를 준 지수 백오프로 재시도하고,
+    # 엔드포인트별 연속 실패가 임계값을 넘으면 서킷 브레이커가 일정 시간 요청을 막습니다.
+    # BROKER_HEDGE_DELAY_SECONDS를 지정하면 그 시간 안에 응답이 없는 조회 요청을 한 번 더 보냅니다.
+    BROKER_RETRY_ATTEMPTS: int = 3
+    BROKER_RETRY_BASE_DELAY_SECONDS: float = 0.2
+    BROKER_RETRY_MAX_DELAY_SECONDS: float = 2.0
+    BROKER_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    BROKER_CIRCUIT_RESET_SECONDS: float = 10.0
+    BROKER_HEDGE_DELAY_SECONDS: Optional[float] = None
+
+    # 보조지표 캐시: 전략들이 같은 종목/타임프레임/봉에 대해 같은 보조지표를 쓰면 한 번만 계산합니다. (0이면 사용 안 함)
+    FEATURE_CACHE_MAX_MB: float = 64.0
+
+    # 즉시 실행 스캔(/scans/run-dynamic): 요청 1건의 최대 실행 시간, 2차 스캔 최대 종목 수, 요청에 지정할 수 있는 최대 종목 수,
+    # 전체 종목 1차 스캔에 재사용하는 시장 데이터 스냅샷의 유효 시간
+    DYNAMIC_SCAN_TIMEOUT_SECONDS: float = 2.0
+    DYNAMIC_SCAN_MAX_TICKERS: int = 50
+    DYNAMIC_SCAN_MAX_REQUEST_TICKERS: int = 200
+    DYNAMIC_SCAN_SNAPSHOT_TTL_SECONDS: float = 60.0
+
+    # 차트 데이터(/charts, WebSocket "chart" 채널): 요청 1건의 최대 봉 수, 보조지표 오버레이 캐시 항목 수,
+    # 실시간 봉 전송 주기와 전송용 오버레이 계산에 쓰는 최근 봉 수
+    CHART_MAX_BARS: int = 2000
+    CHART_CACHE_MAX_ENTRIES: int = 256
+    CHART_PUSH_INTERVAL_SECONDS: float = 1.0
+    CHART_LIVE_BARS: int = 200
+    # 차트 오버레이 전용 보조지표 캐시 크기 (0이면 사용 안 함)
+    CHART_FEATURE_CACHE_MAX_MB: float = 16.0
+
+    # 2차 스캔 스트리밍: 종목 묶음 크기, 평가를 기다리는 봉 데이터의 최대 크기(MB), 동시 조회 수
+    SCAN_CHUNK_SIZE: int = 50
+    SCAN_BUFFER_MAX_MB: float = 64.0
+    SCAN_FETCH_CONCURRENCY: int = 8
+
+    # 스캔 단계별 지연 시간/카운터 수집 및 /api/v1/metrics 노출 여부
+    METRICS_ENABLED: bool = True
+
+    # `profile=true`로 실행된 스캔 프로파일을 메모리에 보관하는 최대 개수
+    SCAN_PROFILE_HISTORY: int = 50
+
+    # 주문 파이프라인: 주문 API 요청 수 제한(초당), 동시 전송 수, 미체결 주문 조회 주기
+    # ORDER_BROKER를 "simulator"로 지정하면 실제 거래소 대신 로컬 모의 거래소로 주문합니다.
+    ORDER_BROKER: str = "upbit"
+    ORDER_RATE_PER_SECOND: float = 8.0
+    ORDER_CONCURRENCY: int = 4
+    ORDER_FILL_POLL_INTERVAL_SECONDS: float = 1.0
+
+    # 스캔 워커 모드: API는 스캔을 로컬 작업 큐(SQLite 파일)에 넣고, `python -m app.worker` 프로세스들이 실행합니다.
+    # 워커의 진행 메시지와 결과는 API 프로세스가 큐에서 읽어 WebSocket으로 전달합니다.
+    SCAN_WORKERS_ENABLED: bool = False
+    SCAN_QUEUE_PATH: str = "./scan_jobs.db"
+    SCAN_WORKER_PROCESSES: int = 2
+    SCAN_WORKER_CONCURRENCY: int = 2
+    SCAN_JOB_LEASE_SECONDS: float = 60.0
+    SCAN_JOB_MAX_ATTEMPTS: int = 3
+    SCAN_RELAY_POLL_SECONDS: float = 0.05
+
+    # 주문 전 위험 한도 확인: 주문 브로커의 잔고/현재가로 포트폴리오를 주기적으로 평가하고, 한도를 넘는 주문은 거부합니다.
+    # 비율은 총자산 대비이며 0이면 해당 한도를 적용하지 않습니다.
+    RISK_CHECKS_ENABLED: bool = False
+    PORTFOLIO_REFRESH_SECONDS: float = 5.0
+    RISK_MAX_ORDER_VALUE: float = 0.0
+    RISK_MAX_POSITION_FRACTION: float = 0.25
+    RISK_MAX_GROSS_EXPOSURE_FRACTION: float = 1.0
+    RISK_MAX_POSITION_LOSS_FRACTION: float = 0.0
+
+    # 로깅: 레코드는 큐에 넣기만 하고 백그라운드 스레드가 기록합니다. LOG_FORMAT은 "text" 또는 "json".
+    # 종목별 오류/전송 실패처럼 반복되는 로그는 키마다 LOG_SAMPLE_INTERVAL_SECONDS 동안 LOG_SAMPLE_LIMIT개만 남깁니다.
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "text"
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_SAMPLE_LIMIT: int = 10
+    LOG_SAMPLE_INTERVAL_SECONDS: float = 60.0
+
+    # cron 스케줄러: 활성 전략의 cron_schedule에 따라 스캔을 실행합니다. 대상 전략은 주기적으로 DB에서 다시 읽습니다.
+    SCHEDULER_ENABLED: bool = False
+    SCHEDULER_REFRESH_SECONDS: float = 60.0
+    # 리플레이 모드: 지정하면 스케줄러가 과거 봉 디렉터리를 시뮬레이션 시계로 가속 재생합니다. (부하 테스트용)
+    REPLAY_DATA_DIR: Optional[str] = None
+    REPLAY_SPEED: float = 1000.0
+    REPLAY_START: Optional[str] = None
+    REPLAY_END: Optional[str] = None
+
     model_config = SettingsConfigDict(
         # env_file 설정은 더 이상 필요하지 않습니다.
         # Pydantic은 기본적으로 환경 변수를 읽어오기 때문입니다.
@@ -0,0 +1,80 @@
+import datetime
+from typing import Set
+from zoneinfo import ZoneInfo
+
+from app.core.candles import KST
+
+# (최솟값, 최댓값) — 분, 시, 일, 월, 요일(0=일요일, 7도 일요일로 허용)
+_FIELD_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+
+def _parse_field(field: str, low: int, high: int) -> Set[int]:
+    values: Set[int] = set()
+    for part in field.split(","):
+        step = 1
+        if "/" in part:
+            part, step_str = part.split("/", 1)
+            step = int(step_str)
+            if step <= 0:
+                raise ValueError(f"Invalid cron step: {step_str}")
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start_str, end_str = part.split("-", 1)
+            start, end = int(start_str), int(end_str)
+        else:
+            start = end = int(part)
+            if step != 1:
+                end = high
+        if start < low or end > high or start > end:
+            raise ValueError(f"Cron field out of range: {field}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """
+    표준 5필드 cron 식(`분 시 일 월 요일`)을 해석합니다. `*`, `*/n`, `a-b`, `a-b/n`, 쉼표 목록을 지원합니다.
+    일/요일이 모두 지정되면 둘 중 하나만 맞아도 실행합니다. (Vixie cron 규칙)
+    시각은 Upbit 시장 기준인 한국 시간(KST)으로 해석합니다.
+    """
+    def __init__(self, expression: str, timezone: str = KST):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression must have 5 fields: '{expression}'")
+        self.expression = expression
+        self.tz = ZoneInfo(timezone)
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            _parse_field(field, low, high) for field, (low, high) in zip(fields, _FIELD_RANGES)
+        )
+        self.weekdays = {d % 7 for d in weekdays}
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, dt: datetime.datetime) -> bool:
+        day_ok = dt.day in self.days
+        weekday_ok = (dt.isoweekday() % 7) in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, timestamp: float) -> float:
+        """`timestamp`(epoch 초) 이후 처음으로 일치하는 시각(epoch 초)을 반환합니다."""
+        dt = datetime.datetime.fromtimestamp(timestamp, self.tz).replace(second=0, microsecond=0)
+        dt += datetime.timedelta(minutes=1)
+        limit = dt + datetime.timedelta(days=366 * 5)
+        while dt < limit:
+            if dt.month not in self.months:
+                dt = (dt.replace(day=1, hour=0, minute=0) + datetime.timedelta(days=32)).replace(day=1)
+                continue
+            if not self._day_matches(dt):
+                dt = dt.replace(hour=0, minute=0) + datetime.timedelta(days=1)
+                continue
+            if dt.hour not in self.hours:
+                dt = dt.replace(minute=0) + datetime.timedelta(hours=1)
+                continue
+            if dt.minute not in self.minutes:
+                dt += datetime.timedelta(minutes=1)
+                continue
+            return dt.timestamp()
+        raise ValueError(f"Cron expression never matches: '{self.expression}'")
@@ -1,17 +1,156 @@
 import polars as pl
+import asyncio
 import operator
 import logging
-from typing import Dict, Any, List, Callable
+import time
+from dataclasses import dataclass, field
+from functools import reduce
+from typing import AsyncIterator, Dict, Any, List, Callable, Optional, Tuple, Union
+
+from app.core.candles import timeframe_to_seconds
+from app.core.clock import Clock
+from app.core.features import FeatureCache, FrameKey
+from app.core.logs import log_sampled
+from app.core.metrics import SCAN_STAGE_SECONDS, SCAN_TICKERS
+from app.core.profiling import ScanProfiler
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 조건 항의 상대적 평가 비용 추정치. 컬럼 비교는 싸고, 보조지표(롤링 윈도 등)는 비쌉니다.
+# 변수를 통해 보조지표를 중첩하면 비용이 누적되므로 깊게 중첩된 식일수록 나중에 평가됩니다.
+LITERAL_COST = 0
+COLUMN_COST = 1
+SHIFT_COST = 2
+INDICATOR_COST = 20
+
+# 1차 스캔 스냅샷(브로커가 제공하는 종목별 최신 일봉)의 봉 단위와 컬럼
+FIRST_SCAN_TIMEFRAME = "day"
+SNAPSHOT_COLUMNS = ("open", "high", "low", "close", "volume", "amount")
+# 1차 스캔 통과 종목을 정렬하는 기본 우선순위 컬럼(내림차순). 유동성이 큰 종목부터 2차 스캔합니다.
+DEFAULT_PRIORITY_COLUMN = "amount"
+
+
+def scan_deadline(scan_logic: Dict[str, Any], now: float) -> Optional[float]:
+    """
+    2차 스캔의 마감 시각(epoch 초)을 계산합니다.
+    - `"2nd_scan": {"deadline_seconds": 30}`이면 지금부터 30초 뒤
+    - 지정하지 않으면 2차 스캔 봉이 닫히는 시각 (그 뒤의 결과는 이미 다음 봉 기준으로 낡은 결과입니다)
+    - `deadline_seconds`가 0 또는 null이면 마감 없음
+    """
+    second_scan_conditions = scan_logic.get("2nd_scan") or {}
+    if "deadline_seconds" in second_scan_conditions:
+        seconds = second_scan_conditions["deadline_seconds"]
+        return now + float(seconds) if seconds else None
+    try:
+        period = timeframe_to_seconds(second_scan_conditions.get("timeframe", "day"))
+    except ValueError:
+        return None
+    return (now // period + 1) * period
+
+
+class _Term:
+    """
+    조건식의 말단 항(비교/산술식)과 추정 비용.
+    `row_local`이면 현재 행의 값만 사용하므로 최신 행 하나만으로 평가할 수 있습니다.
+    """
+    __slots__ = ("expr", "cost", "row_local")
+
+    def __init__(self, expr: pl.Expr, cost: int, row_local: bool):
+        self.expr = expr
+        self.cost = cost
+        self.row_local = row_local
+
+    def to_expr(self) -> pl.Expr:
+        return self.expr
+
+
+class _Logical:
+    """AND/OR로 결합된 조건 노드. 같은 연산자의 하위 노드는 하나로 평탄화합니다."""
+    __slots__ = ("op", "children", "cost", "row_local")
+
+    def __init__(self, op: str, children: List["_Node"]):
+        self.op = op
+        self.children: List[_Node] = []
+        for child in children:
+            if isinstance(child, _Logical) and child.op == op:
+                self.children.extend(child.children)
+            else:
+                self.children.append(child)
+        self.cost = sum(child.cost for child in self.children)
+        self.row_local = all(child.row_local for child in self.children)
+
+    def to_expr(self) -> pl.Expr:
+        combine = operator.and_ if self.op == 'AND' else operator.or_
+        return reduce(combine, [child.to_expr() for child in self.children])
+
+
+_Node = Union[_Term, _Logical]
+
+
+def _as_term(node: _Node) -> _Term:
+    return node if isinstance(node, _Term) else _Term(node.to_expr(), node.cost, node.row_local)
+
+
 class LogicParser:
-    # ... (기존 LogicParser 코드는 변경 없음) ...
-    def __init__(self, indicators: Dict[str, Callable], data: pl.DataFrame):
+    """
+    조건 문자열을 Polars 표현식으로 변환하고 봉 데이터에서 평가합니다.
+    `features`(공유 보조지표 캐시)와 `frame_key`(종목, 타임프레임)가 주어지면 보조지표는 자리표시 컬럼으로 컴파일되고,
+    평가에 실제로 필요할 때 캐시에서 가져오거나 한 번 계산하여 채웁니다. 따라서 같은 봉 데이터에 대해 여러 전략이
+    같은 보조지표를 쓰더라도 계산은 한 번만 일어납니다.
+    """
+    def __init__(
+        self,
+        indicators: Dict[str, Callable],
+        data: pl.DataFrame,
+        features: Optional[FeatureCache] = None,
+        frame_key: Optional[FrameKey] = None,
+    ):
         self.indicators = indicators
         self.data = data
         self.variables: Dict[str, Any] = {}
+        self._variable_nodes: Dict[str, _Node] = {}
+        self.features = features
+        self.frame_key = frame_key
+        self._frame_version = (
+            FeatureCache.frame_version(data) if features is not None and frame_key is not None else None
+        )
+        # 자리표시 컬럼 이름 → (캐시 키로 쓰는 보조지표 식별자, 실제 계산식)
+        self._feature_exprs: Dict[str, Tuple[Tuple[Any, ...], pl.Expr]] = {}
+
+    def _indicator_term(self, func_name: str, args: List[float]) -> pl.Expr:
+        func = self.indicators[func_name]
+        expr = func(*args)
+        if self._frame_version is None:
+            return expr
+        name = f"__feature_{func_name}({','.join(repr(a) for a in args)})"
+        self._feature_exprs[name] = ((func, tuple(args)), expr)
+        return pl.col(name)
+
+    def _materialize(self, exprs) -> pl.DataFrame:
+        """식들이 참조하는 자리표시 보조지표 컬럼 중 아직 없는 것을 캐시 또는 계산으로 채운 데이터를 반환합니다."""
+        if not self._feature_exprs:
+            return self.data
+        missing = []
+        for expr in exprs:
+            for name in expr.meta.root_names():
+                if name in self._feature_exprs and name not in self.data.columns and name not in missing:
+                    missing.append(name)
+        if not missing:
+            return self.data
+        columns = []
+        for name in missing:
+            feature, expr = self._feature_exprs[name]
+            series = self.features.get(self.frame_key, self._frame_version, feature)
+            if series is None:
+                series = self.data.select(expr.alias(name)).to_series()
+                self.features.put(self.frame_key, self._frame_version, feature, series)
+            columns.append(series.alias(name))
+        self.data = self.data.with_columns(columns)
+        return self.data
+
+    def frame_for(self, exprs) -> pl.DataFrame:
+        """`exprs`를 평가할 수 있도록 필요한 보조지표 컬럼을 채운 봉 데이터. (쿼리 플랜 캡처 등)"""
+        return self._materialize(list(exprs))
 
     def _parse_tokens(self, expression: str) -> List[str]:
         # 간단한 공백 기반 토크나이저
@@ -26,15 +165,16 @@ class LogicParser:
         }
         for token in tokens:
             if token.replace('.', '', 1).isdigit():
-                output_queue.append(pl.lit(float(token)))
+                output_queue.append(_Term(pl.lit(float(token)), LITERAL_COST, True))
             elif token in self.data.columns:
-                output_queue.append(pl.col(token))
-            elif token.endswith(')'):
+                output_queue.append(_Term(pl.col(token), COLUMN_COST, True))
+            elif token.endswith(')') and token != ')':
                 if '.' in token and 'shift' in token:
                     var_name, func_call = token.split('.', 1)
                     shift_period = int(func_call.strip('shift()'))
-                    if var_name in self.variables:
-                        output_queue.append(self.variables[var_name].shift(shift_period))
+                    if var_name in self._variable_nodes:
+                        node = self._variable_nodes[var_name]
+                        output_queue.append(_Term(node.to_expr().shift(shift_period), node.cost + SHIFT_COST, False))
                     else:
                         raise ValueError(f"Unknown variable for shift: {var_name}")
                 else:
@@ -43,7 +183,7 @@ class LogicParser:
                     if func_name in self.indicators:
                         try:
                             converted_args = [float(a) for a in args if a]
-                            output_queue.append(self.indicators[func_name](*converted_args))
+                            output_queue.append(_Term(self._indicator_term(func_name, converted_args), INDICATOR_COST, False))
                         except (ValueError, TypeError) as e:
                             raise ValueError(f"Error converting args for {func_name}: {e}")
                     else:
@@ -60,8 +200,8 @@ class LogicParser:
                     output_queue.append(operator_stack.pop())
                 if operator_stack: operator_stack.pop()
                 else: raise ValueError("Mismatched parentheses")
-            elif token in self.variables:
-                output_queue.append(self.variables[token])
+            elif token in self._variable_nodes:
+                output_queue.append(_as_term(self._variable_nodes[token]))
             else:
                 raise ValueError(f"Unknown token: {token}")
 
@@ -70,121 +210,520 @@ class LogicParser:
             output_queue.append(operator_stack.pop())
         return output_queue
 
-    def _evaluate_rpn(self, rpn_queue: List[Any]) -> pl.Expr:
-        stack: List[Any] = []
+    def _evaluate_rpn(self, rpn_queue: List[Any]) -> _Node:
+        stack: List[_Node] = []
         OPERATOR_FUNCS = {
             '+': operator.add, '-': operator.sub, '*': operator.mul, '/': operator.truediv,
             '>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le,
-            '==': operator.eq, '!=': operator.ne, 'AND': operator.and_, 'OR': operator.or_
+            '==': operator.eq, '!=': operator.ne,
         }
         for token in rpn_queue:
-            if token in OPERATOR_FUNCS:
+            if isinstance(token, str):
                 right = stack.pop()
                 left = stack.pop()
-                stack.append(OPERATOR_FUNCS[token](left, right))
+                if token in ('AND', 'OR'):
+                    # 논리 결합은 즉시 계산하지 않고 노드로 남겨 비용 순서대로 단락 평가할 수 있게 합니다.
+                    stack.append(_Logical(token, [left, right]))
+                else:
+                    left, right = _as_term(left), _as_term(right)
+                    stack.append(_Term(
+                        OPERATOR_FUNCS[token](left.expr, right.expr),
+                        left.cost + right.cost,
+                        left.row_local and right.row_local,
+                    ))
             else:
                 stack.append(token)
         if len(stack) != 1: raise ValueError("Invalid expression")
         return stack[0]
 
+    def compile_condition(self, expression: str) -> _Node:
+        """조건 문자열을 비용 정보가 있는 조건 트리로 변환합니다."""
+        with SCAN_STAGE_SECONDS.time(stage="compile"):
+            tokens = self._parse_tokens(expression)
+            rpn_queue = self._shunting_yard(tokens)
+            return self._evaluate_rpn(rpn_queue)
+
+    def compile(self, expression: str) -> pl.Expr:
+        """조건 문자열을 Polars 표현식으로 변환합니다."""
+        return self.compile_condition(expression).to_expr()
+
     def evaluate_on_df(self, expression: str) -> pl.Series:
-        tokens = self._parse_tokens(expression)
-        rpn_queue = self._shunting_yard(tokens)
-        final_expr = self._evaluate_rpn(rpn_queue)
-        return self.data.select(final_expr).to_series()
+        final_expr = self.compile(expression)
+        with SCAN_STAGE_SECONDS.time(stage="evaluate"):
+            return self._materialize([final_expr]).select(final_expr).to_series()
+
+    def evaluate_latest(self, condition: _Node) -> bool:
+        """
+        최신 행에서 조건이 참인지 평가합니다.
+        AND/OR의 하위 조건은 추정 비용이 낮은 순서로 평가하고 결과가 정해지면 나머지(비싼 보조지표)는 계산하지 않습니다.
+        현재 행만 참조하는 항은 전체 시계열이 아닌 최신 행 하나로 평가합니다. null은 거짓으로 취급합니다.
+        """
+        if self.data.is_empty():
+            return False
+        with SCAN_STAGE_SECONDS.time(stage="evaluate"):
+            return self._evaluate_node(condition)
+
+    def _evaluate_node(self, node: _Node) -> bool:
+        if isinstance(node, _Logical):
+            short_circuit = node.op == 'OR'
+            for child in sorted(node.children, key=lambda c: c.cost):
+                if self._evaluate_node(child) == short_circuit:
+                    return short_circuit
+            return not short_circuit
+        data = self._materialize([node.expr])
+        frame = data.tail(1).select(node.expr) if node.row_local else data.select(node.expr).tail(1)
+        return bool(frame.to_series()[0])
 
     def set_variable(self, var_name: str, expression: str):
-        tokens = self._parse_tokens(expression)
-        rpn_queue = self._shunting_yard(tokens)
-        expr_to_save = self._evaluate_rpn(rpn_queue)
-        self.variables[var_name] = expr_to_save
+        node = self.compile_condition(expression)
+        self._variable_nodes[var_name] = node
+        self.variables[var_name] = node.to_expr()
+
+
+def validate_scan_logic(scan_logic: Dict[str, Any], indicators: Dict[str, Callable]) -> List[Dict[str, str]]:
+    """
+    데이터 없이 scan_logic의 조건/변수를 컴파일해 보고 오류 목록(`[{"field": ..., "error": ...}]`)을 반환합니다.
+    1차 스캔 조건은 보조지표 없이 스냅샷 컬럼만 사용할 수 있습니다.
+    """
+    errors: List[Dict[str, str]] = []
+    empty = pl.DataFrame(schema={"timestamp": pl.Int64, **{c: pl.Float64 for c in SNAPSHOT_COLUMNS}})
+
+    def check(field_name: str, compile_fn: Callable[[], Any]):
+        try:
+            compile_fn()
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            errors.append({"field": field_name, "error": str(e) or type(e).__name__})
+
+    first_scan_conditions = scan_logic.get("1st_scan") or {}
+    if first_scan_conditions.get("condition"):
+        check("1st_scan.condition", lambda: LogicParser({}, empty).compile_condition(first_scan_conditions["condition"]))
+
+    second_scan_conditions = scan_logic.get("2nd_scan")
+    if not second_scan_conditions or not second_scan_conditions.get("condition"):
+        errors.append({"field": "2nd_scan.condition", "error": "2nd_scan.condition is required"})
+        return errors
+    timeframe = second_scan_conditions.get("timeframe", "day")
+    if timeframe not in ("week", "month"):
+        check("2nd_scan.timeframe", lambda: timeframe_to_seconds(timeframe))
+
+    parser = LogicParser(indicators, empty)
+    for index, var in enumerate(second_scan_conditions.get("variables", [])):
+        check(f"2nd_scan.variables[{index}]", lambda: parser.set_variable(var["name"], var["expression"]))
+    check("2nd_scan.condition", lambda: parser.compile_condition(second_scan_conditions["condition"]))
+    return errors
+
+
+@dataclass
+class ScanReport:
+    """스캔 1회의 처리 결과. 데이터를 가져오거나 평가하지 못한 종목은 사유와 함께 `failures`에 남깁니다."""
+    phase: str
+    scanned: int = 0
+    matched: int = 0
+    failures: Dict[str, str] = field(default_factory=dict)
+    # 마감 시각이 지나 평가하지 못한 종목이 있으면 부분 결과입니다.
+    partial: bool = False
+    skipped: List[str] = field(default_factory=list)
+    # 스트리밍 2차 스캔에서 평가를 기다린 봉 데이터의 최대 크기(바이트)
+    peak_buffer_bytes: int = 0
+    duration_ms: float = 0.0
+
+    def fail(self, ticker: str, error: Union[str, Exception]):
+        if isinstance(error, Exception):
+            error = f"{type(error).__name__}: {error}"
+        self.failures[ticker] = error
+
+    def failed_list(self) -> List[Dict[str, str]]:
+        return [{"ticker": ticker, "error": error} for ticker, error in self.failures.items()]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "phase": self.phase,
+            "scanned": self.scanned,
+            "matched": self.matched,
+            "failed": self.failed_list(),
+            "partial": self.partial,
+            "skipped": list(self.skipped),
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """로그용 요약: 종목 목록 대신 개수만 담습니다."""
+        return {
+            "phase": self.phase,
+            "scanned": self.scanned,
+            "matched": self.matched,
+            "failed": len(self.failures),
+            "skipped": len(self.skipped),
+            "partial": self.partial,
+            "peak_buffer_bytes": self.peak_buffer_bytes,
+            "duration_ms": round(self.duration_ms, 3),
+        }
 
 
 class ScanEngine:
     """
     PRD v7.3의 '2단계 스캔' 아키텍처를 구현한 스캔 엔진.
+    마지막으로 실행한 스캔의 종목별 처리 결과(실패 사유 포함)는 `last_report`에 남습니다.
+    2차 스캔 마감 시각은 `clock` 기준입니다. (리플레이에서는 시뮬레이션 시계)
+    `features`가 주어지면 2차 스캔의 보조지표 시계열을 종목/타임프레임/봉 버전별로 캐시하여 전략 간에 재사용합니다.
+    2차 스캔은 `chunk_size`개 종목 묶음 단위로 조회/평가하며, 평가를 기다리는 봉 데이터는 `max_buffer_bytes`로 제한합니다.
     """
-    def __init__(self, broker, indicators: Dict[str, Callable]):
+    def __init__(
+        self,
+        broker,
+        indicators: Dict[str, Callable],
+        profiler: Optional[ScanProfiler] = None,
+        clock: Optional[Clock] = None,
+        features: Optional[FeatureCache] = None,
+        chunk_size: int = 50,
+        max_buffer_bytes: Optional[int] = None,
+        fetch_concurrency: int = 8,
+        prefetch_chunks: int = 1,
+    ):
         self.broker = broker
         self.indicators = indicators
+        # 지정되면 쿼리 플랜과 종목별 소요 시간을 기록합니다. (`profile=true` 스캔)
+        self.profiler = profiler
+        self.clock = clock or Clock()
+        # 지정되면 2차 스캔의 보조지표 계산 결과를 다른 전략/스캔과 공유합니다.
+        self.features = features
+        self.chunk_size = max(1, chunk_size)
+        self.max_buffer_bytes = max_buffer_bytes
+        self.fetch_concurrency = max(1, fetch_concurrency)
+        self.prefetch_chunks = max(1, prefetch_chunks)
+        self.last_report: Optional[ScanReport] = None
 
-    async def run_1st_scan(self, scan_logic: Dict[str, Any], tickers: List[str]) -> List[str]:
+    async def run_1st_scan(
+        self, scan_logic: Dict[str, Any], tickers: Optional[List[str]] = None, market_data: Optional[pl.DataFrame] = None,
+    ) -> List[str]:
         """
         1차 스캔: 현재 시점 데이터만으로 빠르게 종목을 필터링합니다.
+        대상 종목을 지정하지 않으면 브로커의 전체 종목을 대상으로 합니다.
+        `market_data`(미리 조회해 둔 스냅샷)가 주어지면 브로커에서 다시 조회하지 않고 그 데이터로 평가합니다.
+        통과 종목은 우선순위 컬럼(`"1st_scan": {"priority": "amount"}`, 기본 거래대금)의 내림차순으로 반환하므로
+        마감 시각이 있는 2차 스캔은 유동성이 큰 종목부터 평가합니다.
         """
+        started = time.perf_counter()
+        if tickers is None:
+            tickers = await self.broker.get_tickers()
+        report = self.last_report = ScanReport(phase="1st", scanned=len(tickers))
+        try:
+            return await self._run_1st_scan(scan_logic, tickers, report, market_data)
+        finally:
+            report.duration_ms = (time.perf_counter() - started) * 1000
+
+    async def _run_1st_scan(
+        self, scan_logic: Dict[str, Any], tickers: List[str], report: ScanReport, market_data: Optional[pl.DataFrame],
+    ) -> List[str]:
+
         first_scan_conditions = scan_logic.get("1st_scan")
-        if not first_scan_conditions:
-            logger.info("1차 스캔 조건이 없습니다. 모든 종목을 2차 스캔 대상으로 합니다.")
+        pushdown_expr = self.pushdown_condition(scan_logic)
+        if not first_scan_conditions and pushdown_expr is None:
+            logger.debug("1차 스캔 조건이 없습니다. 모든 종목을 2차 스캔 대상으로 합니다.")
+            report.matched = len(tickers)
             return tickers
 
-        logger.info(f"1차 스캔 시작: {len(tickers)}개 종목 대상")
-        market_data = await self.broker.get_market_data_for_1st_scan(tickers)
+        logger.debug("1차 스캔 시작: %d개 종목 대상", len(tickers))
+        if market_data is None:
+            market_data = await self.broker.get_market_data_for_1st_scan(tickers)
+
+        received = set(market_data["ticker"].to_list()) if "ticker" in market_data.columns else set()
+        for ticker in tickers:
+            if ticker not in received:
+                report.fail(ticker, "market data unavailable")
 
         if market_data.is_empty():
             logger.warning("1차 스캔을 위한 시장 데이터를 가져오지 못했습니다.")
             return []
 
+        filtered_df, plan_nodes = await self._off_loop(
+            self._filter_1st_scan, market_data, first_scan_conditions, pushdown_expr,
+        )
+
+        if self.profiler:
+            self.profiler.capture_plan("1st_scan", market_data, plan_nodes)
+        SCAN_TICKERS.inc(len(tickers), phase="1st", outcome="scanned")
+        SCAN_TICKERS.inc(len(tickers) - market_data.height, phase="1st", outcome="failed")
+        SCAN_TICKERS.inc(filtered_df.height, phase="1st", outcome="matched")
+
+        report.matched = filtered_df.height
+        if filtered_df.is_empty():
+            return []
+        return filtered_df["ticker"].to_list()
+
+    @staticmethod
+    def _filter_1st_scan(
+        market_data: pl.DataFrame, first_scan_conditions: Optional[Dict[str, Any]], pushdown_expr: Optional[pl.Expr],
+    ) -> Tuple[pl.DataFrame, Dict[str, pl.Expr]]:
+        """1차 스캔 조건과 2차 스캔에서 옮겨온 조건으로 거르고, 통과 종목을 우선순위 컬럼 순으로 정렬합니다."""
         # 1차 스캔은 보조지표를 사용하지 않으므로, 빈 indicator 딕셔너리로 파서 초기화
         parser = LogicParser({}, market_data)
+        plan_nodes: Dict[str, pl.Expr] = {}
+        filtered_df = market_data
 
-        # 'condition' 키에 전체 조건이 문자열로 들어옴
-        condition_str = first_scan_conditions['condition']
+        if first_scan_conditions:
+            # 'condition' 키에 전체 조건이 문자열로 들어옴
+            condition_str = first_scan_conditions['condition']
+            filtered_df = filtered_df.filter(parser.evaluate_on_df(condition_str))
+            plan_nodes["condition"] = parser.compile(condition_str)
 
-        filtered_df = market_data.filter(parser.evaluate_on_df(condition_str))
+        if pushdown_expr is not None:
+            with SCAN_STAGE_SECONDS.time(stage="evaluate"):
+                filtered_df = filtered_df.filter(pushdown_expr)
+            plan_nodes["pushdown"] = pushdown_expr
 
-        if filtered_df.is_empty():
-            logger.info("1차 스캔 결과, 조건을 만족하는 종목이 없습니다.")
-            return []
+        priority = (first_scan_conditions or {}).get("priority", DEFAULT_PRIORITY_COLUMN)
+        if not filtered_df.is_empty() and priority in filtered_df.columns:
+            filtered_df = filtered_df.sort(priority, descending=True, nulls_last=True, maintain_order=True)
+        return filtered_df, plan_nodes
+
+    async def _off_loop(self, fn: Callable, *args):
+        """
+        CPU를 쓰는 Polars 평가를 스레드 풀에서 실행하여, API 프로세스에서 스캔하는 동안에도 이벤트 루프(REST/WebSocket)를 막지 않습니다.
+        (Polars는 계산 중 GIL을 놓으므로 이벤트 루프와 함께 실행됩니다.) 프로파일 스캔은 cProfile이 현재 스레드만
+        기록하므로 이벤트 루프에서 그대로 실행합니다.
+        """
+        if self.profiler is not None:
+            return fn(*args)
+        return await asyncio.to_thread(fn, *args)
+
+    def pushdown_condition(self, scan_logic: Dict[str, Any]) -> Optional[pl.Expr]:
+        """
+        2차 스캔 조건 중 보조지표와 shift 없이 현재 행만 참조하는 AND 하위 조건을 모아 1차 스캔용 식으로 반환합니다. (PRD 6.1)
+        - 최상위가 OR인 조건은 하위 조건 하나만으로 종목을 제외할 수 없으므로 옮기지 않습니다.
+        - volume/amount 등은 봉 단위에 따라 값이 다르므로 2차 스캔 timeframe이 1차 스캔 스냅샷과 같을 때만 옮깁니다.
+        - `"1st_scan": {"pushdown": false}`로 끌 수 있습니다.
+        """
+        second_scan_conditions = scan_logic.get("2nd_scan")
+        if not second_scan_conditions or "condition" not in second_scan_conditions:
+            return None
+        if (scan_logic.get("1st_scan") or {}).get("pushdown", True) is False:
+            return None
+        if second_scan_conditions.get("timeframe", "day") != FIRST_SCAN_TIMEFRAME:
+            return None
+
+        # 컬럼 이름만 인식하면 되므로 스냅샷 컬럼을 가진 빈 프레임으로 컴파일합니다.
+        parser = LogicParser(self.indicators, pl.DataFrame(schema={c: pl.Float64 for c in SNAPSHOT_COLUMNS}))
+        try:
+            for var in second_scan_conditions.get("variables", []):
+                parser.set_variable(var["name"], var["expression"])
+            condition = parser.compile_condition(second_scan_conditions["condition"])
+        except (ValueError, KeyError) as e:
+            logger.debug(f"2차 스캔 조건을 1차 스캔으로 옮기지 못했습니다: {e}")
+            return None
 
-        passed_tickers = filtered_df["ticker"].to_list()
-        logger.info(f"1차 스캔 통과: {len(passed_tickers)}개 종목")
-        return passed_tickers
+        conjuncts = condition.children if isinstance(condition, _Logical) and condition.op == 'AND' else [condition]
+        pushable = [c for c in conjuncts if c.row_local]
+        if not pushable:
+            return None
+        logger.debug("2차 스캔 조건 중 %d개를 1차 스캔에 적용합니다.", len(pushable))
+        return reduce(operator.and_, [c.to_expr() for c in pushable])
 
-    async def run_2nd_scan(self, scan_logic: Dict[str, Any], tickers: List[str]) -> pl.DataFrame:
+    async def run_2nd_scan(
+        self,
+        scan_logic: Dict[str, Any],
+        tickers: List[str],
+        deadline: Optional[float] = None,
+    ) -> pl.DataFrame:
         """
         2차 스캔: 시계열 데이터를 사용하여 정밀하게 종목을 분석합니다.
+        종목은 주어진 순서(우선순위)대로 평가합니다. `deadline`(epoch 초, `clock` 기준)이 지나면 남은 종목을
+        평가하지 않고 멈추며, 그때까지의 결과를 반환합니다. 이 경우 `last_report.partial`이 참이고
+        평가하지 못한 종목은 `last_report.skipped`에 남습니다.
+        조건을 만족한 종목의 최신 봉만 모아 반환하며, 묶음 단위로 결과를 받으려면 `stream_2nd_scan`을 사용합니다.
+        """
+        chunks = [chunk async for chunk in self.stream_2nd_scan(scan_logic, tickers, deadline)]
+        if not chunks:
+            return pl.DataFrame()
+        return pl.concat(chunks)
+
+    async def stream_2nd_scan(
+        self,
+        scan_logic: Dict[str, Any],
+        tickers: List[str],
+        deadline: Optional[float] = None,
+    ) -> AsyncIterator[pl.DataFrame]:
         """
+        2차 스캔을 `chunk_size`개 종목 묶음 단위의 파이프라인(조회 → 평가 → 전달)으로 실행하고,
+        묶음마다 조건을 만족한 종목의 최신 봉을 내보냅니다. (만족한 종목이 없는 묶음은 내보내지 않음)
+        - 조회 단계는 다음 묶음을 미리 가져오되, 평가를 기다리는 봉 데이터가 `max_buffer_bytes`를 넘으면 멈춥니다.
+          대기열도 `prefetch_chunks`개로 제한하므로, 평가나 결과 전달이 느리면 조회도 그만큼 늦춰집니다. (배압)
+        - 평가가 끝난 묶음의 봉 데이터는 바로 놓아주므로, 메모리는 종목 수와 무관하게 한 두 묶음 크기로 유지됩니다.
+        마감 시각 처리와 `last_report` 내용은 `run_2nd_scan`과 같습니다.
+        """
+        started = time.perf_counter()
         second_scan_conditions = scan_logic.get("2nd_scan")
+        report = self.last_report = ScanReport(phase="2nd")
         if not second_scan_conditions:
             logger.warning("2차 스캔 조건이 없어 스캔을 종료합니다.")
-            return pl.DataFrame()
+            return
 
-        logger.info(f"2차 스캔 시작: {len(tickers)}개 종목 대상")
-        all_results = []
+        logger.debug("2차 스캔 시작: %d개 종목 대상 (%d개씩)", len(tickers), self.chunk_size)
         timeframe = second_scan_conditions.get("timeframe", "day")
-        
-        for ticker in tickers:
-            try:
-                # 2차 스캔은 과거 데이터가 필요
-                ohlcv_df = await self.broker.get_ohlcv(ticker, timeframe, limit=200)
+        buffer = _FrameBuffer(self.max_buffer_bytes)
+        chunks: "asyncio.Queue[Optional[List[_Fetched]]]" = asyncio.Queue(maxsize=self.prefetch_chunks)
+        producer = asyncio.create_task(self._fetch_chunks(tickers, timeframe, deadline, buffer, chunks))
+        try:
+            while True:
+                chunk = await chunks.get()
+                if chunk is None:
+                    break
+                matched = await self._off_loop(self._evaluate_chunk, second_scan_conditions, timeframe, chunk, report)
+                buffer.release(sum(fetched.size for fetched in chunk))
+                del chunk
+                if matched is not None:
+                    yield matched
+            await producer
+        finally:
+            if not producer.done():
+                producer.cancel()
+                await asyncio.gather(producer, return_exceptions=True)
+
+        if report.skipped:
+            report.partial = True
+            SCAN_TICKERS.inc(len(report.skipped), phase="2nd", outcome="skipped")
+        report.peak_buffer_bytes = buffer.peak
+        report.duration_ms = (time.perf_counter() - started) * 1000
+
+    async def _fetch_chunks(
+        self,
+        tickers: List[str],
+        timeframe: str,
+        deadline: Optional[float],
+        buffer: "_FrameBuffer",
+        chunks: "asyncio.Queue[Optional[List[_Fetched]]]",
+    ):
+        """조회 단계: 종목 묶음의 봉 데이터를 동시에 가져와 평가 대기열에 넣습니다."""
+        slots = asyncio.Semaphore(self.fetch_concurrency)
+        expired = False
 
-                if ohlcv_df.is_empty():
-                    logger.debug(f"{ticker}: 2차 스캔 데이터를 가져오지 못해 건너뜁니다.")
-                    continue
+        async def fetch_one(ticker: str) -> "_Fetched":
+            nonlocal expired
+            async with slots:
+                # 마감 시각이 지나면 아직 조회를 시작하지 않은 종목은 건너뜁니다.
+                if expired or (deadline is not None and self.clock.now() >= deadline):
+                    expired = True
+                    return _Fetched(ticker, skipped=True)
+                started = time.perf_counter()
+                try:
+                    # 2차 스캔은 과거 데이터가 필요
+                    df = await self.broker.get_ohlcv(ticker, timeframe, limit=200)
+                except Exception as e:
+                    return _Fetched(ticker, error=e, fetch_seconds=time.perf_counter() - started)
+                return _Fetched(ticker, df, fetch_seconds=time.perf_counter() - started)
 
-                parser = LogicParser(self.indicators, ohlcv_df)
+        try:
+            estimate = 0
+            for start in range(0, len(tickers), self.chunk_size):
+                if expired:
+                    await chunks.put([_Fetched(t, skipped=True) for t in tickers[start:]])
+                    break
+                await buffer.wait_for_room(estimate)
+                chunk = await asyncio.gather(*(fetch_one(t) for t in tickers[start:start + self.chunk_size]))
+                estimate = buffer.add(chunk)
+                await chunks.put(chunk)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            await chunks.put(None)
+            raise
+        # 평가 단계에 끝을 알립니다.
+        await chunks.put(None)
+
+    def _evaluate_chunk(
+        self,
+        second_scan_conditions: Dict[str, Any],
+        timeframe: str,
+        chunk: List["_Fetched"],
+        report: ScanReport,
+    ) -> Optional[pl.DataFrame]:
+        """평가 단계: 묶음의 종목별 조건을 평가하고, 만족한 종목의 최신 봉을 하나의 프레임으로 반환합니다."""
+        matched_rows = []
+        for fetched in chunk:
+            ticker = fetched.ticker
+            if fetched.skipped:
+                report.skipped.append(ticker)
+                continue
+            report.scanned += 1
+            SCAN_TICKERS.inc(phase="2nd", outcome="scanned")
+            if fetched.error is not None:
+                SCAN_TICKERS.inc(phase="2nd", outcome="failed")
+                report.fail(ticker, fetched.error)
+                log_sampled(logger, logging.ERROR, "scan.2nd.ticker_failed", "2차 스캔 중 오류: %s", fetched.error, ticker=ticker)
+                continue
+            ohlcv_df = fetched.frame
+            if ohlcv_df.is_empty():
+                logger.debug("%s: 2차 스캔 데이터를 가져오지 못해 건너뜁니다.", ticker)
+                SCAN_TICKERS.inc(phase="2nd", outcome="failed")
+                report.fail(ticker, "no data")
+                continue
+            try:
+                evaluate_started = time.perf_counter()
+                parser = LogicParser(self.indicators, ohlcv_df, features=self.features, frame_key=(ticker, timeframe))
 
                 if 'variables' in second_scan_conditions:
                     for var in second_scan_conditions['variables']:
                         parser.set_variable(var['name'], var['expression'])
 
-                final_condition = second_scan_conditions['condition']
-                mask = parser.evaluate_on_df(final_condition)
-
-                if mask.is_empty() or not mask.tail(1)[0]:
-                    continue
-
-                latest_data = ohlcv_df.tail(1).with_columns(pl.lit(ticker).alias("ticker"))
-                all_results.append(latest_data)
-                logger.info(f"2차 스캔 조건 만족: {ticker}")
+                condition = parser.compile_condition(second_scan_conditions['condition'])
+                matched = parser.evaluate_latest(condition)
 
+                if self.profiler:
+                    self.profiler.record_ticker(ticker, fetched.fetch_seconds, time.perf_counter() - evaluate_started)
+                    if not self.profiler.has_plan("2nd_scan"):
+                        nodes = {**parser.variables, "condition": condition.to_expr()}
+                        self.profiler.capture_plan("2nd_scan", parser.frame_for(nodes.values()), nodes)
             except Exception as e:
-                logger.error(f"{ticker} 2차 스캔 중 오류: {e}", exc_info=False)
+                SCAN_TICKERS.inc(phase="2nd", outcome="failed")
+                report.fail(ticker, e)
+                log_sampled(logger, logging.ERROR, "scan.2nd.ticker_failed", "2차 스캔 중 오류: %s", e, ticker=ticker)
                 continue
 
-        if not all_results:
-            return pl.DataFrame()
+            if not matched:
+                continue
+            matched_rows.append(ohlcv_df.tail(1).with_columns(pl.lit(ticker).alias("ticker")))
+            report.matched += 1
+            SCAN_TICKERS.inc(phase="2nd", outcome="matched")
+            logger.debug("2차 스캔 조건 만족: %s", ticker)
+        return pl.concat(matched_rows) if matched_rows else None
+
+
+@dataclass
+class _Fetched:
+    """스트리밍 2차 스캔의 조회 단계 결과 (종목 하나)."""
+    ticker: str
+    frame: Optional[pl.DataFrame] = None
+    error: Optional[Exception] = None
+    skipped: bool = False
+    fetch_seconds: float = 0.0
+
+    @property
+    def size(self) -> int:
+        return self.frame.estimated_size() if self.frame is not None else 0
+
+
+class _FrameBuffer:
+    """
+    조회했지만 아직 평가하지 않은 봉 데이터의 크기(바이트) 한도.
+    묶음 크기는 가져온 뒤에야 알 수 있으므로, 조회 단계는 직전 묶음 크기만큼 여유가 생길 때까지 기다린 뒤 조회합니다.
+    버퍼가 비어 있으면 한도보다 큰 묶음도 허용하여 멈추지 않게 합니다.
+    """
+    def __init__(self, max_bytes: Optional[int]):
+        self.max_bytes = max_bytes
+        self.used = 0
+        self.peak = 0
+        self._changed = asyncio.Event()
+
+    async def wait_for_room(self, estimate: int):
+        while self.max_bytes and self.used and self.used + estimate > self.max_bytes:
+            self._changed.clear()
+            await self._changed.wait()
+
+    def add(self, chunk: List[_Fetched]) -> int:
+        size = sum(fetched.size for fetched in chunk)
+        self.used += size
+        self.peak = max(self.peak, self.used)
+        return size
 
-        final_df = pl.concat(all_results)
-        logger.info(f"2차 스캔 완료. 최종 {len(final_df)}개 결과 발견.")
-        return final_df
+    def release(self, size: int):
+        self.used -= size
+        self._changed.set()
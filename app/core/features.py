@@ -0,0 +1,73 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+import polars as pl
+
+from app.core.metrics import metrics
+
+FEATURE_CACHE_REQUESTS = metrics.counter(
+    "tbot_feature_cache_requests_total", "Indicator feature lookups by cache result (hit, miss).", ("result",),
+)
+
+# (종목, 타임프레임)
+FrameKey = Tuple[str, str]
+
+
+class FeatureCache:
+    """
+    전략들이 공유하는 보조지표 계산 결과(시계열) 캐시.
+    항목은 (종목, 타임프레임, 보조지표 함수, 인자)로 구분하고, 계산에 사용한 봉 데이터의 버전과 함께 저장합니다.
+    버전은 봉 개수와 마지막 봉(timestamp 및 OHLCV 값)으로 정하므로, 새 봉이 추가되거나 진행 중인 봉의 값이
+    바뀌면 이전 결과는 더 이상 사용되지 않고 다음 계산 결과로 교체됩니다.
+    전체 크기는 `max_bytes`로 제한하며, 가장 오래 사용되지 않은 항목부터 버립니다. (LRU)
+    스캔 평가는 스레드 풀에서 실행되므로 모든 연산은 락으로 보호됩니다.
+    """
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple, Tuple[Hashable, pl.Series]]" = OrderedDict()
+        self._bytes = 0
+
+    @staticmethod
+    def frame_version(data: pl.DataFrame) -> Optional[Hashable]:
+        """봉 데이터의 버전. timestamp가 없으면 같은 데이터인지 판단할 수 없으므로 None(캐시 사용 안 함)입니다."""
+        if data.is_empty() or "timestamp" not in data.columns:
+            return None
+        return (data.height,) + data.row(-1)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, frame: FrameKey, version: Hashable, feature: Tuple[Any, ...]) -> Optional[pl.Series]:
+        key = (*frame, feature)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+        if entry is None or entry[0] != version:
+            FEATURE_CACHE_REQUESTS.inc(result="miss")
+            return None
+        FEATURE_CACHE_REQUESTS.inc(result="hit")
+        return entry[1]
+
+    def put(self, frame: FrameKey, version: Hashable, feature: Tuple[Any, ...], series: pl.Series):
+        key = (*frame, feature)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1].estimated_size()
+            self._entries[key] = (version, series)
+            self._bytes += series.estimated_size()
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted.estimated_size()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
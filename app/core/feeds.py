@@ -0,0 +1,122 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import AsyncIterator, List, Optional
+
+from app.core.candles import Trade
+
+logger = logging.getLogger(__name__)
+
+
+class TradeFeed(ABC):
+    """
+    체결(틱) 스트림의 추상 기반 클래스.
+    거래소 소켓, 로컬 리플레이 파일, 프로세스 내 큐가 같은 인터페이스로 교체될 수 있습니다.
+    """
+
+    @abstractmethod
+    def trades(self) -> AsyncIterator[Trade]:
+        """체결을 순서대로 비동기 반환합니다. 스트림이 끝나면 반복이 종료됩니다."""
+        pass
+
+
+class QueueTradeFeed(TradeFeed):
+    """프로세스 내에서 직접 체결을 발행하는 피드 (테스트, 시뮬레이션용)."""
+    _CLOSED = object()
+
+    def __init__(self, maxsize: int = 0):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    async def publish(self, trade: Trade):
+        await self._queue.put(trade)
+
+    async def close(self):
+        await self._queue.put(self._CLOSED)
+
+    async def trades(self) -> AsyncIterator[Trade]:
+        while True:
+            item = await self._queue.get()
+            if item is self._CLOSED:
+                return
+            yield item
+
+
+class ReplayTradeFeed(TradeFeed):
+    """
+    JSON Lines 파일에 저장된 체결을 재생하는 피드.
+    각 줄은 `{"ticker": ..., "price": ..., "volume": ..., "timestamp": epoch_ms}` 형식입니다.
+    `speed`를 지정하면 원래 체결 간격을 그 배율로 재현하고, 지정하지 않으면 최대한 빠르게 재생합니다.
+    """
+    def __init__(self, path: str, speed: Optional[float] = None):
+        self.path = Path(path)
+        self.speed = speed
+
+    async def trades(self) -> AsyncIterator[Trade]:
+        first_ts: Optional[int] = None
+        started = time.monotonic()
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                trade = Trade(
+                    ticker=data["ticker"],
+                    price=float(data["price"]),
+                    volume=float(data["volume"]),
+                    timestamp=int(data["timestamp"]),
+                )
+                if self.speed:
+                    if first_ts is None:
+                        first_ts = trade.timestamp
+                    delay = (trade.timestamp - first_ts) / 1000 / self.speed - (time.monotonic() - started)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                else:
+                    # 다른 작업(스캔 등)이 굶지 않도록 주기적으로 이벤트 루프에 양보합니다.
+                    await asyncio.sleep(0)
+                yield trade
+
+
+class UpbitTradeFeed(TradeFeed):
+    """
+    Upbit WebSocket 체결(trade) 스트림을 구독하는 피드.
+    연결이 끊기면 지수 백오프로 재연결합니다.
+    """
+    URL = "wss://api.upbit.com/websocket/v1"
+
+    def __init__(self, tickers: List[str], max_backoff: float = 30.0):
+        self.tickers = tickers
+        self.max_backoff = max_backoff
+
+    async def trades(self) -> AsyncIterator[Trade]:
+        import websockets
+
+        backoff = 1.0
+        while True:
+            try:
+                async with websockets.connect(self.URL, ping_interval=60) as ws:
+                    await ws.send(json.dumps([
+                        {"ticket": str(uuid.uuid4())},
+                        {"type": "trade", "codes": self.tickers},
+                        {"format": "SIMPLE"},
+                    ]))
+                    logger.info(f"Upbit 체결 스트림 구독 시작: {len(self.tickers)}개 종목")
+                    backoff = 1.0
+                    async for raw in ws:
+                        data = json.loads(raw)
+                        yield Trade(
+                            ticker=data["cd"],
+                            price=float(data["tp"]),
+                            volume=float(data["tv"]),
+                            timestamp=int(data["ttms"]),
+                        )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Upbit 체결 스트림 연결 오류, {backoff:.0f}초 후 재연결: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
@@ -0,0 +1,253 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# 이벤트 종류: WebSocket으로 그대로 전송할 메시지 / 작업 결과 / 작업 종료
+EVENT_BROADCAST = "broadcast"
+EVENT_RESULT = "result"
+EVENT_FINISHED = "finished"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_until REAL,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS ix_jobs_status ON jobs (status, id);
+CREATE TABLE IF NOT EXISTS job_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    body TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+@dataclass
+class Job:
+    id: int
+    kind: str
+    payload: Dict[str, Any]
+    status: str
+    attempts: int = 0
+    worker: Optional[str] = None
+    error: Optional[str] = None
+    created_at: Optional[float] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "Job":
+        return cls(
+            id=row["id"],
+            kind=row["kind"],
+            payload=json.loads(row["payload"]),
+            status=row["status"],
+            attempts=row["attempts"],
+            worker=row["worker"],
+            error=row["error"],
+            created_at=row["created_at"],
+            started_at=row["started_at"],
+            finished_at=row["finished_at"],
+        )
+
+
+class JobQueue:
+    """
+    SQLite 파일 하나로 구현한 내구성 있는 로컬 작업 큐. API 프로세스와 워커 프로세스가 같은 파일을 공유합니다.
+    - `claim`은 대기 중인 작업 하나를 원자적으로 가져가고 임대(lease) 시각을 기록합니다. 워커는 실행 중에
+      `heartbeat`로 임대를 연장하며, 워커가 죽어 임대가 끝난 작업은 `max_attempts`번까지 다른 워커가 다시 가져갑니다.
+    - 워커는 진행 상황(WebSocket 메시지)과 결과를 `job_events`에 쓰고, API 프로세스가 이를 읽어 전달합니다.
+    외부 서비스 없이 한 호스트의 여러 프로세스를 잇는 용도이며, WAL 모드로 읽기와 쓰기가 서로 막지 않게 합니다.
+    """
+    def __init__(self, path: str, max_attempts: int = 3, clock=time.time):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.clock = clock
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # 연결은 스레드마다 하나씩 재사용합니다. (API는 asyncio.to_thread로 호출)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # --- 생산자 (API) ---
+
+    def enqueue(self, kind: str, payload: Dict[str, Any]) -> int:
+        cursor = self._connect().execute(
+            "INSERT INTO jobs (kind, payload, status, created_at) VALUES (?, ?, ?, ?)",
+            (kind, json.dumps(payload), QUEUED, self.clock()),
+        )
+        return cursor.lastrowid
+
+    def get(self, job_id: int) -> Optional[Job]:
+        row = self._connect().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job.from_row(row) if row is not None else None
+
+    def stats(self) -> Dict[str, int]:
+        rows = self._connect().execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    # --- 소비자 (워커) ---
+
+    def claim(self, worker: str, lease_seconds: float) -> Optional[Job]:
+        """대기 중이거나 임대가 끝난 작업 중 가장 오래된 것을 가져갑니다. 없으면 None."""
+        now = self.clock()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # 재시도 한도를 넘긴 채 임대가 끝난 작업은 실패로 정리합니다.
+            expired = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? AND lease_until < ? AND attempts >= ?",
+                (RUNNING, now, self.max_attempts),
+            ).fetchall()
+            for row in expired:
+                self._finish(conn, row["id"], FAILED, "Worker lease expired too many times.", now)
+            row = conn.execute(
+                """
+                UPDATE jobs SET status = ?, worker = ?, lease_until = ?, attempts = attempts + 1,
+                    started_at = COALESCE(started_at, ?)
+                WHERE id = (
+                    SELECT id FROM jobs
+                    WHERE status = ? OR (status = ? AND lease_until < ?)
+                    ORDER BY id LIMIT 1
+                )
+                RETURNING *
+                """,
+                (RUNNING, worker, now + lease_seconds, now, QUEUED, RUNNING, now),
+            ).fetchone()
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return Job.from_row(row) if row is not None else None
+
+    def heartbeat(self, job_id: int, worker: str, lease_seconds: float) -> bool:
+        """임대를 연장합니다. 다른 워커가 이미 가져간 작업이면 False를 반환합니다."""
+        cursor = self._connect().execute(
+            "UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND status = ?",
+            (self.clock() + lease_seconds, job_id, worker, RUNNING),
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: int, worker: str, result: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        작업을 완료로 기록합니다. `worker`가 아직 작업을 가지고 있을 때만 기록하고, 임대를 잃어 다른 워커가
+        가져간 작업이면 아무것도 쓰지 않고 False를 반환합니다. (결과가 두 번 반영되지 않도록)
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            owned = self._owns(conn, job_id, worker)
+            if owned:
+                if result is not None:
+                    self._event(conn, job_id, EVENT_RESULT, json.dumps(result))
+                self._finish(conn, job_id, DONE, None, self.clock())
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return owned
+
+    def fail(self, job_id: int, worker: str, error: str) -> bool:
+        """작업을 실패로 기록합니다. `complete`와 같이 `worker`가 작업을 가지고 있을 때만 기록합니다."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            owned = self._owns(conn, job_id, worker)
+            if owned:
+                self._finish(conn, job_id, FAILED, error, self.clock())
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return owned
+
+    def publish(self, job_id: int, worker: str, message: str) -> bool:
+        """작업 진행 중 WebSocket으로 보낼 메시지를 기록합니다. 작업을 가지고 있지 않은 워커의 메시지는 버립니다."""
+        cursor = self._connect().execute(
+            """
+            INSERT INTO job_events (job_id, kind, body, created_at)
+            SELECT ?, ?, ?, ? WHERE EXISTS (SELECT 1 FROM jobs WHERE id = ? AND worker = ? AND status = ?)
+            """,
+            (job_id, EVENT_BROADCAST, message, self.clock(), job_id, worker, RUNNING),
+        )
+        return cursor.rowcount == 1
+
+    @staticmethod
+    def _owns(conn: sqlite3.Connection, job_id: int, worker: str) -> bool:
+        row = conn.execute(
+            "SELECT 1 FROM jobs WHERE id = ? AND worker = ? AND status = ?", (job_id, worker, RUNNING),
+        ).fetchone()
+        return row is not None
+
+    def _event(self, conn: sqlite3.Connection, job_id: int, kind: str, body: str):
+        conn.execute(
+            "INSERT INTO job_events (job_id, kind, body, created_at) VALUES (?, ?, ?, ?)",
+            (job_id, kind, body, self.clock()),
+        )
+
+    def _finish(self, conn: sqlite3.Connection, job_id: int, status: str, error: Optional[str], now: float):
+        conn.execute(
+            "UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_until = NULL WHERE id = ?",
+            (status, error, now, job_id),
+        )
+        self._event(conn, job_id, EVENT_FINISHED, json.dumps({"status": status, "error": error}))
+
+    # --- 이벤트 (API 릴레이) ---
+
+    def last_event_id(self) -> int:
+        row = self._connect().execute("SELECT COALESCE(MAX(id), 0) AS id FROM job_events").fetchone()
+        return row["id"]
+
+    def events_after(self, event_id: int, limit: int = 500) -> List[Tuple[int, int, str, str]]:
+        """`event_id` 이후의 이벤트를 (이벤트 ID, 작업 ID, 종류, 내용) 목록으로 반환합니다."""
+        rows = self._connect().execute(
+            "SELECT id, job_id, kind, body FROM job_events WHERE id > ? ORDER BY id LIMIT ?", (event_id, limit),
+        ).fetchall()
+        return [(row["id"], row["job_id"], row["kind"], row["body"]) for row in rows]
+
+    def prune(self, retention_seconds: float) -> int:
+        """보관 기간이 지난 이벤트와 끝난 작업을 지웁니다. 여러 API 프로세스가 같은 이벤트를 읽으므로 읽었다고 바로 지우지 않습니다."""
+        cutoff = self.clock() - retention_seconds
+        conn = self._connect()
+        deleted = conn.execute("DELETE FROM job_events WHERE created_at < ?", (cutoff,)).rowcount
+        deleted += conn.execute(
+            "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?", (DONE, FAILED, cutoff),
+        ).rowcount
+        return deleted
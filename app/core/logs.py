@@ -0,0 +1,146 @@
+import atexit
+import datetime
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+LOG_RECORDS_DROPPED = metrics.counter(
+    "tbot_log_records_dropped_total", "Log records dropped because the background log writer queue was full.",
+)
+
+# 로그 레코드에 붙이는 구조화 필드: logger.info("...", extra={"fields": {...}})
+FIELDS_ATTR = "fields"
+
+
+class StructuredFormatter(logging.Formatter):
+    """
+    `extra={"fields": {...}}`로 전달된 구조화 필드를 함께 출력하는 포매터.
+    `json_format`이면 한 줄짜리 JSON, 아니면 사람이 읽는 텍스트 뒤에 `key=value`를 붙입니다.
+    """
+    def __init__(self, json_format: bool = False):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+        self.json_format = json_format
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields: Dict[str, Any] = getattr(record, FIELDS_ATTR, None) or {}
+        if not self.json_format:
+            text = super().format(record)
+            if fields:
+                text += " " + " ".join(f"{key}={json.dumps(value, ensure_ascii=False, default=str)}" for key, value in fields.items())
+            return text
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            **fields,
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """큐가 가득 차면 기다리지 않고 레코드를 버리고 수를 셉니다. (로그 때문에 이벤트 루프가 멈추지 않도록)"""
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 메시지 포맷팅과 예외 문자열화는 백그라운드 스레드의 포매터가 합니다.
+        # 다른 스레드로 넘기기 전에 인자만 합쳐 두어, 나중에 바뀔 수 있는 객체를 참조하지 않게 합니다.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def configure_logging(level: Optional[str] = None, json_format: Optional[bool] = None, queue_size: Optional[int] = None):
+    """
+    루트 로거가 레코드를 큐에 넣기만 하고, 백그라운드 스레드(QueueListener)가 stderr에 쓰도록 설정합니다.
+    로그 호출은 큐에 넣는 비용만 들고, 큐가 가득 차면 기다리지 않고 버립니다. (`tbot_log_records_dropped_total`)
+    지정하지 않은 값은 설정(LOG_LEVEL, LOG_FORMAT, LOG_QUEUE_SIZE)을 따릅니다.
+    여러 번 호출하면 이전 설정을 교체합니다. 프로세스 종료 시 남은 레코드를 모두 씁니다.
+    """
+    global _listener
+    level = level or settings.LOG_LEVEL
+    json_format = settings.LOG_FORMAT.lower() == "json" if json_format is None else json_format
+    queue_size = queue_size or settings.LOG_QUEUE_SIZE
+    stop_logging()
+    records: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=queue_size)
+    writer = logging.StreamHandler(sys.stderr)
+    writer.setFormatter(StructuredFormatter(json_format))
+    _listener = logging.handlers.QueueListener(records, writer, respect_handler_level=True)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_NonBlockingQueueHandler(records))
+    root.setLevel(level.upper())
+    _listener.start()
+
+
+def stop_logging():
+    """백그라운드 로그 기록을 멈추고 큐에 남은 레코드를 씁니다."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
+
+
+class LogSampler:
+    """
+    자주 반복되는 로그(종목별 오류, 전송 실패 등)를 키마다 `interval`초 동안 최대 `limit`개만 남기는 제한기.
+    나머지는 버리고, 다음에 남기는 레코드에 그동안 버린 수를 `suppressed`로 붙입니다.
+    """
+    def __init__(self, limit: int = 10, interval: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        self.limit = limit
+        self.interval = interval
+        self.clock = clock
+        # 키 → (구간 시작 시각, 구간 내 기록 수, 버린 수)
+        self._windows: Dict[str, Tuple[float, int, int]] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key: str) -> Optional[int]:
+        """기록해도 되면 그동안 버린 수(0 이상)를, 버려야 하면 None을 반환합니다."""
+        now = self.clock()
+        with self._lock:
+            started, count, suppressed = self._windows.get(key, (now, 0, 0))
+            if now - started >= self.interval:
+                started, count = now, 0
+            if count >= self.limit:
+                self._windows[key] = (started, count, suppressed + 1)
+                return None
+            self._windows[key] = (started, count + 1, 0)
+            return suppressed
+
+
+# Create a singleton instance of the LogSampler (스캔/전송 경로의 반복 로그용)
+hot_path_sampler = LogSampler(settings.LOG_SAMPLE_LIMIT, settings.LOG_SAMPLE_INTERVAL_SECONDS)
+
+
+def log_sampled(logger: logging.Logger, level: int, key: str, message: str, *args, **fields):
+    """`key`별로 빈도를 제한하여 로그를 남깁니다. 구조화 필드는 키워드 인자로 전달합니다."""
+    if not logger.isEnabledFor(level):
+        return
+    suppressed = hot_path_sampler.allow(key)
+    if suppressed is None:
+        return
+    if suppressed:
+        fields["suppressed"] = suppressed
+    logger.log(level, message, *args, extra={FIELDS_ATTR: fields} if fields else None)
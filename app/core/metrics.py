@@ -0,0 +1,198 @@
+import bisect
+import threading
+import time
+from typing import Dict, List, Sequence, Tuple
+
+from app.core.config import settings
+
+# 스캔 단계별 지연 시간(초)에 맞춘 기본 히스토그램 버킷
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _NoopTimer:
+    """메트릭이 비활성화되었을 때 사용하는, 아무 일도 하지 않는 타이머."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP_TIMER = _NoopTimer()
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram: "Histogram", labels: Tuple[str, ...]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram._observe(self.labels, time.perf_counter() - self.start)
+        return False
+
+
+class Counter:
+    """단조 증가하는 카운터 메트릭."""
+    def __init__(self, registry: "MetricsRegistry", name: str, help_text: str, label_names: Sequence[str]):
+        self.registry = registry
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        if not self.registry.enabled or amount == 0:
+            return
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(str(labels.get(name, "")) for name in self.label_names), 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """지연 시간 분포를 기록하는 히스토그램 메트릭."""
+    def __init__(
+        self,
+        registry: "MetricsRegistry",
+        name: str,
+        help_text: str,
+        label_names: Sequence[str],
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.registry = registry
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 조합별 [버킷별 개수(누적 아님, 마지막은 +Inf), 합계, 개수]
+        self._series: Dict[Tuple[str, ...], List] = {}
+        self._lock = threading.Lock()
+
+    def _observe(self, key: Tuple[str, ...], value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def observe(self, value: float, **labels: str):
+        if not self.registry.enabled:
+            return
+        self._observe(tuple(str(labels.get(name, "")) for name in self.label_names), value)
+
+    def time(self, **labels: str):
+        """`with` 블록의 실행 시간을 기록하는 컨텍스트 매니저를 반환합니다."""
+        if not self.registry.enabled:
+            return _NOOP_TIMER
+        return _Timer(self, tuple(str(labels.get(name, "")) for name in self.label_names))
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(tuple(str(labels.get(name, "")) for name in self.label_names))
+        return series[2] if series else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((key, [list(s[0]), s[1], s[2]]) for key, s in self._series.items())
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = _format_labels(self.label_names, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            inf = _format_labels(self.label_names, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{inf} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    프로세스 내 메트릭 레지스트리.
+    비활성화 상태에서는 기록 호출이 플래그 확인 한 번으로 끝나므로 핫 패스의 오버헤드가 무시할 수준입니다.
+    """
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics: List = []
+
+    def counter(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> Counter:
+        metric = Counter(self, name, help_text, label_names)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self, name: str, help_text: str, label_names: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        metric = Histogram(self, name, help_text, label_names, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """모든 메트릭을 Prometheus 텍스트 노출 형식(0.0.4)으로 렌더링합니다."""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Create a singleton instance of the MetricsRegistry
+metrics = MetricsRegistry(enabled=settings.METRICS_ENABLED)
+
+BROKER_REQUEST_SECONDS = metrics.histogram(
+    "tbot_broker_request_seconds", "Latency of broker (exchange) API calls.", ("broker", "endpoint"),
+)
+BROKER_RATE_LIMITED = metrics.counter(
+    "tbot_broker_rate_limited_total", "Broker calls rejected by exchange rate limits.", ("broker", "endpoint"),
+)
+BROKER_RESILIENCE_EVENTS = metrics.counter(
+    "tbot_broker_resilience_events_total", "Broker call retries, hedged requests and circuit breaker transitions.",
+    ("broker", "endpoint", "event"),
+)
+BROKER_CACHE_REQUESTS = metrics.counter(
+    "tbot_broker_cache_requests_total", "Broker reads by cache result (hit, miss, coalesced).", ("endpoint", "result"),
+)
+SCAN_STAGE_SECONDS = metrics.histogram(
+    "tbot_scan_stage_seconds", "Latency of scan pipeline stages (compile, evaluate, serialize, fanout).", ("stage",),
+)
+SCAN_TICKERS = metrics.counter(
+    "tbot_scan_tickers_total", "Tickers processed by scans, by phase and outcome (scanned, matched, failed, skipped).",
+    ("phase", "outcome"),
+)
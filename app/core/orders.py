@@ -0,0 +1,354 @@
+import asyncio
+import datetime
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.core.brokers.base import BaseBroker
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+ORDER_STAGE_SECONDS = metrics.histogram(
+    "tbot_order_stage_seconds", "Order pipeline latency by stage (risk, queue, submit, fill).", ("stage",),
+)
+ORDER_RESULTS = metrics.counter(
+    "tbot_orders_total", "Orders by final pipeline status.", ("status",),
+)
+
+# 더 이상 상태가 바뀌지 않는 주문 상태. `expired`는 체결 추적 시간(fill_timeout)이 지나 더 이상 추적하지 않는 주문입니다.
+TERMINAL_STATUSES = {"filled", "partially_filled", "cancelled", "rejected", "failed", "expired"}
+
+
+def _now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+@dataclass
+class OrderRequest:
+    """
+    파이프라인에 제출하는 주문. 시장가 매수의 `amount`는 주문 금액(KRW), 그 외는 수량입니다. (pyupbit 규약)
+    같은 `idempotency_key`로 다시 제출하면 새 주문을 내지 않고 기존 주문을 반환합니다.
+    """
+    ticker: str
+    side: str
+    order_type: str
+    amount: float
+    price: Optional[float] = None
+    idempotency_key: Optional[str] = None
+    strategy_id: Optional[int] = None
+
+
+@dataclass
+class OrderRecord:
+    """파이프라인이 추적하는 주문 1건의 상태."""
+    client_order_id: str
+    request: OrderRequest
+    status: str = "queued"  # queued → submitting → open → filled / partially_filled / cancelled / rejected / failed / expired
+    exchange_order_id: Optional[str] = None
+    executed_volume: float = 0.0
+    attempts: int = 0
+    error: Optional[str] = None
+    created_at: datetime.datetime = field(default_factory=_now)
+    submitted_at: Optional[datetime.datetime] = None
+    completed_at: Optional[datetime.datetime] = None
+    _created: float = field(default_factory=time.perf_counter, repr=False)
+    _done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    # 전송 중(submitting)에 들어온 취소 요청. 전송이 끝나면 접수된 주문을 바로 취소합니다.
+    _cancel_requested: bool = field(default=False, repr=False)
+    _submitted: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    @property
+    def submit_latency(self) -> Optional[float]:
+        """주문 생성(시그널)부터 거래소 접수까지 걸린 시간(초)."""
+        if self.submitted_at is None:
+            return None
+        return (self.submitted_at - self.created_at).total_seconds()
+
+
+class TokenBucket:
+    """초당 `rate`개, 최대 `capacity`개까지 몰아서 허용하는 토큰 버킷."""
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class OrderPipeline:
+    """
+    PRD 6.5 스캔 → 매매 연동을 위한 비동기 주문 파이프라인.
+    - 주문은 큐에 쌓이고, 여러 워커가 주문 API 요청 수 제한(토큰 버킷) 안에서 독립적인 주문을 동시에 전송합니다.
+    - 멱등 키로 중복 제출을 막습니다. 거래소에 클라이언트 주문 ID를 전달할 수 없으므로 파이프라인에서 보장합니다.
+    - 재시도는 요청 수 제한으로 거부되어 주문이 확실히 접수되지 않은 경우에만 합니다.
+      응답 없이 실패한 요청은 이미 접수되었을 수 있으므로 다시 보내지 않습니다.
+    - 접수된 미체결 주문은 별도 태스크가 주기적으로 조회하여 체결 여부를 추적합니다.
+    - `pre_trade`가 지정되면 큐에 넣기 전에 동기적으로 호출하여(위험 한도 확인 등) 거부 사유가 있으면 바로 거부합니다.
+    """
+    def __init__(
+        self,
+        broker: BaseBroker,
+        rate_per_second: float = 8.0,
+        burst: Optional[float] = None,
+        concurrency: int = 4,
+        max_retries: int = 3,
+        fill_poll_interval: float = 1.0,
+        fill_timeout: float = 300.0,
+        max_records: int = 10000,
+        pre_trade: Optional[Callable[[OrderRecord], Optional[str]]] = None,
+    ):
+        self.broker = broker
+        self.bucket = TokenBucket(rate_per_second, burst if burst is not None else rate_per_second)
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.fill_poll_interval = fill_poll_interval
+        self.fill_timeout = fill_timeout
+        self.max_records = max_records
+        self.pre_trade = pre_trade
+        self._queue: "asyncio.Queue[OrderRecord]" = asyncio.Queue()
+        self._records: "OrderedDict[str, OrderRecord]" = OrderedDict()
+        self._idempotency: Dict[str, str] = {}
+        self._workers: List[asyncio.Task] = []
+        self._trackers: Dict[str, asyncio.Task] = {}
+        self._listeners: List[Callable[[OrderRecord], Awaitable[None]]] = []
+
+    # --- lifecycle ---
+
+    def start(self):
+        if self._workers:
+            return
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    async def stop(self):
+        tasks = self._workers + list(self._trackers.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._trackers.clear()
+
+    def add_listener(self, listener: Callable[[OrderRecord], Awaitable[None]]):
+        """주문 상태가 바뀔 때마다 호출할 코루틴 함수를 등록합니다."""
+        self._listeners.append(listener)
+
+    # --- public API ---
+
+    async def submit(self, request: OrderRequest) -> OrderRecord:
+        """주문을 큐에 넣고 즉시 반환합니다. 같은 멱등 키의 주문이 있으면 그 주문을 반환합니다."""
+        if request.idempotency_key:
+            existing = self._idempotency.get(request.idempotency_key)
+            if existing in self._records:
+                return self._records[existing]
+
+        record = OrderRecord(client_order_id=uuid.uuid4().hex, request=request)
+        self._remember(record)
+        if self.pre_trade is not None:
+            started = time.perf_counter()
+            reason = self.pre_trade(record)
+            ORDER_STAGE_SECONDS.observe(time.perf_counter() - started, stage="risk")
+            if reason is not None:
+                await self._finish(record, "rejected", reason)
+                return record
+        await self._queue.put(record)
+        await self._notify(record)
+        return record
+
+    def get(self, client_order_id: str) -> Optional[OrderRecord]:
+        return self._records.get(client_order_id)
+
+    async def wait(self, client_order_id: str, timeout: Optional[float] = None) -> OrderRecord:
+        """주문이 최종 상태(체결/취소/거부/실패)가 될 때까지 기다립니다."""
+        record = self._records[client_order_id]
+        await asyncio.wait_for(record._done.wait(), timeout)
+        return record
+
+    async def cancel(self, client_order_id: str) -> Optional[OrderRecord]:
+        """
+        대기 중이거나 미체결인 주문을 취소합니다. 이미 끝난 주문은 그대로 반환합니다.
+        거래소로 전송 중인 주문은 전송이 끝날 때까지 기다렸다가, 접수되었으면 그 주문을 취소합니다.
+        (바로 체결되었거나 거부되었으면 그 상태로 반환합니다.)
+        """
+        record = self._records.get(client_order_id)
+        if record is None or record.is_terminal:
+            return record
+        if record.status == "submitting":
+            record._cancel_requested = True
+            await record._submitted.wait()
+            return record
+        if record.exchange_order_id is not None and not await self._cancel_on_exchange(record):
+            return record
+        await self._finish(record, self._cancelled_status(record))
+        return record
+
+    # --- internals ---
+
+    async def _cancel_on_exchange(self, record: OrderRecord) -> bool:
+        """접수된 주문을 거래소에서 취소하고 추적을 멈춥니다. 취소가 거부되면 오류를 기록하고 False를 반환합니다."""
+        await self.bucket.acquire()
+        response = await self.broker.cancel_order(record.exchange_order_id)
+        if "error" in response:
+            record.error = str(response["error"])
+            await self._notify(record)
+            return False
+        self._apply_fill(record, response)
+        tracker = self._trackers.pop(record.client_order_id, None)
+        if tracker is not None:
+            tracker.cancel()
+        return True
+
+    def _remember(self, record: OrderRecord):
+        self._records[record.client_order_id] = record
+        if record.request.idempotency_key:
+            self._idempotency[record.request.idempotency_key] = record.client_order_id
+        # 오래된 최종 상태 주문부터 버립니다. 아직 진행 중인 주문은 건너뜁니다.
+        excess = len(self._records) - self.max_records
+        if excess <= 0:
+            return
+        evicted = [cid for cid, old in self._records.items() if old.is_terminal][:excess]
+        for cid in evicted:
+            old = self._records.pop(cid)
+            if old.request.idempotency_key:
+                self._idempotency.pop(old.request.idempotency_key, None)
+
+    async def _notify(self, record: OrderRecord):
+        for listener in self._listeners:
+            try:
+                await listener(record)
+            except Exception as e:
+                logger.error(f"주문 상태 리스너 오류: {e}", exc_info=True)
+
+    async def _finish(self, record: OrderRecord, status: str, error: Optional[str] = None):
+        record.status = status
+        record.error = error or record.error
+        record.completed_at = _now()
+        record._done.set()
+        ORDER_RESULTS.inc(status=status)
+        if status == "filled":
+            ORDER_STAGE_SECONDS.observe(time.perf_counter() - record._created, stage="fill")
+        await self._notify(record)
+
+    async def _worker(self):
+        while True:
+            record = await self._queue.get()
+            try:
+                if record.status == "queued":
+                    await self._submit(record)
+            except Exception as e:
+                logger.error(f"주문 {record.client_order_id} 처리 중 오류: {e}", exc_info=True)
+                await self._finish(record, "failed", str(e))
+            finally:
+                record._submitted.set()
+                self._queue.task_done()
+
+    async def _submit(self, record: OrderRecord):
+        request = record.request
+        ORDER_STAGE_SECONDS.observe(time.perf_counter() - record._created, stage="queue")
+        record.status = "submitting"
+        while True:
+            if record._cancel_requested:
+                await self._finish(record, "cancelled")
+                return
+            await self.bucket.acquire()
+            record.attempts += 1
+            with ORDER_STAGE_SECONDS.time(stage="submit"):
+                response = await self.broker.place_order(
+                    request.ticker, request.order_type, request.side, request.amount, request.price
+                )
+            if "error" not in response:
+                break
+            if response.get("retryable") and record.attempts <= self.max_retries:
+                await asyncio.sleep(min(2.0, 0.1 * 2 ** record.attempts))
+                continue
+            await self._finish(record, "rejected", str(response["error"]))
+            return
+
+        record.exchange_order_id = response.get("uuid")
+        record.submitted_at = _now()
+        self._apply_fill(record, response)
+        if response.get("state") == "done":
+            await self._finish(record, "filled")
+            return
+        if response.get("state") == "cancel":
+            await self._finish(record, self._cancelled_status(record))
+            return
+        if record.exchange_order_id is None:
+            await self._finish(record, "failed", "Broker response has no order id.")
+            return
+        # 전송 중에 취소가 요청되었으면 방금 접수된 주문을 취소합니다. 취소가 거부되면 미체결 주문으로 계속 추적합니다.
+        if record._cancel_requested and await self._cancel_on_exchange(record):
+            await self._finish(record, self._cancelled_status(record))
+            return
+        record.status = "open"
+        await self._notify(record)
+        self._trackers[record.client_order_id] = asyncio.create_task(self._track(record))
+
+    @staticmethod
+    def _apply_fill(record: OrderRecord, response: Dict[str, Any]):
+        executed = response.get("executed_volume")
+        if executed is not None:
+            record.executed_volume = float(executed)
+
+    @staticmethod
+    def _cancelled_status(record: OrderRecord) -> str:
+        """
+        거래소에서 취소(`cancel`)로 끝난 주문의 최종 상태를 정합니다.
+        업비트 시장가 매수(`price` 주문)는 체결 후 남은 잔액이 취소되며 `cancel`로 끝나므로,
+        체결량이 있으면 시장가 매수는 `filled`, 그 외 주문은 `partially_filled`로 봅니다.
+        """
+        if record.executed_volume <= 0:
+            return "cancelled"
+        request = record.request
+        if request.order_type == "market" and request.side == "buy":
+            return "filled"
+        return "partially_filled"
+
+    async def _track(self, record: OrderRecord):
+        """
+        미체결 주문의 상태를 주기적으로 조회하여 체결/취소를 반영합니다.
+        `fill_timeout`이 지나도 끝나지 않으면 `expired`로 마치고 추적을 멈춥니다. (거래소에는 남아 있을 수 있음)
+        """
+        deadline = time.monotonic() + self.fill_timeout
+        try:
+            while time.monotonic() < deadline:
+                await asyncio.sleep(self.fill_poll_interval)
+                await self.bucket.acquire()
+                response = await self.broker.get_order(record.exchange_order_id)
+                if "error" in response:
+                    logger.warning(f"주문 {record.client_order_id} 상태 조회 실패: {response['error']}")
+                    continue
+                previous = record.executed_volume
+                self._apply_fill(record, response)
+                state = response.get("state")
+                if state == "done":
+                    await self._finish(record, "filled")
+                    return
+                if state == "cancel":
+                    await self._finish(record, self._cancelled_status(record))
+                    return
+                if record.executed_volume != previous:
+                    await self._notify(record)
+                if record.is_terminal:
+                    return
+            logger.warning(f"주문 {record.client_order_id} 체결 추적 시간 초과")
+            await self._finish(record, "expired", "Fill tracking timed out; the order may still be open on the exchange.")
+        finally:
+            self._trackers.pop(record.client_order_id, None)
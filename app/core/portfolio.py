@@ -0,0 +1,274 @@
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import polars as pl
+
+from app.core.orders import OrderRecord
+
+# 보유 종목 테이블의 컬럼. quantity는 주문에 묶인 수량(locked)을 포함한 전체 수량입니다.
+POSITION_SCHEMA = {
+    "ticker": pl.String,
+    "quantity": pl.Float64,
+    "available": pl.Float64,
+    "avg_price": pl.Float64,
+    "mark": pl.Float64,
+}
+
+
+@dataclass(frozen=True)
+class RiskLimits:
+    """
+    주문 전 위험 한도. 비율은 총자산(현금 + 보유 종목 평가금액) 대비이며, 0이면 해당 한도를 적용하지 않습니다.
+    - max_order_value: 주문 1건의 최대 금액(KRW)
+    - max_position_fraction: 종목 하나의 평가금액(대기 중인 매수 주문 포함) 상한
+    - max_gross_exposure_fraction: 전체 보유 평가금액(대기 중인 매수 주문 포함) 상한
+    - max_position_loss_fraction: 평균 매수가 대비 손실률이 이 값 이상인 종목은 추가 매수하지 않습니다.
+    """
+    max_order_value: float = 0.0
+    max_position_fraction: float = 0.0
+    max_gross_exposure_fraction: float = 1.0
+    max_position_loss_fraction: float = 0.0
+
+
+class Portfolio:
+    """
+    보유 종목을 메모리 내 컬럼형 테이블(Polars DataFrame)로 관리하는 포트폴리오 평가/위험 엔진.
+    - 잔고는 `load_balances`(Upbit get_balances 형식), 시세는 `update_marks`(종목 → 현재가 일괄 스냅샷)로 갱신합니다.
+    - 갱신할 때마다 평가금액, 손익, 비중, 종목별 한도 위반 여부를 한 번의 벡터 연산으로 다시 계산하고,
+      주문 전 확인에 필요한 값만 딕셔너리로 뽑아 둡니다.
+    - `check_order`는 그 값만 읽는 O(1) 연산이므로, 시그널과 주문 사이에서 병목이 되지 않습니다.
+      통과한 주문은 끝날 때까지 금액/수량을 예약해 두어, 잔고가 갱신되기 전의 연속 주문도 한도 안에 둡니다.
+    """
+    def __init__(
+        self,
+        limits: Optional[RiskLimits] = None,
+        quote_currency: str = "KRW",
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.limits = limits or RiskLimits()
+        self.quote_currency = quote_currency
+        self.clock = clock
+        self.positions = pl.DataFrame(schema=POSITION_SCHEMA)
+        self.valuation = pl.DataFrame()
+        self.loaded = False
+        self.cash = 0.0
+        self.cash_available = 0.0
+        self.equity = 0.0
+        self.gross_exposure = 0.0
+        self.unrealized_pnl = 0.0
+        self.marked_at: Optional[float] = None
+        # 주문 전 확인용 스냅샷
+        self._marks: Dict[str, float] = {}
+        self._exposure: Dict[str, float] = {}
+        self._available: Dict[str, float] = {}
+        self._locked: Dict[str, float] = {}
+        self._blocked: Dict[str, str] = {}
+        # 통과한 주문의 예약: client_order_id → (종목, 매수, 금액 또는 수량)
+        self._reservations: Dict[str, Tuple[str, bool, float]] = {}
+        # 체결되어 잔고 반영을 기다리는 주문: client_order_id → 정리 시점에 이미 시작된 마지막 잔고 조회 번호
+        self._settled: Dict[str, int] = {}
+        self._refresh_seq = 0
+        self._pending_buy: Dict[str, float] = {}
+        self._pending_buy_total = 0.0
+        self._pending_sell: Dict[str, float] = {}
+
+    @property
+    def tickers(self) -> List[str]:
+        return self.positions["ticker"].to_list()
+
+    # --- 갱신 ---
+
+    def begin_refresh(self) -> int:
+        """잔고 조회를 시작하기 직전에 호출하여 조회 번호를 받습니다. 조회 결과와 함께 `load_balances`에 넘깁니다."""
+        self._refresh_seq += 1
+        return self._refresh_seq
+
+    def load_balances(self, balances: List[Dict[str, Any]], refresh: Optional[int] = None):
+        """
+        Upbit 잔고 목록으로 현금과 보유 종목을 교체합니다. 기존 시세(mark)는 종목별로 유지합니다.
+        `refresh`는 이 잔고를 조회하기 전에 받은 `begin_refresh` 번호이며, 없으면 지금 조회한 잔고로 봅니다.
+        """
+        if refresh is None:
+            refresh = self.begin_refresh()
+        rows = []
+        cash = cash_available = 0.0
+        for balance in balances:
+            available = float(balance.get("balance") or 0.0)
+            quantity = available + float(balance.get("locked") or 0.0)
+            currency = balance["currency"]
+            if currency == self.quote_currency:
+                cash, cash_available = quantity, available
+            elif quantity > 0:
+                unit = balance.get("unit_currency") or self.quote_currency
+                rows.append({
+                    "ticker": f"{unit}-{currency}",
+                    "quantity": quantity,
+                    "available": available,
+                    "avg_price": float(balance.get("avg_buy_price") or 0.0),
+                    "mark": self._marks.get(f"{unit}-{currency}"),
+                })
+        self.positions = pl.DataFrame(rows, schema=POSITION_SCHEMA)
+        self.cash, self.cash_available = cash, cash_available
+        self.loaded = True
+        # 주문이 끝난 뒤에 시작된 조회의 잔고에만 체결이 반영되어 있으므로, 그런 주문의 예약만 풉니다.
+        for client_order_id, settled_at in list(self._settled.items()):
+            if settled_at < refresh:
+                del self._settled[client_order_id]
+                self._release(client_order_id)
+        self.revalue()
+
+    def update_marks(self, prices: Dict[str, float]):
+        """종목 → 현재가 스냅샷으로 보유 종목의 시세를 일괄 갱신합니다. 스냅샷에 없는 종목은 이전 시세를 유지합니다."""
+        if prices and not self.positions.is_empty():
+            snapshot = pl.DataFrame(
+                {"ticker": list(prices), "price": list(prices.values())},
+                schema={"ticker": pl.String, "price": pl.Float64},
+            )
+            self.positions = (
+                self.positions.join(snapshot, on="ticker", how="left")
+                .with_columns(pl.coalesce("price", "mark").alias("mark"))
+                .drop("price")
+            )
+        self.marked_at = self.clock()
+        self.revalue()
+
+    def revalue(self):
+        """평가금액, 손익, 비중, 한도 위반을 한 번에 다시 계산합니다. 시세가 없는 종목은 평균 매수가로 평가합니다."""
+        limits = self.limits
+        mark = pl.coalesce("mark", "avg_price")
+        valued = self.positions.with_columns(
+            (pl.col("quantity") * mark).alias("market_value"),
+            (pl.col("quantity") * pl.col("avg_price")).alias("cost"),
+        )
+        self.gross_exposure = float(valued["market_value"].sum())
+        self.equity = self.cash + self.gross_exposure
+        pnl = pl.col("market_value") - pl.col("cost")
+        pnl_fraction = pl.when(pl.col("cost") > 0).then(pnl / pl.col("cost")).otherwise(0.0)
+        weight = pl.col("market_value") / self.equity if self.equity > 0 else pl.lit(0.0)
+        self.valuation = valued.with_columns(
+            pnl.alias("unrealized_pnl"),
+            pnl_fraction.alias("pnl_fraction"),
+            weight.alias("weight"),
+        ).with_columns(
+            pl.when(
+                pl.lit(limits.max_position_loss_fraction > 0)
+                & (pl.col("pnl_fraction") <= -limits.max_position_loss_fraction)
+            ).then(pl.lit("loss_limit"))
+            .when(pl.lit(limits.max_position_fraction > 0) & (pl.col("weight") > limits.max_position_fraction))
+            .then(pl.lit("position_limit"))
+            .otherwise(pl.lit(None, dtype=pl.String))
+            .alias("breach")
+        )
+        self.unrealized_pnl = float(self.valuation["unrealized_pnl"].sum())
+
+        tickers = self.valuation["ticker"].to_list()
+        self._marks.update(zip(tickers, self.valuation.select(mark)["mark"].to_list()))
+        self._exposure = dict(zip(tickers, self.valuation["market_value"].to_list()))
+        self._available = dict(zip(tickers, self.valuation["available"].to_list()))
+        self._locked = dict(zip(tickers, (self.valuation["quantity"] - self.valuation["available"]).to_list()))
+        breached = self.valuation.filter(pl.col("breach").is_not_null())
+        self._blocked = dict(zip(breached["ticker"].to_list(), breached["breach"].to_list()))
+
+    # --- 주문 전 확인 ---
+
+    def check_order(self, record: OrderRecord) -> Optional[str]:
+        """
+        주문이 위험 한도 안에 있는지 확인합니다. 거부 사유 문자열을 반환하고, 통과하면 None을 반환합니다.
+        통과한 주문은 예약되며 `settle`로 주문이 끝났음을 알려야 풀립니다.
+        """
+        if not self.loaded:
+            return "Portfolio is not loaded yet."
+        request = record.request
+        ticker = request.ticker
+        limits = self.limits
+
+        if request.side == "sell":
+            available = self._available.get(ticker, 0.0) - self._unlocked_reservation(
+                self._pending_sell.get(ticker, 0.0), self._locked.get(ticker, 0.0),
+            )
+            if request.amount > available:
+                return f"Insufficient {ticker} position: {available:g} available, {request.amount:g} requested."
+            self._reserve(record.client_order_id, ticker, False, request.amount)
+            return None
+
+        if request.order_type == "market":
+            value = request.amount
+        else:
+            value = request.amount * (request.price or self._marks.get(ticker, 0.0))
+        if limits.max_order_value > 0 and value > limits.max_order_value:
+            return f"Order value {value:,.0f} exceeds the limit of {limits.max_order_value:,.0f}."
+        if value > self.cash_available - self._unlocked_reservation(self._pending_buy_total, self.cash - self.cash_available):
+            return f"Insufficient cash for an order of {value:,.0f}."
+        breach = self._blocked.get(ticker)
+        if breach is not None:
+            return f"{ticker} has breached its {breach.replace('_', ' ')}."
+        if limits.max_position_fraction > 0:
+            position = self._exposure.get(ticker, 0.0) + self._pending_buy.get(ticker, 0.0) + value
+            if position > limits.max_position_fraction * self.equity:
+                return f"{ticker} exposure would exceed {limits.max_position_fraction:.0%} of equity."
+        if limits.max_gross_exposure_fraction > 0:
+            gross = self.gross_exposure + self._pending_buy_total + value
+            if gross > limits.max_gross_exposure_fraction * self.equity:
+                return f"Gross exposure would exceed {limits.max_gross_exposure_fraction:.0%} of equity."
+        self._reserve(record.client_order_id, ticker, True, value)
+        return None
+
+    @staticmethod
+    def _unlocked_reservation(reserved: float, locked: float) -> float:
+        """
+        예약 중 아직 잔고의 `locked`에 반영되지 않은 부분. 거래소가 접수한 주문의 금액은 이미 `balance`에서 빠져
+        `locked`로 옮겨지므로, 그만큼은 예약에서 다시 빼지 않습니다. (같은 금액을 두 번 빼지 않도록)
+        """
+        return max(0.0, reserved - locked)
+
+    def settle(self, record: OrderRecord):
+        """
+        끝난 주문의 예약을 정리합니다. 체결되지 않은 주문은 바로 풀고, 체결된 주문은 잔고에 반영될 때까지
+        (이 시점 이후에 시작된 잔고 조회가 `load_balances`로 반영될 때까지) 유지합니다.
+        """
+        if not record.is_terminal or record.client_order_id not in self._reservations:
+            return
+        if record.status == "filled" or record.executed_volume > 0:
+            self._settled[record.client_order_id] = self._refresh_seq
+        else:
+            self._release(record.client_order_id)
+
+    def _reserve(self, client_order_id: str, ticker: str, is_buy: bool, amount: float):
+        self._reservations[client_order_id] = (ticker, is_buy, amount)
+        if is_buy:
+            self._pending_buy[ticker] = self._pending_buy.get(ticker, 0.0) + amount
+            self._pending_buy_total += amount
+        else:
+            self._pending_sell[ticker] = self._pending_sell.get(ticker, 0.0) + amount
+
+    def _release(self, client_order_id: str):
+        reservation = self._reservations.pop(client_order_id, None)
+        if reservation is None:
+            return
+        ticker, is_buy, amount = reservation
+        pending = self._pending_buy if is_buy else self._pending_sell
+        remaining = pending.get(ticker, 0.0) - amount
+        if remaining > 1e-9:
+            pending[ticker] = remaining
+        else:
+            pending.pop(ticker, None)
+        if is_buy:
+            self._pending_buy_total = max(0.0, self._pending_buy_total - amount)
+
+    # --- 조회 ---
+
+    def snapshot(self) -> Dict[str, Any]:
+        """API 응답용 요약과 종목별 평가."""
+        age = None if self.marked_at is None else round(self.clock() - self.marked_at, 3)
+        return {
+            "loaded": self.loaded,
+            "cash": self.cash,
+            "equity": self.equity,
+            "gross_exposure": self.gross_exposure,
+            "unrealized_pnl": self.unrealized_pnl,
+            "pending_buy_value": self._pending_buy_total,
+            "marks_age_seconds": age,
+            "limits": vars(self.limits),
+            "positions": self.valuation.to_dicts() if not self.valuation.is_empty() else [],
+        }
@@ -0,0 +1,93 @@
+import cProfile
+import io
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import polars as pl
+
+# cProfile은 스레드당 하나의 프로파일러만 활성화할 수 있으므로 동시에 한 실행만 Python 프로파일을 수집합니다.
+_python_profile_lock = threading.Lock()
+
+
+class ScanProfiler:
+    """
+    스캔 1회 실행의 프로파일을 수집합니다.
+    - Python 구간: cProfile 통계 (누적 시간 상위 함수)
+    - Polars 구간: 최적화된 쿼리 플랜과 노드(표현식)별 실행 시간
+    - 종목별 데이터 조회/평가 시간 중 가장 느린 종목들
+    """
+    def __init__(self, slowest_limit: int = 10, stats_limit: int = 40):
+        self.slowest_limit = slowest_limit
+        self.stats_limit = stats_limit
+        self.python_stats: Optional[str] = None
+        self.plans: List[Dict] = []
+        self._plan_labels = set()
+        self._tickers: List[Dict] = []
+
+    @contextmanager
+    def profile_python(self):
+        """
+        블록 실행 동안 cProfile을 활성화합니다. 다른 프로파일이 이미 실행 중이면 수집을 건너뜁니다.
+        스캔은 이벤트 루프에서 실행되므로, 통계에는 같은 시간대에 실행된 다른 코루틴도 포함될 수 있습니다.
+        """
+        if not _python_profile_lock.acquire(blocking=False):
+            self.python_stats = "skipped: another profiled scan is running"
+            yield
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+            try:
+                yield
+            finally:
+                profile.disable()
+            stream = io.StringIO()
+            pstats.Stats(profile, stream=stream).sort_stats("cumulative").print_stats(self.stats_limit)
+            self.python_stats = stream.getvalue()
+        finally:
+            _python_profile_lock.release()
+
+    def has_plan(self, label: str) -> bool:
+        return label in self._plan_labels
+
+    def capture_plan(self, label: str, data: pl.DataFrame, exprs: Dict[str, pl.Expr]):
+        """
+        표현식들의 최적화된 쿼리 플랜과 노드별 실행 시간을 기록합니다.
+        Polars가 `LazyFrame.profile()`을 제공하면 그 노드 타이밍을, 아니면 표현식별 실행 시간을 사용합니다.
+        """
+        if label in self._plan_labels or not exprs:
+            return
+        self._plan_labels.add(label)
+        lazy = data.lazy().select([expr.alias(name) for name, expr in exprs.items()])
+        optimized_plan = lazy.explain()
+
+        node_timings: List[Dict] = []
+        if hasattr(lazy, "profile"):
+            _, timings = lazy.profile()
+            for row in timings.iter_rows(named=True):
+                node_timings.append({"node": row["node"], "seconds": (row["end"] - row["start"]) / 1_000_000})
+        else:
+            for name, expr in exprs.items():
+                started = time.perf_counter()
+                data.lazy().select(expr.alias(name)).collect()
+                node_timings.append({"node": name, "seconds": time.perf_counter() - started})
+
+        self.plans.append({"label": label, "optimized_plan": optimized_plan, "node_timings": node_timings})
+
+    def record_ticker(self, ticker: str, fetch_seconds: float, evaluate_seconds: float):
+        self._tickers.append({
+            "ticker": ticker,
+            "fetch_seconds": fetch_seconds,
+            "evaluate_seconds": evaluate_seconds,
+            "total_seconds": fetch_seconds + evaluate_seconds,
+        })
+
+    @property
+    def ticker_count(self) -> int:
+        return len(self._tickers)
+
+    def slowest_tickers(self) -> List[Dict]:
+        return sorted(self._tickers, key=lambda t: t["total_seconds"], reverse=True)[:self.slowest_limit]
@@ -0,0 +1,107 @@
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class RetryPolicy:
+    """
+    지수 백오프 + full jitter 재시도 정책. (AWS Architecture Blog "Exponential Backoff And Jitter")
+    `attempt`번째 재시도 전에 0 ~ min(max_delay, base_delay * 2^attempt) 사이의 임의 시간만큼 기다립니다.
+    대기 시간을 흩뜨려서 여러 호출자가 같은 순간에 다시 몰리지 않게 합니다.
+    """
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.2, max_delay: float = 2.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """
+    연속 실패가 `failure_threshold`번 이어지면 열려서(open) `reset_timeout`초 동안 요청을 막는 서킷 브레이커.
+    그 후에는 반쯤 열린(half_open) 상태로 시험 요청 하나만 허용하여, 성공하면 닫고 실패하면 다시 엽니다.
+    """
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        """요청을 보내도 되는지 확인합니다. 반쯤 열린 상태에서는 시험 요청 하나만 허용합니다."""
+        if self.state == OPEN:
+            if self.clock() - self._opened_at < self.reset_timeout:
+                return False
+            self.state = HALF_OPEN
+            self._trial_in_flight = False
+        if self.state == HALF_OPEN:
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+        return True
+
+    def record_success(self):
+        self.state = CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def release(self):
+        """결과를 알 수 없이 끝난 시험 요청(취소 등)의 자리를 돌려주어 다음 요청이 시험 요청이 되게 합니다."""
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = OPEN
+            self._opened_at = self.clock()
+
+
+async def hedged(
+    call: Callable[[], Awaitable[Any]],
+    delay: Optional[float],
+    on_hedge: Optional[Callable[[], None]] = None,
+) -> Any:
+    """
+    `call()`이 `delay`초 안에 끝나지 않으면 같은 요청을 한 번 더 보내고, 먼저 성공한 결과를 반환합니다. (hedged request)
+    두 요청이 모두 실패하면 마지막 오류를 다시 발생시킵니다. 지연 꼬리(tail latency)를 줄이기 위한 것이므로
+    여러 번 실행해도 안전한 조회 요청에만 사용해야 합니다.
+    """
+    if not delay or delay <= 0:
+        return await call()
+
+    pending = {asyncio.ensure_future(call())}
+    try:
+        done, pending = await asyncio.wait(pending, timeout=delay)
+        if done:
+            return done.pop().result()
+
+        if on_hedge is not None:
+            on_hedge()
+        pending.add(asyncio.ensure_future(call()))
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
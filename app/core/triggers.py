@@ -0,0 +1,96 @@
+import heapq
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+class TriggeredSymbols:
+    """
+    PRD Phase 11 '트리거-액션' 모델의 메모리 내 상태.
+    트리거 전략이 조건을 만족한 종목을 만료 시각과 함께 '무장(armed)'시키면,
+    액션 스캐너는 무장된 종목만 높은 빈도로 재평가합니다.
+
+    전략별 {종목: 만료 시각} 딕셔너리와 만료 시각 기준의 최소 힙을 함께 유지하므로,
+    만료 처리와 조회 비용은 전체 시장이 아닌 무장된 종목 수에 비례합니다.
+    """
+    def __init__(self):
+        self._armed: Dict[int, Dict[str, float]] = {}
+        self._expiry_heap: List[Tuple[float, int, str]] = []
+        self._dirty: Set[int] = set()
+
+    def arm(self, strategy_id: int, tickers: Iterable[str], ttl_seconds: float, now: Optional[float] = None):
+        """종목들을 무장시킵니다. 이미 무장된 종목은 만료 시각이 연장됩니다."""
+        now = time.time() if now is None else now
+        expires_at = now + ttl_seconds
+        armed = self._armed.setdefault(strategy_id, {})
+        for ticker in tickers:
+            armed[ticker] = expires_at
+            heapq.heappush(self._expiry_heap, (expires_at, strategy_id, ticker))
+        self._dirty.add(strategy_id)
+
+    def disarm(self, strategy_id: int, tickers: Iterable[str]):
+        armed = self._armed.get(strategy_id)
+        if not armed:
+            return
+        for ticker in tickers:
+            armed.pop(ticker, None)
+        self._dirty.add(strategy_id)
+
+    def clear(self, strategy_id: int):
+        if self._armed.pop(strategy_id, None) is not None:
+            self._dirty.add(strategy_id)
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """만료된 종목을 제거하고 제거된 개수를 반환합니다."""
+        now = time.time() if now is None else now
+        removed = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, strategy_id, ticker = heapq.heappop(heap)
+            armed = self._armed.get(strategy_id)
+            # 재무장으로 만료 시각이 갱신된 경우 힙의 오래된 항목은 무시합니다.
+            if armed is not None and armed.get(ticker) == expires_at:
+                del armed[ticker]
+                self._dirty.add(strategy_id)
+                removed += 1
+        # 해제/재무장으로 쌓인 오래된 힙 항목이 너무 많으면 힙을 재구성합니다.
+        live = sum(len(armed) for armed in self._armed.values())
+        if len(heap) > 2 * live + 1024:
+            self._rebuild_heap()
+        return removed
+
+    def _rebuild_heap(self):
+        self._expiry_heap = [
+            (expires_at, strategy_id, ticker)
+            for strategy_id, armed in self._armed.items()
+            for ticker, expires_at in armed.items()
+        ]
+        heapq.heapify(self._expiry_heap)
+
+    def active(self, strategy_id: int, now: Optional[float] = None) -> List[str]:
+        """만료되지 않은 무장 종목 목록을 반환합니다."""
+        self.prune(now)
+        return list(self._armed.get(strategy_id, ()))
+
+    def items(self, strategy_id: int) -> Dict[str, float]:
+        return dict(self._armed.get(strategy_id, {}))
+
+    def pop_dirty(self) -> Dict[int, Dict[str, float]]:
+        """마지막 영속화 이후 변경된 전략들의 현재 상태를 반환하고 변경 표시를 지웁니다."""
+        dirty = {strategy_id: dict(self._armed.get(strategy_id, {})) for strategy_id in self._dirty}
+        self._dirty.clear()
+        return dirty
+
+    def mark_dirty(self, strategy_ids: Iterable[int]):
+        """영속화에 실패한 전략들을 다음 주기에 다시 저장하도록 표시합니다."""
+        self._dirty.update(strategy_ids)
+
+    def load(self, strategy_id: int, entries: Dict[str, float]):
+        """
+        영속화된 상태를 복원합니다. 복원은 변경으로 표시하지 않으며,
+        이미 메모리에 있는 종목은 더 늦은 만료 시각을 유지합니다.
+        """
+        armed = self._armed.setdefault(strategy_id, {})
+        for ticker, expires_at in entries.items():
+            if armed.get(ticker, 0.0) < expires_at:
+                armed[ticker] = expires_at
+                heapq.heappush(self._expiry_heap, (expires_at, strategy_id, ticker))
@@ -1,19 +1,70 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from typing import AsyncIterator
 from app.core.config import settings
 
-# 데이터베이스 엔진 생성
-# SQLite를 사용할 경우, check_same_thread=False 옵션은 FastAPI와 같은 비동기 프레임워크에서 필요합니다.
+
+def to_async_database_url(url: str) -> str:
+    """
+    동기 드라이버용 DATABASE_URL을 대응하는 비동기 드라이버 URL로 변환합니다.
+    (sqlite -> sqlite+aiosqlite, postgresql -> postgresql+asyncpg)
+    """
+    scheme, sep, rest = url.partition("://")
+    if not sep or "+" in scheme and scheme.split("+", 1)[1] in ("aiosqlite", "asyncpg"):
+        return url
+    dialect = scheme.split("+", 1)[0]
+    if dialect == "sqlite":
+        return f"sqlite+aiosqlite://{rest}"
+    if dialect in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg://{rest}"
+    return url
+
+
+def _engine_options(url: str) -> dict:
+    """
+    엔진 공통 옵션을 생성합니다.
+    SQLite는 파일 잠금 기반이라 풀 크기 설정이 의미가 없으므로, 서버형 DB에만 풀 설정을 적용합니다.
+    """
+    if "sqlite" in url:
+        # SQLite를 사용할 경우, check_same_thread=False 옵션은 FastAPI와 같은 비동기 프레임워크에서 필요합니다.
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+
+# 데이터베이스 엔진 생성 (동기: Alembic, 스크립트 등에서 사용)
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
+    **_engine_options(settings.DATABASE_URL)
 )
 
 # 데이터베이스 세션 생성을 위한 SessionLocal 클래스
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 비동기 데이터베이스 엔진 생성 (API 라우터에서 사용)
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or to_async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+    **_engine_options(ASYNC_DATABASE_URL)
+)
+
+# 비동기 세션에서는 커밋 후 속성 접근 시 암묵적인 지연 로딩(I/O)이 발생하지 않도록
+# expire_on_commit=False를 사용합니다. (PRD 8.2 Eager Loading 원칙)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # SQLAlchemy 모델을 정의하기 위한 기본 클래스
 Base = declarative_base()
 
@@ -24,3 +75,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# FastAPI의 의존성 주입 시스템에서 사용할 비동기 데이터베이스 세션 getter
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,18 +1,54 @@
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Query
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
 import logging
 import json
+from app.core.config import settings
+from app.core.logs import configure_logging
 from app.services.websocket_manager import manager
-from app.api import strategies, scans
+from app.services.candle_service import candle_service, start_candle_service
+from app.services.scan_service import action_scanners
+from app.services.trigger_service import start_trigger_persistence, stop_trigger_persistence
+from app.services.order_service import get_order_pipeline, stop_order_pipeline
+from app.services.portfolio_service import portfolio_service
+from app.services.job_service import start_scan_job_relay, stop_scan_job_relay
+from app.services.scheduler_service import start_scheduler, stop_scheduler
+from app.services.chart_service import chart_service, validate_chart_request
+from app.api import strategies, scans, metrics, orders, portfolio, charts
 
 # 로깅 설정
-logging.basicConfig(level=logging.INFO)
+configure_logging()
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """애플리케이션 시작/종료 시 백그라운드 서비스를 관리합니다."""
+    if settings.LIVE_CANDLES_ENABLED:
+        await start_candle_service()
+    start_trigger_persistence(settings.TRIGGER_PERSIST_INTERVAL_SECONDS)
+    if settings.SCAN_WORKERS_ENABLED:
+        await start_scan_job_relay()
+    if settings.SCHEDULER_ENABLED:
+        await start_scheduler()
+    if settings.RISK_CHECKS_ENABLED:
+        await portfolio_service.start(get_order_pipeline().broker, settings.PORTFOLIO_REFRESH_SECONDS)
+    yield
+    await stop_scheduler()
+    await chart_service.stop()
+    await stop_scan_job_relay()
+    await portfolio_service.stop()
+    await action_scanners.stop_all()
+    await stop_order_pipeline()
+    await stop_trigger_persistence()
+    await candle_service.stop()
+
+
 app = FastAPI(
     title="Trading Bot API",
     description="API for managing trading strategies, scans, and real-time updates.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS 미들웨어 설정 수정
@@ -57,7 +93,7 @@ async def websocket_endpoint(websocket: WebSocket, token: str = Query("default_u
 
         while True:
             data = await websocket.receive_text()
-            logger.info(f"WebSocket 메시지 수신 (클라이언트: {client_id}): {data}")
+            logger.debug("WebSocket 메시지 수신 (클라이언트: %s, %d자)", client_id, len(data))
 
             try:
                 message = json.loads(data)
@@ -66,6 +102,22 @@ async def websocket_endpoint(websocket: WebSocket, token: str = Query("default_u
 
                 if event == "subscribe":
                     logger.info(f"'{payload.get('channel')}' 채널 구독 요청 (클라이언트: {client_id})")
+                    if payload.get("channel") == "chart":
+                        # 구독 이후의 새 봉/진행 중인 봉 변경분을 chart_data_update로 받습니다. (전체 구간은 GET /charts)
+                        overlays = payload.get("overlays") or []
+                        timeframe = payload.get("timeframe", "day")
+                        broker = payload.get("broker", "upbit")
+                        errors = validate_chart_request(timeframe, overlays, broker)
+                        if not payload.get("ticker"):
+                            errors.append({"field": "ticker", "error": "ticker is required"})
+                        if errors:
+                            details = "; ".join(f"{e['field']}: {e['error']}" for e in errors)
+                            await manager.send_personal_message(json.dumps({
+                                "event": "notification",
+                                "payload": {"level": "error", "message": f"Invalid chart subscription: {details}"}
+                            }), client_id)
+                            continue
+                        chart_service.subscribe(client_id, payload["ticker"], timeframe, overlays, broker)
                     await manager.send_personal_message(json.dumps({
                         "event": "notification",
                         "payload": {"level": "info", "message": f"Subscribed to {payload.get('channel')}"}
@@ -73,6 +125,8 @@ async def websocket_endpoint(websocket: WebSocket, token: str = Query("default_u
 
                 elif event == "unsubscribe":
                     logger.info(f"'{payload.get('channel')}' 채널 구독 해지 요청 (클라이언트: {client_id})")
+                    if payload.get("channel") == "chart":
+                        chart_service.unsubscribe(client_id, payload.get("ticker"), payload.get("timeframe"))
 
                 else:
                     logger.warning(f"알 수 없는 WebSocket 이벤트: {event} (클라이언트: {client_id})")
@@ -82,7 +136,7 @@ async def websocket_endpoint(websocket: WebSocket, token: str = Query("default_u
                     }), client_id)
 
             except json.JSONDecodeError:
-                logger.error(f"잘못된 JSON 형식의 메시지 수신 (클라이언트: {client_id}): {data}")
+                logger.warning("잘못된 JSON 형식의 메시지 수신 (클라이언트: %s, %d자)", client_id, len(data))
                 await manager.send_personal_message(json.dumps({
                     "event": "notification",
                     "payload": {"level": "error", "message": "Invalid JSON format."}
@@ -90,6 +144,7 @@ async def websocket_endpoint(websocket: WebSocket, token: str = Query("default_u
 
     except WebSocketDisconnect:
         manager.disconnect(client_id)
+        chart_service.unsubscribe(client_id)
         logger.info(f"WebSocket 연결 해제 (클라이언트: {client_id})")
 
     except Exception as e:
@@ -100,7 +155,12 @@ async def websocket_endpoint(websocket: WebSocket, token: str = Query("default_u
                 "payload": {"level": "error", "message": "An unexpected server error occurred."}
             }), client_id)
         manager.disconnect(client_id)
+        chart_service.unsubscribe(client_id)
 
 # API 라우터 추가
 app.include_router(strategies.router, prefix="/api/v1", tags=["strategies"])
 app.include_router(scans.router, prefix="/api/v1", tags=["scans"])
+app.include_router(orders.router, prefix="/api/v1", tags=["orders"])
+app.include_router(portfolio.router, prefix="/api/v1", tags=["portfolio"])
+app.include_router(charts.router, prefix="/api/v1", tags=["charts"])
+app.include_router(metrics.router, prefix="/api/v1", tags=["metrics"])
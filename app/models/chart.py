@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List
+
+# ==================================
+# Pydantic Schemas (API 데이터 검증용)
+# ==================================
+
+class ChartResponse(BaseModel):
+    """
+    개별 분석 페이지의 차트 데이터. `bars`의 각 행은 봉 하나의 OHLCV(`timestamp`는 봉 시작 시각, epoch ms)와
+    `overlays`에 나열된 오버레이 값(키는 식 그대로, 계산 구간 이전은 null)을 담습니다.
+    요청한 `width`보다 봉이 많으면 서버에서 LTTB로 줄이며, 이때 `downsampled`가 참이고 원래 봉 수는 `total_bars`입니다.
+    """
+    ticker: str
+    timeframe: str
+    overlays: List[str] = []
+    bars: List[Dict[str, Any]]
+    total_bars: int
+    downsampled: bool = False
@@ -0,0 +1,54 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import Any, Dict, List, Optional, Union
+
+from app.core.config import settings
+
+# ==================================
+# Pydantic Schemas (API 데이터 검증용)
+# ==================================
+
+class BuilderStrategy(BaseModel):
+    """
+    전략 빌더 화면(StrategyBuilderPage)이 보내는 저장되지 않은 전략.
+    `*_scan_expression`은 캔버스 항목({type, label})을 연산자 노드({type: "expression", operator, operands})로 묶은 트리입니다.
+    """
+    id: Optional[Union[int, str]] = None
+    name: str = "Untitled Strategy"
+    first_scan_expression: Optional[Any] = None
+    second_scan_expression: Optional[Any] = None
+
+
+class DynamicScanRequest(BaseModel):
+    """
+    즉시 실행 스캔 요청. `scan_logic`(저장된 전략과 같은 형식) 또는 전략 빌더의 `strategy` 중 하나가 필요합니다.
+    `tickers`를 지정하지 않으면 브로커의 전체 종목을 대상으로 1차 스캔 후 거래대금 상위 `max_tickers`개를 2차 스캔합니다.
+    이때 1차 스캔은 주기적으로 갱신되는 시장 데이터 스냅샷으로 평가합니다.
+    `tickers` 개수, `max_tickers`와 `timeout_seconds`는 서버 설정의 상한을 넘을 수 없습니다.
+    """
+    scan_logic: Optional[Dict[str, Any]] = None
+    strategy: Optional[BuilderStrategy] = None
+    broker: str = "upbit"
+    tickers: Optional[List[str]] = Field(default=None, min_length=1, max_length=settings.DYNAMIC_SCAN_MAX_REQUEST_TICKERS)
+    max_tickers: Optional[int] = Field(default=None, gt=0)
+    timeout_seconds: Optional[float] = Field(default=None, gt=0)
+
+    @model_validator(mode="after")
+    def check_logic(self):
+        if self.scan_logic is None and self.strategy is None:
+            raise ValueError("Either scan_logic or strategy is required")
+        return self
+
+
+class DynamicScanResponse(BaseModel):
+    """
+    즉시 실행 스캔 결과. `results`의 각 행은 최신 봉 OHLCV와 종목 정보이며, 전략 빌더의 결과 표 필드
+    (`code`, `price`, `ohlc`)를 함께 담습니다. 시간/종목 수 한도에 걸리면 `partial`이 참입니다.
+    """
+    results: List[Dict[str, Any]]
+    scanned: int
+    matched: int
+    universe: int
+    partial: bool = False
+    skipped: List[str] = []
+    failed: List[Dict[str, str]] = []
+    elapsed_ms: float
@@ -0,0 +1,66 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, Literal
+import datetime
+
+# ==================================
+# Pydantic Schemas (API 데이터 검증용)
+# ==================================
+
+class OrderCreate(BaseModel):
+    """
+    주문 생성 요청 스키마. 시장가 매수의 `amount`는 주문 금액(KRW), 그 외는 수량입니다.
+    """
+    ticker: str
+    side: Literal["buy", "sell"]
+    order_type: Literal["market", "limit"] = "market"
+    amount: float = Field(gt=0)
+    price: Optional[float] = Field(default=None, gt=0)
+    strategy_id: Optional[int] = None
+
+    @model_validator(mode="after")
+    def check_limit_price(self):
+        if self.order_type == "limit" and self.price is None:
+            raise ValueError("price is required for limit orders")
+        return self
+
+
+class OrderSchema(BaseModel):
+    """
+    API 응답으로 반환되는 주문 상태 스키마.
+    """
+    client_order_id: str
+    ticker: str
+    side: str
+    order_type: str
+    amount: float
+    price: Optional[float] = None
+    strategy_id: Optional[int] = None
+    status: Literal["queued", "submitting", "open", "filled", "partially_filled", "cancelled", "rejected", "failed", "expired"]
+    exchange_order_id: Optional[str] = None
+    executed_volume: float = 0.0
+    attempts: int = 0
+    error: Optional[str] = None
+    created_at: datetime.datetime
+    submitted_at: Optional[datetime.datetime] = None
+    completed_at: Optional[datetime.datetime] = None
+
+    @classmethod
+    def from_record(cls, record) -> "OrderSchema":
+        request = record.request
+        return cls(
+            client_order_id=record.client_order_id,
+            ticker=request.ticker,
+            side=request.side,
+            order_type=request.order_type,
+            amount=request.amount,
+            price=request.price,
+            strategy_id=request.strategy_id,
+            status=record.status,
+            exchange_order_id=record.exchange_order_id,
+            executed_volume=record.executed_volume,
+            attempts=record.attempts,
+            error=record.error,
+            created_at=record.created_at,
+            submitted_at=record.submitted_at,
+            completed_at=record.completed_at,
+        )
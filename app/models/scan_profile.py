@@ -0,0 +1,44 @@
+from pydantic import BaseModel
+from typing import List, Literal, Optional
+import datetime
+
+# ==================================
+# Pydantic Schemas (API 데이터 검증용)
+# ==================================
+
+class PlanNodeTiming(BaseModel):
+    node: str
+    seconds: float
+
+
+class PlanCapture(BaseModel):
+    """Polars 평가 구간의 최적화된 쿼리 플랜과 노드별 실행 시간."""
+    label: str
+    optimized_plan: str
+    node_timings: List[PlanNodeTiming] = []
+
+
+class TickerTiming(BaseModel):
+    ticker: str
+    fetch_seconds: float
+    evaluate_seconds: float
+    total_seconds: float
+
+
+class ScanProfileSummary(BaseModel):
+    """프로파일 목록 조회에 사용하는 요약 스키마."""
+    id: str
+    strategy_id: int
+    phase: Literal["1st", "2nd"]
+    status: Literal["running", "completed", "failed"] = "running"
+    started_at: datetime.datetime
+    duration_seconds: Optional[float] = None
+
+
+class ScanProfileSchema(ScanProfileSummary):
+    """`profile=true`로 실행된 스캔 1회의 프로파일."""
+    ticker_count: int = 0
+    python_stats: Optional[str] = None
+    plans: List[PlanCapture] = []
+    slowest_tickers: List[TickerTiming] = []
+    error: Optional[str] = None
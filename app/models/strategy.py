@@ -1,8 +1,8 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, JSON, Index
 from sqlalchemy.sql import func
 from app.db.session import Base
 from pydantic import BaseModel, ConfigDict
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Literal
 import datetime
 
 # ==================================
@@ -29,6 +29,16 @@ class Strategy(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # 목록 조회 필터(is_active, broker, market) + 키셋 페이지네이션(id) 용 복합 인덱스
+    # 인덱스는 선두 컬럼부터만 쓰이므로, 필터 조합마다 그 필터로 시작하는 인덱스를 둡니다.
+    # (is_active / broker+market[+is_active] / market[+is_active] / broker[+is_active])
+    __table_args__ = (
+        Index("ix_strategies_is_active_id", "is_active", "id"),
+        Index("ix_strategies_broker_market_active_id", "broker", "market", "is_active", "id"),
+        Index("ix_strategies_market_active_id", "market", "is_active", "id"),
+        Index("ix_strategies_broker_active_id", "broker", "is_active", "id"),
+    )
+
 # ==================================
 # Pydantic Schemas (API 데이터 검증용)
 # ==================================
@@ -81,3 +91,41 @@ class StrategySchema(StrategyBase):
     model_config = ConfigDict(
         from_attributes=True,
     )
+
+class StrategyPage(BaseModel):
+    """
+    키셋(cursor) 페이지네이션 기반 경량 목록 조회의 응답 스키마.
+    `items`에는 요청한 필드만 포함되며, `next_cursor`가 None이면 마지막 페이지입니다.
+    """
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[int] = None
+
+class StrategyBatchOperation(BaseModel):
+    """
+    일괄 변경 요청의 개별 작업.
+    `create`는 `data`(StrategyCreate 형식), `update`는 `id`와 `data`(StrategyUpdate 형식),
+    `delete`/`activate`/`deactivate`는 `id`만 필요합니다.
+    """
+    op: Literal["create", "update", "delete", "activate", "deactivate"]
+    id: Optional[int] = None
+    data: Optional[Dict[str, Any]] = None
+
+class StrategyBatchRequest(BaseModel):
+    """여러 작업을 하나의 트랜잭션으로 처리하기 위한 일괄 변경 요청 스키마."""
+    operations: List[StrategyBatchOperation]
+
+class StrategyBatchItemResult(BaseModel):
+    """
+    일괄 처리의 항목별 결과.
+    `index`는 일괄 변경에서는 작업 순서(0부터), 가져오기(import)에서는 줄 번호(1부터)입니다.
+    """
+    index: int
+    status: Literal["ok", "skipped", "error"]
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+class StrategyBatchResult(BaseModel):
+    """일괄 처리 응답 스키마."""
+    results: List[StrategyBatchItemResult]
+    succeeded: int
+    failed: int
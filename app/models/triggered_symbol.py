@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from app.db.session import Base
+from pydantic import BaseModel, ConfigDict
+import datetime
+
+# ==================================
+# SQLAlchemy Model
+# ==================================
+
+class TriggeredSymbol(Base):
+    """
+    트리거 전략에 의해 '무장(armed)'된 종목을 나타내는 SQLAlchemy 모델. (PRD Phase 11)
+    실시간 상태는 메모리(TriggeredSymbols)에 있으며, 이 테이블은 주기적으로 저장되는 스냅샷입니다.
+    """
+    __tablename__ = "triggered_symbols"
+
+    id = Column(Integer, primary_key=True, index=True)
+    strategy_id = Column(Integer, ForeignKey("strategies.id", ondelete="CASCADE"), nullable=False, index=True)
+    ticker = Column(String, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("strategy_id", "ticker", name="uq_triggered_symbols_strategy_ticker"),
+    )
+
+# ==================================
+# Pydantic Schemas (API 데이터 검증용)
+# ==================================
+
+class TriggeredSymbolSchema(BaseModel):
+    """
+    API 응답으로 클라이언트에게 반환될 때 사용하는 무장 종목 스키마.
+    """
+    ticker: str
+    expires_at: datetime.datetime
+
+    model_config = ConfigDict(
+        from_attributes=True,
+    )
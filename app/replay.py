@@ -0,0 +1,82 @@
+"""
+과거 봉 데이터를 가속 재생하여 스케줄러 → 스캔 엔진 → 결과 전송 경로 전체를 실행하는 리플레이 러너.
+실제 시장 시간 없이 운영과 같은 부하 패턴을 재현하고 처리량 한계를 찾는 데 사용합니다.
+
+사용 예:
+    python -m app.replay --data ./history --speed 1000 --start 2024-01-02T09:00 --end 2024-01-09T09:00
+    python -m app.replay --data ./history --strategy-id 3 --strategy-id 5
+
+데이터 디렉터리에는 `<종목>_<타임프레임>.parquet`(또는 .csv) 파일이 있어야 합니다. (예: KRW-BTC_day.parquet)
+대상 전략은 DB에서 읽으며, `--strategy-id`를 지정하지 않으면 cron 스케줄이 있는 활성 전략 전체를 사용합니다.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+from typing import List
+
+from app.core.logs import configure_logging
+from app.models.strategy import StrategySchema
+from app.services.scheduler_service import create_replay_scheduler, load_scheduled_strategies
+from app.services import strategy_service
+from app.db.session import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+async def _load_strategies(strategy_ids: List[int]) -> List[StrategySchema]:
+    if not strategy_ids:
+        return await load_scheduled_strategies()
+    strategies = []
+    async with AsyncSessionLocal() as db:
+        for strategy_id in strategy_ids:
+            strategy = await strategy_service.get_strategy(db, strategy_id)
+            if strategy is None:
+                raise SystemExit(f"Strategy {strategy_id} not found")
+            if not strategy.cron_schedule:
+                raise SystemExit(f"Strategy {strategy_id} has no cron_schedule")
+            # 리플레이에서는 비활성 전략도 명시적으로 지정하면 실행합니다.
+            strategies.append(StrategySchema.model_validate(strategy).model_copy(update={"is_active": True}))
+    return strategies
+
+
+async def run_replay(data_dir: str, speed: float, start: str = None, end: str = None, strategy_ids: List[int] = ()):
+    strategies = await _load_strategies(list(strategy_ids))
+
+    async def loader():
+        return strategies
+
+    scheduler, until = create_replay_scheduler(data_dir, speed, start, end, loader=loader)
+    sim_start = scheduler.clock.now()
+    started = time.perf_counter()
+    await scheduler.run(until=until)
+    elapsed = time.perf_counter() - started
+
+    report = {
+        "strategies": len(strategies),
+        "speed": speed,
+        "simulated_seconds": scheduler.clock.now() - sim_start,
+        "wall_seconds": elapsed,
+        "scans_per_second": scheduler.stats.completed / elapsed if elapsed else 0.0,
+        **scheduler.stats.as_dict(),
+    }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay historical candles through the scheduler and scan pipeline.")
+    parser.add_argument("--data", required=True, help="Directory of <ticker>_<timeframe>.parquet/.csv candle files")
+    parser.add_argument("--speed", type=float, default=1000.0, help="Simulated seconds per wall-clock second")
+    parser.add_argument("--start", help="Replay start (ISO format, KST if no timezone). Defaults to the data start.")
+    parser.add_argument("--end", help="Replay end (ISO format, KST if no timezone). Defaults to the data end.")
+    parser.add_argument("--strategy-id", type=int, action="append", default=[], help="Strategy to replay (repeatable)")
+    args = parser.parse_args()
+
+    configure_logging(level="WARNING")
+    report = asyncio.run(run_replay(args.data, args.speed, args.start, args.end, args.strategy_id))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
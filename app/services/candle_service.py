@@ -0,0 +1,86 @@
+import asyncio
+import logging
+import time
+from typing import List, Optional
+
+from app.core.brokers.base import BaseBroker
+from app.core.brokers.registry import create_broker
+from app.core.brokers.live import LiveCandleBroker
+from app.core.candles import CandleAggregator, CandleStore
+from app.core.config import settings
+from app.core.feeds import TradeFeed, ReplayTradeFeed, UpbitTradeFeed
+
+logger = logging.getLogger(__name__)
+
+
+class CandleIngestionService:
+    """
+    체결 스트림을 구독하여 메모리 내 OHLCV 봉을 유지하는 수집 서비스.
+    실행 중에는 `wrap()`으로 감싼 브로커가 REST 대신 메모리의 봉을 사용합니다.
+    """
+    def __init__(self, timeframes: List[str], capacity: int = 500):
+        self.timeframes = timeframes
+        self.store = CandleStore(capacity=capacity)
+        self.aggregator = CandleAggregator(timeframes, self.store)
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def is_running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    async def _consume(self, feed: TradeFeed):
+        try:
+            async for trade in feed.trades():
+                self.aggregator.add_trade(trade)
+            logger.info("체결 스트림이 종료되었습니다.")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"체결 스트림 처리 중 오류: {e}", exc_info=True)
+
+    async def _close_expired_loop(self, interval: float):
+        # 체결이 뜸한 종목도 구간이 끝나면 제때 봉이 완성되도록 주기적으로 확인합니다.
+        while True:
+            await asyncio.sleep(interval)
+            self.aggregator.close_expired(int(time.time() * 1000))
+
+    def start(self, feed: TradeFeed, close_interval: float = 1.0):
+        if self.is_running:
+            return
+        self._tasks = [
+            asyncio.create_task(self._consume(feed)),
+            asyncio.create_task(self._close_expired_loop(close_interval)),
+        ]
+        logger.info(f"실시간 봉 집계 시작: {', '.join(self.timeframes)}")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def wrap(self, broker: BaseBroker) -> BaseBroker:
+        """서비스가 실행 중이면 메모리 내 봉을 사용하는 브로커로 감싸서 반환합니다."""
+        if not self.is_running:
+            return broker
+        return LiveCandleBroker(broker, self.store, set(self.timeframes))
+
+
+# Create a singleton instance of the CandleIngestionService
+candle_service = CandleIngestionService(
+    timeframes=[tf.strip() for tf in settings.LIVE_CANDLE_TIMEFRAMES.split(",") if tf.strip()],
+    capacity=settings.LIVE_CANDLE_CAPACITY,
+)
+
+
+async def start_candle_service(broker: Optional[BaseBroker] = None):
+    """설정에 따라 체결 피드(리플레이 파일 또는 Upbit 소켓)를 선택하여 수집 서비스를 시작합니다."""
+    if settings.LIVE_CANDLE_REPLAY_FILE:
+        feed: TradeFeed = ReplayTradeFeed(settings.LIVE_CANDLE_REPLAY_FILE, speed=settings.LIVE_CANDLE_REPLAY_SPEED)
+    else:
+        if settings.LIVE_CANDLE_TICKERS:
+            tickers = [t.strip() for t in settings.LIVE_CANDLE_TICKERS.split(",") if t.strip()]
+        else:
+            tickers = await (broker or create_broker("upbit")).get_tickers()
+        feed = UpbitTradeFeed(tickers)
+    candle_service.start(feed)
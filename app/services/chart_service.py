@@ -0,0 +1,179 @@
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import polars as pl
+
+from app.core.brokers.registry import get_broker_class
+from app.core.charts import OverlayCache, downsample, validate_overlays, validate_timeframe, with_overlays
+from app.core.config import settings
+from app.core.features import FeatureCache
+from app.core.logs import log_sampled
+from app.models.chart import ChartResponse
+from app.services.scan_service import create_scan_broker, mock_indicators
+from app.services.websocket_manager import manager
+
+logger = logging.getLogger(__name__)
+
+# (브로커, 종목, 타임프레임, 오버레이 식들)
+Subscription = Tuple[str, str, str, Tuple[str, ...]]
+
+
+def validate_chart_request(timeframe: str, overlays: Sequence[str], broker: str) -> List[Dict[str, str]]:
+    """
+    차트 요청(REST 조회와 WebSocket 구독 공통)의 오버레이, 타임프레임, 브로커를 확인하고
+    오류 목록(`[{"field": ..., "error": ...}]`)을 반환합니다.
+    """
+    errors = validate_overlays(overlays, mock_indicators)
+    timeframe_error = validate_timeframe(timeframe)
+    if timeframe_error:
+        errors.append({"field": "timeframe", "error": timeframe_error})
+    try:
+        get_broker_class(broker)
+    except ValueError as e:
+        errors.append({"field": "broker", "error": str(e)})
+    return errors
+
+
+class ChartService:
+    """
+    차트 데이터(봉 + 보조지표 오버레이)를 제공하는 서비스.
+    - 봉은 스캔과 같은 브로커(시세 캐시, 실시간 봉 집계 포함)에서 가져오고, 오버레이는 스캔과 같은 파서로 계산합니다.
+      보조지표 캐시는 스캔과 따로 둡니다. (차트와 스캔은 봉 수가 달라 같은 캐시를 쓰면 서로의 항목을 밀어냄)
+    - 계산 결과는 (종목, 타임프레임, 봉 수, 오버레이)마다 봉 데이터 버전과 함께 캐시합니다.
+    - WebSocket "chart" 채널 구독자에게는 주기적으로 새 봉과 진행 중인 봉의 변경분만 `chart_data_update`로 보냅니다.
+      같은 차트를 여러 클라이언트가 구독해도 계산과 직렬화는 한 번만 합니다.
+    """
+    def __init__(self, cache: Optional[OverlayCache] = None, features: Optional[FeatureCache] = None):
+        self.cache = cache or OverlayCache(settings.CHART_CACHE_MAX_ENTRIES)
+        self.features = features
+        self._subscribers: Dict[Subscription, Set[str]] = {}
+        # 구독별로 마지막으로 보낸 봉 (timestamp, 행 전체). 같은 봉이 바뀌지 않았으면 다시 보내지 않습니다.
+        self._last_sent: Dict[Subscription, Tuple[int, Tuple]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def load(
+        self, ticker: str, timeframe: str = "day", limit: int = 200, overlays: Sequence[str] = (), broker: str = "upbit",
+    ) -> pl.DataFrame:
+        """최근 `limit`개 봉에 오버레이 컬럼을 덧붙인 원본 해상도의 차트 데이터를 반환합니다."""
+        candles = await create_scan_broker(broker).get_ohlcv(ticker, timeframe, limit=limit)
+        key = (ticker, timeframe, limit, tuple(overlays))
+        version = FeatureCache.frame_version(candles)
+        frame = self.cache.get(key, version)
+        if frame is None:
+            frame = with_overlays(candles, overlays, mock_indicators, self.features, (ticker, timeframe))
+            self.cache.put(key, version, frame)
+        return frame
+
+    async def get_chart(
+        self,
+        ticker: str,
+        timeframe: str = "day",
+        limit: int = 200,
+        overlays: Sequence[str] = (),
+        width: Optional[int] = None,
+        broker: str = "upbit",
+    ) -> ChartResponse:
+        """차트 데이터를 반환합니다. `width`(화면 픽셀 폭)가 주어지면 봉 수를 그 이하로 줄입니다. (LTTB)"""
+        frame = await self.load(ticker, timeframe, min(limit, settings.CHART_MAX_BARS), overlays, broker)
+        bars = downsample(frame, width) if width else frame
+        return ChartResponse(
+            ticker=ticker,
+            timeframe=timeframe,
+            overlays=list(overlays),
+            bars=bars.to_dicts(),
+            total_bars=frame.height,
+            downsampled=bars.height < frame.height,
+        )
+
+    # --- WebSocket 구독 ---
+
+    def subscribe(
+        self, client_id: str, ticker: str, timeframe: str = "day", overlays: Sequence[str] = (), broker: str = "upbit",
+    ) -> Subscription:
+        subscription = (broker.lower(), ticker, timeframe, tuple(overlays))
+        self._subscribers.setdefault(subscription, set()).add(client_id)
+        self.start()
+        return subscription
+
+    def unsubscribe(self, client_id: str, ticker: Optional[str] = None, timeframe: Optional[str] = None):
+        """클라이언트의 구독을 해지합니다. 종목/타임프레임을 지정하지 않으면 해당하는 구독을 모두 해지합니다."""
+        for subscription in list(self._subscribers):
+            _, sub_ticker, sub_timeframe, _ = subscription
+            if ticker is not None and sub_ticker != ticker:
+                continue
+            if timeframe is not None and sub_timeframe != timeframe:
+                continue
+            clients = self._subscribers[subscription]
+            clients.discard(client_id)
+            if not clients:
+                del self._subscribers[subscription]
+                self._last_sent.pop(subscription, None)
+
+    def _updates(self, subscription: Subscription, frame: pl.DataFrame) -> List[Dict[str, Any]]:
+        """마지막으로 보낸 봉 이후(그 봉 포함, 값이 바뀐 경우)의 봉만 골라냅니다. 처음에는 마지막 봉 하나만 보냅니다."""
+        if frame.is_empty():
+            return []
+        last = self._last_sent.get(subscription)
+        if last is None:
+            rows = frame.tail(1)
+        else:
+            last_timestamp, last_row = last
+            rows = frame.filter(pl.col("timestamp") >= last_timestamp)
+            if rows.height and rows.row(0) == last_row:
+                rows = rows.slice(1)
+        if rows.is_empty():
+            return []
+        self._last_sent[subscription] = (rows["timestamp"][-1], rows.row(-1))
+        return rows.to_dicts()
+
+    async def push_updates(self) -> int:
+        """구독 중인 차트마다 변경된 봉을 구독자에게 보내고, 보낸 메시지 수를 반환합니다."""
+        sent = 0
+        for subscription, clients in list(self._subscribers.items()):
+            broker, ticker, timeframe, overlays = subscription
+            try:
+                frame = await self.load(ticker, timeframe, settings.CHART_LIVE_BARS, overlays, broker)
+            except Exception as e:
+                log_sampled(logger, logging.WARNING, "chart.push_failed", "차트 데이터 조회 실패: %s", e, ticker=ticker)
+                continue
+            bars = self._updates(subscription, frame)
+            if not bars:
+                continue
+            message = json.dumps({
+                "event": "chart_data_update",
+                "payload": {"ticker": ticker, "timeframe": timeframe, "type": "candle", "data": {"bars": bars}},
+            })
+            for client_id in list(clients):
+                await manager.send_personal_message(message, client_id)
+                sent += 1
+        return sent
+
+    async def _loop(self, interval: float):
+        while self._subscribers:
+            try:
+                await self.push_updates()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"차트 데이터 전송 중 오류: {e}", exc_info=True)
+            await asyncio.sleep(interval)
+
+    def start(self, interval: Optional[float] = None):
+        """구독자가 있는 동안 실행되는 전송 루프를 시작합니다. 구독이 모두 해지되면 루프도 끝납니다."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop(interval or settings.CHART_PUSH_INTERVAL_SECONDS))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+# Create a singleton instance of the ChartService
+chart_service = ChartService(
+    features=FeatureCache(max_bytes=int(settings.CHART_FEATURE_CACHE_MAX_MB * 1024 * 1024))
+    if settings.CHART_FEATURE_CACHE_MAX_MB > 0 else None,
+)
@@ -0,0 +1,143 @@
+import asyncio
+import json
+import logging
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.core.jobs import Job, JobQueue, DONE, EVENT_BROADCAST, EVENT_FINISHED, EVENT_RESULT
+from app.models.strategy import StrategySchema
+from app.services.scan_service import apply_scan_job_result
+from app.services.websocket_manager import manager
+
+logger = logging.getLogger(__name__)
+
+_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    """스캔 작업 큐 싱글턴을 반환합니다. (SCAN_QUEUE_PATH의 SQLite 파일)"""
+    global _queue
+    if _queue is None:
+        _queue = JobQueue(settings.SCAN_QUEUE_PATH, max_attempts=settings.SCAN_JOB_MAX_ATTEMPTS)
+    return _queue
+
+
+class ScanJobRelay:
+    """
+    워커 프로세스가 작업 큐에 기록한 이벤트를 이 API 프로세스로 가져오는 릴레이.
+    - WebSocket 메시지는 그대로 이 프로세스의 연결들에 전송합니다.
+    - 작업 결과는 관심종목 저장소와 트리거 무장 상태에 반영합니다.
+    - 작업 종료는 `wait`로 기다리는 호출자(cron 스케줄러 등)에게 알립니다.
+    여러 API 프로세스가 각자 모든 이벤트를 읽으므로, 이벤트는 읽은 뒤 지우지 않고 보관 기간이 지나면 정리합니다.
+    """
+    def __init__(self, queue: JobQueue, poll_interval: float = 0.05, retention_seconds: float = 600.0):
+        self.queue = queue
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        self.last_event_id: Optional[int] = None
+        self._waiters: Dict[int, List[asyncio.Future]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def submit(self, kind: str, strategy: StrategySchema, **payload) -> int:
+        """스캔 작업을 큐에 넣고 작업 ID를 반환합니다."""
+        payload["strategy"] = strategy.model_dump(mode="json")
+        return await asyncio.to_thread(self.queue.enqueue, kind, payload)
+
+    async def wait(self, job_id: int, timeout: Optional[float] = None) -> Job:
+        """작업이 끝날 때까지 기다리고 최종 상태를 반환합니다. 릴레이가 실행 중이어야 합니다."""
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(job_id, []).append(future)
+        job = await asyncio.to_thread(self.queue.get, job_id)
+        # 등록하기 전에 이미 끝났을 수 있습니다.
+        if job is None or job.finished_at is None:
+            try:
+                await asyncio.wait_for(future, timeout)
+            finally:
+                waiters = self._waiters.get(job_id, [])
+                if future in waiters:
+                    waiters.remove(future)
+                if not waiters:
+                    self._waiters.pop(job_id, None)
+            job = await asyncio.to_thread(self.queue.get, job_id)
+        return job
+
+    async def poll_once(self) -> int:
+        """새 이벤트를 읽어 처리하고, 처리한 이벤트 수를 반환합니다."""
+        if self.last_event_id is None:
+            # 시작 전에 쌓인 이벤트는 이미 지난 것이므로 다시 보내지 않습니다.
+            self.last_event_id = await asyncio.to_thread(self.queue.last_event_id)
+        events = await asyncio.to_thread(self.queue.events_after, self.last_event_id)
+        for event_id, job_id, kind, body in events:
+            self.last_event_id = event_id
+            try:
+                if kind == EVENT_BROADCAST:
+                    await manager.broadcast(body)
+                elif kind == EVENT_RESULT:
+                    job = await asyncio.to_thread(self.queue.get, job_id)
+                    if job is not None:
+                        await apply_scan_job_result(job.payload, json.loads(body))
+                elif kind == EVENT_FINISHED:
+                    for future in self._waiters.pop(job_id, []):
+                        if not future.done():
+                            future.set_result(None)
+            except Exception as e:
+                logger.error(f"스캔 작업 {job_id} 이벤트 처리 중 오류: {e}", exc_info=True)
+        return len(events)
+
+    async def _run(self):
+        prune_every = max(1, int(60.0 / self.poll_interval))
+        polls = 0
+        while True:
+            try:
+                if not await self.poll_once():
+                    await asyncio.sleep(self.poll_interval)
+                polls += 1
+                if polls % prune_every == 0:
+                    await asyncio.to_thread(self.queue.prune, self.retention_seconds)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"스캔 작업 릴레이 오류: {e}", exc_info=True)
+                await asyncio.sleep(self.poll_interval)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+_relay: Optional[ScanJobRelay] = None
+
+
+def get_scan_job_relay() -> ScanJobRelay:
+    global _relay
+    if _relay is None:
+        _relay = ScanJobRelay(get_job_queue(), poll_interval=settings.SCAN_RELAY_POLL_SECONDS)
+    return _relay
+
+
+async def start_scan_job_relay():
+    get_scan_job_relay().start()
+
+
+async def stop_scan_job_relay():
+    global _relay
+    if _relay is not None:
+        await _relay.stop()
+        _relay = None
+
+
+async def run_scheduled_scan_job(strategy: StrategySchema):
+    """
+    스캔 워커 모드에서 스케줄러가 호출하는 작업: 1차+2차 스캔 작업을 큐에 넣고 끝날 때까지 기다립니다.
+    기다리는 동안 스케줄러는 같은 전략의 다음 실행을 건너뛰므로 전략별 동시 실행 1개 규칙이 유지됩니다.
+    """
+    relay = get_scan_job_relay()
+    job = await relay.wait(await relay.submit("scan", strategy))
+    if job.status != DONE:
+        raise RuntimeError(f"Scan job {job.id} {job.status}: {job.error}")
@@ -0,0 +1,57 @@
+from typing import Optional
+import json
+import logging
+
+from app.core.config import settings
+from app.core.brokers.base import BaseBroker
+from app.core.brokers.registry import create_broker
+from app.core.orders import OrderPipeline, OrderRecord
+from app.models.order import OrderSchema
+from app.services.portfolio_service import portfolio_service
+from app.services.websocket_manager import manager
+
+logger = logging.getLogger(__name__)
+
+_pipeline: Optional[OrderPipeline] = None
+
+
+def create_order_broker() -> BaseBroker:
+    """주문용 브로커를 생성합니다. `ORDER_BROKER=simulator`이면 로컬 모의 거래소를 사용합니다."""
+    return create_broker(settings.ORDER_BROKER)
+
+
+async def broadcast_order_update(record: OrderRecord):
+    """주문 상태 변경을 WebSocket으로 전송합니다."""
+    message = {
+        "event": "order_updated",
+        "payload": OrderSchema.from_record(record).model_dump(mode="json"),
+    }
+    await manager.broadcast(json.dumps(message))
+
+
+def get_order_pipeline() -> OrderPipeline:
+    """
+    주문 파이프라인 싱글턴을 반환합니다. 처음 호출될 때 실행 중인 이벤트 루프에서 워커를 시작합니다.
+    `RISK_CHECKS_ENABLED`이면 포트폴리오의 위험 한도 확인을 주문 전 단계로 연결합니다.
+    """
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = OrderPipeline(
+            create_order_broker(),
+            rate_per_second=settings.ORDER_RATE_PER_SECOND,
+            concurrency=settings.ORDER_CONCURRENCY,
+            fill_poll_interval=settings.ORDER_FILL_POLL_INTERVAL_SECONDS,
+            pre_trade=portfolio_service.portfolio.check_order if settings.RISK_CHECKS_ENABLED else None,
+        )
+        _pipeline.add_listener(broadcast_order_update)
+        if settings.RISK_CHECKS_ENABLED:
+            _pipeline.add_listener(portfolio_service.on_order_update)
+        _pipeline.start()
+    return _pipeline
+
+
+async def stop_order_pipeline():
+    global _pipeline
+    if _pipeline is not None:
+        await _pipeline.stop()
+        _pipeline = None
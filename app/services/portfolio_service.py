@@ -0,0 +1,87 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+from app.core.brokers.base import BaseBroker
+from app.core.config import settings
+from app.core.orders import OrderRecord
+from app.core.portfolio import Portfolio, RiskLimits
+
+logger = logging.getLogger(__name__)
+
+
+def risk_limits_from_settings() -> RiskLimits:
+    return RiskLimits(
+        max_order_value=settings.RISK_MAX_ORDER_VALUE,
+        max_position_fraction=settings.RISK_MAX_POSITION_FRACTION,
+        max_gross_exposure_fraction=settings.RISK_MAX_GROSS_EXPOSURE_FRACTION,
+        max_position_loss_fraction=settings.RISK_MAX_POSITION_LOSS_FRACTION,
+    )
+
+
+class PortfolioService:
+    """
+    주문 브로커의 잔고와 보유 종목 현재가(일괄 조회)로 포트폴리오를 주기적으로 다시 평가하는 서비스.
+    주문이 체결되면 다음 주기를 기다리지 않고 바로 잔고를 다시 읽습니다.
+    """
+    def __init__(self, portfolio: Optional[Portfolio] = None):
+        self.portfolio = portfolio or Portfolio(risk_limits_from_settings())
+        self.broker: Optional[BaseBroker] = None
+        self._task: Optional[asyncio.Task] = None
+        self._refresh_requested = asyncio.Event()
+        self._lock = asyncio.Lock()
+
+    async def refresh(self):
+        """잔고를 읽고 보유 종목의 현재가를 한 번에 조회하여 다시 평가합니다."""
+        if self.broker is None:
+            raise RuntimeError("PortfolioService has no broker.")
+        async with self._lock:
+            refresh = self.portfolio.begin_refresh()
+            response = await self.broker.get_balance()
+            if "error" in response:
+                raise RuntimeError(f"Balance lookup failed: {response['error']}")
+            self.portfolio.load_balances(response.get("all_balances") or [], refresh=refresh)
+            tickers = self.portfolio.tickers
+            if tickers:
+                self.portfolio.update_marks(await self.broker.get_current_prices(tickers))
+
+    async def on_order_update(self, record: OrderRecord):
+        """주문 파이프라인 리스너: 끝난 주문의 예약을 정리하고, 체결되었으면 잔고를 다시 읽도록 요청합니다."""
+        if not record.is_terminal:
+            return
+        self.portfolio.settle(record)
+        if record.executed_volume > 0 or record.status == "filled":
+            self._refresh_requested.set()
+
+    async def _loop(self, interval: float):
+        while True:
+            # 갱신 도중에 들어온 체결 알림이 지워지지 않도록 갱신 전에 비웁니다.
+            self._refresh_requested.clear()
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"포트폴리오 갱신 실패: {e}")
+            try:
+                await asyncio.wait_for(self._refresh_requested.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self, broker: BaseBroker, interval: float):
+        self.broker = broker
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop(interval))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return self.portfolio.snapshot()
+
+
+# Create a singleton instance of the PortfolioService
+portfolio_service = PortfolioService()
@@ -0,0 +1,55 @@
+import datetime
+import threading
+import uuid
+from collections import OrderedDict
+from typing import List, Optional
+
+from app.core.config import settings
+from app.models.scan_profile import ScanProfileSchema, ScanProfileSummary
+
+
+class ScanProfileStore:
+    """
+    최근 스캔 프로파일을 메모리에 보관합니다.
+    프로파일은 진단용이므로 개수 제한을 넘으면 가장 오래된 것부터 버립니다.
+    """
+    def __init__(self, max_profiles: int = 50):
+        self.max_profiles = max_profiles
+        self._profiles: "OrderedDict[str, ScanProfileSchema]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start(self, strategy_id: int, phase: str) -> ScanProfileSchema:
+        """실행 중 상태의 프로파일을 등록하고 반환합니다. 스캔이 끝나면 같은 객체가 결과로 채워집니다."""
+        profile = ScanProfileSchema(
+            id=uuid.uuid4().hex,
+            strategy_id=strategy_id,
+            phase=phase,
+            started_at=datetime.datetime.now(datetime.timezone.utc),
+        )
+        self.put(profile)
+        return profile
+
+    def put(self, profile: ScanProfileSchema):
+        with self._lock:
+            self._profiles[profile.id] = profile
+            self._profiles.move_to_end(profile.id)
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[ScanProfileSchema]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def list(self, strategy_id: int) -> List[ScanProfileSummary]:
+        """전략의 프로파일 요약을 최신순으로 반환합니다."""
+        with self._lock:
+            profiles = [p for p in reversed(self._profiles.values()) if p.strategy_id == strategy_id]
+        return [ScanProfileSummary(**p.model_dump(include=set(ScanProfileSummary.model_fields))) for p in profiles]
+
+    def clear(self):
+        with self._lock:
+            self._profiles.clear()
+
+
+# Create a singleton instance of the ScanProfileStore
+scan_profiles = ScanProfileStore(max_profiles=settings.SCAN_PROFILE_HISTORY)
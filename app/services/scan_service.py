@@ -0,0 +1,522 @@
+from app.models.strategy import StrategySchema
+from app.core.engine import ScanEngine, ScanReport, scan_deadline
+from app.core.clock import Clock
+from app.core.features import FeatureCache
+from app.core.brokers.base import BaseBroker
+from app.core.brokers.registry import create_broker
+from app.core.brokers.cached import CachingBroker
+from app.core.brokers.resilient import ResilientBroker
+from app.core.resilience import RetryPolicy
+from app.core.config import settings
+from app.core.logs import FIELDS_ATTR, log_sampled
+from app.services.websocket_manager import manager
+from app.services.candle_service import candle_service
+from app.services.trigger_service import triggered_symbols, ensure_triggered_symbols_loaded
+from app.services.profile_service import scan_profiles
+from app.core.metrics import SCAN_STAGE_SECONDS
+from app.core.candles import with_kst_datetime
+from app.core.profiling import ScanProfiler
+from app.models.scan_profile import ScanProfileSchema, PlanCapture, TickerTiming
+from app.models.dynamic_scan import BuilderStrategy, DynamicScanResponse
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import time
+import json
+import logging
+import polars as pl
+
+logger = logging.getLogger(__name__)
+
+# --- Mock/Temporary implementations ---
+# TODO: 플러그인 시스템을 통해 동적으로 로드해야 합니다.
+def moving_average(period: int):
+    # 파서는 인자를 float로 변환하므로 윈도 크기는 정수로 바꿔야 합니다.
+    return pl.col('close').rolling_mean(window_size=int(period))
+mock_indicators = {"ma": moving_average}
+
+# TODO: Redis와 같은 견고한 캐시/메시지 큐로 교체해야 합니다.
+watchlist_storage = {}
+
+# Create a singleton instance of the FeatureCache (전략 간에 공유하는 보조지표 계산 결과)
+feature_cache: Optional[FeatureCache] = (
+    FeatureCache(max_bytes=int(settings.FEATURE_CACHE_MAX_MB * 1024 * 1024)) if settings.FEATURE_CACHE_MAX_MB > 0 else None
+)
+# --- End of Mock/Temporary implementations ---
+
+# 스캔 이벤트(WebSocket 메시지)를 보낼 곳. 지정되지 않으면 이 프로세스의 WebSocket 연결로 바로 보내고,
+# 스캔 워커 프로세스(app.worker)에서는 작업마다 작업 큐로 보내도록 지정합니다.
+scan_event_sink: ContextVar[Optional[Callable[[str], Awaitable[None]]]] = ContextVar("scan_event_sink", default=None)
+
+
+async def publish_scan_event(message: str):
+    sink = scan_event_sink.get()
+    if sink is None:
+        await manager.broadcast(message)
+    else:
+        await sink(message)
+
+
+def log_scan_summary(strategy_name: str, report: ScanReport, **fields):
+    """
+    스캔 1회를 구조화 로그 레코드 하나로 남깁니다. (종목별 로그 대신 개수/소요 시간 요약)
+    평가하지 못한 종목이 있거나 부분 결과이면 WARNING, 아니면 INFO입니다.
+    """
+    level = logging.WARNING if report.failures or report.partial else logging.INFO
+    logger.log(
+        level, "%s 스캔 완료: '%s'", report.phase, strategy_name,
+        extra={FIELDS_ATTR: {"strategy": strategy_name, **report.summary(), **fields}},
+    )
+
+
+async def broadcast_scan_result(strategy_name: str, result_df: pl.DataFrame, report: Optional[ScanReport] = None):
+    """
+    Helper function to broadcast scan results via WebSocket.
+    스캔 보고서가 주어지면 평가하지 못한 종목과 사유를 `failed`로, 마감 시각 초과로 건너뛴 종목을 `skipped`로 함께 보냅니다.
+    `partial`이 참이면 일부 종목만 평가한 부분 결과입니다.
+    """
+    failed = report.failed_list() if report is not None else []
+    partial = report is not None and report.partial
+    if not result_df.is_empty() or failed or partial:
+        with SCAN_STAGE_SECONDS.time(stage="serialize"):
+            # 캔들 timestamp(epoch ms)는 화면 표시용 KST 시각으로 바꿔 보냅니다.
+            result_json = with_kst_datetime(result_df).write_json() if not result_df.is_empty() else "[]"
+            message = json.dumps({
+                "event": "scan_result_found",
+                "payload": {
+                    "strategy_name": strategy_name,
+                    "results": json.loads(result_json),
+                    "failed": failed,
+                    "partial": partial,
+                    "skipped": list(report.skipped) if report is not None else [],
+                }
+            })
+        await publish_scan_event(message)
+
+
+async def broadcast_scan_chunk(strategy_name: str, result_df: pl.DataFrame, report: ScanReport, total: int):
+    """2차 스캔 도중 한 묶음에서 조건을 만족한 종목을 바로 전송합니다. 최종 결과는 `scan_result_found`로 다시 보냅니다."""
+    message = json.dumps({
+        "event": "scan_result_chunk",
+        "payload": {
+            "strategy_name": strategy_name,
+            "results": json.loads(with_kst_datetime(result_df).write_json()),
+            "evaluated": report.scanned,
+            "total": total,
+        }
+    })
+    await publish_scan_event(message)
+
+
+async def broadcast_watchlist(strategy_name: str, watchlist: list[str], report: Optional[ScanReport] = None):
+    """Helper function to broadcast the watchlist via WebSocket."""
+    message = {
+        "event": "watchlist_updated",
+        "payload": {
+            "strategy_name": strategy_name,
+            "watchlist": watchlist,
+            "count": len(watchlist),
+            "failed": report.failed_list() if report is not None else [],
+        }
+    }
+    await publish_scan_event(json.dumps(message))
+
+
+@asynccontextmanager
+async def profile_scan(profile: Optional[ScanProfileSchema]):
+    """
+    프로파일이 지정되면 블록 실행 동안 ScanProfiler를 제공하고, 끝나면 결과를 프로파일에 기록합니다.
+    프로파일이 없으면 None을 제공하므로 일반 실행에는 추가 비용이 없습니다.
+    """
+    if profile is None:
+        yield None
+        return
+    profiler = ScanProfiler()
+    started = time.perf_counter()
+    try:
+        with profiler.profile_python():
+            yield profiler
+        profile.status = "completed"
+    except Exception as e:
+        profile.status = "failed"
+        profile.error = str(e)
+        raise
+    finally:
+        profile.duration_seconds = time.perf_counter() - started
+        profile.ticker_count = profiler.ticker_count
+        profile.python_stats = profiler.python_stats
+        profile.plans = [PlanCapture(**plan) for plan in profiler.plans]
+        profile.slowest_tickers = [TickerTiming(**timing) for timing in profiler.slowest_tickers()]
+        scan_profiles.put(profile)
+
+
+async def run_1st_scan_background(
+    strategy: StrategySchema,
+    profile: Optional[ScanProfileSchema] = None,
+    broker: Optional[BaseBroker] = None,
+    clock: Optional[Clock] = None,
+) -> List[str]:
+    """백그라운드에서 1차 스캔을 실행하고 관심종목을 반환합니다. 프로파일이 지정되면 실행 프로파일을 기록합니다."""
+    async with profile_scan(profile) as profiler:
+        broker = broker or create_scan_broker(strategy.broker)
+        engine = ScanEngine(broker=broker, indicators=mock_indicators, profiler=profiler, clock=clock)
+
+        watchlist = await engine.run_1st_scan(strategy.scan_logic)
+
+        watchlist_storage[strategy.id] = watchlist
+        log_scan_summary(strategy.name, engine.last_report, strategy_id=strategy.id)
+
+        await broadcast_watchlist(strategy.name, watchlist, engine.last_report)
+    return watchlist
+
+
+async def run_2nd_scan_background(
+    strategy: StrategySchema,
+    profile: Optional[ScanProfileSchema] = None,
+    broker: Optional[BaseBroker] = None,
+    clock: Optional[Clock] = None,
+    arm_triggers: bool = True,
+) -> Optional[pl.DataFrame]:
+    """
+    백그라운드에서 2차 스캔을 실행하고 결과를 반환합니다. 프로파일이 지정되면 실행 프로파일을 기록합니다.
+    스캔은 2차 스캔 봉이 닫히는 시각(또는 `deadline_seconds`)까지만 실행하고, 넘기면 부분 결과를 보냅니다.
+    종목은 `SCAN_CHUNK_SIZE`개 묶음으로 조회/평가하고, 묶음마다 만족한 종목을 `scan_result_chunk`로 바로 보냅니다.
+    `arm_triggers`가 거짓이면 트리거 종목 무장은 호출자에게 맡깁니다. (워커 프로세스는 API 프로세스가 무장)
+    """
+    watchlist = watchlist_storage.get(strategy.id)
+    if watchlist is None:
+        logger.warning("'%s'에 대한 2차 스캔을 시작할 수 없습니다. 먼저 1차 스캔을 실행해야 합니다.", strategy.name)
+        # TODO: 사용자에게 에러를 알리는 WebSocket 메시지 전송
+        return None
+
+    async with profile_scan(profile) as profiler:
+        broker = broker or create_scan_broker(strategy.broker)
+        engine = ScanEngine(
+            broker=broker, indicators=mock_indicators, profiler=profiler, clock=clock, features=feature_cache,
+            chunk_size=settings.SCAN_CHUNK_SIZE,
+            max_buffer_bytes=int(settings.SCAN_BUFFER_MAX_MB * 1024 * 1024),
+            fetch_concurrency=settings.SCAN_FETCH_CONCURRENCY,
+        )
+
+        deadline = scan_deadline(strategy.scan_logic, engine.clock.now())
+        chunks = []
+        async for chunk in engine.stream_2nd_scan(strategy.scan_logic, tickers=watchlist, deadline=deadline):
+            chunks.append(chunk)
+            await broadcast_scan_chunk(strategy.name, chunk, engine.last_report, len(watchlist))
+        results = pl.concat(chunks) if chunks else pl.DataFrame()
+        log_scan_summary(strategy.name, engine.last_report, strategy_id=strategy.id, universe=len(watchlist))
+
+        await broadcast_scan_result(strategy.name, results, engine.last_report)
+        if arm_triggers:
+            await arm_triggered_symbols(strategy, results)
+    return results
+
+
+def builder_expression_to_condition(expression: Any) -> Optional[str]:
+    """
+    전략 빌더의 식 트리를 조건 문자열로 변환합니다.
+    트리는 캔버스 항목을 왼쪽부터 차례로 묶은 것이므로, 중위 순회로 펼치면 캔버스의 토큰 순서가 됩니다.
+    """
+    tokens: List[str] = []
+
+    def walk(node: Any):
+        if node is None:
+            return
+        if isinstance(node, list):
+            for child in node:
+                walk(child)
+        elif isinstance(node, dict) and node.get("type") == "expression":
+            operands = node.get("operands") or []
+            walk(operands[0] if operands else None)
+            tokens.append(str(node["operator"]))
+            for operand in operands[1:]:
+                walk(operand)
+        elif isinstance(node, dict):
+            tokens.append(str(node["label"]))
+        else:
+            tokens.append(str(node))
+
+    walk(expression)
+    return " ".join(tokens) or None
+
+
+def builder_to_scan_logic(strategy: BuilderStrategy) -> Dict[str, Any]:
+    """전략 빌더의 저장되지 않은 전략을 scan_logic 형식으로 변환합니다."""
+    scan_logic: Dict[str, Any] = {"name": strategy.name}
+    first_condition = builder_expression_to_condition(strategy.first_scan_expression)
+    if first_condition:
+        scan_logic["1st_scan"] = {"condition": first_condition}
+    second_condition = builder_expression_to_condition(strategy.second_scan_expression)
+    if second_condition:
+        scan_logic["2nd_scan"] = {"condition": second_condition}
+    return scan_logic
+
+
+def _result_rows(result_df: pl.DataFrame) -> List[Dict[str, Any]]:
+    """스캔 결과를 JSON 행으로 변환하고, 전략 빌더 결과 표에서 쓰는 필드(code, price, ohlc)를 덧붙입니다."""
+    rows = with_kst_datetime(result_df).to_dicts() if not result_df.is_empty() else []
+    for row in rows:
+        row["code"] = row["ticker"].split("-", 1)[-1]
+        row["price"] = row.get("close")
+        if row.get("open") is not None and row.get("close") is not None:
+            row["ohlc"] = "bar_up" if row["close"] >= row["open"] else "bar_down"
+    return rows
+
+
+async def run_dynamic_scan(
+    scan_logic: Dict[str, Any],
+    broker_name: str = "upbit",
+    tickers: Optional[List[str]] = None,
+    max_tickers: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> DynamicScanResponse:
+    """
+    저장되지 않은 scan_logic을 즉시 실행합니다. (전략 빌더의 빠른 반복용)
+    - 스캔 브로커의 공유 캐시(시세/보조지표)를 사용하므로 최근 스캔된 종목은 거래소 호출 없이 평가됩니다.
+    - `tickers`를 지정하지 않으면 1차 스캔은 전체 종목 시장 데이터 스냅샷(`market_snapshots`)으로 평가하므로,
+      요청마다 전체 종목을 거래소에서 다시 조회하지 않습니다.
+    - 1차 스캔 통과 종목 중 거래대금 상위 `max_tickers`개만 2차 스캔하고, `timeout`초가 지나면 부분 결과를 반환합니다.
+    - 1차 스캔이 `timeout` 안에 끝나지 않으면 asyncio.TimeoutError가 발생합니다. (스냅샷 조회는 계속 진행되어 다음 요청에 사용)
+    """
+    started = time.perf_counter()
+    max_tickers = min(max_tickers or settings.DYNAMIC_SCAN_MAX_TICKERS, settings.DYNAMIC_SCAN_MAX_TICKERS)
+    timeout = min(timeout or settings.DYNAMIC_SCAN_TIMEOUT_SECONDS, settings.DYNAMIC_SCAN_TIMEOUT_SECONDS)
+
+    engine = ScanEngine(broker=create_scan_broker(broker_name), indicators=mock_indicators, features=feature_cache)
+    deadline = engine.clock.now() + timeout
+
+    async def first_phase() -> List[str]:
+        if tickers is not None:
+            return await engine.run_1st_scan(scan_logic, tickers=tickers)
+        universe, market_data = await market_snapshots.get(broker_name)
+        return await engine.run_1st_scan(scan_logic, tickers=universe, market_data=market_data)
+
+    watchlist = await asyncio.wait_for(first_phase(), timeout)
+    first_report = engine.last_report
+
+    candidates = watchlist[:max_tickers]
+    results = await engine.run_2nd_scan(scan_logic, tickers=candidates, deadline=deadline)
+    report = engine.last_report
+    log_scan_summary(scan_logic.get("name") or "dynamic", report, universe=first_report.scanned)
+
+    return DynamicScanResponse(
+        results=_result_rows(results),
+        scanned=report.scanned,
+        matched=report.matched,
+        universe=first_report.scanned,
+        partial=report.partial or len(watchlist) > len(candidates),
+        skipped=report.skipped + watchlist[len(candidates):],
+        failed=first_report.failed_list() + report.failed_list(),
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 3),
+    )
+
+
+async def run_scheduled_scan(
+    strategy: StrategySchema,
+    broker: Optional[BaseBroker] = None,
+    clock: Optional[Clock] = None,
+):
+    """스케줄러가 호출하는 작업: 1차 스캔 후 2차 스캔을 이어서 실행합니다."""
+    await run_1st_scan_background(strategy, broker=broker, clock=clock)
+    await run_2nd_scan_background(strategy, broker=broker, clock=clock)
+
+
+async def execute_scan_job(kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    스캔 워커가 실행하는 작업. (app.worker)
+    - `scan_1st`: 1차 스캔 → `{"watchlist": [...]}`
+    - `scan_2nd`: 작업에 담긴 관심종목으로 2차 스캔 → `{"matched": [...]}`
+    - `scan`: 1차 스캔 후 2차 스캔 (cron 스케줄 실행) → 두 결과를 모두 반환
+    진행 중 메시지는 `scan_event_sink`로, 관심종목 저장과 트리거 무장은 반환값으로 API 프로세스에 넘깁니다.
+    """
+    strategy = StrategySchema.model_validate(payload["strategy"])
+    result: Dict[str, Any] = {"strategy_id": strategy.id}
+    if kind not in ("scan_1st", "scan_2nd", "scan"):
+        raise ValueError(f"Unknown scan job kind: {kind}")
+    if kind in ("scan_1st", "scan"):
+        result["watchlist"] = await run_1st_scan_background(strategy)
+    else:
+        watchlist_storage[strategy.id] = payload["watchlist"]
+    if kind in ("scan_2nd", "scan"):
+        results = await run_2nd_scan_background(strategy, arm_triggers=False)
+        result["matched"] = results["ticker"].to_list() if results is not None and not results.is_empty() else []
+    return result
+
+
+async def apply_scan_job_result(payload: Dict[str, Any], result: Dict[str, Any]):
+    """워커가 끝낸 스캔 작업의 결과를 이 프로세스의 관심종목 저장소와 트리거 무장 상태에 반영합니다."""
+    strategy = StrategySchema.model_validate(payload["strategy"])
+    if "watchlist" in result:
+        watchlist_storage[strategy.id] = result["watchlist"]
+    if result.get("matched"):
+        await arm_triggered_symbols(strategy, pl.DataFrame({"ticker": result["matched"]}))
+
+
+async def arm_triggered_symbols(strategy: StrategySchema, result_df: pl.DataFrame):
+    """
+    트리거 전략(scan_logic에 `trigger` 설정이 있는 전략)이면 검출된 종목을 무장시킵니다.
+    예: `{"trigger": {"ttl_seconds": 3600}}`
+    """
+    trigger_config = strategy.scan_logic.get("trigger")
+    if not trigger_config or result_df.is_empty():
+        return
+    await ensure_triggered_symbols_loaded()
+    tickers = result_df["ticker"].to_list()
+    triggered_symbols.arm(strategy.id, tickers, ttl_seconds=float(trigger_config.get("ttl_seconds", 3600)))
+    logger.info("'%s' 트리거: %d개 종목 무장", strategy.name, len(tickers))
+
+
+class ActionScannerManager:
+    """
+    액션 전략별 고빈도 스캔 루프를 관리합니다. (PRD Phase 11 '액션 스캐너')
+    액션 전략의 scan_logic 예: `{"action": {"trigger_strategy_id": 1, "interval_seconds": 5}, "2nd_scan": {...}}`
+    각 루프는 트리거 전략이 무장시킨 종목만 재평가하므로, 한 주기의 비용은 무장 종목 수에 비례합니다.
+    중지는 강제 취소가 아닌 중지 플래그를 확인하는 협력적 방식으로 처리합니다. (PRD 8.2)
+    """
+    def __init__(self):
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self._stop_events: Dict[int, asyncio.Event] = {}
+
+    def is_running(self, strategy_id: int) -> bool:
+        task = self._tasks.get(strategy_id)
+        return task is not None and not task.done()
+
+    async def _run(self, strategy: StrategySchema, stop_event: asyncio.Event):
+        action_config = strategy.scan_logic["action"]
+        trigger_strategy_id = int(action_config["trigger_strategy_id"])
+        interval = float(action_config.get("interval_seconds", 5))
+        disarm_on_match = action_config.get("disarm_on_match", True)
+
+        await ensure_triggered_symbols_loaded()
+        engine = ScanEngine(
+            broker=create_scan_broker(strategy.broker), indicators=mock_indicators, features=feature_cache,
+        )
+        logger.info(f"액션 스캐너 시작: '{strategy.name}' (트리거 전략 ID {trigger_strategy_id}, {interval}초 주기)")
+
+        while not stop_event.is_set():
+            armed = triggered_symbols.active(trigger_strategy_id)
+            if armed:
+                try:
+                    results = await engine.run_2nd_scan(strategy.scan_logic, tickers=armed)
+                    if not results.is_empty():
+                        await broadcast_scan_result(strategy.name, results)
+                        if disarm_on_match:
+                            triggered_symbols.disarm(trigger_strategy_id, results["ticker"].to_list())
+                except Exception as e:
+                    logger.error(f"액션 스캐너 '{strategy.name}' 실행 중 오류: {e}", exc_info=True)
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+        logger.info(f"액션 스캐너 중지: '{strategy.name}'")
+
+    def start(self, strategy: StrategySchema):
+        if self.is_running(strategy.id):
+            return
+        stop_event = asyncio.Event()
+        self._stop_events[strategy.id] = stop_event
+        self._tasks[strategy.id] = asyncio.create_task(self._run(strategy, stop_event))
+
+    async def stop(self, strategy_id: int):
+        stop_event = self._stop_events.pop(strategy_id, None)
+        task = self._tasks.pop(strategy_id, None)
+        if stop_event is not None:
+            stop_event.set()
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def stop_all(self):
+        for strategy_id in list(self._tasks):
+            await self.stop(strategy_id)
+
+
+# Create a singleton instance of the ActionScannerManager
+action_scanners = ActionScannerManager()
+
+
+# 브로커 이름 → 스캔 작업들이 공유하는 브로커 (시세 조회 캐시 포함)
+_scan_brokers: Dict[str, BaseBroker] = {}
+
+
+def create_scan_broker(name: str = "upbit") -> BaseBroker:
+    """
+    스캔 작업용 브로커를 전략의 브로커 이름(Strategy.broker)으로 생성합니다.
+    실시간 봉 집계(Upbit 체결 기반)가 실행 중이면 Upbit 브로커는 메모리 내 봉을 사용합니다.
+    시세 조회는 브로커별로 공유하는 캐시(CachingBroker)를 거치므로, 동시에 실행된 스캔들의 같은 요청은 한 번만 전송됩니다.
+    캐시 아래에서는 재시도/서킷 브레이커/헤지 요청(ResilientBroker)이 일시적인 거래소 오류를 흡수합니다.
+    """
+    key = name.lower()
+    broker = _scan_brokers.get(key)
+    if broker is None:
+        broker = ResilientBroker(
+            create_broker(key),
+            name=key,
+            retry=RetryPolicy(
+                max_attempts=settings.BROKER_RETRY_ATTEMPTS,
+                base_delay=settings.BROKER_RETRY_BASE_DELAY_SECONDS,
+                max_delay=settings.BROKER_RETRY_MAX_DELAY_SECONDS,
+            ),
+            failure_threshold=settings.BROKER_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=settings.BROKER_CIRCUIT_RESET_SECONDS,
+            hedge_delay=settings.BROKER_HEDGE_DELAY_SECONDS,
+        )
+        if settings.BROKER_CACHE_ENABLED:
+            broker = CachingBroker(
+                broker, ttl=settings.BROKER_CACHE_TTL_SECONDS, max_entries=settings.BROKER_CACHE_MAX_ENTRIES,
+            )
+        _scan_brokers[key] = broker
+    return candle_service.wrap(broker) if key == "upbit" else broker
+
+
+class MarketSnapshotCache:
+    """
+    즉시 실행 스캔의 1차 스캔용 전체 종목 시장 데이터 스냅샷. (브로커마다 종목 목록 + 종목별 최근 일봉)
+    - `ttl_seconds`가 지나기 전에는 그대로 재사용하고, 지난 스냅샷은 그대로 반환하면서 백그라운드에서 갱신합니다.
+    - 갱신은 브로커마다 하나만 실행하며, 요청의 제한 시간으로 취소되지 않습니다. (처음 요청이 시간 초과되어도 다음 요청에 사용)
+    - 스캔 브로커가 바뀌면(예: 테스트에서 교체) 이전 브로커의 스냅샷은 사용하지 않습니다.
+    """
+    def __init__(self, ttl_seconds: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = settings.DYNAMIC_SCAN_SNAPSHOT_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.clock = clock
+        # 브로커 이름 -> (스냅샷을 만든 스캔 브로커, 조회 시각, 종목 목록, 시장 데이터)
+        self._snapshots: Dict[str, Tuple[Any, float, List[str], pl.DataFrame]] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+
+    async def _refresh(self, key: str, source: Any, broker: BaseBroker) -> Tuple[List[str], pl.DataFrame]:
+        tickers = await broker.get_tickers()
+        market_data = await broker.get_market_data_for_1st_scan(tickers)
+        self._snapshots[key] = (source, self.clock(), tickers, market_data)
+        return tickers, market_data
+
+    def _on_refreshed(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            log_sampled(logger, logging.WARNING, "scan.snapshot_failed", "시장 데이터 스냅샷 갱신 실패: %s", task.exception())
+
+    def _start_refresh(self, key: str, source: Any, broker: BaseBroker) -> asyncio.Task:
+        task = self._refreshing.get(key)
+        if task is None or task.done():
+            task = self._refreshing[key] = asyncio.create_task(self._refresh(key, source, broker))
+            task.add_done_callback(self._on_refreshed)
+        return task
+
+    async def get(self, broker_name: str) -> Tuple[List[str], pl.DataFrame]:
+        """브로커의 (종목 목록, 시장 데이터) 스냅샷을 반환합니다. 스냅샷이 없으면 조회가 끝날 때까지 기다립니다."""
+        key = broker_name.lower()
+        broker = create_scan_broker(key)
+        source = _scan_brokers[key]
+        snapshot = self._snapshots.get(key)
+        if snapshot is not None and snapshot[0] is source:
+            _, fetched_at, tickers, market_data = snapshot
+            if self.clock() - fetched_at >= self.ttl_seconds:
+                self._start_refresh(key, source, broker)
+            return tickers, market_data
+        return await asyncio.shield(self._start_refresh(key, source, broker))
+
+    def clear(self):
+        self._snapshots.clear()
+        self._refreshing.clear()
+
+
+# Create a singleton instance of the MarketSnapshotCache
+market_snapshots = MarketSnapshotCache()
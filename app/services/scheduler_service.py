@@ -0,0 +1,242 @@
+import asyncio
+import datetime
+import logging
+from dataclasses import dataclass
+from functools import partial
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+
+from app.core.clock import Clock, SimulatedClock
+from app.core.config import settings
+from app.core.cron import CronSchedule
+from app.db.session import AsyncSessionLocal
+from app.models.strategy import Strategy, StrategySchema
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _ScheduledStrategy:
+    strategy: StrategySchema
+    schedule: CronSchedule
+    next_fire: float
+    task: Optional[asyncio.Task] = None
+
+
+@dataclass
+class SchedulerStats:
+    """스케줄러 실행 통계. 지연(lateness)은 예정 시각부터 실제 실행 시작까지의 시계 기준 시간(초)입니다."""
+    fired: int = 0
+    completed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    max_lateness: float = 0.0
+    total_lateness: float = 0.0
+
+    def as_dict(self) -> dict:
+        started = self.completed + self.failed
+        return {
+            "fired": self.fired,
+            "completed": self.completed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "max_lateness_seconds": self.max_lateness,
+            "avg_lateness_seconds": self.total_lateness / started if started else 0.0,
+        }
+
+
+class StrategyScheduler:
+    """
+    활성 전략을 `cron_schedule`에 따라 실행하는 스케줄러. (PRD Phase 5)
+    - 전략별로 동시에 하나의 실행만 허용합니다. 이전 실행이 끝나지 않았으면 이번 실행은 건너뜁니다. (APScheduler `max_instances=1`)
+    - 밀린 실행은 한 번으로 합쳐서 처리합니다. (coalesce)
+    - 시계를 주입받으므로 SimulatedClock으로 과거 데이터를 가속 재생할 수 있습니다.
+    """
+    def __init__(
+        self,
+        run_job: Callable[[StrategySchema], Awaitable[None]],
+        clock: Optional[Clock] = None,
+        loader: Optional[Callable[[], Awaitable[List[StrategySchema]]]] = None,
+        refresh_interval: float = 60.0,
+    ):
+        self.run_job = run_job
+        self.clock = clock or Clock()
+        self.loader = loader
+        self.refresh_interval = refresh_interval
+        self.stats = SchedulerStats()
+        self._entries: Dict[int, _ScheduledStrategy] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._stop_event = asyncio.Event()
+
+    def set_strategies(self, strategies: Iterable[StrategySchema]):
+        """스케줄할 전략 목록을 교체합니다. 실행 중인 작업과 다음 실행 시각은 cron 식이 같으면 유지됩니다."""
+        now = self.clock.now()
+        entries: Dict[int, _ScheduledStrategy] = {}
+        for strategy in strategies:
+            if not strategy.is_active or not strategy.cron_schedule:
+                continue
+            previous = self._entries.get(strategy.id)
+            if previous is not None and previous.schedule.expression == strategy.cron_schedule:
+                previous.strategy = strategy
+                entries[strategy.id] = previous
+                continue
+            try:
+                schedule = CronSchedule(strategy.cron_schedule)
+            except ValueError as e:
+                logger.warning(f"'{strategy.name}'의 cron 식이 올바르지 않아 스케줄하지 않습니다: {e}")
+                continue
+            entries[strategy.id] = _ScheduledStrategy(strategy, schedule, schedule.next_after(now))
+        self._entries = entries
+
+    def next_fire_times(self) -> Dict[int, float]:
+        return {strategy_id: entry.next_fire for strategy_id, entry in self._entries.items()}
+
+    async def _run_entry(self, entry: _ScheduledStrategy, scheduled_at: float):
+        lateness = max(0.0, self.clock.now() - scheduled_at)
+        self.stats.max_lateness = max(self.stats.max_lateness, lateness)
+        self.stats.total_lateness += lateness
+        try:
+            await self.run_job(entry.strategy)
+            self.stats.completed += 1
+        except Exception as e:
+            self.stats.failed += 1
+            logger.error(f"스케줄 실행 '{entry.strategy.name}' 실패: {e}", exc_info=True)
+
+    def _fire_due(self, now: float):
+        for entry in self._entries.values():
+            if entry.next_fire > now:
+                continue
+            scheduled_at = entry.next_fire
+            entry.next_fire = entry.schedule.next_after(now)
+            self.stats.fired += 1
+            if entry.task is not None and not entry.task.done():
+                self.stats.skipped += 1
+                logger.warning(f"'{entry.strategy.name}'의 이전 실행이 끝나지 않아 이번 실행을 건너뜁니다.")
+                continue
+            entry.task = asyncio.create_task(self._run_entry(entry, scheduled_at))
+
+    async def run(self, until: Optional[float] = None):
+        """
+        중지되거나 시계가 `until`(epoch 초)에 도달할 때까지 스케줄을 실행합니다.
+        `until`에 도달하면 실행 중인 작업이 모두 끝날 때까지 기다린 뒤 반환합니다.
+        """
+        next_refresh = self.clock.now()
+        while not self._stop_event.is_set():
+            now = self.clock.now()
+            if self.loader is not None and now >= next_refresh:
+                try:
+                    self.set_strategies(await self.loader())
+                except Exception as e:
+                    logger.error(f"스케줄 대상 전략 로드 실패: {e}", exc_info=True)
+                next_refresh = now + self.refresh_interval
+            if until is not None and now >= until:
+                break
+            self._fire_due(now)
+
+            wake_at = min([e.next_fire for e in self._entries.values()], default=now + self.refresh_interval)
+            if self.loader is not None:
+                wake_at = min(wake_at, next_refresh)
+            if until is not None:
+                wake_at = min(wake_at, until)
+            try:
+                await asyncio.wait_for(
+                    self._stop_event.wait(), timeout=max(0.0, wake_at - self.clock.now()) / self.clock.speed
+                )
+            except asyncio.TimeoutError:
+                pass
+
+        running = [e.task for e in self._entries.values() if e.task is not None and not e.task.done()]
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._stop_event.clear()
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        self._stop_event.set()
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+async def load_scheduled_strategies() -> List[StrategySchema]:
+    """cron 스케줄이 있는 활성 전략을 DB에서 읽어옵니다."""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Strategy)
+            .where(Strategy.is_active.is_(True), Strategy.cron_schedule.is_not(None))
+            .order_by(Strategy.id)
+        )
+        return [StrategySchema.model_validate(s) for s in result.scalars().all()]
+
+
+def _parse_time(value: Optional[str], default: float) -> float:
+    if not value:
+        return default
+    parsed = datetime.datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone(datetime.timedelta(hours=9)))
+    return parsed.timestamp()
+
+
+def create_replay_scheduler(
+    data_dir: str,
+    speed: float,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    loader: Optional[Callable[[], Awaitable[List[StrategySchema]]]] = None,
+):
+    """
+    과거 봉 디렉터리를 가속 재생하는 스케줄러를 만듭니다. 스캔은 ReplayBroker로 실행되고 결과는 평소처럼 전송됩니다.
+    (스케줄러, 재생 종료 시각(epoch 초)) 튜플을 반환합니다. 시작/종료 시각은 ISO 형식이며 시간대가 없으면 KST로 해석합니다.
+    """
+    from app.core.brokers.replay import load_candle_directory, ReplayBroker
+    from app.services.scan_service import run_scheduled_scan
+
+    candles = load_candle_directory(data_dir)
+    # 데이터 범위를 먼저 구한 뒤 시작 시각에 맞춘 시계로 브로커를 만듭니다.
+    first, last = ReplayBroker(candles, Clock()).time_range()
+    clock = SimulatedClock(_parse_time(start, first), speed)
+    broker = ReplayBroker(candles, clock)
+    scheduler = StrategyScheduler(
+        partial(run_scheduled_scan, broker=broker, clock=clock),
+        clock=clock,
+        loader=loader or load_scheduled_strategies,
+        refresh_interval=settings.SCHEDULER_REFRESH_SECONDS * speed,
+    )
+    return scheduler, _parse_time(end, last)
+
+
+_scheduler: Optional[StrategyScheduler] = None
+
+
+async def start_scheduler():
+    """
+    cron 스케줄러를 시작합니다. `REPLAY_DATA_DIR`이 지정되면 실제 시장 대신 과거 데이터를 가속 재생합니다.
+    스캔 워커 모드이면 스캔을 작업 큐에 넣고 워커가 끝낼 때까지 기다립니다. (리플레이는 항상 이 프로세스에서 실행)
+    """
+    global _scheduler
+    if settings.REPLAY_DATA_DIR:
+        _scheduler, _ = create_replay_scheduler(
+            settings.REPLAY_DATA_DIR, settings.REPLAY_SPEED, settings.REPLAY_START, settings.REPLAY_END,
+        )
+        logger.info(f"리플레이 모드로 스케줄러를 시작합니다. ({settings.REPLAY_SPEED}배속, 데이터: {settings.REPLAY_DATA_DIR})")
+    else:
+        if settings.SCAN_WORKERS_ENABLED:
+            from app.services.job_service import run_scheduled_scan_job as run_scheduled_scan
+        else:
+            from app.services.scan_service import run_scheduled_scan
+        _scheduler = StrategyScheduler(
+            run_scheduled_scan, loader=load_scheduled_strategies, refresh_interval=settings.SCHEDULER_REFRESH_SECONDS,
+        )
+    _scheduler.start()
+
+
+async def stop_scheduler():
+    global _scheduler
+    if _scheduler is not None:
+        await _scheduler.stop()
+        _scheduler = None
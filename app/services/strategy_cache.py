@@ -0,0 +1,139 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """
+    캐시에 저장되는 한 건의 응답 스냅샷.
+    `data`는 Pydantic 스키마(또는 그 리스트), `body`는 미리 직렬화된 JSON 바이트입니다.
+    """
+    data: Any
+    body: bytes
+    etag: str
+    expires_at: float
+
+
+def make_etag(body: bytes) -> str:
+    """직렬화된 응답 본문으로부터 강한(strong) ETag를 계산합니다."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    `If-None-Match` 헤더 값이 주어진 ETag와 일치하는지 확인합니다.
+    여러 값(쉼표 구분), `*`, 약한 비교(`W/` 접두사)를 모두 지원합니다.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class StrategyCache:
+    """
+    프로세스 내(in-process) 전략 캐시.
+    단건 조회는 전략 ID로, 목록 조회는 (skip, limit) 같은 조회 키로 저장하며,
+    생성/수정/삭제 시 서비스 계층에서 무효화합니다.
+    단건/목록 캐시는 각각 `max_entries`개까지 보관하며, 가장 오래 사용되지 않은 항목부터 버립니다. (LRU)
+    무효화할 때마다 세대(generation)를 올리므로, 무효화 전에 DB 조회를 시작한 요청은 `generation`을 넘겨
+    이전 데이터를 캐시에 다시 넣지 못하게 합니다.
+    백그라운드 스캔 작업이 스레드 풀에서 접근하므로 모든 연산은 락으로 보호됩니다.
+    """
+    def __init__(self, ttl_seconds: float, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._items: "OrderedDict[int, CacheEntry]" = OrderedDict()
+        self._lists: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+
+    @property
+    def generation(self) -> int:
+        """현재 세대. DB 조회 전에 읽어 두었다가 `put_item`/`put_list`에 넘깁니다."""
+        with self._lock:
+            return self._generation
+
+    def _is_fresh(self, entry: Optional[CacheEntry]) -> bool:
+        return entry is not None and entry.expires_at > time.monotonic()
+
+    def _build_entry(self, data: Any, body: bytes) -> CacheEntry:
+        return CacheEntry(
+            data=data,
+            body=body,
+            etag=make_etag(body),
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+
+    def _get(self, entries: "OrderedDict[Hashable, CacheEntry]", key: Hashable) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = entries.get(key)
+            if self._is_fresh(entry):
+                entries.move_to_end(key)
+                return entry
+            entries.pop(key, None)
+            return None
+
+    def _put(
+        self, entries: "OrderedDict[Hashable, CacheEntry]", key: Hashable, data: Any, body: bytes,
+        generation: Optional[int],
+    ) -> CacheEntry:
+        entry = self._build_entry(data, body)
+        if self.ttl_seconds > 0:
+            with self._lock:
+                # 조회를 시작한 뒤에 무효화되었으면 이전 데이터이므로 저장하지 않습니다.
+                if generation is not None and generation != self._generation:
+                    return entry
+                entries[key] = entry
+                entries.move_to_end(key)
+                while len(entries) > self.max_entries:
+                    entries.popitem(last=False)
+        return entry
+
+    def get_item(self, strategy_id: int) -> Optional[CacheEntry]:
+        return self._get(self._items, strategy_id)
+
+    def put_item(self, strategy_id: int, data: Any, body: bytes, generation: Optional[int] = None) -> CacheEntry:
+        return self._put(self._items, strategy_id, data, body, generation)
+
+    def get_list(self, key: Hashable) -> Optional[CacheEntry]:
+        return self._get(self._lists, key)
+
+    def put_list(self, key: Hashable, data: Any, body: bytes, generation: Optional[int] = None) -> CacheEntry:
+        return self._put(self._lists, key, data, body, generation)
+
+    def invalidate(self, strategy_id: Optional[int] = None):
+        """
+        특정 전략의 단건 캐시와 모든 목록 캐시를 무효화합니다.
+        `strategy_id`가 없으면 목록 캐시만 비웁니다 (예: 새 전략 생성).
+        """
+        with self._lock:
+            self._generation += 1
+            if strategy_id is not None:
+                self._items.pop(strategy_id, None)
+            self._lists.clear()
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._items.clear()
+            self._lists.clear()
+
+
+# Create a singleton instance of the StrategyCache
+strategy_cache = StrategyCache(
+    ttl_seconds=settings.STRATEGY_CACHE_TTL_SECONDS, max_entries=settings.STRATEGY_CACHE_MAX_ENTRIES,
+)
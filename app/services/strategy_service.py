@@ -1,17 +1,109 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Sequence, Tuple, Dict, Any, AsyncIterator, Set
+from pydantic import TypeAdapter, ValidationError
 
-from app.models.strategy import Strategy, StrategyCreate, StrategyUpdate
+from app.models.strategy import (
+    Strategy, StrategyCreate, StrategyUpdate, StrategySchema,
+    StrategyBatchOperation, StrategyBatchItemResult,
+)
+from app.services.strategy_cache import strategy_cache, CacheEntry
 
-def get_strategy(db: Session, strategy_id: int) -> Optional[Strategy]:
+_strategy_list_adapter = TypeAdapter(List[StrategySchema])
+
+# 경량 목록 조회에서 선택할 수 있는 필드와 기본 필드 (scan_logic은 요청 시에만 포함)
+STRATEGY_LIST_FIELDS = (
+    "id", "name", "broker", "market", "description", "scan_logic",
+    "is_active", "cron_schedule", "created_at", "updated_at",
+)
+DEFAULT_STRATEGY_LIST_FIELDS = tuple(f for f in STRATEGY_LIST_FIELDS if f != "scan_logic")
+
+# 일괄 처리 한 번에 허용하는 최대 항목 수, 가져오기 요청 본문의 최대 크기, 내보내기 시 한 번에 읽어오는 행 수
+MAX_BATCH_ITEMS = 5000
+MAX_IMPORT_BYTES = 16 * 1024 * 1024
+EXPORT_BATCH_SIZE = 500
+
+# NULL을 허용하지 않는 컬럼. 수정 요청에서 명시적인 null은 flush 전에 항목별 오류로 거부합니다.
+NON_NULLABLE_FIELDS = frozenset(
+    column.name for column in Strategy.__table__.columns if not column.nullable and not column.primary_key
+)
+
+async def get_strategy(db: AsyncSession, strategy_id: int) -> Optional[Strategy]:
     """ID로 특정 전략을 조회합니다."""
-    return db.query(Strategy).filter(Strategy.id == strategy_id).first()
+    result = await db.execute(select(Strategy).where(Strategy.id == strategy_id))
+    return result.scalar_one_or_none()
 
-def get_strategies(db: Session, skip: int = 0, limit: int = 100) -> List[Strategy]:
+async def get_strategies(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Strategy]:
     """모든 전략의 목록을 조회합니다."""
-    return db.query(Strategy).offset(skip).limit(limit).all()
+    result = await db.execute(select(Strategy).order_by(Strategy.id).offset(skip).limit(limit))
+    return list(result.scalars().all())
+
+async def list_strategies_page(
+    db: AsyncSession,
+    *,
+    cursor: Optional[int] = None,
+    limit: int = 100,
+    fields: Sequence[str] = DEFAULT_STRATEGY_LIST_FIELDS,
+    is_active: Optional[bool] = None,
+    broker: Optional[str] = None,
+    market: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """
+    키셋(id) 페이지네이션으로 전략 목록을 조회합니다.
+    요청한 컬럼만 SELECT하므로 scan_logic을 요청하지 않으면 JSON 컬럼을 읽지 않습니다.
+    `cursor`는 이전 페이지의 마지막 id이며, 다음 페이지가 있으면 그 cursor를 함께 반환합니다.
+    """
+    unknown = [f for f in fields if f not in STRATEGY_LIST_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    # 다음 cursor 계산을 위해 id는 항상 포함합니다.
+    selected = ["id"] + [f for f in dict.fromkeys(fields) if f != "id"]
+    stmt = select(*(getattr(Strategy, f) for f in selected))
+    if cursor is not None:
+        stmt = stmt.where(Strategy.id > cursor)
+    if is_active is not None:
+        stmt = stmt.where(Strategy.is_active == is_active)
+    if broker is not None:
+        stmt = stmt.where(Strategy.broker == broker)
+    if market is not None:
+        stmt = stmt.where(Strategy.market == market)
+    # 한 건을 더 조회하여 다음 페이지 존재 여부를 판단합니다.
+    stmt = stmt.order_by(Strategy.id).limit(limit + 1)
+
+    rows = (await db.execute(stmt)).mappings().all()
+    items = [dict(row) for row in rows[:limit]]
+    next_cursor = items[-1]["id"] if len(rows) > limit else None
+    return items, next_cursor
 
-def create_strategy(db: Session, strategy: StrategyCreate) -> Strategy:
+async def get_cached_strategy(db: AsyncSession, strategy_id: int) -> Optional[CacheEntry]:
+    """
+    캐시를 거쳐 특정 전략을 조회합니다 (read-through).
+    캐시에 있으면 DB를 조회하지 않으며, 반환값의 `data`는 세션과 분리된 StrategySchema입니다.
+    """
+    entry = strategy_cache.get_item(strategy_id)
+    if entry is not None:
+        return entry
+    generation = strategy_cache.generation
+    db_strategy = await get_strategy(db, strategy_id)
+    if db_strategy is None:
+        return None
+    schema = StrategySchema.model_validate(db_strategy)
+    return strategy_cache.put_item(strategy_id, schema, schema.model_dump_json().encode(), generation)
+
+async def get_cached_strategies(db: AsyncSession, skip: int = 0, limit: int = 100) -> CacheEntry:
+    """캐시를 거쳐 전략 목록을 조회합니다. 직렬화된 JSON 본문도 함께 캐시됩니다."""
+    key = (skip, limit)
+    entry = strategy_cache.get_list(key)
+    if entry is not None:
+        return entry
+    generation = strategy_cache.generation
+    strategies = await get_strategies(db, skip=skip, limit=limit)
+    schemas = [StrategySchema.model_validate(s) for s in strategies]
+    return strategy_cache.put_list(key, schemas, _strategy_list_adapter.dump_json(schemas), generation)
+
+async def create_strategy(db: AsyncSession, strategy: StrategyCreate) -> Strategy:
     """새로운 전략을 생성합니다."""
     db_strategy = Strategy(
         name=strategy.name,
@@ -23,26 +115,224 @@ def create_strategy(db: Session, strategy: StrategyCreate) -> Strategy:
         cron_schedule=strategy.cron_schedule
     )
     db.add(db_strategy)
-    db.commit()
-    db.refresh(db_strategy)
+    await db.commit()
+    await db.refresh(db_strategy)
+    strategy_cache.invalidate()
     return db_strategy
 
-def update_strategy(db: Session, strategy_id: int, strategy_update: StrategyUpdate) -> Optional[Strategy]:
+async def update_strategy(db: AsyncSession, strategy_id: int, strategy_update: StrategyUpdate) -> Optional[Strategy]:
     """기존 전략을 수정합니다."""
-    db_strategy = get_strategy(db, strategy_id)
+    db_strategy = await get_strategy(db, strategy_id)
     if db_strategy:
         # Pydantic V2에 맞게 .dict()를 .model_dump()로 변경
         update_data = strategy_update.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_strategy, key, value)
-        db.commit()
-        db.refresh(db_strategy)
+        await db.commit()
+        await db.refresh(db_strategy)
+        strategy_cache.invalidate(strategy_id)
     return db_strategy
 
-def delete_strategy(db: Session, strategy_id: int) -> Optional[Strategy]:
+async def delete_strategy(db: AsyncSession, strategy_id: int) -> Optional[Strategy]:
     """전략을 삭제합니다."""
-    db_strategy = get_strategy(db, strategy_id)
+    db_strategy = await get_strategy(db, strategy_id)
     if db_strategy:
-        db.delete(db_strategy)
-        db.commit()
+        await db.delete(db_strategy)
+        await db.commit()
+        strategy_cache.invalidate(strategy_id)
     return db_strategy
+
+def _format_validation_error(e: ValidationError) -> str:
+    """Pydantic 검증 오류를 항목별 결과에 담기 좋은 한 줄 메시지로 변환합니다."""
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in err['loc']) or 'data'}: {err['msg']}" for err in e.errors()
+    )
+
+async def _load_by_ids(db: AsyncSession, ids: Set[int]) -> Dict[int, Strategy]:
+    if not ids:
+        return {}
+    result = await db.execute(select(Strategy).where(Strategy.id.in_(ids)))
+    return {s.id: s for s in result.scalars()}
+
+async def _load_ids_by_name(db: AsyncSession, names: Set[str]) -> Dict[str, int]:
+    if not names:
+        return {}
+    result = await db.execute(select(Strategy.name, Strategy.id).where(Strategy.name.in_(names)))
+    return {name: strategy_id for name, strategy_id in result.all()}
+
+async def apply_strategy_batch(
+    db: AsyncSession, operations: Sequence[StrategyBatchOperation]
+) -> List[StrategyBatchItemResult]:
+    """
+    여러 생성/수정/삭제/활성화 작업을 하나의 트랜잭션으로 처리합니다.
+    대상 전략과 이름 중복 여부는 각각 한 번의 쿼리로 조회하고, 변경 사항은 삭제를 먼저 flush한 뒤 나머지를 한 번에 반영합니다.
+    (같은 flush 안에서는 INSERT/UPDATE가 DELETE보다 먼저 실행되므로, 삭제한 전략의 이름을 다시 쓰는 생성/수정이 충돌하지 않도록)
+    검증에 실패한 항목은 건너뛰고 항목별 오류로 보고하며, 나머지 항목은 함께 커밋됩니다.
+    flush/commit 자체가 실패하면 전체를 롤백하고 모든 항목을 오류로 보고합니다.
+    """
+    if len(operations) > MAX_BATCH_ITEMS:
+        raise ValueError(f"Too many operations: {len(operations)} (max {MAX_BATCH_ITEMS})")
+
+    existing = await _load_by_ids(db, {op.id for op in operations if op.op != "create" and op.id is not None})
+    candidate_names = {
+        op.data["name"] for op in operations
+        if op.data and isinstance(op.data.get("name"), str)
+    }
+    taken_names = set(await _load_ids_by_name(db, candidate_names))
+
+    results: List[StrategyBatchItemResult] = []
+    applied: List[Tuple[int, Strategy]] = []
+    deleted_ids: Set[int] = set()
+    # 검증을 통과한 변경은 모아 두었다가 삭제 → 수정/생성 순서로 반영합니다.
+    deletes: List[Strategy] = []
+    changes: List[Tuple[Strategy, Dict[str, Any]]] = []
+    creates: List[Strategy] = []
+    # 아직 반영하지 않은 이름 변경: 전략 id → 바뀔 이름
+    renamed: Dict[int, str] = {}
+
+    for index, operation in enumerate(operations):
+        try:
+            if operation.op == "create":
+                strategy_in = StrategyCreate.model_validate(operation.data or {})
+                if strategy_in.name in taken_names:
+                    raise ValueError(f"Strategy name already exists: {strategy_in.name}")
+                db_strategy = Strategy(**strategy_in.model_dump())
+                creates.append(db_strategy)
+                taken_names.add(strategy_in.name)
+            else:
+                if operation.id is None:
+                    raise ValueError(f"'{operation.op}' operation requires an id")
+                db_strategy = existing.get(operation.id)
+                if db_strategy is None or operation.id in deleted_ids:
+                    raise ValueError("Strategy not found")
+
+                if operation.op == "update":
+                    update_data = StrategyUpdate.model_validate(operation.data or {}).model_dump(exclude_unset=True)
+                    nulls = sorted(key for key, value in update_data.items() if value is None and key in NON_NULLABLE_FIELDS)
+                    if nulls:
+                        raise ValueError(f"Fields cannot be null: {', '.join(nulls)}")
+                    current_name = renamed.get(operation.id, db_strategy.name)
+                    new_name = update_data.get("name")
+                    if new_name is not None and new_name != current_name:
+                        if new_name in taken_names:
+                            raise ValueError(f"Strategy name already exists: {new_name}")
+                        taken_names.discard(current_name)
+                        taken_names.add(new_name)
+                        renamed[operation.id] = new_name
+                    changes.append((db_strategy, update_data))
+                elif operation.op == "delete":
+                    deletes.append(db_strategy)
+                    deleted_ids.add(operation.id)
+                    taken_names.discard(renamed.get(operation.id, db_strategy.name))
+                else:
+                    changes.append((db_strategy, {"is_active": operation.op == "activate"}))
+
+            applied.append((index, db_strategy))
+            results.append(StrategyBatchItemResult(index=index, status="ok"))
+        except ValidationError as e:
+            results.append(StrategyBatchItemResult(index=index, status="error", error=_format_validation_error(e)))
+        except ValueError as e:
+            results.append(StrategyBatchItemResult(index=index, status="error", error=str(e)))
+
+    if not applied:
+        return results
+
+    try:
+        if deletes:
+            for db_strategy in deletes:
+                await db.delete(db_strategy)
+            await db.flush()
+        for db_strategy, update_data in changes:
+            if db_strategy.id in deleted_ids:
+                continue  # 같은 일괄 작업에서 나중에 삭제된 전략
+            for key, value in update_data.items():
+                setattr(db_strategy, key, value)
+        db.add_all(creates)
+        await db.flush()
+        # flush 이후에 id를 읽어두어야 커밋 뒤에도 삭제된 객체의 id를 안전하게 보고할 수 있습니다.
+        applied_ids = {index: db_strategy.id for index, db_strategy in applied}
+        await db.commit()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        message = f"Transaction failed: {e.__class__.__name__}"
+        return [
+            result if result.status == "error"
+            else StrategyBatchItemResult(index=result.index, status="error", error=message)
+            for result in results
+        ]
+    finally:
+        strategy_cache.clear()
+
+    for result in results:
+        if result.index in applied_ids:
+            result.id = applied_ids[result.index]
+    return results
+
+async def import_strategies(
+    db: AsyncSession, records: Sequence[Tuple[int, Dict[str, Any]]], on_conflict: str = "error"
+) -> List[StrategyBatchItemResult]:
+    """
+    (줄 번호, 전략 데이터) 목록을 하나의 트랜잭션으로 가져옵니다.
+    같은 이름의 전략이 이미 있으면 `on_conflict`에 따라 오류(error), 건너뛰기(skip), 덮어쓰기(update)로 처리합니다.
+    내보내기(export) 결과의 id, created_at 등은 무시됩니다.
+    """
+    if on_conflict not in ("error", "skip", "update"):
+        raise ValueError(f"Invalid on_conflict: {on_conflict}")
+
+    ids_by_name = await _load_ids_by_name(
+        db, {data["name"] for _, data in records if isinstance(data.get("name"), str)}
+    )
+    operations: List[StrategyBatchOperation] = []
+    line_numbers: List[int] = []
+    skipped: List[StrategyBatchItemResult] = []
+    for line_number, data in records:
+        existing_id = ids_by_name.get(data.get("name"))
+        if existing_id is not None and on_conflict == "skip":
+            skipped.append(StrategyBatchItemResult(index=line_number, status="skipped", id=existing_id))
+            continue
+        if existing_id is not None and on_conflict == "update":
+            update_fields = {k: v for k, v in data.items() if k in StrategyUpdate.model_fields}
+            operations.append(StrategyBatchOperation(op="update", id=existing_id, data=update_fields))
+        else:
+            operations.append(StrategyBatchOperation(op="create", data=data))
+        line_numbers.append(line_number)
+
+    results = await apply_strategy_batch(db, operations)
+    for result in results:
+        result.index = line_numbers[result.index]
+    return sorted(results + skipped, key=lambda r: r.index)
+
+async def export_strategies(
+    db: AsyncSession,
+    *,
+    is_active: Optional[bool] = None,
+    broker: Optional[str] = None,
+    market: Optional[str] = None,
+) -> AsyncIterator[bytes]:
+    """
+    전략들을 JSON Lines 형식으로 내보냅니다.
+    전체를 메모리에 올리지 않도록 id 기준 키셋 방식으로 EXPORT_BATCH_SIZE개씩 나누어 읽습니다.
+    """
+    cursor: Optional[int] = None
+    while True:
+        stmt = select(Strategy).order_by(Strategy.id).limit(EXPORT_BATCH_SIZE)
+        if cursor is not None:
+            stmt = stmt.where(Strategy.id > cursor)
+        if is_active is not None:
+            stmt = stmt.where(Strategy.is_active == is_active)
+        if broker is not None:
+            stmt = stmt.where(Strategy.broker == broker)
+        if market is not None:
+            stmt = stmt.where(Strategy.market == market)
+
+        strategies = (await db.execute(stmt)).scalars().all()
+        if not strategies:
+            return
+        yield b"".join(
+            StrategySchema.model_validate(s).model_dump_json().encode() + b"\n" for s in strategies
+        )
+        if len(strategies) < EXPORT_BATCH_SIZE:
+            return
+        cursor = strategies[-1].id
+        # 이미 내보낸 객체는 세션의 identity map에서 제거하여 메모리 사용량을 일정하게 유지합니다.
+        db.expunge_all()
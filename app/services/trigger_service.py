@@ -0,0 +1,113 @@
+import asyncio
+import datetime
+import logging
+from typing import Dict, Optional
+
+from sqlalchemy import delete, select
+
+from app.core.triggers import TriggeredSymbols
+from app.db.session import AsyncSessionLocal
+from app.models.triggered_symbol import TriggeredSymbol
+
+logger = logging.getLogger(__name__)
+
+# Create a singleton instance of the TriggeredSymbols
+triggered_symbols = TriggeredSymbols()
+
+_loaded = False
+_load_lock = asyncio.Lock()
+_persistence_task: Optional[asyncio.Task] = None
+
+
+def _to_utc(value: datetime.datetime) -> datetime.datetime:
+    # SQLite는 timezone 정보를 저장하지 않으므로 UTC로 저장된 naive datetime으로 간주합니다.
+    return value if value.tzinfo else value.replace(tzinfo=datetime.timezone.utc)
+
+
+async def ensure_triggered_symbols_loaded():
+    """
+    DB에 저장된 무장 종목 스냅샷을 최초 사용 시 한 번만 메모리로 복원합니다.
+    만료된 종목은 복원하지 않습니다.
+    """
+    global _loaded
+    if _loaded:
+        return
+    async with _load_lock:
+        if _loaded:
+            return
+        now = datetime.datetime.now(datetime.timezone.utc)
+        restored: Dict[int, Dict[str, float]] = {}
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(select(TriggeredSymbol))).scalars().all()
+        for row in rows:
+            expires_at = _to_utc(row.expires_at)
+            if expires_at > now:
+                restored.setdefault(row.strategy_id, {})[row.ticker] = expires_at.timestamp()
+        for strategy_id, entries in restored.items():
+            triggered_symbols.load(strategy_id, entries)
+        _loaded = True
+        logger.info(f"무장 종목 복원 완료: {sum(len(e) for e in restored.values())}개")
+
+
+async def persist_triggered_symbols() -> int:
+    """
+    마지막 저장 이후 변경된 전략들의 무장 종목을 DB에 저장하고, 저장한 전략 수를 반환합니다.
+    전략 단위로 기존 행을 지우고 현재 상태를 다시 쓰는 스냅샷 방식입니다.
+    """
+    if not _loaded:
+        # 아직 복원(=서비스를 통한 사용)이 없었다면 저장할 변경도 없습니다.
+        # 복원 전에 저장하면 DB의 기존 스냅샷을 덮어쓰게 되므로 건너뜁니다.
+        return 0
+    triggered_symbols.prune()
+    dirty = triggered_symbols.pop_dirty()
+    if not dirty:
+        return 0
+    try:
+        async with AsyncSessionLocal() as db:
+            for strategy_id, entries in dirty.items():
+                await db.execute(delete(TriggeredSymbol).where(TriggeredSymbol.strategy_id == strategy_id))
+                db.add_all([
+                    TriggeredSymbol(
+                        strategy_id=strategy_id,
+                        ticker=ticker,
+                        expires_at=datetime.datetime.fromtimestamp(expires_at, datetime.timezone.utc),
+                    )
+                    for ticker, expires_at in entries.items()
+                ])
+            await db.commit()
+    except Exception:
+        triggered_symbols.mark_dirty(dirty.keys())
+        raise
+    return len(dirty)
+
+
+async def _persistence_loop(interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await persist_triggered_symbols()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"무장 종목 저장 실패: {e}", exc_info=True)
+
+
+def start_trigger_persistence(interval: float):
+    """무장 종목 상태를 주기적으로 DB에 저장하는 백그라운드 작업을 시작합니다."""
+    global _persistence_task
+    if _persistence_task is None or _persistence_task.done():
+        _persistence_task = asyncio.create_task(_persistence_loop(interval))
+
+
+async def stop_trigger_persistence():
+    """주기적 저장을 멈추고, 변경 사항이 남아 있으면 마지막으로 한 번 저장합니다."""
+    global _persistence_task
+    if _persistence_task is not None:
+        _persistence_task.cancel()
+        await asyncio.gather(_persistence_task, return_exceptions=True)
+        _persistence_task = None
+    if _loaded:
+        try:
+            await persist_triggered_symbols()
+        except Exception as e:
+            logger.error(f"종료 시 무장 종목 저장 실패: {e}", exc_info=True)
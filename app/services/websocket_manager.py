@@ -2,6 +2,9 @@ import logging
 from typing import List, Dict
 from fastapi import WebSocket
 
+from app.core.logs import log_sampled
+from app.core.metrics import SCAN_STAGE_SECONDS
+
 logger = logging.getLogger(__name__)
 
 class ConnectionManager:
@@ -35,7 +38,7 @@ class ConnectionManager:
         if client_id in self.active_connections:
             websocket = self.active_connections[client_id]
             await websocket.send_text(message)
-            logger.info(f"Sent message to {client_id}: {message}")
+            logger.debug("Sent %d chars to %s", len(message), client_id)
         else:
             logger.warning(f"Attempted to send message to disconnected client_id: {client_id}")
 
@@ -43,12 +46,16 @@ class ConnectionManager:
         """
         Broadcasts a message to all connected clients.
         """
-        logger.info(f"Broadcasting message to {len(self.active_connections)} clients: {message}")
-        for client_id, websocket in self.active_connections.items():
-            try:
-                await websocket.send_text(message)
-            except Exception as e:
-                logger.error(f"Failed to send message to client {client_id}: {e}")
+        logger.debug("Broadcasting %d chars to %d clients", len(message), len(self.active_connections))
+        with SCAN_STAGE_SECONDS.time(stage="fanout"):
+            for client_id, websocket in list(self.active_connections.items()):
+                try:
+                    await websocket.send_text(message)
+                except Exception as e:
+                    log_sampled(
+                        logger, logging.ERROR, "ws.broadcast_failed", "Failed to send broadcast message: %s", e,
+                        client_id=client_id,
+                    )
 
 # Create a singleton instance of the ConnectionManager
 manager = ConnectionManager()
\ No newline at end of file
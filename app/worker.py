@@ -0,0 +1,156 @@
+"""
+스캔 워커. API 프로세스가 작업 큐(SQLite 파일, SCAN_QUEUE_PATH)에 넣은 스캔 작업을 별도 프로세스에서 실행합니다.
+스캔(Polars 평가와 거래소 조회)이 API 프로세스의 REST/WebSocket 처리와 CPU를 다투지 않고,
+워커 프로세스 수로 스캔 처리량을 API 프로세스 수와 따로 늘릴 수 있습니다.
+
+사용 예:
+    SCAN_WORKERS_ENABLED=true uvicorn app.main:app        # API: 스캔을 작업 큐에 넣고 결과를 WebSocket으로 전달
+    python -m app.worker --processes 4 --concurrency 2     # 워커: 프로세스 4개, 프로세스마다 동시 작업 2개
+
+워커는 각자 스캔 브로커(시세 캐시 포함)와 보조지표 캐시를 가지며, 실시간 봉 집계는 사용하지 않습니다.
+작업 중인 워커가 죽으면 임대 시간(SCAN_JOB_LEASE_SECONDS)이 지난 뒤 다른 워커가 작업을 다시 실행합니다.
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+from typing import Optional
+
+from app.core.config import settings
+from app.core.jobs import Job, JobQueue
+from app.core.logs import configure_logging
+from app.services.scan_service import execute_scan_job, scan_event_sink
+
+logger = logging.getLogger(__name__)
+
+
+async def _heartbeat(queue: JobQueue, job: Job, worker_id: str, lease_seconds: float):
+    """임대를 연장합니다. 임대를 잃으면(다른 워커가 가져가면) 반환합니다."""
+    while True:
+        await asyncio.sleep(lease_seconds / 3)
+        if not await asyncio.to_thread(queue.heartbeat, job.id, worker_id, lease_seconds):
+            logger.warning("스캔 작업 %d의 임대를 잃었습니다. (다른 워커가 가져감)", job.id)
+            return
+
+
+async def run_job(queue: JobQueue, job: Job, worker_id: str, lease_seconds: float):
+    """
+    작업 하나를 실행하고 결과 또는 실패를 큐에 기록합니다. 진행 중 메시지는 작업 이벤트로 기록합니다.
+    실행 중에 임대를 잃으면 작업을 취소하고 결과를 기록하지 않습니다. (새로 가져간 워커의 결과만 반영)
+    """
+    async def publish(message: str):
+        await asyncio.to_thread(queue.publish, job.id, worker_id, message)
+
+    token = scan_event_sink.set(publish)
+    try:
+        work = asyncio.create_task(execute_scan_job(job.kind, job.payload))
+    finally:
+        scan_event_sink.reset(token)
+    heartbeat = asyncio.create_task(_heartbeat(queue, job, worker_id, lease_seconds))
+    try:
+        await asyncio.wait({work, heartbeat}, return_when=asyncio.FIRST_COMPLETED)
+        if not work.done():
+            work.cancel()
+            await asyncio.gather(work, return_exceptions=True)
+            return
+        try:
+            result = work.result()
+        except Exception as e:
+            logger.error(f"스캔 작업 {job.id} ({job.kind}) 실패: {e}", exc_info=True)
+            applied = await asyncio.to_thread(queue.fail, job.id, worker_id, str(e))
+        else:
+            applied = await asyncio.to_thread(queue.complete, job.id, worker_id, result)
+        if not applied:
+            logger.warning("스캔 작업 %d의 임대를 잃어 결과를 버립니다.", job.id)
+    finally:
+        for task in (work, heartbeat):
+            task.cancel()
+        await asyncio.gather(work, heartbeat, return_exceptions=True)
+
+
+async def worker_loop(
+    queue: JobQueue,
+    worker_id: str,
+    concurrency: int = 1,
+    lease_seconds: float = 60.0,
+    poll_interval: float = 0.1,
+    stop: Optional[asyncio.Event] = None,
+):
+    """`stop`이 설정될 때까지 작업을 가져와 최대 `concurrency`개씩 동시에 실행합니다. 실행 중인 작업은 끝까지 마칩니다."""
+    stop = stop or asyncio.Event()
+    slots = asyncio.Semaphore(concurrency)
+    running = set()
+    while not stop.is_set():
+        await slots.acquire()
+        job = await asyncio.to_thread(queue.claim, worker_id, lease_seconds)
+        if job is None:
+            slots.release()
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            continue
+        task = asyncio.create_task(run_job(queue, job, worker_id, lease_seconds))
+        running.add(task)
+        task.add_done_callback(running.discard)
+        task.add_done_callback(lambda _: slots.release())
+    if running:
+        await asyncio.gather(*running, return_exceptions=True)
+
+
+def _process_main(index: int, queue_path: str, concurrency: int, lease_seconds: float, poll_interval: float):
+    # spawn으로 시작한 프로세스는 부모의 로깅 설정을 물려받지 않습니다.
+    configure_logging()
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+    async def main():
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, stop.set)
+        queue = JobQueue(queue_path, max_attempts=settings.SCAN_JOB_MAX_ATTEMPTS)
+        logger.info(f"스캔 워커 {index} 시작 ({worker_id}, 동시 작업 {concurrency}개)")
+        await worker_loop(queue, worker_id, concurrency, lease_seconds, poll_interval, stop)
+        logger.info(f"스캔 워커 {index} 종료")
+
+    asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run scan worker processes that consume the local scan job queue.")
+    parser.add_argument("--processes", type=int, default=settings.SCAN_WORKER_PROCESSES, help="Worker processes")
+    parser.add_argument("--concurrency", type=int, default=settings.SCAN_WORKER_CONCURRENCY, help="Concurrent jobs per process")
+    parser.add_argument("--queue", default=settings.SCAN_QUEUE_PATH, help="Job queue SQLite file")
+    parser.add_argument("--lease", type=float, default=settings.SCAN_JOB_LEASE_SECONDS, help="Job lease seconds")
+    parser.add_argument("--poll", type=float, default=0.1, help="Seconds between queue polls when idle")
+    args = parser.parse_args()
+    configure_logging()
+
+    # 워커는 fork 대신 spawn으로 시작하여 부모의 이벤트 루프/연결 상태를 물려받지 않게 합니다.
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(
+            target=_process_main, args=(i, args.queue, args.concurrency, args.lease, args.poll), name=f"scan-worker-{i}",
+        )
+        for i in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    def shutdown(signum, frame):
+        # 자식 프로세스는 SIGTERM을 받으면 새 작업을 가져가지 않고 실행 중인 작업을 마친 뒤 종료합니다.
+        for process in processes:
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+`/ws/v1/updates` WebSocket 전송(ConnectionManager.broadcast)의 부하 테스트 도구.
+앱을 같은 프로세스에서 로컬 포트로 띄우고 여러 WebSocket 클라이언트를 연결한 뒤, 가상의 `scan_result_found`/
+`watchlist_updated` 이벤트를 일정한 속도로 broadcast하여 전달 지연 시간, 처리량, 유실 메시지, 메모리를 보고합니다.
+
+클라이언트 종류:
+- normal: 메시지를 바로바로 읽는 대시보드
+- slow: 메시지마다 `--slow-delay`초씩 늦게 읽는 대시보드 (느린 네트워크/브라우저)
+- stalled: 연결만 유지하고 메시지를 읽지 않는 대시보드 (멈춘 탭)
+
+사용 예:
+    python -m app.ws_loadtest --clients 1000 --slow-fraction 0.05 --stalled-fraction 0.01 --events 200 --rate 20
+    python -m app.ws_loadtest --clients 200 --max-p99-ms 250 --max-dropped 0   # 기준을 넘으면 종료 코드 1
+
+클라이언트 수천 개 이상은 파일 디스크립터 한도(`ulimit -n`)를 늘려야 합니다.
+메모리(RSS)는 서버와 클라이언트가 같은 프로세스이므로 둘을 합친 값입니다.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import uvicorn
+import websockets
+
+from app.main import app
+from app.services.websocket_manager import manager
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("normal", "slow", "stalled")
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """정렬되지 않은 값들의 q 분위수(0~100, nearest-rank)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = math.ceil(q / 100 * len(ordered))
+    return ordered[max(0, min(len(ordered), rank) - 1)]
+
+
+def _summary(values: List[float], scale: float = 1000.0) -> Dict[str, Optional[float]]:
+    """지연 시간 목록(초)을 ms 단위 분위수로 요약합니다."""
+    return {
+        f"p{q}": None if not values else round(percentile(values, q) * scale, 3)
+        for q in (50, 90, 99)
+    } | {"max": None if not values else round(max(values) * scale, 3)}
+
+
+def _memory() -> Dict[str, Optional[int]]:
+    """현재/최대 RSS(KB). Linux의 /proc가 없으면 최대 RSS만 보고합니다."""
+    current = peak = None
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    current = int(line.split()[1])
+                elif line.startswith("VmHWM:"):
+                    peak = int(line.split()[1])
+    except OSError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {"rss_kb": current, "peak_rss_kb": peak}
+
+
+@dataclass
+class LoadClient:
+    index: int
+    kind: str
+    received: Dict[int, float] = field(default_factory=dict)
+    latencies: List[float] = field(default_factory=list)
+    connected: bool = False
+    error: Optional[str] = None
+
+
+def synthetic_event(seq: int, rows: int, tickers: int) -> str:
+    """부하 테스트용 이벤트. 10번째마다 watchlist_updated, 나머지는 scan_result_found를 만듭니다."""
+    meta = {"seq": seq, "sent_at": time.time()}
+    if seq % 10 == 9:
+        watchlist = [f"KRW-T{i:04d}" for i in range(tickers)]
+        payload = {"strategy_name": "loadtest", "watchlist": watchlist, "count": len(watchlist), "failed": []}
+        return json.dumps({"event": "watchlist_updated", "payload": payload, "loadtest": meta})
+    results = [
+        {"timestamp": "2024-01-01 09:00:00", "open": 100.0 + i, "high": 110.0 + i, "low": 90.0 + i,
+         "close": 105.0 + i, "volume": 12.5, "amount": 1312.5, "ticker": f"KRW-T{i:04d}"}
+        for i in range(rows)
+    ]
+    payload = {"strategy_name": "loadtest", "results": results, "failed": [], "partial": False, "skipped": []}
+    return json.dumps({"event": "scan_result_found", "payload": payload, "loadtest": meta})
+
+
+async def _run_client(client: LoadClient, uri: str, slow_delay: float, stop: asyncio.Event):
+    # 멈춘 클라이언트는 수신 대기열을 최소로 두어 TCP 수준의 배압이 바로 서버에 걸리게 합니다.
+    max_queue = 1 if client.kind == "stalled" else 1024
+    try:
+        async with websockets.connect(
+            f"{uri}?token=loadtest-{client.index}", max_size=None, max_queue=max_queue, close_timeout=1,
+        ) as ws:
+            await ws.recv()  # 연결 알림
+            client.connected = True
+            if client.kind == "stalled":
+                await stop.wait()
+                return
+            while not stop.is_set():
+                try:
+                    raw = await asyncio.wait_for(ws.recv(), timeout=0.2)
+                except asyncio.TimeoutError:
+                    continue
+                received_at = time.time()
+                meta = json.loads(raw).get("loadtest")
+                if meta is None:
+                    continue
+                client.received[meta["seq"]] = received_at
+                client.latencies.append(received_at - meta["sent_at"])
+                if client.kind == "slow":
+                    await asyncio.sleep(slow_delay)
+    except Exception as e:
+        client.error = f"{type(e).__name__}: {e}"
+
+
+async def run_load_test(
+    clients: int = 100,
+    slow_fraction: float = 0.05,
+    stalled_fraction: float = 0.01,
+    events: int = 100,
+    rate: float = 10.0,
+    rows: int = 20,
+    slow_delay: float = 0.05,
+    broadcast_timeout: float = 5.0,
+    drain_seconds: float = 2.0,
+    connect_concurrency: int = 200,
+) -> Dict:
+    """로컬 서버를 띄워 부하 테스트를 실행하고 결과 보고서(dict)를 반환합니다."""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, lifespan="off", log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    uri = f"ws://127.0.0.1:{port}/ws/v1/updates"
+    memory_before = _memory()
+
+    slow_count = int(clients * slow_fraction)
+    stalled_count = int(clients * stalled_fraction)
+    load_clients = [
+        LoadClient(i, "stalled" if i < stalled_count else "slow" if i < stalled_count + slow_count else "normal")
+        for i in range(clients)
+    ]
+    stop = asyncio.Event()
+    gate = asyncio.Semaphore(connect_concurrency)
+
+    async def start_client(client: LoadClient):
+        async with gate:
+            task = asyncio.create_task(_run_client(client, uri, slow_delay, stop))
+            while not client.connected and client.error is None and not task.done():
+                await asyncio.sleep(0.01)
+            return task
+
+    connect_started = time.perf_counter()
+    client_tasks = await asyncio.gather(*(start_client(c) for c in load_clients))
+    connect_seconds = time.perf_counter() - connect_started
+
+    broadcast_durations: List[float] = []
+    blocked = 0
+    interval = 1.0 / rate if rate > 0 else 0.0
+    send_started = time.perf_counter()
+    for seq in range(events):
+        scheduled = send_started + seq * interval
+        await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(manager.broadcast(synthetic_event(seq, rows, rows * 5)), timeout=broadcast_timeout)
+        except asyncio.TimeoutError:
+            # 한 클라이언트에 막혀 나머지 클라이언트에 보내지 못한 broadcast
+            blocked += 1
+        broadcast_durations.append(time.perf_counter() - started)
+    send_seconds = time.perf_counter() - send_started
+
+    await asyncio.sleep(drain_seconds)
+    memory_after = _memory()
+    stop.set()
+    await asyncio.gather(*client_tasks, return_exceptions=True)
+    server.should_exit = True
+    await server_task
+
+    by_kind = {}
+    for kind in KINDS:
+        members = [c for c in load_clients if c.kind == kind]
+        if not members:
+            continue
+        connected = [c for c in members if c.connected]
+        # 멈춘 클라이언트는 읽지 않으므로 전달 여부를 셀 수 없습니다.
+        expected = 0 if kind == "stalled" else len(connected) * events
+        delivered = sum(len(c.received) for c in connected)
+        latencies = [latency for c in connected for latency in c.latencies]
+        by_kind[kind] = {
+            "clients": len(members),
+            "connected": len(connected),
+            "errors": sum(1 for c in members if c.error),
+            "expected_messages": expected,
+            "delivered_messages": delivered,
+            "dropped_messages": max(0, expected - delivered),
+            "latency_ms": _summary(latencies),
+        }
+
+    delivered_total = sum(k["delivered_messages"] for k in by_kind.values())
+    return {
+        "clients": clients,
+        "events": events,
+        "rate_per_second": rate,
+        "payload_bytes": len(synthetic_event(0, rows, rows * 5)),
+        "connect_seconds": round(connect_seconds, 3),
+        "send_seconds": round(send_seconds, 3),
+        "throughput_messages_per_second": round(delivered_total / send_seconds, 1) if send_seconds else None,
+        "broadcast_ms": _summary(broadcast_durations),
+        "blocked_broadcasts": blocked,
+        "by_kind": by_kind,
+        "memory_before": memory_before,
+        "memory_after": memory_after,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test WebSocket fan-out of /ws/v1/updates.")
+    parser.add_argument("--clients", type=int, default=100, help="Number of WebSocket clients")
+    parser.add_argument("--slow-fraction", type=float, default=0.05, help="Fraction of clients that read slowly")
+    parser.add_argument("--stalled-fraction", type=float, default=0.01, help="Fraction of clients that never read")
+    parser.add_argument("--slow-delay", type=float, default=0.05, help="Seconds a slow client waits after each message")
+    parser.add_argument("--events", type=int, default=100, help="Number of events to broadcast")
+    parser.add_argument("--rate", type=float, default=10.0, help="Events per second")
+    parser.add_argument("--rows", type=int, default=20, help="Result rows per scan_result_found event")
+    parser.add_argument("--broadcast-timeout", type=float, default=5.0, help="Seconds before a broadcast counts as blocked")
+    parser.add_argument("--drain", type=float, default=2.0, help="Seconds to wait for in-flight messages after sending")
+    parser.add_argument("--max-p99-ms", type=float, help="Fail if normal clients' p99 delivery latency exceeds this")
+    parser.add_argument("--max-dropped", type=int, help="Fail if normal/slow clients drop more messages than this")
+    args = parser.parse_args()
+
+    # 메시지마다 남는 INFO 로그가 측정을 왜곡하지 않도록 줄입니다.
+    logging.getLogger().setLevel(logging.WARNING)
+    report = asyncio.run(run_load_test(
+        clients=args.clients,
+        slow_fraction=args.slow_fraction,
+        stalled_fraction=args.stalled_fraction,
+        events=args.events,
+        rate=args.rate,
+        rows=args.rows,
+        slow_delay=args.slow_delay,
+        broadcast_timeout=args.broadcast_timeout,
+        drain_seconds=args.drain,
+    ))
+    print(json.dumps(report, indent=2))
+
+    failures = []
+    normal_p99 = report["by_kind"].get("normal", {}).get("latency_ms", {}).get("p99")
+    if args.max_p99_ms is not None and (normal_p99 is None or normal_p99 > args.max_p99_ms):
+        failures.append(f"normal p99 latency {normal_p99} ms > {args.max_p99_ms} ms")
+    dropped = sum(report["by_kind"].get(kind, {}).get("dropped_messages", 0) for kind in ("normal", "slow"))
+    if args.max_dropped is not None and dropped > args.max_dropped:
+        failures.append(f"{dropped} dropped messages > {args.max_dropped}")
+    if failures:
+        print("FAILED: " + "; ".join(failures), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
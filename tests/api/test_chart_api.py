@@ -0,0 +1,58 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.core.brokers.simulator import SimulatedBroker
+from app.services import scan_service
+from app.services.chart_service import chart_service
+from fakes import make_candles
+
+
+@pytest.fixture
+def client(monkeypatch):
+    closes = [float(100 + (i % 20)) for i in range(500)]
+    broker = SimulatedBroker(candles={"KRW-BTC": make_candles(closes, high_offset=1.0, low_offset=-1.0)})
+    monkeypatch.setitem(scan_service._scan_brokers, "simulator", broker)
+    return TestClient(app)
+
+
+def test_chart_returns_downsampled_bars_with_overlays(client):
+    response = client.get(
+        "/api/v1/charts/KRW-BTC",
+        params={"broker": "simulator", "timeframe": "minute1", "limit": 500, "width": 100, "overlays": ["ma(20)"]},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total_bars"] == 500
+    assert body["downsampled"] is True
+    assert len(body["bars"]) == 100
+    assert body["overlays"] == ["ma(20)"]
+    assert body["bars"][-1]["timestamp"] == 1_700_000_000_000 + 499 * 60_000
+    assert body["bars"][-1]["ma(20)"] == pytest.approx(109.5)
+
+
+def test_chart_rejects_invalid_overlay_and_unknown_broker(client):
+    response = client.get("/api/v1/charts/KRW-BTC", params={"broker": "simulator", "overlays": ["nope(3)"]})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["field"] == "overlays[0]"
+
+    response = client.get("/api/v1/charts/KRW-BTC", params={"broker": "nowhere"})
+    assert response.status_code == 400
+
+
+def test_chart_subscription_is_validated_like_rest(client):
+    """WebSocket 차트 구독도 REST 조회와 같이 타임프레임과 브로커를 확인하고, 잘못된 구독은 등록하지 않는지 테스트합니다."""
+    response = client.get("/api/v1/charts/KRW-BTC", params={"broker": "simulator", "timeframe": "fortnight"})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["field"] == "timeframe"
+
+    with client.websocket_connect("/ws/v1/updates?token=chart-validation") as websocket:
+        websocket.receive_json()  # 연결 알림
+        for subscription in ({"broker": "nowhere"}, {"broker": "simulator", "timeframe": "fortnight"}):
+            websocket.send_json({"event": "subscribe", "payload": {"channel": "chart", "ticker": "KRW-BTC", **subscription}})
+            notification = websocket.receive_json()["payload"]
+            assert notification["level"] == "error"
+            assert "Invalid chart subscription" in notification["message"]
+    assert not chart_service._subscribers
+    # 차트와 스캔은 보조지표 캐시를 따로 씁니다.
+    assert chart_service.features is not scan_service.feature_cache
@@ -0,0 +1,117 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.core.brokers.simulator import SimulatedBroker
+from app.core.config import settings
+from app.services import scan_service
+from fakes import DAY_MS, make_candles
+
+
+def _candles(closes):
+    return make_candles(closes, interval_ms=DAY_MS, volume=10.0, open_offset=-1.0, high_offset=2.0, low_offset=-2.0)
+
+
+@pytest.fixture
+def client():
+    # 스캔 브로커 공유 캐시에 시세가 채워진 모의 거래소를 넣어 두고 끝나면 되돌립니다.
+    broker = SimulatedBroker(candles={
+        "KRW-UP": _candles([float(100 + i) for i in range(30)]),
+        "KRW-DOWN": _candles([float(200 - i) for i in range(30)]),
+        "KRW-FLAT": _candles([50.0] * 30),
+    })
+    previous = scan_service._scan_brokers.get("simulator")
+    scan_service._scan_brokers["simulator"] = broker
+    scan_service.feature_cache.clear()
+    yield TestClient(app)
+    if previous is None:
+        scan_service._scan_brokers.pop("simulator", None)
+    else:
+        scan_service._scan_brokers["simulator"] = previous
+
+
+def test_run_dynamic_scan_returns_results_synchronously(client):
+    response = client.post("/api/v1/scans/run-dynamic", json={
+        "broker": "simulator",
+        "scan_logic": {
+            "1st_scan": {"condition": "close > 60"},
+            "2nd_scan": {
+                "timeframe": "day",
+                "variables": [{"name": "ma_short", "expression": "ma(5)"}],
+                "condition": "close > ma_short",
+            },
+        },
+    })
+    assert response.status_code == 200
+    body = response.json()
+    assert body["universe"] == 3
+    assert body["scanned"] == 2
+    assert [row["ticker"] for row in body["results"]] == ["KRW-UP"]
+    row = body["results"][0]
+    assert row["code"] == "UP" and row["price"] == 129.0 and row["ohlc"] == "bar_up"
+    assert body["partial"] is False
+
+
+def test_run_dynamic_scan_caps_universe_and_reports_partial(client):
+    response = client.post("/api/v1/scans/run-dynamic", json={
+        "broker": "simulator",
+        "max_tickers": 1,
+        "scan_logic": {"2nd_scan": {"timeframe": "day", "condition": "close > 0"}},
+    })
+    body = response.json()
+    assert response.status_code == 200
+    assert body["scanned"] == 1 and body["partial"] is True
+    assert len(body["skipped"]) == 2
+
+
+def test_run_dynamic_scan_accepts_builder_strategy(client):
+    close = {"id": "a", "type": "indicator", "label": "close"}
+    value = {"id": "b", "type": "value", "label": "150"}
+    response = client.post("/api/v1/scans/run-dynamic", json={
+        "broker": "simulator",
+        "strategy": {
+            "name": "builder",
+            "second_scan_expression": {"type": "expression", "operator": ">", "operands": [close, value]},
+        },
+    })
+    assert response.status_code == 200
+    assert [row["ticker"] for row in response.json()["results"]] == ["KRW-DOWN"]
+
+
+def test_run_dynamic_scan_rejects_invalid_logic(client):
+    response = client.post("/api/v1/scans/run-dynamic", json={
+        "broker": "simulator",
+        "scan_logic": {"2nd_scan": {"timeframe": "day", "condition": "close > unknown_var"}},
+    })
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["field"] == "2nd_scan.condition"
+
+    response = client.post("/api/v1/scans/run-dynamic", json={
+        "broker": "nope", "scan_logic": {"2nd_scan": {"condition": "close > 0"}},
+    })
+    assert response.status_code == 400
+
+
+def test_run_dynamic_scan_reuses_market_snapshot_and_caps_tickers(client, monkeypatch):
+    """전체 종목 1차 스캔은 요청마다 거래소를 다시 조회하지 않고 스냅샷을 재사용하며, 지정 종목 수는 상한을 넘을 수 없는지 테스트합니다."""
+    broker = scan_service._scan_brokers["simulator"]
+    fetches = []
+    fetch = broker.get_market_data_for_1st_scan
+
+    async def counting_fetch(tickers):
+        fetches.append(len(tickers))
+        return await fetch(tickers)
+
+    monkeypatch.setattr(broker, "get_market_data_for_1st_scan", counting_fetch)
+    payload = {"broker": "simulator", "scan_logic": {
+        "1st_scan": {"condition": "close > 60"}, "2nd_scan": {"timeframe": "day", "condition": "close > 0"},
+    }}
+    for _ in range(3):
+        response = client.post("/api/v1/scans/run-dynamic", json=payload)
+        assert response.status_code == 200
+        assert response.json()["universe"] == 3
+    assert fetches == [3]
+
+    tickers = [f"KRW-T{i}" for i in range(settings.DYNAMIC_SCAN_MAX_REQUEST_TICKERS + 1)]
+    response = client.post("/api/v1/scans/run-dynamic", json={**payload, "tickers": tickers})
+    assert response.status_code == 422
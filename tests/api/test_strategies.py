@@ -1,19 +1,25 @@
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import NullPool
 import os
+import json
 
 from app.main import app
-from app.db.session import Base, get_db
+from app.db.session import Base, get_async_db
 from app.models.strategy import StrategyCreate, Strategy
+from app.services.strategy_cache import StrategyCache, strategy_cache
+from app.services import strategy_service
 
 # ==================================
 # 테스트 환경 설정
 # ==================================
 
-# 테스트용 데이터베이스 URL (메모리 내 SQLite 사용)
+# 테스트용 데이터베이스 URL (파일 기반 SQLite 사용)
 TEST_DATABASE_URL = "sqlite:///./test.db"
+TEST_ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
 
 # 테스트용 데이터
 strategy_data = {
@@ -38,33 +44,44 @@ def db_engine():
     engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
     Base.metadata.create_all(bind=engine)
     yield engine
+    engine.dispose()
     # 테스트 종료 후 DB 파일 삭제
     if os.path.exists("./test.db"):
         os.remove("./test.db")
 
 @pytest.fixture(scope="function")
 def db_session(db_engine):
-    """각 테스트 함수마다 독립적인 DB 세션을 생성하고, 끝나면 롤백합니다."""
-    connection = db_engine.connect()
-    transaction = connection.begin()
-    session = sessionmaker(autocommit=False, autoflush=False, bind=connection)()
+    """
+    테스트 데이터 준비용 동기 DB 세션을 생성합니다.
+    API는 별도의 비동기 커넥션을 사용하므로, 롤백 대신 테스트가 끝나면 모든 테이블을 비웁니다.
+    """
+    session = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)()
 
     yield session
 
     session.close()
-    transaction.rollback()
-    connection.close()
+    with db_engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
 
 @pytest.fixture(scope="function")
 def test_client(db_session: Session):
     """테스트용 API 클라이언트를 생성하고 DB 의존성을 오버라이드합니다."""
-    def override_get_db():
-        yield db_session
+    # TestClient는 테스트마다 새로운 이벤트 루프를 사용하므로 커넥션을 풀링하지 않습니다.
+    async_engine = create_async_engine(TEST_ASYNC_DATABASE_URL, poolclass=NullPool)
+    async_session_factory = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
 
-    app.dependency_overrides[get_db] = override_get_db
+    async def override_get_async_db():
+        async with async_session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    # 테스트마다 초기화되는 DB와 프로세스 캐시가 어긋나지 않도록 캐시를 비웁니다.
+    strategy_cache.clear()
     with TestClient(app) as client:
         yield client
     app.dependency_overrides.clear()
+    strategy_cache.clear()
 
 
 @pytest.fixture(scope="function")
@@ -134,3 +151,183 @@ def test_delete_strategy(test_client: TestClient, test_strategy: Strategy):
     # 삭제되었는지 확인
     response_after_delete = test_client.get(f"/api/v1/strategies/{test_strategy.id}")
     assert response_after_delete.status_code == 404
+
+
+def test_read_strategy_etag_not_modified(test_client: TestClient, test_strategy: Strategy):
+    """ETag가 일치하면 304를 반환하는지 테스트합니다."""
+    response = test_client.get(f"/api/v1/strategies/{test_strategy.id}")
+    etag = response.headers["etag"]
+
+    response_cached = test_client.get(
+        f"/api/v1/strategies/{test_strategy.id}", headers={"If-None-Match": etag}
+    )
+    assert response_cached.status_code == 304
+    assert response_cached.headers["etag"] == etag
+
+    list_response = test_client.get("/api/v1/strategies")
+    list_cached = test_client.get(
+        "/api/v1/strategies", headers={"If-None-Match": list_response.headers["etag"]}
+    )
+    assert list_cached.status_code == 304
+
+
+def test_update_strategy_invalidates_cache(test_client: TestClient, test_strategy: Strategy):
+    """전략 수정 후에는 캐시가 무효화되어 새로운 ETag와 데이터가 반환되는지 테스트합니다."""
+    response = test_client.get(f"/api/v1/strategies/{test_strategy.id}")
+    etag = response.headers["etag"]
+    list_etag = test_client.get("/api/v1/strategies").headers["etag"]
+
+    test_client.put(f"/api/v1/strategies/{test_strategy.id}", json={"description": "changed"})
+
+    response_after = test_client.get(
+        f"/api/v1/strategies/{test_strategy.id}", headers={"If-None-Match": etag}
+    )
+    assert response_after.status_code == 200
+    assert response_after.json()["description"] == "changed"
+    assert response_after.headers["etag"] != etag
+
+    list_after = test_client.get("/api/v1/strategies", headers={"If-None-Match": list_etag})
+    assert list_after.status_code == 200
+
+
+def test_strategy_cache_is_bounded_and_drops_reads_older_than_invalidation():
+    """캐시가 LRU로 항목 수를 제한하고, 무효화 전에 시작된 조회 결과는 저장하지 않는지 테스트합니다."""
+    cache = StrategyCache(ttl_seconds=60, max_entries=2)
+    for key in ("a", "b"):
+        cache.put_list(key, [], b"[]")
+    assert cache.get_list("a") is not None
+    cache.put_list("c", [], b"[]")
+    assert cache.get_list("b") is None
+    assert cache.get_list("a") is not None and cache.get_list("c") is not None
+
+    generation = cache.generation
+    cache.invalidate(1)  # 조회 도중 다른 요청이 전략을 수정함
+    cache.put_item(1, {"description": "old"}, b"{}", generation)
+    cache.put_list((0, 100), [], b"[]", generation)
+    assert cache.get_item(1) is None and cache.get_list((0, 100)) is None
+
+    cache.put_item(1, {"description": "new"}, b"{}", cache.generation)
+    assert cache.get_item(1).data == {"description": "new"}
+
+
+def test_read_strategies_page(test_client: TestClient, db_session: Session):
+    """키셋 페이지네이션과 필드 선택을 사용하는 경량 목록 조회 API를 테스트합니다."""
+    for i in range(5):
+        db_session.add(Strategy(**{**strategy_data, "name": f"Paged {i}", "is_active": i % 2 == 0}))
+    db_session.commit()
+
+    response = test_client.get("/api/v1/strategies/page", params={"limit": 2})
+    assert response.status_code == 200, response.text
+    page = response.json()
+    assert len(page["items"]) == 2
+    assert "scan_logic" not in page["items"][0]
+    assert page["next_cursor"] == page["items"][-1]["id"]
+
+    names = [item["name"] for item in page["items"]]
+    cursor = page["next_cursor"]
+    while cursor is not None:
+        page = test_client.get("/api/v1/strategies/page", params={"limit": 2, "cursor": cursor}).json()
+        names += [item["name"] for item in page["items"]]
+        cursor = page["next_cursor"]
+    assert names == [f"Paged {i}" for i in range(5)]
+
+    response = test_client.get(
+        "/api/v1/strategies/page", params={"fields": "name,scan_logic", "is_active": True}
+    )
+    items = response.json()["items"]
+    assert [item["name"] for item in items] == ["Paged 0", "Paged 2", "Paged 4"]
+    assert set(items[0]) == {"id", "name", "scan_logic"}
+
+    response = test_client.get("/api/v1/strategies/page", params={"fields": "name,password"})
+    assert response.status_code == 400
+
+
+
+@pytest.mark.parametrize("filters", [
+    {"is_active": True},
+    {"market": "KRW-BTC"},
+    {"market": "KRW-BTC", "is_active": True},
+    {"broker": "upbit"},
+    {"broker": "upbit", "is_active": True},
+    {"broker": "upbit", "market": "KRW-BTC", "is_active": True},
+])
+def test_strategies_page_filters_use_an_index(db_session: Session, filters):
+    """목록 조회 필터 조합마다 테이블 전체를 훑지 않고 인덱스를 타는지 실행 계획으로 테스트합니다."""
+    stmt = select(Strategy.id).filter_by(**filters).where(Strategy.id > 0).order_by(Strategy.id).limit(101)
+    sql = str(stmt.compile(db_session.bind, compile_kwargs={"literal_binds": True}))
+    plan = [row[-1] for row in db_session.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+    assert any("USING COVERING INDEX ix_strategies_" in step for step in plan), plan
+    assert not any(step.startswith("SCAN strategies") for step in plan), plan
+
+def test_export_import_strategies(test_client: TestClient, test_strategy: Strategy):
+    """JSON Lines 내보내기/가져오기 API를 테스트합니다."""
+    response = test_client.get("/api/v1/strategies/export")
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["name"] for line in lines] == [test_strategy.name]
+
+    new_line = json.dumps({**strategy_data, "name": "Imported"})
+    body = "\n".join([json.dumps(lines[0]), new_line, "{not json", json.dumps({"name": "No broker"})])
+
+    response = test_client.post("/api/v1/strategies/import", params={"on_conflict": "skip"}, content=body)
+    assert response.status_code == 200, response.text
+    result = response.json()
+    statuses = [(r["index"], r["status"]) for r in result["results"]]
+    assert statuses == [(1, "skipped"), (2, "ok"), (3, "error"), (4, "error")]
+    assert result["failed"] == 2
+
+    response = test_client.post("/api/v1/strategies/import", content=new_line)
+    assert response.json()["results"][0]["error"] == "Strategy name already exists: Imported"
+
+
+def test_import_rejects_oversized_body_before_parsing(test_client: TestClient, monkeypatch):
+    """가져오기 요청 본문이 크기 한도를 넘으면 파싱하기 전에 413을 반환하는지 테스트합니다."""
+    monkeypatch.setattr(strategy_service, "MAX_IMPORT_BYTES", 64)
+    body = "\n".join(json.dumps({**strategy_data, "name": f"Big {i}"}) for i in range(3))
+    response = test_client.post("/api/v1/strategies/import", content=body)
+    assert response.status_code == 413
+
+    # Content-Length 없이 청크로 보내도 읽은 크기로 중단합니다.
+    response = test_client.post("/api/v1/strategies/import", content=iter([body.encode()[:50], body.encode()[50:]]))
+    assert response.status_code == 413
+
+
+def test_batch_strategies(test_client: TestClient, test_strategy: Strategy, monkeypatch):
+    """여러 작업을 한 번에 처리하는 일괄 변경 API를 테스트합니다."""
+    operations = [
+        {"op": "create", "data": {**strategy_data, "name": "Batch A", "is_active": False}},
+        {"op": "create", "data": {**strategy_data, "name": "Batch A"}},
+        {"op": "deactivate", "id": test_strategy.id},
+        {"op": "update", "id": 9999, "data": {"description": "missing"}},
+        {"op": "update", "id": test_strategy.id, "data": {"name": None, "description": "null name"}},
+    ]
+    response = test_client.post("/api/v1/strategies/batch", json={"operations": operations})
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert [r["status"] for r in result["results"]] == ["ok", "error", "ok", "error", "error"]
+    assert "name" in result["results"][4]["error"]
+    assert result["succeeded"] == 2
+
+    created_id = result["results"][0]["id"]
+    response = test_client.post(
+        "/api/v1/strategies/batch", json={"operations": [{"op": "activate", "id": created_id}]}
+    )
+    assert response.json()["results"][0]["status"] == "ok"
+
+    assert test_client.get(f"/api/v1/strategies/{created_id}").json()["is_active"] is True
+    assert test_client.get(f"/api/v1/strategies/{test_strategy.id}").json()["is_active"] is False
+
+    # 같은 일괄 작업에서 전략을 삭제하고 같은 이름으로 다시 만들 수 있습니다.
+    response = test_client.post("/api/v1/strategies/batch", json={"operations": [
+        {"op": "delete", "id": test_strategy.id},
+        {"op": "create", "data": {**strategy_data, "name": test_strategy.name}},
+    ]})
+    result = response.json()
+    assert [r["status"] for r in result["results"]] == ["ok", "ok"], result
+    recreated = test_client.get(f"/api/v1/strategies/{result['results'][1]['id']}").json()
+    assert recreated["name"] == test_strategy.name
+    assert test_client.get(f"/api/v1/strategies/{test_strategy.id}").status_code == 404
+
+    monkeypatch.setattr(strategy_service, "MAX_BATCH_ITEMS", 1)
+    response = test_client.post("/api/v1/strategies/batch", json={"operations": operations[:2]})
+    assert response.status_code == 422
@@ -0,0 +1,27 @@
+import asyncio
+
+from app.ws_loadtest import percentile, run_load_test
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 99) is None
+
+
+def test_load_test_reports_delivery_for_each_client_kind():
+    """작은 규모로 부하 테스트를 실행하여 정상/느린/멈춘 클라이언트별 전달 결과가 보고되는지 테스트합니다."""
+    report = asyncio.run(run_load_test(
+        clients=10, slow_fraction=0.2, stalled_fraction=0.1, events=5, rate=50.0, rows=5,
+        slow_delay=0.01, broadcast_timeout=2.0, drain_seconds=0.5,
+    ))
+
+    normal = report["by_kind"]["normal"]
+    assert normal["connected"] == 7
+    assert normal["delivered_messages"] == normal["expected_messages"] == 35
+    assert normal["latency_ms"]["p99"] is not None
+    assert report["by_kind"]["slow"]["dropped_messages"] == 0
+    assert report["by_kind"]["stalled"]["connected"] == 1
+    assert report["blocked_broadcasts"] == 0
+    assert report["memory_after"]["peak_rss_kb"] is not None
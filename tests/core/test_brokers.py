@@ -0,0 +1,207 @@
+import asyncio
+import subprocess
+import sys
+import time
+
+import polars as pl
+import pytest
+
+from app.core.brokers.base import BaseBroker
+from app.core.brokers.cached import CachingBroker
+from app.core.brokers.errors import BrokerUnavailableError, CircuitOpenError
+from app.core.brokers.resilient import ResilientBroker
+from app.core.brokers import registry
+from app.core.brokers.registry import available_brokers, create_broker, get_broker_class, register_broker
+from app.core.brokers.simulator import SimulatedBroker
+from app.core.config import settings
+from app.core.resilience import RetryPolicy
+from fakes import ManualClock
+
+
+class CountingBroker(BaseBroker):
+    """호출 횟수를 세고, `release`가 설정될 때까지 응답을 지연시키는 가짜 브로커."""
+    def __init__(self):
+        self.calls = []
+        self.release = asyncio.Event()
+
+    async def get_tickers(self):
+        return ["KRW-BTC"]
+
+    async def get_market_data_for_1st_scan(self, tickers):
+        return pl.DataFrame()
+
+    async def get_ohlcv(self, ticker, timeframe="day", limit=200):
+        self.calls.append((ticker, timeframe, limit))
+        await self.release.wait()
+        return pl.DataFrame({"close": [float(len(self.calls))]})
+
+    async def get_current_price(self, ticker):
+        return 0.0
+
+    async def place_order(self, ticker, order_type, side, amount, price=None):
+        return {}
+
+    async def get_balance(self):
+        return {}
+
+
+def test_registry_resolves_broker_by_strategy_name(monkeypatch):
+    """전략의 broker 이름(대소문자 무관)으로 구현체를 찾고, 등록된 팩토리로 새 브로커를 추가할 수 있는지 테스트합니다."""
+    assert get_broker_class("Simulator") is SimulatedBroker
+    assert isinstance(create_broker("simulator", balances={"KRW": 1.0}), SimulatedBroker)
+
+    # 테스트에서 등록한 브로커가 전역 레지스트리에 남지 않도록 복사본에 등록합니다.
+    monkeypatch.setattr(registry, "_BROKERS", dict(registry._BROKERS))
+    register_broker("paper", lambda **kwargs: SimulatedBroker(balances={"KRW": 5.0}))
+    assert "paper" in available_brokers()
+    assert create_broker("paper").balances == {"KRW": 5.0}
+
+    with pytest.raises(ValueError):
+        create_broker("unknown-exchange")
+
+
+def test_api_startup_does_not_import_broker_modules():
+    """API 앱을 불러올 때 거래소 브로커 모듈과 pyupbit/pandas가 로드되지 않는지 테스트합니다."""
+    code = (
+        "import sys\n"
+        "import app.main\n"
+        "print(','.join(m for m in ('app.core.brokers.upbit', 'pyupbit', 'pandas') if m in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    loaded = (result.stdout.splitlines() or [""])[-1]
+    assert loaded == ""
+
+
+def test_caching_broker_coalesces_concurrent_reads_and_expires_at_candle_boundary():
+    """동시 요청은 한 번만 전송되고, 결과는 TTL과 봉 경계 중 먼저 오는 시각까지만 재사용되는지 테스트합니다."""
+    async def scenario():
+        inner = CountingBroker()
+        clock = ManualClock(now=120.0 - 0.5)  # 1분봉 경계(120초) 0.5초 전
+        broker = CachingBroker(inner, ttl=2.0, max_entries=2, clock=clock)
+
+        callers = [asyncio.create_task(broker.get_ohlcv("KRW-BTC", "minute1", 3)) for _ in range(10)]
+        await asyncio.sleep(0)
+        inner.release.set()
+        results = await asyncio.gather(*callers)
+        assert len(inner.calls) == 1
+        assert all(df["close"][0] == 1.0 for df in results)
+
+        await broker.get_ohlcv("KRW-BTC", "minute1", 3)
+        assert len(inner.calls) == 1
+
+        # TTL(2초)이 남아 있어도 새 봉이 시작되면 다시 조회합니다.
+        clock.current = 120.0
+        assert (await broker.get_ohlcv("KRW-BTC", "minute1", 3))["close"][0] == 2.0
+
+        # 최대 2개만 보관하므로 가장 오래 사용되지 않은 항목이 버려집니다.
+        await broker.get_ohlcv("KRW-ETH", "minute1", 3)
+        await broker.get_ohlcv("KRW-XRP", "minute1", 3)
+        await broker.get_ohlcv("KRW-BTC", "minute1", 3)
+        assert len(inner.calls) == 5
+
+    asyncio.run(scenario())
+
+
+class TurbulentBroker(CountingBroker):
+    """처음 `failures`번은 재시도 가능한 오류로 실패하고, 이후 `slow_first` 초만큼 지연된 뒤 응답하는 가짜 브로커."""
+    def __init__(self, failures: int = 0, slow_first: float = 0.0):
+        super().__init__()
+        self.failures = failures
+        self.slow_first = slow_first
+
+    async def get_ohlcv(self, ticker, timeframe="day", limit=200):
+        self.calls.append(ticker)
+        if len(self.calls) <= self.failures:
+            raise BrokerUnavailableError("timeout", endpoint="ohlcv")
+        if len(self.calls) == 1 and self.slow_first:
+            await asyncio.sleep(self.slow_first)
+        return pl.DataFrame({"close": [float(len(self.calls))]})
+
+
+def test_resilient_broker_retries_then_opens_circuit():
+    """일시적 오류는 재시도로 흡수하고, 연속 실패가 임계값에 이르면 서킷을 열어 요청을 보내지 않는지 테스트합니다."""
+    async def scenario():
+        retry = RetryPolicy(max_attempts=3, base_delay=0.0)
+        inner = TurbulentBroker(failures=2)
+        broker = ResilientBroker(inner, retry=retry, failure_threshold=5)
+        assert (await broker.get_ohlcv("KRW-BTC"))["close"][0] == 3.0
+        assert broker.breakers["ohlcv"].state == "closed"
+
+        inner = TurbulentBroker(failures=100)
+        broker = ResilientBroker(inner, retry=retry, failure_threshold=2, reset_timeout=60.0)
+        with pytest.raises(CircuitOpenError):
+            await broker.get_ohlcv("KRW-BTC")
+        assert len(inner.calls) == 2
+        with pytest.raises(CircuitOpenError):
+            await broker.get_ohlcv("KRW-BTC")
+        assert len(inner.calls) == 2
+
+    asyncio.run(scenario())
+
+
+def test_hedged_request_covers_slow_first_response():
+    """첫 요청이 헤지 지연보다 늦으면 두 번째 요청의 응답을 먼저 사용하는지 테스트합니다."""
+    async def scenario():
+        inner = TurbulentBroker(slow_first=5.0)
+        broker = ResilientBroker(inner, hedge_delay=0.01)
+        started = time.perf_counter()
+        df = await broker.get_ohlcv("KRW-BTC")
+        assert time.perf_counter() - started < 1.0
+        assert df["close"][0] == 2.0
+
+    asyncio.run(scenario())
+
+
+def test_half_open_trial_slot_is_released_when_the_trial_is_cancelled_or_errors():
+    """반쯤 열린 서킷의 시험 요청이 취소되거나 예상하지 못한 오류로 끝나도 서킷이 반쯤 열린 채 멈추지 않는지 테스트합니다."""
+    async def scenario():
+        inner = CountingBroker()
+        broker = ResilientBroker(inner, retry=RetryPolicy(max_attempts=1), failure_threshold=1, reset_timeout=0.0)
+        breaker = broker._breaker("ohlcv")
+        breaker.record_failure()
+
+        trial = asyncio.create_task(broker.get_ohlcv("KRW-BTC"))
+        await asyncio.sleep(0)
+        trial.cancel()
+        await asyncio.gather(trial, return_exceptions=True)
+        assert breaker.state == "half_open"
+        inner.release.set()
+        assert (await broker.get_ohlcv("KRW-BTC")).height == 1
+        assert breaker.state == "closed"
+
+        async def broken():
+            raise ValueError("cannot decode response")
+
+        breaker.record_failure()
+        with pytest.raises(ValueError):
+            await broker._call("ohlcv", broken)
+        assert (await broker.get_ohlcv("KRW-BTC")).height == 1
+        assert breaker.state == "closed"
+
+    asyncio.run(scenario())
+
+
+def test_default_1st_scan_fetch_is_concurrency_limited(monkeypatch):
+    """기본 1차 스캔 데이터 조회가 동시 조회 수 설정을 넘지 않고, 실패한 종목은 빼고 반환하는지 테스트합니다."""
+    monkeypatch.setattr(settings, "SCAN_FETCH_CONCURRENCY", 3)
+
+    class TrackingBroker(CountingBroker):
+        active = peak = 0
+
+        async def get_ohlcv(self, ticker, timeframe="day", limit=200):
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            await asyncio.sleep(0.001)
+            self.active -= 1
+            if ticker == "KRW-BAD":
+                raise BrokerUnavailableError("timeout", endpoint="ohlcv")
+            return pl.DataFrame({"timestamp": [1, 2], "close": [1.0, 2.0]})
+
+    async def scenario():
+        broker = TrackingBroker()
+        df = await BaseBroker.get_market_data_for_1st_scan(broker, [f"KRW-{i}" for i in range(20)] + ["KRW-BAD"])
+        return broker.peak, df
+
+    peak, df = asyncio.run(scenario())
+    assert peak == 3
+    assert df.height == 20
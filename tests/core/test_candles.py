@@ -0,0 +1,154 @@
+import asyncio
+import json
+import subprocess
+import sys
+import polars as pl
+
+from app.core.brokers.base import BaseBroker
+from app.core.brokers.live import LiveCandleBroker
+from app.core.brokers.upbit import decode_candles
+from app.core.candles import CandleAggregator, CandleStore, Trade, rows_to_frame, with_kst_datetime
+from app.core.config import settings
+from app.core.feeds import QueueTradeFeed, ReplayTradeFeed
+from app.services.candle_service import CandleIngestionService
+
+# 2024-01-01 00:00:00 UTC (= 09:00 KST, Upbit 일봉 시작 시각)
+T0 = 1704067200000
+MINUTE = 60_000
+
+
+class FakeRestBroker(BaseBroker):
+    """REST 호출 횟수를 세는 테스트용 브로커."""
+    def __init__(self, frame: pl.DataFrame):
+        self.frame = frame
+        self.ohlcv_calls = 0
+
+    async def get_tickers(self):
+        return ["KRW-BTC"]
+
+    async def get_market_data_for_1st_scan(self, tickers):
+        return pl.DataFrame()
+
+    async def get_ohlcv(self, ticker, timeframe='day', limit=200):
+        self.ohlcv_calls += 1
+        return self.frame.tail(limit)
+
+    async def get_current_price(self, ticker):
+        return 0.0
+
+    async def place_order(self, ticker, order_type, side, amount, price=None):
+        return {}
+
+    async def get_balance(self):
+        return {}
+
+
+def test_aggregator_builds_and_closes_bars():
+    """체결로부터 OHLCV 봉이 만들어지고, 다음 구간 체결 또는 구간 만료 시 완성되는지 테스트합니다."""
+    store = CandleStore()
+    closed = []
+    aggregator = CandleAggregator(["minute1"], store, on_close=lambda t, tf, c: closed.append(c.as_row()))
+
+    aggregator.add_trade(Trade("KRW-BTC", 100.0, 1.0, T0 + 1_000))
+    aggregator.add_trade(Trade("KRW-BTC", 105.0, 2.0, T0 + 20_000))
+    aggregator.add_trade(Trade("KRW-BTC", 95.0, 1.0, T0 + 40_000))
+    aggregator.add_trade(Trade("KRW-BTC", 101.0, 1.0, T0 + MINUTE + 1_000))
+    # 이미 완성된 구간의 늦은 체결은 무시됩니다.
+    aggregator.add_trade(Trade("KRW-BTC", 1.0, 100.0, T0 + 5_000))
+
+    assert closed == [(T0, 100.0, 105.0, 95.0, 95.0, 4.0, 405.0)]
+
+    df = store.to_frame("KRW-BTC", "minute1", limit=10)
+    assert df["close"].to_list() == [95.0, 101.0]
+    assert df.columns == ["timestamp", "open", "high", "low", "close", "volume", "amount"]
+
+    assert aggregator.close_expired(T0 + 2 * MINUTE) == 1
+    assert len(closed) == 2
+    assert store.size("KRW-BTC", "minute1") == 2
+
+
+def test_live_broker_backfills_once_then_serves_from_memory():
+    """처음 요청 시에만 REST로 과거 봉을 채우고, 이후에는 메모리에서 최신 봉을 제공하는지 테스트합니다."""
+    history = rows_to_frame([(T0 - (3 - i) * MINUTE, 90.0, 91.0, 89.0, 90.0 + i, 1.0, 90.0) for i in range(3)])
+    rest = FakeRestBroker(history)
+    store = CandleStore(capacity=10)
+    aggregator = CandleAggregator(["minute1"], store)
+    broker = LiveCandleBroker(rest, store, {"minute1"})
+
+    async def scenario():
+        aggregator.add_trade(Trade("KRW-BTC", 120.0, 1.0, T0 + 1_000))
+        first = await broker.get_ohlcv("KRW-BTC", "minute1", limit=3)
+        aggregator.add_trade(Trade("KRW-BTC", 125.0, 1.0, T0 + 2_000))
+        second = await broker.get_ohlcv("KRW-BTC", "minute1", limit=3)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert rest.ohlcv_calls == 1
+    assert first["close"].to_list() == [91.0, 92.0, 120.0]
+    assert second["close"].to_list() == [91.0, 92.0, 125.0]
+
+
+def test_ingestion_service_with_replay_and_queue_feeds(tmp_path):
+    """리플레이 파일과 프로세스 내 큐 피드가 거래소 소켓을 대신할 수 있는지 테스트합니다."""
+    replay_file = tmp_path / "trades.jsonl"
+    replay_file.write_text("\n".join(
+        json.dumps({"ticker": "KRW-ETH", "price": 10 + i, "volume": 1, "timestamp": T0 + i * 30_000})
+        for i in range(4)
+    ))
+
+    async def scenario():
+        service = CandleIngestionService(["minute1"])
+        await service._consume(ReplayTradeFeed(str(replay_file)))
+        replayed = service.store.to_frame("KRW-ETH", "minute1", limit=10)
+
+        feed = QueueTradeFeed()
+        service.start(feed)
+        await feed.publish(Trade("KRW-XRP", 1.5, 10.0, T0))
+        await feed.close()
+        await asyncio.sleep(0.01)
+        live = service.store.to_frame("KRW-XRP", "minute1", limit=10)
+        await service.stop()
+        return replayed, live
+
+    replayed, live = asyncio.run(scenario())
+    assert replayed["open"].to_list() == [10.0, 12.0]
+    assert replayed["close"].to_list() == [11.0, 13.0]
+    assert live["amount"].to_list() == [15.0]
+
+
+def test_decode_upbit_candles_into_compact_schema(monkeypatch):
+    """
+    Upbit 캔들 JSON을 pandas 없이 시간 순의 정수 timestamp/Float64 가격 프레임으로 디코딩하고,
+    Float32 가격은 설정으로 선택할 때만 사용하는지 테스트합니다.
+    """
+    payload = json.dumps([
+        {"market": "KRW-BTC", "candle_date_time_utc": "2024-01-02T00:00:00", "candle_date_time_kst": "2024-01-02T09:00:00",
+         "opening_price": 101.0, "high_price": 143_251_000.0, "low_price": 100.0, "trade_price": 105.5,
+         "timestamp": 1704157200000, "candle_acc_trade_price": 2110.0, "candle_acc_trade_volume": 20.0},
+        {"market": "KRW-BTC", "candle_date_time_utc": "2024-01-01T00:00:00", "candle_date_time_kst": "2024-01-01T09:00:00",
+         "opening_price": 95.0, "high_price": 102.0, "low_price": 94.0, "trade_price": 101.0,
+         "timestamp": 1704070800000, "candle_acc_trade_price": 1000.0, "candle_acc_trade_volume": 10.0},
+    ]).encode()
+
+    df = decode_candles(payload)
+
+    assert df.columns == ["timestamp", "open", "high", "low", "close", "volume", "amount"]
+    assert df["timestamp"].to_list() == [T0, T0 + 86_400_000]
+    assert df["timestamp"].dtype == pl.Int64
+    assert df["close"].dtype == pl.Float64
+    assert df["close"].to_list() == [101.0, 105.5]
+    assert df["high"][1] == 143_251_000.0  # 2^24를 넘는 KRW 가격도 그대로 유지
+    assert df["amount"].to_list() == [1000.0, 2110.0]
+    assert with_kst_datetime(df)["timestamp"][0].hour == 9
+
+    monkeypatch.setattr(settings, "CANDLE_PRICE_DTYPE", "float32")
+    compact = decode_candles(payload)
+    assert compact["close"].dtype == pl.Float32
+    assert compact["high"][1] == 143_251_008.0
+
+
+def test_importing_upbit_broker_does_not_load_pandas():
+    """시세 조회 경로만 쓰는 경우 브로커를 불러와도 pandas/pyupbit가 로드되지 않는지 테스트합니다."""
+    code = "import sys, app.core.brokers.upbit; print('pandas' in sys.modules, 'pyupbit' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["False", "False"]
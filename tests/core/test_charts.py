@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from app.core.brokers.simulator import SimulatedBroker
+from app.core.charts import OverlayCache, downsample, lttb_indices
+from app.core.features import FeatureCache
+from app.services import scan_service
+from app.services.chart_service import ChartService
+from fakes import make_candles
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    """LTTB가 요청한 개수만큼 점을 남기면서 첫/마지막 점과 급등 지점을 보존하는지 테스트합니다."""
+    closes = [100.0] * 1000
+    closes[537] = 500.0
+    indices = lttb_indices(list(range(1000)), closes, 50)
+
+    assert len(indices) == 50
+    assert indices[0] == 0 and indices[-1] == 999
+    assert indices == sorted(indices)
+    assert 537 in indices
+
+    frame = downsample(make_candles(closes), 50)
+    assert frame.height == 50
+    assert frame["close"].max() == 500.0
+    # 봉 수가 이미 적으면 그대로 반환합니다.
+    assert downsample(make_candles(closes[:10]), 50).height == 10
+
+
+def test_chart_service_caches_overlays_and_pushes_only_new_bars(monkeypatch):
+    """같은 봉 데이터의 오버레이는 캐시에서 재사용하고, 실시간 전송은 바뀐 봉만 보내는지 테스트합니다."""
+    closes = [float(i) for i in range(1, 31)]
+    broker = SimulatedBroker(candles={"KRW-A": make_candles(closes)})
+    monkeypatch.setitem(scan_service._scan_brokers, "simulator", broker)
+    service = ChartService(cache=OverlayCache(8), features=FeatureCache())
+
+    async def scenario():
+        chart = await service.get_chart("KRW-A", "minute1", 30, ["ma(5)"], broker="simulator")
+        assert chart.total_bars == 30 and not chart.downsampled
+        assert chart.bars[-1]["ma(5)"] == 28.0
+        assert chart.bars[0]["ma(5)"] is None
+        first = await service.load("KRW-A", "minute1", 30, ["ma(5)"], "simulator")
+        assert await service.load("KRW-A", "minute1", 30, ["ma(5)"], "simulator") is first
+
+        subscription = ("simulator", "KRW-A", "minute1", ("ma(5)",))
+        frame = await service.load("KRW-A", "minute1", 30, ["ma(5)"], "simulator")
+        assert [bar["close"] for bar in service._updates(subscription, frame)] == [30.0]
+        assert service._updates(subscription, frame) == []
+
+        # 진행 중인 봉이 바뀌고 새 봉이 하나 추가됨
+        broker.candles["KRW-A"] = make_candles(closes[:-1] + [31.0, 32.0])
+        frame = await service.load("KRW-A", "minute1", 30, ["ma(5)"], "simulator")
+        assert frame is not first
+        bars = service._updates(subscription, frame)
+        assert [bar["close"] for bar in bars] == [31.0, 32.0]
+        assert bars[-1]["ma(5)"] == pytest.approx(29.4)
+
+    asyncio.run(scenario())
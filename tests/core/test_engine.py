@@ -0,0 +1,278 @@
+import asyncio
+import threading
+
+import polars as pl
+
+from app.core.brokers.errors import RateLimitedError
+from app.core.brokers.resilient import ResilientBroker
+from app.core.engine import LogicParser, ScanEngine, scan_deadline
+from app.core.features import FeatureCache
+from app.core.resilience import RetryPolicy
+from app.services.scan_service import mock_indicators
+from fakes import FrameBroker, ManualClock
+
+
+def _frame() -> pl.DataFrame:
+    return pl.DataFrame({
+        "close": [float(i) for i in range(1, 31)],
+        "amount": [1000.0] * 30,
+    })
+
+
+def test_cheap_conjunct_short_circuits_expensive_indicator():
+    """싼 조건이 거짓이면 비싼 보조지표를 계산하지 않는지 테스트합니다."""
+    calls = []
+
+    def tracked_ma(period):
+        def compute(series: pl.Series) -> pl.Series:
+            calls.append(period)
+            return series.rolling_mean(window_size=int(period))
+        return pl.col("close").map_batches(compute, return_dtype=pl.Float64)
+
+    parser = LogicParser({"ma": tracked_ma}, _frame())
+
+    # 사용자가 비싼 조건을 먼저 써도 싼 조건부터 평가합니다.
+    condition = parser.compile_condition("ma(5) > ma(20) AND amount > 5000")
+    assert parser.evaluate_latest(condition) is False
+    assert calls == []
+
+    condition = parser.compile_condition("ma(5) > ma(20) AND amount > 500")
+    assert parser.evaluate_latest(condition) is True
+    assert sorted(calls) == [5.0, 20.0]
+
+    calls.clear()
+    condition = parser.compile_condition("ma(5) > ma(20) OR close > 1")
+    assert parser.evaluate_latest(condition) is True
+    assert calls == []
+
+
+def test_evaluate_latest_matches_full_evaluation():
+    """단락 평가 결과가 전체 시계열 평가의 마지막 값(null은 거짓)과 같은지 테스트합니다."""
+    expressions = [
+        "close > 10 AND ma(5) > ma(20)",
+        "close < 10 OR ma(5) < ma(20)",
+        "( close > 100 OR amount >= 1000 ) AND ma(3) > 0",
+        "ma(50) > 0 OR close > 100",  # 데이터가 부족한 보조지표는 null
+        "ma(50) > 0 AND close > 1",
+        "trend.shift(1) > 0 AND close > 1",
+    ]
+    for expression in expressions:
+        parser = LogicParser(mock_indicators, _frame())
+        parser.set_variable("trend", "ma(5) - ma(10)")
+        expected = parser.evaluate_on_df(expression).tail(1)[0]
+        assert parser.evaluate_latest(parser.compile_condition(expression)) is bool(expected), expression
+
+
+class SnapshotBroker:
+    """1차 스캔용 스냅샷을 반환하는 테스트용 브로커."""
+    def __init__(self, snapshot: pl.DataFrame):
+        self.snapshot = snapshot
+        self.requested = None
+
+    async def get_tickers(self):
+        return self.snapshot["ticker"].to_list()
+
+    async def get_market_data_for_1st_scan(self, tickers):
+        self.requested = tickers
+        return self.snapshot.filter(pl.col("ticker").is_in(tickers))
+
+
+def test_row_local_conjuncts_are_pushed_into_1st_scan():
+    """보조지표/shift 없는 2차 스캔 조건이 1차 스캔에 자동 적용되는지 테스트합니다."""
+    snapshot = pl.DataFrame({
+        "ticker": ["KRW-BTC", "KRW-ETH", "KRW-XRP"],
+        "close": [100.0, 50.0, 10.0],
+        "amount": [9000.0, 100.0, 9000.0],
+    })
+    broker = SnapshotBroker(snapshot)
+    engine = ScanEngine(broker=broker, indicators=mock_indicators)
+    scan_logic = {
+        "2nd_scan": {
+            "variables": [{"name": "fast", "expression": "ma(5)"}],
+            "condition": "amount > 1000 AND fast > ma(20) AND close > 20",
+        }
+    }
+
+    assert asyncio.run(engine.run_1st_scan(scan_logic)) == ["KRW-BTC"]
+
+    # OR 조건, 다른 봉 단위, 명시적으로 끈 경우에는 옮기지 않습니다.
+    assert engine.pushdown_condition({"2nd_scan": {"condition": "amount > 1000 OR ma(5) > 1"}}) is None
+    assert engine.pushdown_condition({"2nd_scan": {"condition": "amount > 1000", "timeframe": "minute1"}}) is None
+    assert engine.pushdown_condition({"1st_scan": {"pushdown": False}, "2nd_scan": {"condition": "close > 1"}}) is None
+
+
+class FlakyBroker:
+    """지정한 종목의 OHLCV 조회가 계속 요청 수 제한으로 실패하는 테스트용 브로커."""
+    def __init__(self, failing: set):
+        self.failing = failing
+
+    async def get_ohlcv(self, ticker, timeframe="day", limit=200):
+        if ticker in self.failing:
+            raise RateLimitedError("Upbit ohlcv rate limited", endpoint="ohlcv")
+        return _frame()
+
+
+def test_2nd_scan_reports_per_ticker_failures():
+    """브로커 오류로 평가하지 못한 종목이 결과에서 조용히 빠지지 않고 사유와 함께 보고되는지 테스트합니다."""
+    broker = ResilientBroker(FlakyBroker({"KRW-ETH"}), retry=RetryPolicy(max_attempts=2, base_delay=0.0))
+    engine = ScanEngine(broker=broker, indicators=mock_indicators)
+    scan_logic = {"2nd_scan": {"timeframe": "minute1", "condition": "close > 10"}}
+
+    results = asyncio.run(engine.run_2nd_scan(scan_logic, tickers=["KRW-BTC", "KRW-ETH"]))
+
+    assert results["ticker"].to_list() == ["KRW-BTC"]
+    report = engine.last_report
+    assert (report.scanned, report.matched) == (2, 1)
+    assert report.failed_list() == [{"ticker": "KRW-ETH", "error": "RateLimitedError: Upbit ohlcv rate limited"}]
+
+
+class SlowBroker:
+    """조회할 때마다 테스트 시계를 1초씩 진행시키는 브로커."""
+    def __init__(self, clock):
+        self.clock = clock
+        self.fetched = []
+
+    async def get_ohlcv(self, ticker, timeframe="day", limit=200):
+        self.fetched.append(ticker)
+        self.clock.current += 1.0
+        return _frame()
+
+
+def test_2nd_scan_stops_at_deadline_with_prioritized_partial_result():
+    """1차 스캔이 거래대금 순으로 정렬하고, 2차 스캔은 마감 시각이 지나면 남은 종목을 건너뛰는지 테스트합니다."""
+    snapshot = pl.DataFrame({
+        "ticker": ["KRW-XRP", "KRW-BTC", "KRW-DOGE", "KRW-ETH"],
+        "close": [10.0, 100.0, 1.0, 50.0],
+        "amount": [300.0, 9000.0, 10.0, 5000.0],
+    })
+    scan_logic = {"1st_scan": {"condition": "close > 0"}, "2nd_scan": {"timeframe": "minute1", "condition": "close > 10"}}
+    watchlist = asyncio.run(ScanEngine(SnapshotBroker(snapshot), mock_indicators).run_1st_scan(scan_logic))
+    assert watchlist == ["KRW-BTC", "KRW-ETH", "KRW-XRP", "KRW-DOGE"]
+
+    clock = ManualClock()
+    broker = SlowBroker(clock)
+    engine = ScanEngine(broker=broker, indicators=mock_indicators, clock=clock)
+
+    results = asyncio.run(engine.run_2nd_scan(scan_logic, tickers=watchlist, deadline=2.5))
+
+    assert broker.fetched == ["KRW-BTC", "KRW-ETH", "KRW-XRP"]
+    assert results.height == 3
+    report = engine.last_report
+    assert report.partial and report.skipped == ["KRW-DOGE"]
+    assert report.scanned == 3
+
+    # 마감 시각은 기본적으로 2차 스캔 봉이 닫히는 시각이며, deadline_seconds로 바꾸거나 끌 수 있습니다.
+    assert scan_deadline(scan_logic, 125.0) == 180.0
+    assert scan_deadline({"2nd_scan": {"deadline_seconds": 30}}, 125.0) == 155.0
+    assert scan_deadline({"2nd_scan": {"deadline_seconds": None}}, 125.0) is None
+
+
+def test_feature_cache_shares_indicators_across_strategies_until_a_new_bar():
+    """같은 봉 데이터의 같은 보조지표는 전략이 달라도 한 번만 계산되고, 새 봉이 오면 다시 계산되는지 테스트합니다."""
+    calls = []
+
+    def tracked_ma(period):
+        def compute(series: pl.Series) -> pl.Series:
+            calls.append(period)
+            return series.rolling_mean(window_size=int(period))
+        return pl.col("close").map_batches(compute, return_dtype=pl.Float64)
+
+    bars = _frame().with_columns(pl.int_range(0, 30, dtype=pl.Int64).alias("timestamp"))
+    cache = FeatureCache()
+    indicators = {"ma": tracked_ma}
+
+    strategies = ["ma(5) > ma(20)", "close > ma(5)", "ma(20) < 100 AND ma(5) > 0"]
+    results = []
+    for expression in strategies:
+        parser = LogicParser(indicators, bars, features=cache, frame_key=("KRW-BTC", "day"))
+        results.append(parser.evaluate_latest(parser.compile_condition(expression)))
+    # 세 전략이 쓰는 ma(5), ma(20)은 각각 한 번씩만 계산됩니다.
+    assert sorted(calls) == [5.0, 20.0]
+    expected = [LogicParser(mock_indicators, bars).evaluate_on_df(e).tail(1)[0] for e in strategies]
+    assert results == expected
+
+    calls.clear()
+
+    # 새 봉이 추가되면 이전 결과를 쓰지 않습니다.
+    next_bar = pl.DataFrame({"close": [31.0], "amount": [1000.0], "timestamp": [30]})
+    parser = LogicParser(indicators, pl.concat([bars, next_bar]), features=cache, frame_key=("KRW-BTC", "day"))
+    parser.evaluate_latest(parser.compile_condition("ma(5) > 0"))
+    assert calls == [5.0]
+    assert len(cache) == 2
+
+    # 메모리 한도를 넘으면 오래된 항목부터 버립니다.
+    small = FeatureCache(max_bytes=bars.height * 8 + 64)
+    for period in ("5", "10"):
+        parser = LogicParser(indicators, bars, features=small, frame_key=("KRW-BTC", "day"))
+        parser.evaluate_latest(parser.compile_condition(f"ma({period}) > 0"))
+    assert len(small) == 1 and small.size_bytes <= small.max_bytes
+
+
+def test_streaming_2nd_scan_bounds_buffered_frames_and_applies_backpressure():
+    """2차 스캔이 묶음 단위로 결과를 내보내고, 평가를 기다리는 봉 데이터를 한도 안에 두며, 느린 소비자에 맞춰 조회를 늦추는지 테스트합니다."""
+    frame = _frame()
+    tickers = [f"KRW-T{i:03d}" for i in range(200)]
+
+    class CountingBroker:
+        def __init__(self):
+            self.fetched = 0
+
+        async def get_ohlcv(self, ticker, timeframe="day", limit=200):
+            self.fetched += 1
+            await asyncio.sleep(0)
+            return frame
+
+    broker = CountingBroker()
+    chunk_bytes = frame.estimated_size() * 10
+    engine = ScanEngine(
+        broker=broker, indicators=mock_indicators, chunk_size=10, max_buffer_bytes=int(chunk_bytes * 2.5),
+    )
+
+    async def consume():
+        chunks, max_ahead, consumed = [], 0, 0
+        async for chunk in engine.stream_2nd_scan({"2nd_scan": {"condition": "close > 15"}}, tickers):
+            consumed += chunk.height
+            max_ahead = max(max_ahead, broker.fetched - consumed)
+            chunks.append(chunk)
+            await asyncio.sleep(0.001)  # 느린 소비자 (결과 전송)
+        return chunks, max_ahead
+
+    chunks, max_ahead = asyncio.run(consume())
+    assert len(chunks) == 20 and sum(c.height for c in chunks) == 200
+    report = engine.last_report
+    assert (report.scanned, report.matched, report.partial) == (200, 200, False)
+    assert 0 < report.peak_buffer_bytes <= chunk_bytes * 2.5
+    # 조회 단계는 평가 대기열(1묶음)과 버퍼 한도만큼만 앞서 나갑니다.
+    assert max_ahead <= 30
+
+
+def test_scan_evaluation_runs_off_the_event_loop_thread(monkeypatch):
+    """1차/2차 스캔의 Polars 평가가 스레드 풀에서 실행되어, API 프로세스의 이벤트 루프를 막지 않는지 테스트합니다."""
+    threads = {}
+    evaluate_on_df = LogicParser.evaluate_on_df
+
+    def traced_evaluate_on_df(self, expression):
+        threads["1st"] = threading.get_ident()
+        return evaluate_on_df(self, expression)
+
+    def traced_ma(period):
+        threads["2nd"] = threading.get_ident()
+        return pl.col("close").rolling_mean(window_size=int(period))
+
+    class SnapshotBroker(FrameBroker):
+        async def get_market_data_for_1st_scan(self, tickers):
+            return pl.DataFrame({"ticker": ["KRW-BTC", "KRW-ETH"], "close": [10.0, 1.0], "amount": [1.0, 2.0]})
+
+    monkeypatch.setattr(LogicParser, "evaluate_on_df", traced_evaluate_on_df)
+
+    async def scenario():
+        engine = ScanEngine(broker=SnapshotBroker(_frame()), indicators={"ma": traced_ma})
+        watchlist = await engine.run_1st_scan({"1st_scan": {"condition": "close > 5"}}, tickers=["KRW-BTC", "KRW-ETH"])
+        results = await engine.run_2nd_scan({"2nd_scan": {"condition": "close > ma(5)"}}, tickers=watchlist)
+        return threading.get_ident(), watchlist, results
+
+    loop_thread, watchlist, results = asyncio.run(scenario())
+    assert watchlist == ["KRW-BTC"]
+    assert results["ticker"].to_list() == ["KRW-BTC"]
+    assert set(threads) == {"1st", "2nd"}
+    assert loop_thread not in threads.values()
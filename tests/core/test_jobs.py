@@ -0,0 +1,109 @@
+import asyncio
+import datetime
+import json
+
+from app.core.brokers.simulator import SimulatedBroker
+from app.core.jobs import JobQueue, DONE, FAILED, EVENT_BROADCAST
+from app.models.strategy import StrategySchema
+from app.services import scan_service
+from app.services.job_service import ScanJobRelay
+from app.services.websocket_manager import manager
+from app.worker import run_job, worker_loop
+from fakes import DAY_MS, FakeClock, make_candles
+
+
+def test_job_queue_claims_in_order_and_reclaims_expired_leases(tmp_path):
+    """작업을 순서대로 한 번씩만 가져가고, 임대가 끝난 작업은 다시 가져가며, 재시도 한도를 넘으면 실패로 정리하는지 테스트합니다."""
+    clock = FakeClock(1_000.0)
+    queue = JobQueue(str(tmp_path / "jobs.db"), max_attempts=2, clock=clock)
+    first = queue.enqueue("scan_1st", {"n": 1})
+    second = queue.enqueue("scan_1st", {"n": 2})
+
+    assert queue.claim("a", lease_seconds=10).id == first
+    assert queue.claim("b", lease_seconds=10).id == second
+    assert queue.claim("c", lease_seconds=10) is None
+
+    clock.now += 5
+    assert queue.heartbeat(first, "a", lease_seconds=10)
+    clock.now += 8  # second의 임대만 끝남
+    reclaimed = queue.claim("c", lease_seconds=10)
+    assert (reclaimed.id, reclaimed.attempts, reclaimed.worker) == (second, 2, "c")
+    assert not queue.heartbeat(second, "b", lease_seconds=10)
+
+    assert queue.publish(first, "a", "hello")
+    assert queue.complete(first, "a", {"watchlist": ["KRW-BTC"]})
+    clock.now += 20
+    assert queue.claim("d", lease_seconds=10) is None
+    assert queue.get(first).status == DONE
+    assert queue.get(second).status == FAILED
+    kinds = [kind for _, _, kind, _ in queue.events_after(0)]
+    assert kinds == [EVENT_BROADCAST, "result", "finished", "finished"]
+
+
+def test_worker_runs_queued_scans_and_relay_delivers_events(tmp_path, monkeypatch):
+    """워커가 큐의 스캔 작업을 실행하고, 릴레이가 메시지 전송과 관심종목 반영을 API 쪽에서 처리하는지 테스트합니다."""
+    candles = make_candles([float(100 + i) for i in range(30)], interval_ms=DAY_MS)
+    monkeypatch.setitem(scan_service._scan_brokers, "simulator", SimulatedBroker(candles={"KRW-UP": candles}))
+    strategy = StrategySchema(
+        id=987, name="worker test", broker="simulator", market="KRW", is_active=True,
+        created_at=datetime.datetime.now(datetime.timezone.utc),
+        scan_logic={"1st_scan": {"condition": "close > 0"}, "2nd_scan": {"timeframe": "day", "condition": "close > 0"}},
+    )
+    broadcasts = []
+
+    async def capture(message):
+        broadcasts.append(json.loads(message)["event"])
+
+    monkeypatch.setattr(manager, "broadcast", capture)
+    queue = JobQueue(str(tmp_path / "jobs.db"))
+
+    async def scenario():
+        relay = ScanJobRelay(queue, poll_interval=0.01)
+        relay.start()
+        stop = asyncio.Event()
+        worker = asyncio.create_task(worker_loop(queue, "w1", concurrency=2, poll_interval=0.01, stop=stop))
+        job = await relay.wait(await relay.submit("scan", strategy), timeout=5)
+        stop.set()
+        await worker
+        await relay.poll_once()
+        await relay.stop()
+        return job
+
+    job = asyncio.run(scenario())
+    assert job.status == DONE and job.worker == "w1"
+    assert broadcasts == ["watchlist_updated", "scan_result_chunk", "scan_result_found"]
+    assert scan_service.watchlist_storage.pop(987) == ["KRW-UP"]
+
+
+def test_worker_drops_result_after_losing_lease(tmp_path, monkeypatch):
+    """임대를 잃은 워커의 완료/실패/메시지는 기록되지 않고, 실행 중인 작업은 취소되는지 테스트합니다."""
+    clock = FakeClock(1_000.0)
+    queue = JobQueue(str(tmp_path / "jobs.db"), clock=clock)
+    job_id = queue.enqueue("scan_1st", {})
+    stale = queue.claim("a", lease_seconds=10)
+    clock.now += 11
+    assert queue.claim("b", lease_seconds=10).id == job_id
+
+    assert not queue.publish(job_id, "a", "late")
+    assert not queue.complete(job_id, "a", {"watchlist": ["KRW-OLD"]})
+    assert not queue.fail(job_id, "a", "boom")
+    assert queue.events_after(0) == []
+
+    cancelled = asyncio.Event()
+
+    async def slow_scan(kind, payload):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    monkeypatch.setattr("app.worker.execute_scan_job", slow_scan)
+
+    asyncio.run(asyncio.wait_for(run_job(queue, stale, "a", lease_seconds=0.03), timeout=5))
+    assert cancelled.is_set()
+    assert queue.get(job_id).worker == "b"
+    assert queue.events_after(0) == []
+
+    assert queue.complete(job_id, "b", {"watchlist": ["KRW-NEW"]})
+    assert [kind for _, _, kind, _ in queue.events_after(0)] == ["result", "finished"]
@@ -0,0 +1,59 @@
+import json
+import logging
+import queue
+
+from app.core.logs import FIELDS_ATTR, LOG_RECORDS_DROPPED, LogSampler, StructuredFormatter, _NonBlockingQueueHandler
+from fakes import FakeClock
+
+
+def _record(message: str, *args, **fields) -> logging.LogRecord:
+    record = logging.LogRecord("app.test", logging.INFO, __file__, 1, message, args, None)
+    if fields:
+        setattr(record, FIELDS_ATTR, fields)
+    return record
+
+
+def test_sampler_limits_per_key_and_reports_suppressed_count():
+    """키마다 구간당 `limit`개만 허용하고, 다음 구간의 첫 레코드에 버린 수를 알려주는지 테스트합니다."""
+    clock = FakeClock()
+    sampler = LogSampler(limit=2, interval=10.0, clock=clock)
+
+    assert [sampler.allow("a") for _ in range(5)] == [0, 0, None, None, None]
+    # 다른 키는 따로 셉니다.
+    assert sampler.allow("b") == 0
+
+    clock.now = 10.0
+    assert sampler.allow("a") == 3
+    assert sampler.allow("a") == 0
+    assert sampler.allow("a") is None
+
+
+def test_queue_handler_drops_instead_of_blocking_when_full():
+    """큐가 가득 차면 로그 호출이 기다리지 않고 레코드를 버리며 버린 수를 세는지 테스트합니다."""
+    records = queue.Queue(maxsize=1)
+    handler = _NonBlockingQueueHandler(records)
+    before = LOG_RECORDS_DROPPED.value()
+
+    handler.handle(_record("첫 번째 %s", "레코드"))
+    handler.handle(_record("두 번째"))
+
+    assert records.qsize() == 1
+    assert LOG_RECORDS_DROPPED.value() == before + 1
+    # 인자는 큐에 넣기 전에 메시지에 합쳐집니다.
+    queued = records.get_nowait()
+    assert queued.getMessage() == "첫 번째 레코드"
+    assert queued.args is None
+
+
+def test_structured_formatter_renders_fields():
+    """구조화 필드가 JSON 형식에서는 최상위 키로, 텍스트 형식에서는 key=value로 출력되는지 테스트합니다."""
+    record = _record("2nd 스캔 완료: '%s'", "전략", scanned=120, partial=False)
+
+    entry = json.loads(StructuredFormatter(json_format=True).format(record))
+    assert entry["message"] == "2nd 스캔 완료: '전략'"
+    assert entry["level"] == "INFO"
+    assert entry["scanned"] == 120
+    assert entry["partial"] is False
+
+    text = StructuredFormatter().format(record)
+    assert text.endswith("2nd 스캔 완료: '전략' scanned=120 partial=false")
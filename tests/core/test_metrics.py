@@ -0,0 +1,58 @@
+import asyncio
+import polars as pl
+
+from app.core.engine import ScanEngine
+from app.core.metrics import MetricsRegistry, SCAN_STAGE_SECONDS, SCAN_TICKERS
+from fakes import FrameBroker
+
+
+def test_registry_renders_prometheus_text():
+    """카운터와 히스토그램이 Prometheus 텍스트 형식으로 렌더링되는지 테스트합니다."""
+    registry = MetricsRegistry()
+    requests = registry.counter("test_requests_total", "Requests.", ("endpoint",))
+    latency = registry.histogram("test_latency_seconds", "Latency.", ("endpoint",), buckets=(0.1, 1.0))
+
+    requests.inc(endpoint="ohlcv")
+    requests.inc(2, endpoint="ohlcv")
+    latency.observe(0.05, endpoint="ohlcv")
+    latency.observe(0.5, endpoint="ohlcv")
+
+    text = registry.render()
+    assert 'test_requests_total{endpoint="ohlcv"} 3' in text
+    assert 'test_latency_seconds_bucket{endpoint="ohlcv",le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{endpoint="ohlcv",le="1"} 2' in text
+    assert 'test_latency_seconds_bucket{endpoint="ohlcv",le="+Inf"} 2' in text
+    assert 'test_latency_seconds_count{endpoint="ohlcv"} 2' in text
+    assert "# TYPE test_latency_seconds histogram" in text
+
+
+def test_disabled_registry_records_nothing():
+    """비활성화된 레지스트리는 아무것도 기록하지 않는지 테스트합니다."""
+    registry = MetricsRegistry(enabled=False)
+    requests = registry.counter("test_requests_total", "Requests.")
+    latency = registry.histogram("test_latency_seconds", "Latency.")
+
+    requests.inc()
+    with latency.time():
+        pass
+
+    assert requests.value() == 0
+    assert latency.count() == 0
+
+
+def test_scan_records_stage_latency_and_ticker_counters():
+    """2차 스캔이 단계별 지연 시간과 종목 카운터를 기록하는지 테스트합니다."""
+    frame = pl.DataFrame({"close": [1.0, 2.0, 3.0]})
+    engine = ScanEngine(broker=FrameBroker(frame), indicators={})
+    scan_logic = {"2nd_scan": {"condition": "close > 2"}}
+
+    scanned = SCAN_TICKERS.value(phase="2nd", outcome="scanned")
+    matched = SCAN_TICKERS.value(phase="2nd", outcome="matched")
+    evaluated = SCAN_STAGE_SECONDS.count(stage="evaluate")
+
+    result = asyncio.run(engine.run_2nd_scan(scan_logic, tickers=["KRW-BTC", "KRW-ETH"]))
+
+    assert result["ticker"].to_list() == ["KRW-BTC", "KRW-ETH"]
+    assert SCAN_TICKERS.value(phase="2nd", outcome="scanned") == scanned + 2
+    assert SCAN_TICKERS.value(phase="2nd", outcome="matched") == matched + 2
+    assert SCAN_STAGE_SECONDS.count(stage="evaluate") == evaluated + 2
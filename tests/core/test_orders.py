@@ -0,0 +1,190 @@
+import asyncio
+import time
+
+from app.core.brokers.simulator import SimulatedBroker
+from app.core.orders import OrderPipeline, OrderRequest
+
+
+def test_pipeline_fills_market_orders_and_deduplicates_by_idempotency_key():
+    """시장가 주문이 체결되고, 같은 멱등 키의 재제출은 새 주문을 내지 않는지 테스트합니다."""
+    broker = SimulatedBroker(balances={"KRW": 1_000_000.0}, prices={"KRW-BTC": 50_000.0}, fee_rate=0.0)
+
+    async def scenario():
+        pipeline = OrderPipeline(broker, rate_per_second=100)
+        pipeline.start()
+        request = OrderRequest("KRW-BTC", "buy", "market", 100_000.0, idempotency_key="signal-1")
+        first = await pipeline.submit(request)
+        second = await pipeline.submit(request)
+        await pipeline.wait(first.client_order_id, timeout=1)
+        await pipeline.stop()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first is second
+    assert first.status == "filled"
+    assert first.executed_volume == 2.0
+    assert first.submit_latency is not None
+    assert len(broker.orders) == 1
+    assert broker.balances == {"KRW": 900_000.0, "BTC": 2.0}
+
+
+def test_pipeline_tracks_resting_limit_orders_until_filled():
+    """미체결 지정가 주문을 추적하다가 가격이 도달하면 체결로 반영하는지 테스트합니다."""
+    broker = SimulatedBroker(balances={"KRW": 1_000_000.0}, prices={"KRW-ETH": 3_000.0}, fee_rate=0.0)
+
+    async def scenario():
+        pipeline = OrderPipeline(broker, rate_per_second=100, fill_poll_interval=0.01)
+        pipeline.start()
+        record = await pipeline.submit(OrderRequest("KRW-ETH", "buy", "limit", 10.0, price=2_900.0))
+        await asyncio.sleep(0.05)
+        status_before = record.status
+        broker.set_price("KRW-ETH", 2_850.0)
+        await pipeline.wait(record.client_order_id, timeout=1)
+        await pipeline.stop()
+        return status_before, record
+
+    status_before, record = asyncio.run(scenario())
+    assert status_before == "open"
+    assert record.status == "filled"
+    assert broker.balances["ETH"] == 10.0
+    assert broker.balances["KRW"] == 1_000_000.0 - 29_000.0
+
+
+def test_pipeline_respects_rate_limit_and_retries_rate_limited_orders():
+    """토큰 버킷으로 주문 전송 속도를 제한하고, 요청 수 제한 거부는 재시도하는지 테스트합니다."""
+    class RateLimitedOnce(SimulatedBroker):
+        rejected = False
+
+        async def place_order(self, ticker, order_type, side, amount, price=None):
+            if not self.rejected:
+                self.rejected = True
+                return {"error": "Too many API requests.", "retryable": True}
+            return await super().place_order(ticker, order_type, side, amount, price)
+
+    broker = RateLimitedOnce(balances={"KRW": 1_000_000.0}, prices={"KRW-XRP": 500.0})
+
+    async def scenario():
+        pipeline = OrderPipeline(broker, rate_per_second=20, burst=1, concurrency=4)
+        pipeline.start()
+        started = time.monotonic()
+        records = [await pipeline.submit(OrderRequest("KRW-XRP", "buy", "market", 5_000.0)) for _ in range(4)]
+        await asyncio.gather(*(pipeline.wait(r.client_order_id, timeout=2) for r in records))
+        elapsed = time.monotonic() - started
+        await pipeline.stop()
+        return records, elapsed
+
+    records, elapsed = asyncio.run(scenario())
+    assert all(r.status == "filled" for r in records)
+    assert sum(r.attempts for r in records) == 5
+    # 버스트 1, 초당 20건이면 5번의 전송에는 최소 4 x 50ms가 필요합니다.
+    assert elapsed >= 0.19
+
+
+def test_pipeline_rejects_orders_the_exchange_refuses():
+    """잔고 부족 등 거래소가 거부한 주문은 재시도 없이 거부 상태가 되는지 테스트합니다."""
+    broker = SimulatedBroker(balances={"KRW": 1_000.0}, prices={"KRW-BTC": 50_000.0})
+
+    async def scenario():
+        pipeline = OrderPipeline(broker, rate_per_second=100)
+        pipeline.start()
+        record = await pipeline.submit(OrderRequest("KRW-BTC", "buy", "market", 100_000.0))
+        await pipeline.wait(record.client_order_id, timeout=1)
+        await pipeline.stop()
+        return record
+
+    record = asyncio.run(scenario())
+    assert record.status == "rejected"
+    assert record.attempts == 1
+    assert record.error == "InsufficientFundsBid"
+
+
+def test_cancel_during_submission_cancels_the_placed_order():
+    """전송 중에 취소하면 전송이 끝난 뒤 접수된 주문을 거래소에서 취소하고, 상태가 다시 미체결로 바뀌지 않는지 테스트합니다."""
+    broker = SimulatedBroker(balances={"KRW": 1_000_000.0}, prices={"KRW-ETH": 3_000.0}, fee_rate=0.0, latency=0.05)
+
+    async def scenario():
+        pipeline = OrderPipeline(broker, rate_per_second=100, fill_poll_interval=0.01)
+        statuses = []
+
+        async def listener(record):
+            statuses.append(record.status)
+
+        pipeline.add_listener(listener)
+        pipeline.start()
+        record = await pipeline.submit(OrderRequest("KRW-ETH", "buy", "limit", 10.0, price=2_900.0))
+        await asyncio.sleep(0.01)
+        status_at_cancel = record.status
+        await pipeline.cancel(record.client_order_id)
+        await asyncio.sleep(0.05)
+        await pipeline.stop()
+        return status_at_cancel, statuses, record
+
+    status_at_cancel, statuses, record = asyncio.run(scenario())
+    assert status_at_cancel == "submitting"
+    assert record.status == "cancelled"
+    assert "open" not in statuses
+    assert [order["state"] for order in broker.orders.values()] == ["cancel"]
+    assert broker.balances["KRW"] == 1_000_000.0
+
+
+def test_fill_tracking_timeout_expires_order_and_allows_eviction():
+    """체결 추적 시간이 지나면 주문을 `expired`로 마치고, 진행 중인 주문이 오래된 주문 정리를 막지 않는지 테스트합니다."""
+    broker = SimulatedBroker(balances={"KRW": 1_000_000.0}, prices={"KRW-ETH": 3_000.0}, fee_rate=0.0)
+
+    async def scenario():
+        pipeline = OrderPipeline(broker, rate_per_second=1000, fill_poll_interval=0.01, fill_timeout=0.05, max_records=2)
+        pipeline.start()
+        resting = await pipeline.submit(OrderRequest("KRW-ETH", "buy", "limit", 1.0, price=1_000.0))
+        expired = await pipeline.wait(resting.client_order_id, timeout=1)
+
+        slow = OrderPipeline(broker, rate_per_second=1000, fill_poll_interval=10, max_records=2)
+        slow.start()
+        stuck = await slow.submit(OrderRequest("KRW-ETH", "buy", "limit", 1.0, price=1_000.0))
+        await asyncio.sleep(0.01)
+        for _ in range(3):
+            filled = await slow.submit(OrderRequest("KRW-ETH", "buy", "market", 3_000.0))
+            await slow.wait(filled.client_order_id, timeout=1)
+        remembered = list(slow._records)
+        await pipeline.stop()
+        await slow.stop()
+        return expired, stuck, remembered
+
+    expired, stuck, remembered = asyncio.run(scenario())
+    assert expired.status == "expired"
+    assert expired.error
+    assert stuck.status == "open"
+    assert stuck.client_order_id in remembered
+    assert len(remembered) == 2
+
+
+def test_exchange_cancelled_orders_with_fills_are_not_reported_as_cancelled():
+    """업비트 시장가 매수처럼 체결 후 `cancel`로 끝난 주문은 체결로, 일부 체결 후 취소된 지정가 주문은 부분 체결로 마치는지 테스트합니다."""
+    class UpbitLikeBroker(SimulatedBroker):
+        async def place_order(self, ticker, order_type, side, amount, price=None):
+            response = await super().place_order(ticker, order_type, side, amount, price)
+            # 업비트는 시장가 매수를 `wait`로 접수하고, 체결 후 남은 잔액을 취소하여 `cancel`로 마칩니다.
+            return {**response, "state": "wait", "executed_volume": "0"}
+
+        async def get_order(self, order_id):
+            order = await super().get_order(order_id)
+            if order.get("ord_type") == "price":
+                return {**order, "state": "cancel"}
+            return {**order, "state": "cancel", "executed_volume": "0.4"}
+
+    broker = UpbitLikeBroker(balances={"KRW": 1_000_000.0}, prices={"KRW-ETH": 3_000.0}, fee_rate=0.0)
+
+    async def scenario():
+        pipeline = OrderPipeline(broker, rate_per_second=1000, fill_poll_interval=0.01)
+        pipeline.start()
+        market = await pipeline.submit(OrderRequest("KRW-ETH", "buy", "market", 3_000.0))
+        limit = await pipeline.submit(OrderRequest("KRW-ETH", "buy", "limit", 1.0, price=2_900.0))
+        await pipeline.wait(market.client_order_id, timeout=1)
+        await pipeline.wait(limit.client_order_id, timeout=1)
+        await pipeline.stop()
+        return market, limit
+
+    market, limit = asyncio.run(scenario())
+    assert market.status == "filled"
+    assert market.executed_volume == 1.0
+    assert limit.status == "partially_filled"
+    assert limit.executed_volume == 0.4
@@ -0,0 +1,129 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.brokers.simulator import SimulatedBroker
+from app.core.orders import OrderPipeline, OrderRecord, OrderRequest
+from app.core.portfolio import Portfolio, RiskLimits
+from app.services.portfolio_service import PortfolioService
+
+BALANCES = [
+    {"currency": "KRW", "balance": "600000", "locked": "0", "avg_buy_price": "0", "unit_currency": "KRW"},
+    {"currency": "BTC", "balance": "2", "locked": "0", "avg_buy_price": "100000", "unit_currency": "KRW"},
+    {"currency": "ETH", "balance": "10", "locked": "0", "avg_buy_price": "10000", "unit_currency": "KRW"},
+]
+
+
+def _record(ticker, side, order_type, amount, price=None):
+    return OrderRecord(client_order_id=f"{ticker}-{side}-{amount}", request=OrderRequest(ticker, side, order_type, amount, price))
+
+
+def test_portfolio_revalues_positions_from_price_snapshot():
+    """잔고와 현재가 스냅샷으로 평가금액, 손익, 비중, 한도 위반을 계산하는지 테스트합니다."""
+    portfolio = Portfolio(RiskLimits(max_position_fraction=0.3, max_position_loss_fraction=0.2))
+    portfolio.load_balances(BALANCES)
+    portfolio.update_marks({"KRW-BTC": 150_000.0, "KRW-ETH": 7_000.0, "KRW-XRP": 1.0})
+
+    assert portfolio.equity == 600_000 + 300_000 + 70_000
+    assert portfolio.unrealized_pnl == 100_000 - 30_000
+    rows = {row["ticker"]: row for row in portfolio.snapshot()["positions"]}
+    assert rows["KRW-BTC"]["weight"] == pytest.approx(300_000 / 970_000)
+    assert rows["KRW-BTC"]["breach"] == "position_limit"
+    assert rows["KRW-ETH"]["pnl_fraction"] == pytest.approx(-0.3)
+    assert rows["KRW-ETH"]["breach"] == "loss_limit"
+
+
+def test_pre_trade_check_enforces_limits_and_reserves_accepted_orders():
+    """주문 전 확인이 한도를 넘는 주문을 거부하고, 통과한 주문을 끝날 때까지 예약하는지 테스트합니다."""
+    portfolio = Portfolio(RiskLimits(max_order_value=200_000, max_position_fraction=0.5))
+    assert portfolio.check_order(_record("KRW-BTC", "buy", "market", 1_000)) == "Portfolio is not loaded yet."
+    portfolio.load_balances(BALANCES)
+    portfolio.update_marks({"KRW-BTC": 100_000.0, "KRW-ETH": 10_000.0})  # equity 1,000,000
+
+    assert "exceeds the limit" in portfolio.check_order(_record("KRW-SOL", "buy", "market", 250_000))
+    assert "Insufficient KRW-ETH position" in portfolio.check_order(_record("KRW-ETH", "sell", "market", 11))
+
+    first = _record("KRW-BTC", "buy", "limit", 1, price=150_000)
+    assert portfolio.check_order(first) is None  # BTC 200,000 + 150,000 ≤ 500,000
+    second = _record("KRW-BTC", "buy", "market", 160_000)
+    assert "exposure would exceed 50%" in portfolio.check_order(second)
+
+    first.status = "cancelled"
+    portfolio.settle(first)
+    assert portfolio.check_order(second) is None
+
+
+def test_open_order_locked_by_exchange_is_not_subtracted_twice():
+    """거래소가 접수해 `locked`로 옮긴 주문 금액/수량을 예약에서 다시 빼지 않는지 테스트합니다."""
+    portfolio = Portfolio()
+    portfolio.load_balances([{"currency": "KRW", "balance": "1000000", "locked": "0", "unit_currency": "KRW"}])
+    resting = _record("KRW-BTC", "buy", "limit", 6, price=100_000)
+    assert portfolio.check_order(resting) is None
+
+    # 거래소가 주문을 접수해 600,000원을 locked로 옮긴 잔고
+    portfolio.load_balances([{"currency": "KRW", "balance": "400000", "locked": "600000", "unit_currency": "KRW"}])
+    assert portfolio.check_order(_record("KRW-BTC", "buy", "market", 300_000)) is None
+    assert "Insufficient cash" in portfolio.check_order(_record("KRW-ETH", "buy", "market", 200_000))
+
+    # 매도도 같습니다: 10개 중 6개를 매도 주문 → 접수되어 6개가 locked
+    portfolio.load_balances([{"currency": "ETH", "balance": "10", "locked": "0", "unit_currency": "KRW"}])
+    assert portfolio.check_order(_record("KRW-ETH", "sell", "limit", 6, price=10_000)) is None
+    portfolio.load_balances([{"currency": "ETH", "balance": "4", "locked": "6", "unit_currency": "KRW"}])
+    assert "Insufficient KRW-ETH position" in portfolio.check_order(_record("KRW-ETH", "sell", "market", 5))
+    assert portfolio.check_order(_record("KRW-ETH", "sell", "market", 4)) is None
+
+
+def test_filled_reservation_waits_for_a_balance_fetched_after_settle():
+    """체결된 주문의 예약은 정리 이후에 시작된 잔고 조회가 반영될 때만 풀리는지 테스트합니다."""
+    portfolio = Portfolio()
+    portfolio.load_balances(BALANCES)
+    order = _record("KRW-BTC", "buy", "market", 100_000)
+    assert portfolio.check_order(order) is None
+
+    in_flight = portfolio.begin_refresh()  # 체결 전에 시작된 잔고 조회
+    order.status = "filled"
+    portfolio.settle(order)
+    portfolio.load_balances(BALANCES, refresh=in_flight)
+    assert portfolio.snapshot()["pending_buy_value"] == 100_000
+
+    portfolio.load_balances(BALANCES, refresh=portfolio.begin_refresh())
+    assert portfolio.snapshot()["pending_buy_value"] == 0
+
+
+def test_pre_trade_check_is_fast():
+    """주문 전 확인이 수 마이크로초 수준으로 끝나는지 테스트합니다. (한도 계산은 갱신 시에 미리 끝나 있음)"""
+    portfolio = Portfolio(RiskLimits(max_position_fraction=0.5))
+    portfolio.load_balances(BALANCES)
+    record = _record("KRW-ETH", "sell", "market", 0.0)
+    iterations = 10_000
+    started = time.perf_counter()
+    for _ in range(iterations):
+        portfolio.check_order(record)
+    assert (time.perf_counter() - started) / iterations < 50e-6
+
+
+def test_pipeline_rejects_orders_that_fail_pre_trade_check():
+    """포트폴리오 서비스와 연결된 주문 파이프라인이 한도를 넘는 주문을 거래소에 보내지 않는지 테스트합니다."""
+    broker = SimulatedBroker(balances={"KRW": 1_000_000.0}, prices={"KRW-BTC": 50_000.0}, fee_rate=0.0)
+    service = PortfolioService(Portfolio(RiskLimits(max_position_fraction=0.25)))
+    service.broker = broker
+
+    async def scenario():
+        await service.refresh()
+        pipeline = OrderPipeline(broker, rate_per_second=100, pre_trade=service.portfolio.check_order)
+        pipeline.add_listener(service.on_order_update)
+        pipeline.start()
+        accepted = await pipeline.submit(OrderRequest("KRW-BTC", "buy", "market", 200_000.0))
+        rejected = await pipeline.submit(OrderRequest("KRW-BTC", "buy", "market", 100_000.0))
+        await pipeline.wait(accepted.client_order_id, timeout=1)
+        await service.refresh()
+        await pipeline.stop()
+        return accepted, rejected
+
+    accepted, rejected = asyncio.run(scenario())
+    assert accepted.status == "filled"
+    assert rejected.status == "rejected" and "exposure would exceed 25%" in rejected.error
+    assert len(broker.orders) == 1
+    assert service.portfolio.gross_exposure == 200_000.0
+    assert service.portfolio.snapshot()["pending_buy_value"] == 0.0
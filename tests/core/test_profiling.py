@@ -0,0 +1,48 @@
+import asyncio
+import polars as pl
+
+from app.core.engine import ScanEngine
+from app.services.profile_service import ScanProfileStore, scan_profiles
+from app.services.scan_service import mock_indicators, profile_scan
+from fakes import FrameBroker
+
+
+def test_profiled_scan_records_plan_stats_and_slowest_tickers():
+    """프로파일 스캔이 cProfile 통계, 쿼리 플랜, 노드별 시간, 종목별 시간을 기록하는지 테스트합니다."""
+    frame = pl.DataFrame({"close": [float(i) for i in range(1, 31)]})
+    scan_logic = {
+        "2nd_scan": {
+            "variables": [{"name": "fast", "expression": "ma(5)"}],
+            "condition": "close > fast",
+        }
+    }
+    profile = scan_profiles.start(strategy_id=7, phase="2nd")
+
+    async def scenario():
+        async with profile_scan(profile) as profiler:
+            engine = ScanEngine(broker=FrameBroker(frame), indicators=mock_indicators, profiler=profiler)
+            return await engine.run_2nd_scan(scan_logic, tickers=["KRW-BTC", "KRW-ETH", "KRW-XRP"])
+
+    result = asyncio.run(scenario())
+
+    assert result.height == 3
+    stored = scan_profiles.get(profile.id)
+    assert stored.status == "completed"
+    assert stored.ticker_count == 3
+    assert "cumulative" in stored.python_stats
+    assert [p.label for p in stored.plans] == ["2nd_scan"]
+    assert "rolling" in stored.plans[0].optimized_plan
+    assert {n.node for n in stored.plans[0].node_timings} >= {"fast", "condition"}
+    assert {t.ticker for t in stored.slowest_tickers} == {"KRW-BTC", "KRW-ETH", "KRW-XRP"}
+    assert [s.id for s in scan_profiles.list(7)][0] == profile.id
+
+
+def test_profile_store_is_bounded():
+    """프로파일 저장소가 최대 개수를 넘으면 가장 오래된 프로파일을 버리는지 테스트합니다."""
+    store = ScanProfileStore(max_profiles=2)
+    first = store.start(1, "1st")
+    store.start(1, "1st")
+    store.start(1, "2nd")
+
+    assert store.get(first.id) is None
+    assert len(store.list(1)) == 2
@@ -0,0 +1,120 @@
+import asyncio
+import datetime
+
+import polars as pl
+import pytest
+
+from app.core.brokers.replay import ReplayBroker
+from app.core.clock import Clock, SimulatedClock
+from app.core.cron import CronSchedule
+from app.models.strategy import StrategySchema
+from app.services.scan_service import run_scheduled_scan, watchlist_storage
+from app.services.scheduler_service import StrategyScheduler
+
+KST = datetime.timezone(datetime.timedelta(hours=9))
+# 2024-01-01 09:00 KST (월요일)
+T0 = datetime.datetime(2024, 1, 1, 9, 0, tzinfo=KST).timestamp()
+MINUTE_MS = 60_000
+
+
+class FixedClock(Clock):
+    def __init__(self, now: float):
+        self.value = now
+
+    def now(self) -> float:
+        return self.value
+
+
+def _minute_candles(count: int, start_price: float = 100.0) -> pl.DataFrame:
+    start_ms = int(T0 * 1000)
+    return pl.DataFrame({
+        "timestamp": [start_ms + i * MINUTE_MS for i in range(count)],
+        "open": [start_price + i for i in range(count)],
+        "high": [start_price + i + 1 for i in range(count)],
+        "low": [start_price + i - 1 for i in range(count)],
+        "close": [start_price + i for i in range(count)],
+        "volume": [1.0] * count,
+        "amount": [start_price + i for i in range(count)],
+    })
+
+
+def _strategy(strategy_id: int, cron: str, scan_logic: dict) -> StrategySchema:
+    return StrategySchema(
+        id=strategy_id, name=f"replay-{strategy_id}", broker="upbit", market="KRW",
+        scan_logic=scan_logic, is_active=True, cron_schedule=cron,
+        created_at=datetime.datetime.now(datetime.timezone.utc),
+    )
+
+
+def test_cron_schedule_next_after():
+    """cron 식이 KST 기준으로 다음 실행 시각을 계산하는지 테스트합니다."""
+    schedule = CronSchedule("30 9 * * 1-5")
+    assert schedule.next_after(T0) == T0 + 30 * 60
+    # 금요일 09:30 이후 다음 실행은 월요일 09:30
+    friday = datetime.datetime(2024, 1, 5, 9, 30, tzinfo=KST).timestamp()
+    assert schedule.next_after(friday) == datetime.datetime(2024, 1, 8, 9, 30, tzinfo=KST).timestamp()
+    assert CronSchedule("*/15 * * * *").next_after(T0 + 1) == T0 + 15 * 60
+
+    with pytest.raises(ValueError):
+        CronSchedule("61 * * * *")
+    with pytest.raises(ValueError):
+        CronSchedule("* * *")
+
+
+def test_replay_broker_only_exposes_closed_bars():
+    """리플레이 브로커가 시계 기준으로 완성된 봉만 제공하는지 테스트합니다."""
+    clock = FixedClock(T0 + 5 * 60 + 30)
+    broker = ReplayBroker({"KRW-BTC": {"minute1": _minute_candles(10)}}, clock)
+
+    async def scenario():
+        first = await broker.get_ohlcv("KRW-BTC", "minute1", limit=3)
+        clock.value += 120
+        second = await broker.get_ohlcv("KRW-BTC", "minute1", limit=200)
+        return first, second, await broker.get_current_price("KRW-BTC")
+
+    first, second, price = asyncio.run(scenario())
+    assert first["close"].to_list() == [102.0, 103.0, 104.0]
+    assert second.height == 7
+    assert price == 106.0
+    assert first["timestamp"].dtype == pl.Int64
+
+
+def test_scheduler_skips_overlapping_runs():
+    """이전 실행이 끝나지 않은 전략의 다음 실행은 건너뛰는지 테스트합니다. (max_instances=1)"""
+    clock = SimulatedClock(T0, speed=6000)  # 1분 = 10ms
+    runs = []
+
+    async def slow_job(strategy):
+        runs.append(clock.now())
+        await clock.sleep(150)  # 2.5분 걸리는 작업
+
+    scheduler = StrategyScheduler(slow_job, clock=clock)
+    scheduler.set_strategies([_strategy(1, "* * * * *", {})])
+    asyncio.run(scheduler.run(until=T0 + 10 * 60 + 1))
+
+    stats = scheduler.stats
+    assert stats.fired >= 9
+    assert stats.skipped >= 4
+    assert stats.completed == len(runs) == stats.fired - stats.skipped
+
+
+def test_replay_drives_scheduled_scans_end_to_end():
+    """가속 재생한 과거 봉으로 스케줄된 1차/2차 스캔이 실행되는지 테스트합니다."""
+    candles = {
+        "KRW-BTC": {"minute1": _minute_candles(60, 100.0)},
+        "KRW-ETH": {"minute1": _minute_candles(60, 10.0)},
+    }
+    clock = SimulatedClock(T0 + 30 * 60, speed=6000)
+    broker = ReplayBroker(candles, clock)
+    strategy = _strategy(42, "*/5 * * * *", {"2nd_scan": {"timeframe": "minute1", "condition": "close > 50"}})
+
+    async def job(s):
+        await run_scheduled_scan(s, broker=broker)
+
+    scheduler = StrategyScheduler(job, clock=clock)
+    scheduler.set_strategies([strategy])
+    asyncio.run(scheduler.run(until=T0 + 46 * 60))
+
+    assert scheduler.stats.completed >= 2
+    assert scheduler.stats.failed == 0
+    assert sorted(watchlist_storage[42]) == ["KRW-BTC", "KRW-ETH"]
@@ -0,0 +1,35 @@
+from app.core.triggers import TriggeredSymbols
+
+
+def test_arm_expire_and_rearm():
+    """무장, 만료, 재무장(만료 연장), 해제가 올바르게 동작하는지 테스트합니다."""
+    symbols = TriggeredSymbols()
+    symbols.arm(1, ["KRW-BTC", "KRW-ETH"], ttl_seconds=10, now=0)
+    symbols.arm(2, ["KRW-XRP"], ttl_seconds=100, now=0)
+    # 재무장하면 만료 시각이 연장되고, 힙에 남은 이전 항목은 무시됩니다.
+    symbols.arm(1, ["KRW-ETH"], ttl_seconds=10, now=5)
+
+    assert sorted(symbols.active(1, now=9)) == ["KRW-BTC", "KRW-ETH"]
+    assert symbols.active(1, now=12) == ["KRW-ETH"]
+    assert symbols.active(1, now=15) == []
+    assert symbols.active(2, now=15) == ["KRW-XRP"]
+
+    symbols.disarm(2, ["KRW-XRP"])
+    assert symbols.active(2, now=15) == []
+
+
+def test_dirty_tracking_and_load():
+    """변경된 전략만 영속화 대상으로 반환되고, 복원 시 더 늦은 만료 시각이 유지되는지 테스트합니다."""
+    symbols = TriggeredSymbols()
+    symbols.load(1, {"KRW-BTC": 50.0})
+    assert symbols.pop_dirty() == {}
+
+    symbols.arm(1, ["KRW-ETH"], ttl_seconds=10, now=0)
+    assert symbols.pop_dirty() == {1: {"KRW-BTC": 50.0, "KRW-ETH": 10.0}}
+    assert symbols.pop_dirty() == {}
+
+    symbols.load(1, {"KRW-ETH": 5.0})
+    assert symbols.items(1)["KRW-ETH"] == 10.0
+
+    symbols.prune(now=20)
+    assert symbols.pop_dirty() == {1: {"KRW-BTC": 50.0}}
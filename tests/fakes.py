@@ -0,0 +1,61 @@
+"""여러 테스트 모듈에서 함께 쓰는 가짜 시계, 브로커, 봉 데이터."""
+from typing import Sequence
+
+import polars as pl
+
+from app.core.clock import Clock
+
+MINUTE_MS = 60_000
+DAY_MS = 86_400_000
+
+
+class ManualClock(Clock):
+    """`current`를 직접 바꿔 시간을 진행시키는 스캔 엔진/브로커용 시계."""
+    def __init__(self, now: float = 0.0):
+        self.current = now
+
+    def now(self) -> float:
+        return self.current
+
+
+class FakeClock:
+    """`now`를 직접 바꿔 시간을 진행시키는, 호출하면 현재 시각을 반환하는 시계. (`time.monotonic` 대용)"""
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FrameBroker:
+    """모든 종목에 같은 OHLCV를 반환하는 테스트용 브로커."""
+    def __init__(self, frame: pl.DataFrame):
+        self.frame = frame
+
+    async def get_ohlcv(self, ticker, timeframe='day', limit=200):
+        return self.frame.tail(limit)
+
+
+def make_candles(
+    closes: Sequence[float],
+    start: int = 1_700_000_000_000,
+    interval_ms: int = MINUTE_MS,
+    volume: float = 1.0,
+    open_offset: float = 0.0,
+    high_offset: float = 0.0,
+    low_offset: float = 0.0,
+) -> pl.DataFrame:
+    """
+    종가 목록으로 표준 스키마의 OHLCV를 만듭니다. 시가/고가/저가는 종가에 오프셋을 더한 값이고,
+    거래대금은 종가 × 거래량입니다.
+    """
+    n = len(closes)
+    return pl.DataFrame({
+        "timestamp": [start + i * interval_ms for i in range(n)],
+        "open": [c + open_offset for c in closes],
+        "high": [c + high_offset for c in closes],
+        "low": [c + low_offset for c in closes],
+        "close": list(closes),
+        "volume": [volume] * n,
+        "amount": [c * volume for c in closes],
+    })